@@ -17,7 +17,7 @@ from app.main import app
 from app.config import config
 
 # Core utilities
-from app.utils.database import get_db, database, engine, SessionLocal, Base
+from app.utils.database import get_db, get_async_db, engine, SessionLocal, AsyncSessionLocal, Base
 
 # Core responses
 from app.core.responses import (
@@ -40,9 +40,10 @@ __all__ = [
     
     # Database
     "get_db",
-    "database", 
+    "get_async_db",
     "engine",
     "SessionLocal",
+    "AsyncSessionLocal",
     "Base",
     
     # Responses
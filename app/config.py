@@ -62,6 +62,13 @@ class Config(BaseSettings):
     DB_POOL_RECYCLE: int = Field(default=3600, description="Database pool recycle")
     DB_POOL_PRE_PING: bool = Field(default=True, description="Database pool pre ping")
     
+    # ============================
+    # Cache Configuration
+    # ============================
+    REDIS_URL: Optional[str] = Field(default=None, description="Redis URL for the shared cache backend")
+    CACHE_MAX_ENTRIES: int = Field(default=10000, description="Maximum entries kept in the in-process cache")
+    RATE_LIMIT_MAX_KEYS: int = Field(default=100000, description="Maximum client keys tracked by the in-process rate limiter")
+    
     # ============================
     # Plaid Configuration
     # ============================
@@ -195,6 +202,12 @@ class Config(BaseSettings):
     DB_POOL_TIMEOUT: int = Field(default=30, description="Database pool timeout")
     DB_POOL_RECYCLE: int = Field(default=3600, description="Database pool recycle")
 
+    # ============================
+    # Background Job Configuration
+    # ============================
+    SCHEDULER_ENABLED: bool = Field(default=False, description="Run the data sync job scheduler in this process (enable on exactly one process)")
+    TRANSACTION_SYNC_INTERVAL_HOURS: int = Field(default=6, description="Hours between Plaid transaction syncs for church donors")
+
     # ============================
     # Notification Configuration
     # ============================
@@ -255,6 +268,8 @@ class Config(BaseSettings):
     JWT_EXPIRES_IN_SECONDS: int = Field(default=1800, description="JWT expires in seconds")
     JWT_TOKEN_TYPE: str = Field(default="bearer", description="JWT token type")
     JWT_AUDIENCE: List[str] = Field(default=["manna-users", "manna-refresh"], description="JWT audience")
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = Field(default=30, description="TTL of cached authenticated principals (0 disables)")
+    REVOKED_TOKEN_REFRESH_SECONDS: int = Field(default=30, description="Max delay before a token revoked on another worker is rejected here")
     
     # ============================
     # Admin Configuration
@@ -30,12 +30,12 @@ from app.controller.mobile.roundups import (
 )
 
 from app.controller.mobile.notifications import (
-    get_mobile_notifications, mark_notification_read, mark_all_notifications_read,
+    get_mobile_notifications, get_mobile_notifications_async, mark_notification_read, mark_all_notifications_read,
     delete_notification, get_notification_preferences, update_notification_preferences
 )
 
 from app.controller.mobile.dashboard import (
-    get_mobile_dashboard
+    get_mobile_dashboard, get_mobile_dashboard_async
 )
 
 # Import church controllers
@@ -123,9 +123,9 @@ __all__ = [
     "get_mobile_impact_analytics", "list_mobile_payment_methods", "delete_mobile_payment_method",
     "save_mobile_payment_method", "get_mobile_roundup_settings", "update_mobile_roundup_settings",
     "get_mobile_pending_roundups", "quick_toggle_roundups", "get_mobile_impact_summary",
-    "get_mobile_notifications", "mark_notification_read", "mark_all_notifications_read",
+    "get_mobile_notifications", "get_mobile_notifications_async", "mark_notification_read", "mark_all_notifications_read",
     "delete_notification", "get_notification_preferences", "update_notification_preferences",
-    "get_mobile_dashboard",
+    "get_mobile_dashboard", "get_mobile_dashboard_async",
     
     # Church controllers
     "register_church_admin", "login_church_admin", "logout_church", "refresh_church_token",
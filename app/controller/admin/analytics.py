@@ -20,10 +20,10 @@ from app.model.m_user import User
 from app.model.m_church import Church
 from app.model.m_donation_batch import DonationBatch
 from app.model.m_donation_preference import DonationPreference
-from app.model.m_church_referral import ChurchReferral
-from app.model.m_referral import ReferralCommission
 from app.model.m_roundup_new import ChurchPayout, DonorPayout
 from app.core.responses import ResponseFactory
+from app.services.platform_counters import get_platform_counters, counter_breakdown
+from app.utils.time_series import aggregate_by_period, complete_periods, fill_periods
 
 
 def get_church_statistics(db: Session):
@@ -276,31 +276,25 @@ def get_revenue_analytics(
         start_dt = parse_date(start_date)
         end_dt = parse_date(end_date)
 
-        # Build query for donations from DonorPayout (current system)
-        query = db.query(DonorPayout).filter(DonorPayout.status == "completed")
+        # Monthly totals from DonorPayout (current system), grouped in the database
+        query = db.query(
+            func.sum(DonorPayout.donation_amount),
+            func.count(DonorPayout.id)
+        ).filter(DonorPayout.status == "completed")
 
         if start_dt:
             query = query.filter(DonorPayout.created_at >= start_dt)
         if end_dt:
             query = query.filter(DonorPayout.created_at <= end_dt)
 
-        donations = query.all()
+        monthly_data = aggregate_by_period(query, DonorPayout.created_at)
 
         # Calculate revenue metrics
-        total_revenue = sum(float(d.donation_amount or 0) for d in donations)
-        donation_count = len(donations)
+        total_revenue = sum(float(amount or 0) for amount, _ in monthly_data.values())
+        donation_count = sum(count for _, count in monthly_data.values())
         avg_donation = total_revenue / donation_count if donation_count > 0 else 0.0
 
-        # Monthly breakdown
-        monthly_data = {}
-        for donation in donations:
-            month_key = donation.created_at.strftime("%Y-%m")
-            if month_key not in monthly_data:
-                monthly_data[month_key] = {"amount": 0.0, "count": 0}
-            monthly_data[month_key]["amount"] += float(donation.donation_amount)
-            monthly_data[month_key]["count"] += 1
-
-        sorted_monthly = sorted(monthly_data.items(), key=lambda x: x[0])
+        sorted_monthly = fill_periods(monthly_data, start_dt, end_dt, empty=(0, 0))
 
         # Top churches by revenue from DonorPayout
         church_revenue_query = (
@@ -340,10 +334,10 @@ def get_revenue_analytics(
                 "monthly_breakdown": [
                     {
                         "month": month,
-                        "amount": round(data["amount"], 2),
-                        "count": data["count"],
+                        "amount": round(float(amount or 0), 2),
+                        "count": count,
                     }
-                    for month, data in sorted_monthly
+                    for month, (amount, count) in sorted_monthly
                 ],
                 "top_churches": [
                     {
@@ -378,37 +372,29 @@ def get_user_growth_analytics(
         start_dt = parse_date(start_date)
         end_dt = parse_date(end_date)
 
-        # Get user growth over time
-        if start_dt and end_dt:
-            users = (
-                db.query(User)
-                .filter(User.created_at >= start_dt, User.created_at <= end_dt)
-                .all()
-            )
-        else:
-            # Get last 12 months by default
+        # Get last 12 months by default
+        if not (start_dt and end_dt):
             end_dt = datetime.now(timezone.utc)
             start_dt = end_dt - timedelta(days=365)
-            users = (
-                db.query(User)
-                .filter(User.created_at >= start_dt, User.created_at <= end_dt)
-                .all()
-            )
 
-        # Monthly user growth
-        monthly_growth = {}
-        for user in users:
-            month_key = user.created_at.strftime("%Y-%m")
-            if month_key not in monthly_growth:
-                monthly_growth[month_key] = 0
-            monthly_growth[month_key] += 1
+        # Monthly user growth, grouped in the database
+        monthly_growth = aggregate_by_period(
+            db.query(func.count(User.id)).filter(
+                User.created_at >= start_dt, User.created_at <= end_dt
+            ),
+            User.created_at
+        )
+        total_users = sum(count for (count,) in monthly_growth.values())
 
-        sorted_growth = sorted(monthly_growth.items(), key=lambda x: x[0])
+        sorted_growth = [
+            (month, count) for month, (count,) in fill_periods(monthly_growth, start_dt, end_dt, empty=(0,))
+        ]
 
-        # Calculate growth rate
-        if len(sorted_growth) >= 2:
-            current_month = sorted_growth[-1][1]
-            previous_month = sorted_growth[-2][1]
+        # Growth between the last two complete months; the current one is still filling up
+        complete_growth = complete_periods(sorted_growth)
+        if len(complete_growth) >= 2:
+            current_month = complete_growth[-1][1]
+            previous_month = complete_growth[-2][1]
             growth_rate = (
                 ((current_month - previous_month) / previous_month * 100)
                 if previous_month > 0
@@ -420,7 +406,7 @@ def get_user_growth_analytics(
         return ResponseFactory.success(
             message="User growth analytics retrieved successfully",
             data={
-                "total_users": len(users),
+                "total_users": total_users,
                 "growth_rate": round(growth_rate, 2),
                 "monthly_growth": [
                     {"month": month, "new_users": count}
@@ -454,37 +440,29 @@ def get_church_growth_analytics(
         start_dt = parse_date(start_date)
         end_dt = parse_date(end_date)
 
-        # Get church growth over time
-        if start_dt and end_dt:
-            churches = (
-                db.query(Church)
-                .filter(Church.created_at >= start_dt, Church.created_at <= end_dt)
-                .all()
-            )
-        else:
-            # Get last 12 months by default
+        # Get last 12 months by default
+        if not (start_dt and end_dt):
             end_dt = datetime.now(timezone.utc)
             start_dt = end_dt - timedelta(days=365)
-            churches = (
-                db.query(Church)
-                .filter(Church.created_at >= start_dt, Church.created_at <= end_dt)
-                .all()
-            )
 
-        # Monthly church growth
-        monthly_growth = {}
-        for church in churches:
-            month_key = church.created_at.strftime("%Y-%m")
-            if month_key not in monthly_growth:
-                monthly_growth[month_key] = 0
-            monthly_growth[month_key] += 1
+        # Monthly church growth, grouped in the database
+        monthly_growth = aggregate_by_period(
+            db.query(func.count(Church.id)).filter(
+                Church.created_at >= start_dt, Church.created_at <= end_dt
+            ),
+            Church.created_at
+        )
+        total_churches = sum(count for (count,) in monthly_growth.values())
 
-        sorted_growth = sorted(monthly_growth.items(), key=lambda x: x[0])
+        sorted_growth = [
+            (month, count) for month, (count,) in fill_periods(monthly_growth, start_dt, end_dt, empty=(0,))
+        ]
 
-        # Calculate growth rate
-        if len(sorted_growth) >= 2:
-            current_month = sorted_growth[-1][1]
-            previous_month = sorted_growth[-2][1]
+        # Growth between the last two complete months; the current one is still filling up
+        complete_growth = complete_periods(sorted_growth)
+        if len(complete_growth) >= 2:
+            current_month = complete_growth[-1][1]
+            previous_month = complete_growth[-2][1]
             growth_rate = (
                 ((current_month - previous_month) / previous_month * 100)
                 if previous_month > 0
@@ -496,7 +474,7 @@ def get_church_growth_analytics(
         return ResponseFactory.success(
             message="Church growth analytics retrieved successfully",
             data={
-                "total_churches": len(churches),
+                "total_churches": total_churches,
                 "growth_rate": round(growth_rate, 2),
                 "monthly_growth": [
                     {"month": month, "new_churches": count}
@@ -530,31 +508,25 @@ def get_donation_analytics(
         start_dt = parse_date(start_date)
         end_dt = parse_date(end_date)
 
-        # Build query for donations from DonorPayout (current system)
-        query = db.query(DonorPayout).filter(DonorPayout.status == "completed")
+        # Monthly totals from DonorPayout (current system), grouped in the database
+        query = db.query(
+            func.sum(DonorPayout.donation_amount),
+            func.count(DonorPayout.id)
+        ).filter(DonorPayout.status == "completed")
 
         if start_dt:
             query = query.filter(DonorPayout.created_at >= start_dt)
         if end_dt:
             query = query.filter(DonorPayout.created_at <= end_dt)
 
-        donations = query.all()
+        monthly_data = aggregate_by_period(query, DonorPayout.created_at)
 
         # Calculate donation metrics
-        total_amount = sum(float(d.donation_amount or 0) for d in donations)
-        donation_count = len(donations)
+        total_amount = sum(float(amount or 0) for amount, _ in monthly_data.values())
+        donation_count = sum(count for _, count in monthly_data.values())
         avg_donation = total_amount / donation_count if donation_count > 0 else 0.0
 
-        # Monthly donation breakdown
-        monthly_data = {}
-        for donation in donations:
-            month_key = donation.created_at.strftime("%Y-%m")
-            if month_key not in monthly_data:
-                monthly_data[month_key] = {"amount": 0.0, "count": 0}
-            monthly_data[month_key]["amount"] += float(donation.donation_amount)
-            monthly_data[month_key]["count"] += 1
-
-        sorted_monthly = sorted(monthly_data.items(), key=lambda x: x[0])
+        sorted_monthly = fill_periods(monthly_data, start_dt, end_dt, empty=(0, 0))
 
         # Top donors from DonorPayout
         top_donors_query = (
@@ -595,10 +567,10 @@ def get_donation_analytics(
                 "monthly_breakdown": [
                     {
                         "month": month,
-                        "amount": round(data["amount"], 2),
-                        "count": data["count"],
+                        "amount": round(float(amount or 0), 2),
+                        "count": count,
                     }
-                    for month, data in sorted_monthly
+                    for month, (amount, count) in sorted_monthly
                 ],
                 "top_donors": [
                     {
@@ -622,21 +594,25 @@ def get_donation_analytics(
 def get_system_health_analytics(db: Session):
     """Get comprehensive system health analytics"""
     try:
-        # System status overview
-        total_churches = db.query(func.count(Church.id)).scalar()
-        active_churches = db.query(func.count(Church.id)).filter(Church.is_active == True).scalar()
+        # All-time totals from the incrementally maintained counters
+        counters = get_platform_counters(db)
+        total_churches = int(counters.get("churches.total", 0))
+        active_churches = int(counters.get("churches.active", 0))
+        kyc_breakdown = counter_breakdown(counters, "churches.kyc_status.")
+        church_status_breakdown = counter_breakdown(counters, "churches.status.")
         
-        # KYC status breakdown
-        kyc_statuses = db.query(
-            Church.kyc_status,
-            func.count(Church.id).label('count')
-        ).group_by(Church.kyc_status).all()
+        # Pending KYC applications
+        pending_kyc = kyc_breakdown.get("pending_review", 0) + kyc_breakdown.get("under_review", 0)
         
-        # Church status breakdown
-        church_statuses = db.query(
-            Church.status,
-            func.count(Church.id).label('count')
-        ).group_by(Church.status).all()
+        # System performance metrics from DonorPayout
+        total_donations = float(counters.get("donor_payouts.completed_amount", 0))
+        
+        # Referral system health
+        total_referrals = int(counters.get("referrals.total", 0))
+        active_referrals = int(counters.get("referrals.status.active", 0))
+        
+        # Commission analytics
+        total_commissions = float(counters.get("referral_commissions.amount", 0))
         
         # Recent activity (last 7 days)
         week_ago = datetime.now(timezone.utc) - timedelta(days=7)
@@ -648,25 +624,6 @@ def get_system_health_analytics(db: Session):
             User.created_at >= week_ago
         ).scalar()
         
-        # Pending KYC applications
-        pending_kyc = db.query(func.count(Church.id)).filter(
-            Church.kyc_status.in_(['pending_review', 'under_review'])
-        ).scalar()
-        
-        # System performance metrics from DonorPayout
-        total_donations = float(db.query(func.sum(DonorPayout.donation_amount)).filter(
-            DonorPayout.status == "completed"
-        ).scalar() or 0)
-        
-        # Referral system health
-        total_referrals = db.query(func.count(ChurchReferral.id)).scalar()
-        active_referrals = db.query(func.count(ChurchReferral.id)).filter(
-            ChurchReferral.status == "active"
-        ).scalar()
-        
-        # Commission analytics
-        total_commissions = db.query(func.sum(ReferralCommission.amount)).scalar() or 0.0
-        
         return ResponseFactory.success(
             message="System health analytics retrieved successfully",
             data={
@@ -678,12 +635,8 @@ def get_system_health_analytics(db: Session):
                     "recent_users_7d": recent_users,
                     "total_donations": round(float(total_donations), 2)
                 },
-                "kyc_breakdown": {
-                    status: count for status, count in kyc_statuses
-                },
-                "church_status_breakdown": {
-                    status: count for status, count in church_statuses
-                },
+                "kyc_breakdown": kyc_breakdown,
+                "church_status_breakdown": church_status_breakdown,
                 "referral_system": {
                     "total_referrals": total_referrals,
                     "active_referrals": active_referrals,
@@ -700,28 +653,19 @@ def get_system_health_analytics(db: Session):
 def get_operational_analytics(db: Session):
     """Get operational analytics including payouts, transactions, and errors"""
     try:
-        # Payout analytics
-        total_payouts = db.query(func.count(ChurchPayout.id)).scalar()
-        completed_payouts = db.query(func.count(ChurchPayout.id)).filter(
-            ChurchPayout.status == "completed"
-        ).scalar()
-        pending_payouts = db.query(func.count(ChurchPayout.id)).filter(
-            ChurchPayout.status == "pending"
-        ).scalar()
+        # All-time totals from the incrementally maintained counters
+        counters = get_platform_counters(db)
         
-        total_payout_amount = db.query(func.sum(ChurchPayout.net_payout_amount)).filter(
-            ChurchPayout.status == "completed"
-        ).scalar() or 0.0
+        # Payout analytics
+        total_payouts = int(counters.get("church_payouts.total", 0))
+        completed_payouts = int(counters.get("church_payouts.status.completed", 0))
+        pending_payouts = int(counters.get("church_payouts.status.pending", 0))
+        total_payout_amount = float(counters.get("church_payouts.completed_net_amount", 0))
         
         # Donation analytics
-        total_donations = db.query(func.count(DonorPayout.id)).scalar()
-        completed_donations = db.query(func.count(DonorPayout.id)).filter(
-            DonorPayout.status == "completed"
-        ).scalar()
-        
-        total_donation_amount = db.query(func.sum(DonorPayout.donation_amount)).filter(
-            DonorPayout.status == "completed"
-        ).scalar() or 0.0
+        total_donations = int(counters.get("donor_payouts.total", 0))
+        completed_donations = int(counters.get("donor_payouts.status.completed", 0))
+        total_donation_amount = float(counters.get("donor_payouts.completed_amount", 0))
         
         # Recent activity (last 30 days)
         month_ago = datetime.now(timezone.utc) - timedelta(days=30)
@@ -16,6 +16,7 @@ from app.model.m_user import User
 from app.schema.admin_schema import ChurchKYCReviewRequest
 from app.core.responses import ResponseFactory
 from app.utils.audit import log_audit_event
+from app.utils.enrichment import aggregate_by_ids
 from datetime import datetime, timezone
 import logging
 
@@ -35,24 +36,23 @@ def list_churches(status_filter: str, limit: int, offset: int, db: Session):
         # Get churches with pagination
         churches = query.order_by(desc(Church.created_at)).offset(offset).limit(limit).all()
         
+        # Church analytics for the whole page
+        analytics = aggregate_by_ids(
+            db,
+            DonationBatch.church_id,
+            [church.id for church in churches],
+            {
+                "total_revenue": func.sum(DonationBatch.amount),
+                "active_givers": func.count(func.distinct(DonationBatch.user_id)),
+            },
+            DonationBatch.status == "completed",
+            empty={"total_revenue": 0.0, "active_givers": 0},
+        )
+
         church_data = []
         for church in churches:
-            # Get church analytics
-            total_revenue_result = db.query(func.sum(DonationBatch.total_amount)).filter(
-                and_(
-                    DonationBatch.church_id == church.id,
-                    DonationBatch.status == "success"
-                )
-            ).scalar()
-            total_revenue = float(total_revenue_result) if total_revenue_result else 0.0
-            
-            # Get active givers count
-            active_givers = db.query(func.count(func.distinct(DonationBatch.user_id))).filter(
-                and_(
-                    DonationBatch.church_id == church.id,
-                    DonationBatch.status == "success"
-                )
-            ).scalar()
+            total_revenue = float(analytics[church.id]["total_revenue"])
+            active_givers = analytics[church.id]["active_givers"]
             
             church_data.append({
                 "id": church.id,
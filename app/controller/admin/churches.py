@@ -15,6 +15,7 @@ from app.model.m_roundup_new import DonorPayout, ChurchPayout
 from app.core.responses import ResponseFactory
 from app.schema.church_schema import ChurchProfileUpdateRequest
 from app.services.church_notification_service import ChurchNotificationService
+from app.utils.enrichment import aggregate_by_ids, rows_by_ids
 
 
 def get_all_churches(
@@ -35,26 +36,29 @@ def get_all_churches(
         total = query.count()
         churches = query.offset(offset).limit(limit).all()
 
+        # Admins, their users, member counts and donation totals for the whole page
+        church_ids = [church.id for church in churches]
+        admins = rows_by_ids(db, ChurchAdmin, ChurchAdmin.church_id, church_ids)
+        admin_users = rows_by_ids(db, User, User.id, [admin.user_id for admin in admins.values()])
+        member_counts = aggregate_by_ids(
+            db, User.church_id, church_ids, {"member_count": func.count(User.id)},
+            empty={"member_count": 0},
+        )
+        donation_totals = aggregate_by_ids(
+            db,
+            DonationBatch.church_id,
+            church_ids,
+            {"total_donations": func.sum(DonationBatch.amount)},
+            DonationBatch.status == "completed",
+            empty={"total_donations": 0.0},
+        )
+
         churches_data = []
         for church in churches:
-            # Get church admin
-            admin = db.query(ChurchAdmin).filter_by(church_id=church.id).first()
-
-            # Get member count
-            member_count = (
-                db.query(func.count(User.id)).filter_by(church_id=church.id).scalar()
-            )
-
-            # Get total donations
-            total_donations = (
-                db.query(func.sum(DonationBatch.total_amount))
-                .filter(
-                    DonationBatch.church_id == church.id,
-                    DonationBatch.status == "completed",
-                )
-                .scalar()
-                or 0.0
-            )
+            admin = admins.get(church.id)
+            admin_user = admin_users.get(admin.user_id) if admin else None
+            member_count = member_counts[church.id]["member_count"]
+            total_donations = donation_totals[church.id]["total_donations"]
 
             churches_data.append(
                 {
@@ -71,10 +75,10 @@ def get_all_churches(
                     ),
                     "admin": {
                         "id": admin.id if admin else None,
-                        "email": admin.user.email if admin and admin.user else None,
+                        "email": admin_user.email if admin_user else None,
                         "name": (
-                            f"{admin.user.first_name} {admin.user.last_name}"
-                            if admin and admin.user
+                            f"{admin_user.first_name} {admin_user.last_name}"
+                            if admin_user
                             else None
                         ),
                     },
@@ -374,50 +378,31 @@ def get_church_members(
         total = query.count()
         members = query.offset((page - 1) * limit).limit(limit).all()
 
+        # Donation stats and preferences of every member on the page
+        member_ids = [member.id for member in members]
+        donation_stats = aggregate_by_ids(
+            db,
+            DonationBatch.user_id,
+            member_ids,
+            {
+                "total_donations": func.sum(DonationBatch.amount),
+                "donation_count": func.count(DonationBatch.id),
+                "last_donation": func.max(DonationBatch.created_at),
+            },
+            DonationBatch.church_id == church_id,
+            DonationBatch.status == "completed",
+            empty={"total_donations": 0.0, "donation_count": 0, "last_donation": None},
+        )
+        preferences_by_user = rows_by_ids(
+            db, DonationPreference, DonationPreference.user_id, member_ids
+        )
+
         members_data = []
         for member in members:
-            # Get member's total donations
-            total_donations = (
-                db.query(func.sum(DonationBatch.amount))
-                .filter(
-                    DonationBatch.user_id == member.id,
-                    DonationBatch.church_id == church_id,
-                    DonationBatch.status == "completed",
-                )
-                .scalar()
-                or 0.0
-            )
-
-            # Get member's donation count
-            donation_count = (
-                db.query(func.count(DonationBatch.id))
-                .filter(
-                    DonationBatch.user_id == member.id,
-                    DonationBatch.church_id == church_id,
-                    DonationBatch.status == "completed",
-                )
-                .scalar()
-                or 0
-            )
-
-            # Get member's last donation date
-            last_donation = (
-                db.query(DonationBatch.created_at)
-                .filter(
-                    DonationBatch.user_id == member.id,
-                    DonationBatch.church_id == church_id,
-                    DonationBatch.status == "completed",
-                )
-                .order_by(DonationBatch.created_at.desc())
-                .first()
-            )
-
-            # Get member's donation preferences
-            preferences = (
-                db.query(DonationPreference)
-                .filter(DonationPreference.user_id == member.id)
-                .first()
-            )
+            total_donations = donation_stats[member.id]["total_donations"]
+            donation_count = donation_stats[member.id]["donation_count"]
+            last_donation = donation_stats[member.id]["last_donation"]
+            preferences = preferences_by_user.get(member.id)
 
             # Calculate average donation
             avg_donation = 0.0
@@ -444,7 +429,7 @@ def get_church_members(
                     "donation_count": donation_count,
                     "average_donation": round(avg_donation, 2),
                     "last_donation": (
-                        last_donation[0].isoformat() if last_donation and last_donation[0] else None
+                        last_donation.isoformat() if last_donation else None
                     ),
                     "roundup_enabled": not preferences.pause if preferences else False,
                     "donation_frequency": (
@@ -518,17 +503,17 @@ def get_church_donations(
             .all()
         )
 
+        # Donors and their preferences for the whole page
+        donor_ids = [donation.user_id for donation in donations]
+        donors = rows_by_ids(db, User, User.id, donor_ids)
+        preferences_by_user = rows_by_ids(
+            db, DonationPreference, DonationPreference.user_id, donor_ids
+        )
+
         donations_data = []
         for donation in donations:
-            # Get donor information
-            donor = db.query(User).filter(User.id == donation.user_id).first()
-            
-            # Get donation preferences for this donor
-            preferences = (
-                db.query(DonationPreference)
-                .filter(DonationPreference.user_id == donation.user_id)
-                .first()
-            )
+            donor = donors.get(donation.user_id)
+            preferences = preferences_by_user.get(donation.user_id)
 
             donations_data.append(
                 {
@@ -30,6 +30,8 @@ from app.model.m_church_referral import ChurchReferral
 from app.model.m_payout import Payout
 from app.model.m_admin_user import AdminUser
 from app.core.responses import ResponseFactory
+from app.core.constants import ADMIN_DASHBOARD_CACHE_TTL
+from app.services.cache_service import get_cache_service
 
 
 def get_dashboard_overview(
@@ -46,331 +48,16 @@ def get_dashboard_overview(
         start_dt = parse_date(start_date) if start_date else None
         end_dt = parse_date(end_date) if end_date else None
 
-        # Get current time for real-time calculations
-        now = datetime.now(timezone.utc)
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        yesterday_start = today_start - timedelta(days=1)
-        week_ago = now - timedelta(days=7)
-        month_ago = now - timedelta(days=30)
-        year_ago = now - timedelta(days=365)
-
-        # ===== PLATFORM OVERVIEW METRICS =====
-        total_users = db.query(func.count(User.id)).scalar()
-        active_users = db.query(func.count(User.id)).filter(User.is_active == True).scalar()
-        verified_users = db.query(func.count(User.id)).filter(User.is_email_verified == True).scalar()
-        
-        total_churches = db.query(func.count(Church.id)).scalar()
-        active_churches = db.query(func.count(Church.id)).filter(Church.is_active == True).scalar()
-        approved_churches = db.query(func.count(Church.id)).filter(Church.kyc_status == "approved").scalar()
-
-        # ===== REVENUE & FINANCIAL METRICS =====
-        # Total revenue from DonationBatch (completed donations)
-        total_revenue_query = db.query(func.sum(DonationBatch.amount)).filter(
-            DonationBatch.status == "completed"
+        # Short-TTL result cache: the overview is the same for every admin
+        data = get_cache_service().get_or_set(
+            f"admin:dashboard_overview:{start_date or ''}:{end_date or ''}",
+            lambda: _build_dashboard_overview(db, start_dt, end_dt),
+            ttl=ADMIN_DASHBOARD_CACHE_TTL
         )
-        if start_dt:
-            total_revenue_query = total_revenue_query.filter(DonationBatch.created_at >= start_dt)
-        if end_dt:
-            total_revenue_query = total_revenue_query.filter(DonationBatch.created_at <= end_dt)
-        
-        total_revenue = float(total_revenue_query.scalar() or 0.0)
-        platform_fee = total_revenue * 0.05  # 5% platform fee
-        net_revenue = total_revenue - platform_fee
-
-        # Today's metrics
-        today_revenue = float(db.query(func.sum(DonationBatch.amount)).filter(
-            DonationBatch.status == "completed",
-            DonationBatch.created_at >= today_start
-        ).scalar() or 0.0)
-
-        # Yesterday's metrics for comparison
-        yesterday_revenue = float(db.query(func.sum(DonationBatch.amount)).filter(
-            DonationBatch.status == "completed",
-            DonationBatch.created_at >= yesterday_start,
-            DonationBatch.created_at < today_start
-        ).scalar() or 0.0)
-
-        # This week's revenue
-        week_revenue = float(db.query(func.sum(DonationBatch.amount)).filter(
-            DonationBatch.status == "completed",
-            DonationBatch.created_at >= week_ago
-        ).scalar() or 0.0)
-
-        # This month's revenue
-        month_revenue = float(db.query(func.sum(DonationBatch.amount)).filter(
-            DonationBatch.status == "completed",
-            DonationBatch.created_at >= month_ago
-        ).scalar() or 0.0)
-
-        # ===== DONATION METRICS =====
-        total_donations = db.query(func.count(DonationBatch.id)).filter(
-            DonationBatch.status == "completed"
-        ).scalar()
-        
-        today_donations = db.query(func.count(DonationBatch.id)).filter(
-            DonationBatch.status == "completed",
-            DonationBatch.created_at >= today_start
-        ).scalar()
-
-        # Average donation amount
-        avg_donation = float(db.query(func.avg(DonationBatch.amount)).filter(
-            DonationBatch.status == "completed"
-        ).scalar() or 0.0)
-
-        # ===== ACTIVE DONORS =====
-        # Users with active donation preferences
-        active_donors = db.query(func.count(User.id.distinct())).join(
-            DonationPreference, User.id == DonationPreference.user_id
-        ).filter(
-            DonationPreference.pause == False,
-            DonationPreference.roundups_enabled == True
-        ).scalar()
-
-        # ===== GROWTH CALCULATIONS =====
-        revenue_growth = calculate_growth_rate(today_revenue, yesterday_revenue)
-        user_growth = calculate_user_growth(db, today_start, yesterday_start)
-        church_growth = calculate_church_growth(db, today_start, yesterday_start)
-        donation_growth = calculate_donation_growth(db, today_start, yesterday_start)
-
-        # ===== RECENT ACTIVITY (last 24 hours) =====
-        recent_donations = db.query(func.count(DonationBatch.id)).filter(
-            DonationBatch.created_at >= yesterday_start,
-            DonationBatch.status == "completed"
-        ).scalar()
-
-        recent_users = db.query(func.count(User.id)).filter(
-            User.created_at >= yesterday_start
-        ).scalar()
-
-        recent_churches = db.query(func.count(Church.id)).filter(
-            Church.created_at >= yesterday_start
-        ).scalar()
-
-        # ===== KYC STATUS OVERVIEW =====
-        kyc_pending = db.query(func.count(Church.id)).filter(
-            Church.kyc_status == "pending"
-        ).scalar()
-
-        kyc_approved = db.query(func.count(Church.id)).filter(
-            Church.kyc_status == "approved"
-        ).scalar()
-
-        kyc_rejected = db.query(func.count(Church.id)).filter(
-            Church.kyc_status == "rejected"
-        ).scalar()
-
-        kyc_not_submitted = db.query(func.count(Church.id)).filter(
-            Church.kyc_status == "not_submitted"
-        ).scalar()
-
-        # ===== PAYOUT MANAGEMENT =====
-        # Pending payouts (DonationBatch status pending)
-        pending_payouts = db.query(func.count(DonationBatch.id)).filter(
-            DonationBatch.status == "pending"
-        ).scalar()
-
-        # Completed payouts
-        completed_payouts = db.query(func.count(DonationBatch.id)).filter(
-            DonationBatch.status == "completed"
-        ).scalar()
-
-        # Failed payouts
-        failed_payouts = db.query(func.count(DonationBatch.id)).filter(
-            DonationBatch.status == "failed"
-        ).scalar()
-
-        # Total payout amount
-        total_payout_amount = float(db.query(func.sum(DonationBatch.amount)).filter(
-            DonationBatch.status == "completed"
-        ).scalar() or 0.0)
-
-        # Next payout calculation (assuming weekly payouts on Fridays)
-        next_payout_date = calculate_next_payout_date()
-        days_until_payout = (next_payout_date - now).days
-
-        # ===== TOP PERFORMING CHURCHES =====
-        top_churches = db.query(
-            Church.id,
-            Church.name,
-            Church.kyc_status,
-            func.sum(DonationBatch.amount).label("revenue"),
-            func.count(DonationBatch.id).label("donation_count"),
-            func.count(func.distinct(DonationBatch.user_id)).label("donor_count")
-        ).join(DonationBatch, Church.id == DonationBatch.church_id).filter(
-            DonationBatch.status == "completed",
-            DonationBatch.created_at >= month_ago
-        ).group_by(Church.id, Church.name, Church.kyc_status).order_by(
-            func.sum(DonationBatch.amount).desc()
-        ).limit(10).all()
-
-        # ===== DONOR ANALYTICS =====
-        # Donation frequency distribution
-        donation_frequencies = db.query(
-            DonationPreference.frequency,
-            func.count(DonationPreference.id).label("count")
-        ).group_by(DonationPreference.frequency).all()
-
-        # Roundup multiplier distribution
-        multiplier_distribution = db.query(
-            DonationPreference.multiplier,
-            func.count(DonationPreference.id).label("count")
-        ).group_by(DonationPreference.multiplier).all()
-
-        # ===== REFERRAL SYSTEM =====
-        total_referrals = db.query(func.count(ChurchReferral.id)).scalar()
-        active_referrals = db.query(func.count(ChurchReferral.id)).filter(
-            ChurchReferral.status == "active"
-        ).scalar()
-        
-        total_commission_earned = float(db.query(func.sum(ChurchReferral.total_commission_earned)).scalar() or 0.0)
-
-        # ===== SYSTEM HEALTH =====
-        system_health = get_system_health_metrics(db)
-        system_alerts = get_system_alerts(db)
-
-        # ===== CHART DATA =====
-        revenue_trend = generate_revenue_trend_data(db, start_dt, end_dt)
-        user_growth_trend = generate_user_growth_trend_data(db, start_dt, end_dt)
-        donation_trend = generate_donation_trend_data(db, start_dt, end_dt)
-        church_performance = generate_church_performance_data(db, start_dt, end_dt)
-
-        # ===== REAL-TIME METRICS =====
-        # Last hour activity
-        last_hour = now - timedelta(hours=1)
-        donations_last_hour = db.query(func.count(DonationBatch.id)).filter(
-            DonationBatch.created_at >= last_hour,
-            DonationBatch.status == "completed"
-        ).scalar()
-
-        revenue_last_hour = float(db.query(func.sum(DonationBatch.amount)).filter(
-            DonationBatch.created_at >= last_hour,
-            DonationBatch.status == "completed"
-        ).scalar() or 0.0)
-
-        # Active sessions (users who logged in within last hour)
-        active_sessions = db.query(func.count(User.id)).filter(
-            User.last_login >= last_hour
-        ).scalar()
 
         return ResponseFactory.success(
             message="Comprehensive dashboard overview retrieved successfully",
-            data={
-                # Platform Overview
-                "overview": {
-                    "total_users": total_users,
-                    "active_users": active_users,
-                    "verified_users": verified_users,
-                    "total_churches": total_churches,
-                    "active_churches": active_churches,
-                    "approved_churches": approved_churches,
-                    "active_donors": active_donors,
-                },
-                
-                # Financial Metrics
-                "revenue": {
-                    "total_revenue": round(float(total_revenue), 2),
-                    "platform_fee": round(float(platform_fee), 2),
-                    "net_revenue": round(float(net_revenue), 2),
-                    "today_revenue": round(float(today_revenue), 2),
-                    "yesterday_revenue": round(float(yesterday_revenue), 2),
-                    "week_revenue": round(float(week_revenue), 2),
-                    "month_revenue": round(float(month_revenue), 2),
-                    "revenue_growth": round(revenue_growth, 2),
-                },
-                
-                # Donation Metrics
-                "donations": {
-                    "total_donations": total_donations,
-                    "today_donations": today_donations,
-                    "average_donation": round(float(avg_donation), 2),
-                    "donation_growth": round(donation_growth, 2),
-                },
-                
-                # Growth Metrics
-                "growth": {
-                    "user_growth": round(user_growth, 2),
-                    "church_growth": round(church_growth, 2),
-                    "revenue_growth": round(revenue_growth, 2),
-                    "donation_growth": round(donation_growth, 2),
-                },
-                
-                # Activity Metrics
-                "activity": {
-                    "recent_donations": recent_donations,
-                    "recent_users": recent_users,
-                    "recent_churches": recent_churches,
-                    "donations_last_hour": donations_last_hour,
-                    "revenue_last_hour": round(float(revenue_last_hour), 2),
-                    "active_sessions": active_sessions,
-                },
-                
-                # KYC Status
-                "kyc_status": {
-                    "pending": kyc_pending,
-                    "approved": kyc_approved,
-                    "rejected": kyc_rejected,
-                    "not_submitted": kyc_not_submitted,
-                },
-                
-                # Payout Management
-                "payouts": {
-                    "pending_payouts": pending_payouts,
-                    "completed_payouts": completed_payouts,
-                    "failed_payouts": failed_payouts,
-                    "total_payout_amount": round(float(total_payout_amount), 2),
-                    "next_payout_date": next_payout_date.isoformat(),
-                    "days_until_payout": days_until_payout,
-                },
-                
-                # Top Churches
-                "top_churches": [
-                    {
-                        "id": church_id,
-                        "name": church_name,
-                        "kyc_status": kyc_status,
-                        "revenue": round(float(revenue or 0), 2),
-                        "donation_count": count or 0,
-                        "donor_count": donor_count or 0
-                    }
-                    for church_id, church_name, kyc_status, revenue, count, donor_count in top_churches
-                ],
-                
-                # Donor Analytics
-                "donor_analytics": {
-                    "donation_frequencies": [
-                        {"frequency": freq, "count": count}
-                        for freq, count in donation_frequencies
-                    ],
-                    "multiplier_distribution": [
-                        {"multiplier": mult, "count": count}
-                        for mult, count in multiplier_distribution
-                    ],
-                },
-                
-                # Referral System
-                "referrals": {
-                    "total_referrals": total_referrals,
-                    "active_referrals": active_referrals,
-                    "total_commission_earned": round(float(total_commission_earned), 2),
-                },
-                
-                # System Health
-                "system_health": system_health,
-                "system_alerts": system_alerts,
-                
-                # Chart Data
-                "revenue_trend": revenue_trend,
-                "user_growth_trend": user_growth_trend,
-                "donation_trend": donation_trend,
-                "church_performance": church_performance,
-                
-                # Metadata
-                "last_updated": now.isoformat(),
-                "data_period": {
-                    "start_date": start_dt.isoformat() if start_dt else None,
-                    "end_date": end_dt.isoformat() if end_dt else None,
-                }
-            },
+            data=data,
         )
 
     except Exception as e:
@@ -379,6 +66,257 @@ def get_dashboard_overview(
         raise HTTPException(status_code=500, detail="Failed to retrieve comprehensive dashboard overview")
 
 
+def _build_dashboard_overview(
+    db: Session,
+    start_dt: Optional[datetime],
+    end_dt: Optional[datetime],
+) -> Dict[str, Any]:
+    """Compute the dashboard overview payload"""
+    # Get current time for real-time calculations
+    now = datetime.now(timezone.utc)
+    month_ago = now - timedelta(days=30)
+
+    # ===== PLATFORM, REVENUE, DONATION, KYC AND PAYOUT METRICS =====
+    # One conditional-aggregate query per table instead of one query per number
+    aggregates = get_overview_aggregates(db, now, start_dt, end_dt)
+    users = aggregates["users"]
+    churches = aggregates["churches"]
+    batches = aggregates["batches"]
+
+    total_users = users["total"]
+    active_users = users["active"]
+    verified_users = users["verified"]
+    
+    total_churches = churches["total"]
+    active_churches = churches["active"]
+    approved_churches = churches["kyc_approved"]
+
+    # ===== REVENUE & FINANCIAL METRICS =====
+    # Total revenue from DonationBatch (completed donations)
+    total_revenue = batches["range_revenue"]
+    platform_fee = total_revenue * 0.05  # 5% platform fee
+    net_revenue = total_revenue - platform_fee
+
+    today_revenue = batches["today_revenue"]
+    yesterday_revenue = batches["yesterday_revenue"]
+    week_revenue = batches["week_revenue"]
+    month_revenue = batches["month_revenue"]
+
+    # ===== DONATION METRICS =====
+    total_donations = batches["completed"]
+    today_donations = batches["today_completed"]
+    avg_donation = batches["average_completed"]
+
+    # ===== ACTIVE DONORS =====
+    # Users with active donation preferences
+    active_donors = db.query(func.count(User.id.distinct())).join(
+        DonationPreference, User.id == DonationPreference.user_id
+    ).filter(
+        DonationPreference.pause == False,
+        DonationPreference.roundups_enabled == True
+    ).scalar()
+
+    # ===== GROWTH CALCULATIONS =====
+    revenue_growth = calculate_growth_rate(today_revenue, yesterday_revenue)
+    user_growth = calculate_growth_rate(users["created_today"], users["created_yesterday"])
+    church_growth = calculate_growth_rate(churches["created_today"], churches["created_yesterday"])
+    donation_growth = calculate_growth_rate(batches["today_completed"], batches["yesterday_completed"])
+
+    # ===== RECENT ACTIVITY (last 24 hours) =====
+    recent_donations = batches["recent_completed"]
+    recent_users = users["recent"]
+    recent_churches = churches["recent"]
+
+    # ===== KYC STATUS OVERVIEW =====
+    kyc_pending = churches["kyc_pending"]
+    kyc_approved = churches["kyc_approved"]
+    kyc_rejected = churches["kyc_rejected"]
+    kyc_not_submitted = churches["kyc_not_submitted"]
+
+    # ===== PAYOUT MANAGEMENT =====
+    # DonationBatch status counts
+    pending_payouts = batches["pending"]
+    completed_payouts = batches["completed"]
+    failed_payouts = batches["failed"]
+    total_payout_amount = batches["completed_revenue"]
+
+    # Next payout calculation (assuming weekly payouts on Fridays)
+    next_payout_date = calculate_next_payout_date()
+    days_until_payout = (next_payout_date - now).days
+
+    # ===== TOP PERFORMING CHURCHES =====
+    top_churches = db.query(
+        Church.id,
+        Church.name,
+        Church.kyc_status,
+        func.sum(DonationBatch.amount).label("revenue"),
+        func.count(DonationBatch.id).label("donation_count"),
+        func.count(func.distinct(DonationBatch.user_id)).label("donor_count")
+    ).join(DonationBatch, Church.id == DonationBatch.church_id).filter(
+        DonationBatch.status == "completed",
+        DonationBatch.created_at >= month_ago
+    ).group_by(Church.id, Church.name, Church.kyc_status).order_by(
+        func.sum(DonationBatch.amount).desc()
+    ).limit(10).all()
+
+    # ===== DONOR ANALYTICS =====
+    # Donation frequency distribution
+    donation_frequencies = db.query(
+        DonationPreference.frequency,
+        func.count(DonationPreference.id).label("count")
+    ).group_by(DonationPreference.frequency).all()
+
+    # Roundup multiplier distribution
+    multiplier_distribution = db.query(
+        DonationPreference.multiplier,
+        func.count(DonationPreference.id).label("count")
+    ).group_by(DonationPreference.multiplier).all()
+
+    # ===== REFERRAL SYSTEM =====
+    total_referrals, active_referrals, total_commission_earned = db.query(
+        func.count(ChurchReferral.id),
+        func.count(ChurchReferral.id).filter(ChurchReferral.status == "active"),
+        func.coalesce(func.sum(ChurchReferral.total_commission_earned), 0.0)
+    ).one()
+    total_commission_earned = float(total_commission_earned or 0.0)
+
+    # ===== SYSTEM HEALTH =====
+    system_health = get_system_health_metrics(db, aggregates)
+    system_alerts = get_system_alerts(db, aggregates)
+
+    # ===== CHART DATA =====
+    revenue_trend = generate_revenue_trend_data(db, start_dt, end_dt)
+    user_growth_trend = generate_user_growth_trend_data(db, start_dt, end_dt)
+    donation_trend = generate_donation_trend_data(db, start_dt, end_dt)
+    church_performance = generate_church_performance_data(db, start_dt, end_dt)
+
+    # ===== REAL-TIME METRICS =====
+    # Last hour activity
+    donations_last_hour = batches["last_hour_completed"]
+    revenue_last_hour = batches["last_hour_revenue"]
+
+    # Active sessions (users who logged in within last hour)
+    active_sessions = users["logged_in_last_hour"]
+
+    return {
+        # Platform Overview
+        "overview": {
+            "total_users": total_users,
+            "active_users": active_users,
+            "verified_users": verified_users,
+            "total_churches": total_churches,
+            "active_churches": active_churches,
+            "approved_churches": approved_churches,
+            "active_donors": active_donors,
+        },
+        
+        # Financial Metrics
+        "revenue": {
+            "total_revenue": round(float(total_revenue), 2),
+            "platform_fee": round(float(platform_fee), 2),
+            "net_revenue": round(float(net_revenue), 2),
+            "today_revenue": round(float(today_revenue), 2),
+            "yesterday_revenue": round(float(yesterday_revenue), 2),
+            "week_revenue": round(float(week_revenue), 2),
+            "month_revenue": round(float(month_revenue), 2),
+            "revenue_growth": round(revenue_growth, 2),
+        },
+        
+        # Donation Metrics
+        "donations": {
+            "total_donations": total_donations,
+            "today_donations": today_donations,
+            "average_donation": round(float(avg_donation), 2),
+            "donation_growth": round(donation_growth, 2),
+        },
+        
+        # Growth Metrics
+        "growth": {
+            "user_growth": round(user_growth, 2),
+            "church_growth": round(church_growth, 2),
+            "revenue_growth": round(revenue_growth, 2),
+            "donation_growth": round(donation_growth, 2),
+        },
+        
+        # Activity Metrics
+        "activity": {
+            "recent_donations": recent_donations,
+            "recent_users": recent_users,
+            "recent_churches": recent_churches,
+            "donations_last_hour": donations_last_hour,
+            "revenue_last_hour": round(float(revenue_last_hour), 2),
+            "active_sessions": active_sessions,
+        },
+        
+        # KYC Status
+        "kyc_status": {
+            "pending": kyc_pending,
+            "approved": kyc_approved,
+            "rejected": kyc_rejected,
+            "not_submitted": kyc_not_submitted,
+        },
+        
+        # Payout Management
+        "payouts": {
+            "pending_payouts": pending_payouts,
+            "completed_payouts": completed_payouts,
+            "failed_payouts": failed_payouts,
+            "total_payout_amount": round(float(total_payout_amount), 2),
+            "next_payout_date": next_payout_date.isoformat(),
+            "days_until_payout": days_until_payout,
+        },
+        
+        # Top Churches
+        "top_churches": [
+            {
+                "id": church_id,
+                "name": church_name,
+                "kyc_status": kyc_status,
+                "revenue": round(float(revenue or 0), 2),
+                "donation_count": count or 0,
+                "donor_count": donor_count or 0
+            }
+            for church_id, church_name, kyc_status, revenue, count, donor_count in top_churches
+        ],
+        
+        # Donor Analytics
+        "donor_analytics": {
+            "donation_frequencies": [
+                {"frequency": freq, "count": count}
+                for freq, count in donation_frequencies
+            ],
+            "multiplier_distribution": [
+                {"multiplier": mult, "count": count}
+                for mult, count in multiplier_distribution
+            ],
+        },
+        
+        # Referral System
+        "referrals": {
+            "total_referrals": total_referrals,
+            "active_referrals": active_referrals,
+            "total_commission_earned": round(float(total_commission_earned), 2),
+        },
+        
+        # System Health
+        "system_health": system_health,
+        "system_alerts": system_alerts,
+        
+        # Chart Data
+        "revenue_trend": revenue_trend,
+        "user_growth_trend": user_growth_trend,
+        "donation_trend": donation_trend,
+        "church_performance": church_performance,
+        
+        # Metadata
+        "last_updated": now.isoformat(),
+        "data_period": {
+            "start_date": start_dt.isoformat() if start_dt else None,
+            "end_date": end_dt.isoformat() if end_dt else None,
+        }
+    }
+
+
 def get_realtime_metrics(db: Session):
     """Get real-time system and business metrics"""
     try:
@@ -707,31 +645,116 @@ def get_church_performance_analytics(db: Session, start_dt: Optional[datetime] =
         raise HTTPException(status_code=500, detail="Failed to retrieve church performance analytics")
 
 
-def get_system_health_metrics(db: Session) -> Dict[str, Any]:
+def get_overview_aggregates(
+    db: Session,
+    now: Optional[datetime] = None,
+    start_dt: Optional[datetime] = None,
+    end_dt: Optional[datetime] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Platform counters for the dashboard, one query per table
+    
+    Uses conditional aggregates (COUNT/SUM ... FILTER (WHERE ...)) so every
+    window and status split of a table comes back in a single pass.
+    start_dt/end_dt only bound batches["range_revenue"].
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    yesterday_start = today_start - timedelta(days=1)
+    week_ago = now - timedelta(days=7)
+    month_ago = now - timedelta(days=30)
+    last_hour = now - timedelta(hours=1)
+
+    user_row = db.query(
+        func.count(User.id).label("total"),
+        func.count(User.id).filter(User.is_active == True).label("active"),
+        func.count(User.id).filter(User.is_email_verified == True).label("verified"),
+        func.count(User.id).filter(User.created_at >= yesterday_start).label("recent"),
+        func.count(User.id).filter(User.created_at >= today_start).label("created_today"),
+        func.count(User.id).filter(
+            User.created_at >= yesterday_start, User.created_at < today_start
+        ).label("created_yesterday"),
+        func.count(User.id).filter(User.last_login >= last_hour).label("logged_in_last_hour"),
+    ).one()
+
+    church_row = db.query(
+        func.count(Church.id).label("total"),
+        func.count(Church.id).filter(Church.is_active == True).label("active"),
+        func.count(Church.id).filter(Church.is_active == False).label("inactive"),
+        func.count(Church.id).filter(Church.created_at >= yesterday_start).label("recent"),
+        func.count(Church.id).filter(Church.created_at >= today_start).label("created_today"),
+        func.count(Church.id).filter(
+            Church.created_at >= yesterday_start, Church.created_at < today_start
+        ).label("created_yesterday"),
+        func.count(Church.id).filter(Church.kyc_status == "pending").label("kyc_pending"),
+        func.count(Church.id).filter(Church.kyc_status == "approved").label("kyc_approved"),
+        func.count(Church.id).filter(Church.kyc_status == "rejected").label("kyc_rejected"),
+        func.count(Church.id).filter(Church.kyc_status == "not_submitted").label("kyc_not_submitted"),
+    ).one()
+
+    completed = DonationBatch.status == "completed"
+    range_filter = [completed]
+    if start_dt:
+        range_filter.append(DonationBatch.created_at >= start_dt)
+    if end_dt:
+        range_filter.append(DonationBatch.created_at <= end_dt)
+
+    batch_row = db.query(
+        func.count(DonationBatch.id).label("total"),
+        func.count(DonationBatch.id).filter(completed).label("completed"),
+        func.count(DonationBatch.id).filter(DonationBatch.status == "pending").label("pending"),
+        func.count(DonationBatch.id).filter(DonationBatch.status == "failed").label("failed"),
+        func.sum(DonationBatch.amount).filter(completed).label("completed_revenue"),
+        func.avg(DonationBatch.amount).filter(completed).label("average_completed"),
+        func.sum(DonationBatch.amount).filter(*range_filter).label("range_revenue"),
+        func.sum(DonationBatch.amount).filter(completed, DonationBatch.created_at >= today_start).label("today_revenue"),
+        func.sum(DonationBatch.amount).filter(
+            completed, DonationBatch.created_at >= yesterday_start, DonationBatch.created_at < today_start
+        ).label("yesterday_revenue"),
+        func.sum(DonationBatch.amount).filter(completed, DonationBatch.created_at >= week_ago).label("week_revenue"),
+        func.sum(DonationBatch.amount).filter(completed, DonationBatch.created_at >= month_ago).label("month_revenue"),
+        func.count(DonationBatch.id).filter(completed, DonationBatch.created_at >= today_start).label("today_completed"),
+        func.count(DonationBatch.id).filter(
+            completed, DonationBatch.created_at >= yesterday_start, DonationBatch.created_at < today_start
+        ).label("yesterday_completed"),
+        func.count(DonationBatch.id).filter(completed, DonationBatch.created_at >= yesterday_start).label("recent_completed"),
+        func.count(DonationBatch.id).filter(completed, DonationBatch.created_at >= last_hour).label("last_hour_completed"),
+        func.sum(DonationBatch.amount).filter(completed, DonationBatch.created_at >= last_hour).label("last_hour_revenue"),
+    ).one()
+
+    batches = {key: value or 0 for key, value in batch_row._mapping.items()}
+    for key in ("completed_revenue", "average_completed", "range_revenue", "today_revenue",
+                "yesterday_revenue", "week_revenue", "month_revenue", "last_hour_revenue"):
+        batches[key] = float(batches[key] or 0.0)
+
+    return {
+        "users": {key: value or 0 for key, value in user_row._mapping.items()},
+        "churches": {key: value or 0 for key, value in church_row._mapping.items()},
+        "batches": batches,
+    }
+
+
+def get_system_health_metrics(db: Session, aggregates: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
     """Get comprehensive system health metrics"""
     try:
         now = datetime.now(timezone.utc)
+        if aggregates is None:
+            aggregates = get_overview_aggregates(db, now)
         
         # Database health
-        total_users = db.query(func.count(User.id)).scalar()
-        total_churches = db.query(func.count(Church.id)).scalar()
-        total_donations = db.query(func.count(DonationBatch.id)).scalar()
+        total_users = aggregates["users"]["total"]
+        total_churches = aggregates["churches"]["total"]
+        total_donations = aggregates["batches"]["total"]
         
         # Error rates
-        failed_donations = db.query(func.count(DonationBatch.id)).filter(
-            DonationBatch.status == "failed"
-        ).scalar()
+        failed_donations = aggregates["batches"]["failed"]
         
         error_rate = (failed_donations / total_donations * 100) if total_donations > 0 else 0.0
         
         # Processing efficiency
-        pending_donations = db.query(func.count(DonationBatch.id)).filter(
-            DonationBatch.status == "pending"
-        ).scalar()
-        
-        completed_donations = db.query(func.count(DonationBatch.id)).filter(
-            DonationBatch.status == "completed"
-        ).scalar()
+        pending_donations = aggregates["batches"]["pending"]
+        completed_donations = aggregates["batches"]["completed"]
         
         processing_efficiency = (completed_donations / (completed_donations + pending_donations) * 100) if (completed_donations + pending_donations) > 0 else 100.0
         
@@ -769,17 +792,18 @@ def get_system_health_metrics(db: Session) -> Dict[str, Any]:
         }
 
 
-def get_system_alerts(db: Session) -> List[Dict[str, Any]]:
+def get_system_alerts(db: Session, aggregates: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
     """Get system alerts and notifications"""
     alerts = []
     now = datetime.now(timezone.utc)
     
     try:
+        if aggregates is None:
+            aggregates = get_overview_aggregates(db, now)
+        
         # Check for high error rates
-        total_donations = db.query(func.count(DonationBatch.id)).scalar()
-        failed_donations = db.query(func.count(DonationBatch.id)).filter(
-            DonationBatch.status == "failed"
-        ).scalar()
+        total_donations = aggregates["batches"]["total"]
+        failed_donations = aggregates["batches"]["failed"]
         
         error_rate = (failed_donations / total_donations * 100) if total_donations > 0 else 0.0
         
@@ -793,9 +817,7 @@ def get_system_alerts(db: Session) -> List[Dict[str, Any]]:
             })
 
         # Check for pending KYC applications
-        pending_kyc = db.query(func.count(Church.id)).filter(
-            Church.kyc_status == "pending"
-        ).scalar()
+        pending_kyc = aggregates["churches"]["kyc_pending"]
         
         if pending_kyc > 10:
             alerts.append({
@@ -807,9 +829,7 @@ def get_system_alerts(db: Session) -> List[Dict[str, Any]]:
             })
 
         # Check for failed payouts
-        failed_payouts = db.query(func.count(DonationBatch.id)).filter(
-            DonationBatch.status == "failed"
-        ).scalar()
+        failed_payouts = aggregates["batches"]["failed"]
         
         if failed_payouts > 0:
             alerts.append({
@@ -821,9 +841,7 @@ def get_system_alerts(db: Session) -> List[Dict[str, Any]]:
             })
 
         # Check for inactive churches
-        inactive_churches = db.query(func.count(Church.id)).filter(
-            Church.is_active == False
-        ).scalar()
+        inactive_churches = aggregates["churches"]["inactive"]
         
         if inactive_churches > 5:
             alerts.append({
@@ -938,6 +956,26 @@ def parse_date(date_str: str) -> datetime:
             raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
 
 
+def _month_buckets(start_dt: datetime, end_dt: datetime) -> List[tuple]:
+    """(month_start, month_end) pairs covering start_dt..end_dt, month_end capped at end_dt"""
+    buckets = []
+    current_date = start_dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    
+    while current_date <= end_dt:
+        month_end = (current_date + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        if month_end > end_dt:
+            month_end = end_dt
+        buckets.append((current_date, month_end))
+        
+        # Move to next month
+        if current_date.month == 12:
+            current_date = current_date.replace(year=current_date.year + 1, month=1)
+        else:
+            current_date = current_date.replace(month=current_date.month + 1)
+    
+    return buckets
+
+
 def generate_revenue_trend_data(db: Session, start_dt: Optional[datetime], end_dt: Optional[datetime]) -> List[Dict[str, Any]]:
     """Generate revenue trend data for the last 6 months"""
     try:
@@ -947,40 +985,32 @@ def generate_revenue_trend_data(db: Session, start_dt: Optional[datetime], end_d
         if not start_dt:
             start_dt = end_dt - timedelta(days=180)
         
-        # Generate monthly data points
-        trend_data = []
-        current_date = start_dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        # All months in one pass: a filtered SUM/COUNT pair per month
+        buckets = _month_buckets(start_dt, end_dt)
+        if not buckets:
+            return []
         
-        while current_date <= end_dt:
-            month_end = (current_date + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-            if month_end > end_dt:
-                month_end = end_dt
-            
-            # Get revenue for this month
-            monthly_revenue = float(db.query(func.sum(DonationBatch.amount)).filter(
+        columns = []
+        for month_start, month_end in buckets:
+            in_month = and_(
                 DonationBatch.status == "completed",
-                DonationBatch.created_at >= current_date,
+                DonationBatch.created_at >= month_start,
                 DonationBatch.created_at <= month_end
-            ).scalar() or 0.0)
-            
-            # Get donation count for this month
-            monthly_count = db.query(func.count(DonationBatch.id)).filter(
-                DonationBatch.status == "completed",
-                DonationBatch.created_at >= current_date,
-                DonationBatch.created_at <= month_end
-            ).scalar() or 0
+            )
+            columns.append(func.sum(DonationBatch.amount).filter(in_month))
+            columns.append(func.count(DonationBatch.id).filter(in_month))
+        row = db.query(*columns).one()
+        
+        trend_data = []
+        for index, (month_start, _) in enumerate(buckets):
+            monthly_revenue = float(row[2 * index] or 0.0)
+            monthly_count = row[2 * index + 1] or 0
             
             trend_data.append({
-                "month": current_date.strftime("%b %Y"),
+                "month": month_start.strftime("%b %Y"),
                 "revenue": round(float(monthly_revenue), 2),
                 "count": monthly_count
             })
-            
-            # Move to next month
-            if current_date.month == 12:
-                current_date = current_date.replace(year=current_date.year + 1, month=1)
-            else:
-                current_date = current_date.replace(month=current_date.month + 1)
         
         return trend_data
         
@@ -998,31 +1028,22 @@ def generate_user_growth_trend_data(db: Session, start_dt: Optional[datetime], e
         if not start_dt:
             start_dt = end_dt - timedelta(days=180)
         
-        # Generate monthly data points
-        trend_data = []
-        current_date = start_dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        # All months in one pass: a filtered COUNT per month
+        buckets = _month_buckets(start_dt, end_dt)
+        if not buckets:
+            return []
         
-        while current_date <= end_dt:
-            month_end = (current_date + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-            if month_end > end_dt:
-                month_end = end_dt
-            
-            # Get new users for this month
-            monthly_users = db.query(func.count(User.id)).filter(
-                User.created_at >= current_date,
-                User.created_at <= month_end
-            ).scalar() or 0
-            
+        row = db.query(*[
+            func.count(User.id).filter(User.created_at >= month_start, User.created_at <= month_end)
+            for month_start, month_end in buckets
+        ]).one()
+        
+        trend_data = []
+        for index, (month_start, _) in enumerate(buckets):
             trend_data.append({
-                "month": current_date.strftime("%b %Y"),
-                "users": monthly_users
+                "month": month_start.strftime("%b %Y"),
+                "users": row[index] or 0
             })
-            
-            # Move to next month
-            if current_date.month == 12:
-                current_date = current_date.replace(year=current_date.year + 1, month=1)
-            else:
-                current_date = current_date.replace(month=current_date.month + 1)
         
         return trend_data
         
@@ -1040,40 +1061,29 @@ def generate_donation_trend_data(db: Session, start_dt: Optional[datetime], end_
         if not start_dt:
             start_dt = end_dt - timedelta(days=180)
         
-        # Generate monthly data points
-        trend_data = []
-        current_date = start_dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        # All months in one pass: filtered donation and distinct-donor counts per month
+        buckets = _month_buckets(start_dt, end_dt)
+        if not buckets:
+            return []
         
-        while current_date <= end_dt:
-            month_end = (current_date + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-            if month_end > end_dt:
-                month_end = end_dt
-            
-            # Get donations for this month
-            monthly_donations = db.query(func.count(DonationBatch.id)).filter(
-                DonationBatch.status == "completed",
-                DonationBatch.created_at >= current_date,
-                DonationBatch.created_at <= month_end
-            ).scalar() or 0
-            
-            # Get unique donors for this month
-            monthly_donors = db.query(func.count(func.distinct(DonationBatch.user_id))).filter(
+        columns = []
+        for month_start, month_end in buckets:
+            in_month = and_(
                 DonationBatch.status == "completed",
-                DonationBatch.created_at >= current_date,
+                DonationBatch.created_at >= month_start,
                 DonationBatch.created_at <= month_end
-            ).scalar() or 0
-            
+            )
+            columns.append(func.count(DonationBatch.id).filter(in_month))
+            columns.append(func.count(func.distinct(DonationBatch.user_id)).filter(in_month))
+        row = db.query(*columns).one()
+        
+        trend_data = []
+        for index, (month_start, _) in enumerate(buckets):
             trend_data.append({
-                "month": current_date.strftime("%b %Y"),
-                "donations": monthly_donations,
-                "donors": monthly_donors
+                "month": month_start.strftime("%b %Y"),
+                "donations": row[2 * index] or 0,
+                "donors": row[2 * index + 1] or 0
             })
-            
-            # Move to next month
-            if current_date.month == 12:
-                current_date = current_date.replace(year=current_date.year + 1, month=1)
-            else:
-                current_date = current_date.replace(month=current_date.month + 1)
         
         return trend_data
         
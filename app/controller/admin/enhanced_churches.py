@@ -24,6 +24,7 @@ from app.model.m_user import User
 from app.model.m_donation_batch import DonationBatch
 from app.model.m_donation_preference import DonationPreference
 from app.core.responses import ResponseFactory
+from app.utils.enrichment import aggregate_by_ids, rows_by_ids
 
 
 class BulkChurchActionRequest(BaseModel):
@@ -112,45 +113,51 @@ def get_enhanced_church_list(
         offset = (search_request.page - 1) * search_request.limit
         churches = query.offset(offset).limit(search_request.limit).all()
 
+        # Admins and per-church metrics for the whole page
+        church_ids = [church.id for church in churches]
+        admins = rows_by_ids(db, ChurchAdmin, ChurchAdmin.church_id, church_ids)
+        admin_users = rows_by_ids(db, User, User.id, [admin.user_id for admin in admins.values()])
+        member_counts = aggregate_by_ids(
+            db, User.church_id, church_ids, {"member_count": func.count(User.id)},
+            empty={"member_count": 0},
+        )
+        current_month = datetime.now(timezone.utc).replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        revenue = aggregate_by_ids(
+            db,
+            DonationBatch.church_id,
+            church_ids,
+            {
+                "total_revenue": func.sum(DonationBatch.amount),
+                "this_month_revenue": func.sum(DonationBatch.amount).filter(
+                    DonationBatch.created_at >= current_month
+                ),
+                "donation_count": func.count(DonationBatch.id),
+            },
+            DonationBatch.status == "completed",
+            empty={"total_revenue": 0.0, "this_month_revenue": 0.0, "donation_count": 0},
+        )
+        active_donor_counts = aggregate_by_ids(
+            db,
+            User.church_id,
+            church_ids,
+            {"active_donors": func.count(User.id.distinct())},
+            DonationPreference.user_id == User.id,
+            DonationPreference.pause == False,
+            empty={"active_donors": 0},
+        )
+
         # Build enhanced church data
         churches_data = []
         for church in churches:
-            # Get church admin
-            admin = db.query(ChurchAdmin).filter(ChurchAdmin.church_id == church.id).first()
-            admin_user = None
-            if admin:
-                admin_user = db.query(User).filter(User.id == admin.user_id).first()
-
-            # Get member count
-            member_count = db.query(func.count(User.id)).filter(User.church_id == church.id).scalar()
-
-            # Get revenue metrics
-            total_revenue = db.query(func.sum(DonationBatch.amount)).filter(
-                DonationBatch.church_id == church.id,
-                DonationBatch.status == "completed"
-            ).scalar() or 0.0
-
-            # Get this month's revenue
-            current_month = datetime.now(timezone.utc).replace(
-                day=1, hour=0, minute=0, second=0, microsecond=0
-            )
-            this_month_revenue = db.query(func.sum(DonationBatch.amount)).filter(
-                DonationBatch.church_id == church.id,
-                DonationBatch.status == "completed",
-                DonationBatch.created_at >= current_month
-            ).scalar() or 0.0
-
-            # Get active donors
-            active_donors = db.query(func.count(User.id.distinct())).join(DonationPreference, User.id == DonationPreference.user_id).filter(
-                User.church_id == church.id,
-                DonationPreference.pause == False
-            ).scalar()
-
-            # Get donation count
-            donation_count = db.query(func.count(DonationBatch.id)).filter(
-                DonationBatch.church_id == church.id,
-                DonationBatch.status == "completed"
-            ).scalar()
+            admin = admins.get(church.id)
+            admin_user = admin_users.get(admin.user_id) if admin else None
+            member_count = member_counts[church.id]["member_count"]
+            total_revenue = revenue[church.id]["total_revenue"]
+            this_month_revenue = revenue[church.id]["this_month_revenue"]
+            donation_count = revenue[church.id]["donation_count"]
+            active_donors = active_donor_counts[church.id]["active_donors"]
 
             # Calculate performance score (0-100)
             performance_score = calculate_church_performance_score(
@@ -7,19 +7,30 @@ from typing import Dict, Any, List, Optional
 
 from app.model.m_church import Church
 from app.model.m_audit_log import AuditLog
+from app.model.m_user import User
 from app.services.kyc_service import KYCService
 from app.services.notification_service import NotificationService
 from app.core.responses import ResponseFactory, SuccessResponse
 from app.core.exceptions import StripeError
+from app.utils.enrichment import latest_rows_by_ids, rows_by_ids
+from app.utils.pagination import apply_order, estimated_count, keyset_page, keyset_pagination
 import json
 import uuid
 from typing import Optional
 
 
+KYC_LIST_ORDER = ((Church.id, False),)
+
+
 def get_kyc_list(
-    db: Session, page: int = 1, limit: int = 20, state: Optional[str] = None
+    db: Session,
+    page: int = 1,
+    limit: int = 20,
+    state: Optional[str] = None,
+    cursor: Optional[str] = None,
+    with_total: bool = False,
 ) -> SuccessResponse:
-    """Get list of churches with KYC status for admin review"""
+    """Get list of churches with KYC status for admin review (keyset pages when a cursor is passed)"""
     try:
         query = db.query(Church)
 
@@ -28,8 +39,24 @@ def get_kyc_list(
             query = query.filter(Church.kyc_state == state)
 
         # Pagination
-        total = query.count()
-        churches = query.offset((page - 1) * limit).limit(limit).all()
+        if cursor is not None:
+            churches, next_cursor = keyset_page(query, KYC_LIST_ORDER, limit, cursor)
+            total_estimate = None
+            if with_total:
+                # Unfiltered lists can use the planner's row estimate
+                total_estimate = estimated_count(
+                    query, ("kyc_list", state), table=None if state else Church.__tablename__
+                )
+            pagination = keyset_pagination(limit, next_cursor, total_estimate)
+        else:
+            total = query.count()
+            churches = apply_order(query, KYC_LIST_ORDER).offset((page - 1) * limit).limit(limit).all()
+            pagination = {
+                "page": page,
+                "limit": limit,
+                "total": total,
+                "pages": (total + limit - 1) // limit,
+            }
 
         # Format response data
         church_data = []
@@ -55,15 +82,12 @@ def get_kyc_list(
             message="KYC list retrieved successfully",
             data={
                 "churches": church_data,
-                "pagination": {
-                    "page": page,
-                    "limit": limit,
-                    "total": total,
-                    "pages": (total + limit - 1) // limit,
-                },
+                "pagination": pagination,
             },
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail="Failed to get KYC list")
 
@@ -1354,26 +1378,28 @@ def get_kyc_confirmation_queue(
         total = query.count()
         churches = query.offset((page - 1) * limit).limit(limit).all()
 
+        # Admins and recent audit logs (for context) for the whole page
+        church_ids = [church.id for church in churches]
+        admins = rows_by_ids(db, ChurchAdmin, ChurchAdmin.church_id, church_ids)
+        admin_users = rows_by_ids(db, User, User.id, [admin.user_id for admin in admins.values()])
+        logs_by_church = latest_rows_by_ids(
+            db, AuditLog, AuditLog.resource_id, church_ids, AuditLog.created_at.desc(), 5,
+            AuditLog.resource_type == "church",
+        )
+
         # Format response data
         church_data = []
         for church in churches:
-            admin = db.query(ChurchAdmin).filter_by(church_id=church.id).first()
-
-            # Get recent audit logs for context
-            recent_logs = (
-                db.query(AuditLog)
-                .filter(AuditLog.church_id == church.id)
-                .order_by(AuditLog.created_at.desc())
-                .limit(5)
-                .all()
-            )
+            admin = admins.get(church.id)
+            admin_user = admin_users.get(admin.user_id) if admin else None
+            recent_logs = logs_by_church[church.id]
 
             log_data = []
             for log in recent_logs:
                 log_data.append(
                     {
                         "action": log.action,
-                        "details": log.details_json,
+                        "details": log.additional_data,
                         "created_at": log.created_at,
                     }
                 )
@@ -1395,10 +1421,10 @@ def get_kyc_confirmation_queue(
                     "recent_activity": log_data,
                     "admin": {
                         "id": admin.id if admin else None,
-                        "email": admin.user.email if admin and admin.user else None,
+                        "email": admin_user.email if admin_user else None,
                         "name": (
-                            f"{admin.user.first_name} {admin.user.last_name}"
-                            if admin and admin.user
+                            f"{admin_user.first_name} {admin_user.last_name}"
+                            if admin_user
                             else None
                         ),
                     },
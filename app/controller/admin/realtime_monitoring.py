@@ -13,44 +13,20 @@ from fastapi import HTTPException
 import logging
 import traceback
 from sqlalchemy.orm import Session
-from sqlalchemy import func, text
+from sqlalchemy import func, text, and_
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict, Any, List
 import time
 
-# Try to import psutil, fallback to mock if not available
-try:
-    import psutil
-    PSUTIL_AVAILABLE = True
-except ImportError:
-    PSUTIL_AVAILABLE = False
-    # Mock psutil for development
-    class MockPsutil:
-        @staticmethod
-        def cpu_percent(interval=1):
-            return 45.0
-        
-        @staticmethod
-        def virtual_memory():
-            class MockMemory:
-                percent = 67.8
-                available = 8 * 1024**3  # 8GB
-            return MockMemory()
-        
-        @staticmethod
-        def disk_usage(path):
-            class MockDisk:
-                percent = 23.1
-                free = 100 * 1024**3  # 100GB
-            return MockDisk()
-    
-    psutil = MockPsutil()
-
 from app.model.m_user import User
 from app.model.m_church import Church
 from app.model.m_donation_batch import DonationBatch
 from app.model.m_donation_preference import DonationPreference
 from app.core.responses import ResponseFactory
+from app.services.cache_service import get_cache_service
+from app.services.request_metrics import get_request_metrics
+from app.services.system_metrics_sampler import get_system_metrics_sampler
+from app.utils.database import checked_out_connections
 
 
 def get_system_alerts(db: Session):
@@ -154,10 +130,9 @@ def acknowledge_alert(alert_id: int, admin_user_id: int, db: Session):
 def get_realtime_system_health(db: Session):
     """Get real-time system health metrics"""
     try:
-        # System metrics
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+        # System metrics from the background sampler
+        sample = get_system_metrics_sampler().latest()
+        cpu_percent = sample.cpu_percent
         
         # Database health check
         db_start_time = time.time()
@@ -172,7 +147,7 @@ def get_realtime_system_health(db: Session):
 
         # Calculate health score (0-100)
         health_score = calculate_system_health_score(
-            cpu_percent, memory.percent, disk.percent, db_response_time
+            cpu_percent, sample.memory_percent, sample.disk_percent, db_response_time
         )
 
         # Determine overall status
@@ -193,16 +168,16 @@ def get_realtime_system_health(db: Session):
                 "timestamp": datetime.now(timezone.utc).isoformat(),
                 "system_metrics": {
                     "cpu_usage": round(cpu_percent, 2),
-                    "memory_usage": round(memory.percent, 2),
-                    "memory_available": round(memory.available / (1024**3), 2),  # GB
-                    "disk_usage": round(disk.percent, 2),
-                    "disk_free": round(disk.free / (1024**3), 2),  # GB
+                    "memory_usage": round(sample.memory_percent, 2),
+                    "memory_available": sample.memory_available_gb,
+                    "disk_usage": round(sample.disk_percent, 2),
+                    "disk_free": sample.disk_free_gb,
                 },
                 "database": {
                     "status": db_status,
                     "response_time_ms": round(db_response_time, 2),
                 },
-                "alerts": get_system_alerts(cpu_percent, memory.percent, disk.percent, db_response_time),
+                "alerts": get_system_alerts(cpu_percent, sample.memory_percent, sample.disk_percent, db_response_time),
             },
         )
 
@@ -219,38 +194,31 @@ def get_realtime_business_metrics(db: Session):
         last_24h = now - timedelta(hours=24)
         last_7d = now - timedelta(days=7)
 
-        # Real-time donation metrics
-        donations_last_hour = db.query(func.count(DonationBatch.id)).filter(
-            DonationBatch.created_at >= last_hour,
-            DonationBatch.status == "completed"
-        ).scalar()
-
-        revenue_last_hour = db.query(func.sum(DonationBatch.amount)).filter(
-            DonationBatch.created_at >= last_hour,
-            DonationBatch.status == "completed"
-        ).scalar() or 0.0
-
-        # 24-hour metrics
-        donations_24h = db.query(func.count(DonationBatch.id)).filter(
-            DonationBatch.created_at >= last_24h,
-            DonationBatch.status == "completed"
-        ).scalar()
-
-        revenue_24h = db.query(func.sum(DonationBatch.amount)).filter(
-            DonationBatch.created_at >= last_24h,
-            DonationBatch.status == "completed"
-        ).scalar() or 0.0
-
-        # 7-day metrics
-        donations_7d = db.query(func.count(DonationBatch.id)).filter(
-            DonationBatch.created_at >= last_7d,
-            DonationBatch.status == "completed"
-        ).scalar()
+        hour_ago = now - timedelta(hours=1)
+        two_hours_ago = now - timedelta(hours=2)
 
-        revenue_7d = db.query(func.sum(DonationBatch.amount)).filter(
+        # Every donation window in one pass over the last 7 days of completed batches
+        in_last_hour = DonationBatch.created_at >= last_hour
+        in_last_24h = DonationBatch.created_at >= last_24h
+        in_previous_hour = and_(DonationBatch.created_at >= two_hours_ago, DonationBatch.created_at < hour_ago)
+        (
+            donations_last_hour, revenue_last_hour,
+            donations_24h, revenue_24h,
+            donations_7d, revenue_7d,
+            donations_previous_hour, revenue_previous_hour
+        ) = db.query(
+            func.count(DonationBatch.id).filter(in_last_hour),
+            func.coalesce(func.sum(DonationBatch.amount).filter(in_last_hour), 0),
+            func.count(DonationBatch.id).filter(in_last_24h),
+            func.coalesce(func.sum(DonationBatch.amount).filter(in_last_24h), 0),
+            func.count(DonationBatch.id),
+            func.coalesce(func.sum(DonationBatch.amount), 0),
+            func.count(DonationBatch.id).filter(in_previous_hour),
+            func.coalesce(func.sum(DonationBatch.amount).filter(in_previous_hour), 0)
+        ).filter(
             DonationBatch.created_at >= last_7d,
             DonationBatch.status == "completed"
-        ).scalar() or 0.0
+        ).one()
 
         # Active users (logged in within last hour)
         active_users = db.query(func.count(User.id)).filter(
@@ -266,22 +234,6 @@ def get_realtime_business_metrics(db: Session):
             Church.created_at >= last_24h
         ).scalar()
 
-        # Calculate trends
-        hour_ago = now - timedelta(hours=1)
-        two_hours_ago = now - timedelta(hours=2)
-        
-        donations_previous_hour = db.query(func.count(DonationBatch.id)).filter(
-            DonationBatch.created_at >= two_hours_ago,
-            DonationBatch.created_at < hour_ago,
-            DonationBatch.status == "completed"
-        ).scalar()
-
-        revenue_previous_hour = db.query(func.sum(DonationBatch.amount)).filter(
-            DonationBatch.created_at >= two_hours_ago,
-            DonationBatch.created_at < hour_ago,
-            DonationBatch.status == "completed"
-        ).scalar() or 0.0
-
         # Calculate growth rates
         donation_growth = calculate_growth_rate(donations_last_hour, donations_previous_hour)
         revenue_growth = calculate_growth_rate(revenue_last_hour, revenue_previous_hour)
@@ -324,7 +276,7 @@ def get_performance_metrics(db: Session):
     try:
         now = datetime.now(timezone.utc)
         
-        # API response times (placeholder - would integrate with monitoring)
+        # API response times over the last hour
         avg_response_time = get_avg_response_time()
         p95_response_time = get_p95_response_time()
         p99_response_time = get_p99_response_time()
@@ -334,7 +286,7 @@ def get_performance_metrics(db: Session):
         db.execute(text("SELECT COUNT(*) FROM users"))
         db_query_time = (time.time() - db_start_time) * 1000
 
-        # Cache performance (placeholder)
+        # Cache performance
         cache_hit_rate = get_cache_hit_rate()
         cache_miss_rate = 100 - cache_hit_rate
 
@@ -545,47 +497,47 @@ def calculate_growth_rate(current: float, previous: float) -> float:
     return ((current - previous) / previous) * 100
 
 
-# Placeholder functions for monitoring integration
-def get_avg_response_time() -> float:
-    """Get average API response time (placeholder)"""
-    return 150.0  # Would integrate with actual monitoring
+# Request metrics from the monitoring middleware's rolling windows
+def get_avg_response_time(window: str = "1h") -> float:
+    """Get average API response time in ms"""
+    return get_request_metrics().summary(window)["avg_ms"]
 
 
-def get_p95_response_time() -> float:
-    """Get P95 API response time (placeholder)"""
-    return 300.0
+def get_p95_response_time(window: str = "1h") -> float:
+    """Get P95 API response time in ms"""
+    return get_request_metrics().summary(window)["p95_ms"]
 
 
-def get_p99_response_time() -> float:
-    """Get P99 API response time (placeholder)"""
-    return 500.0
+def get_p99_response_time(window: str = "1h") -> float:
+    """Get P99 API response time in ms"""
+    return get_request_metrics().summary(window)["p99_ms"]
 
 
 def get_cache_hit_rate() -> float:
-    """Get cache hit rate (placeholder)"""
-    return 85.0
+    """Get cache hit rate percentage of the application cache"""
+    return float(get_cache_service().get_stats()["hit_rate"])
 
 
 def get_error_rate_24h() -> float:
-    """Get 24-hour error rate (placeholder)"""
-    return 0.5
+    """Get 24-hour server error rate percentage"""
+    return get_request_metrics().summary("24h")["error_rate"]
 
 
 def get_error_rate_7d() -> float:
-    """Get 7-day error rate (placeholder)"""
+    """Get 7-day error rate (placeholder, request metrics keep 24 hours)"""
     return 0.3
 
 
 def get_requests_per_minute() -> int:
-    """Get requests per minute (placeholder)"""
-    return 120
+    """Get requests in the last minute"""
+    return get_request_metrics().window("1m").count
 
 
 def get_requests_per_hour() -> int:
-    """Get requests per hour (placeholder)"""
-    return 7200
+    """Get requests in the last hour"""
+    return get_request_metrics().window("1h").count
 
 
 def get_db_connections() -> int:
-    """Get active database connections (placeholder)"""
-    return 15
+    """Get database connections checked out of the connection pools"""
+    return checked_out_connections()
@@ -10,6 +10,12 @@ import time
 from app.model.m_user import User
 from app.model.m_church import Church
 from app.core.responses import ResponseFactory
+from app.services.system_metrics_sampler import get_system_metrics_sampler
+from app.controller.admin.realtime_monitoring import (
+    get_avg_response_time, get_p95_response_time, get_p99_response_time,
+    get_requests_per_minute, get_requests_per_hour, get_error_rate_24h,
+    get_db_connections, get_cache_hit_rate
+)
 
 
 def get_system_status(db: Session):
@@ -23,12 +29,13 @@ def get_system_status(db: Session):
             logging.error(f"Database health check failed: {str(e)}")
             db_status = "unhealthy"
 
-        # Get system metrics (placeholder values since psutil is not available)
-        cpu_percent = 25.0  # Placeholder
-        memory_percent = 60.0  # Placeholder
-        memory_available = 4.0  # GB placeholder
-        disk_percent = 45.0  # Placeholder
-        disk_free = 50.0  # GB placeholder
+        # Get system metrics from the background sampler
+        sample = get_system_metrics_sampler().latest()
+        cpu_percent = sample.cpu_percent
+        memory_percent = sample.memory_percent
+        memory_available = sample.memory_available_gb
+        disk_percent = sample.disk_percent
+        disk_free = sample.disk_free_gb
 
         # Get application metrics with error handling
         total_users = 0
@@ -132,8 +139,11 @@ def get_health_check(db: Session):
         except Exception as e:
             health_checks["database"] = {"status": "unhealthy", "error": str(e)}
 
-        # Disk space check (placeholder values since psutil is not available)
-        disk_percent = 45.0  # Placeholder
+        # Resource checks from the background sampler's latest sample
+        sample = get_system_metrics_sampler().latest()
+
+        # Disk space check
+        disk_percent = sample.disk_percent
         if disk_percent > 90:
             health_checks["disk"] = {
                 "status": "warning",
@@ -145,8 +155,8 @@ def get_health_check(db: Session):
                 "usage_percent": str(round(disk_percent, 2)),
             }
 
-        # Memory check (placeholder values since psutil is not available)
-        memory_percent = 60.0  # Placeholder
+        # Memory check
+        memory_percent = sample.memory_percent
         if memory_percent > 85:
             health_checks["memory"] = {
                 "status": "warning",
@@ -158,8 +168,8 @@ def get_health_check(db: Session):
                 "usage_percent": str(round(memory_percent, 2)),
             }
 
-        # CPU check (placeholder values since psutil is not available)
-        cpu_percent = 25.0  # Placeholder
+        # CPU check
+        cpu_percent = sample.cpu_percent
         if cpu_percent > 80:
             health_checks["cpu"] = {
                 "status": "warning",
@@ -230,10 +240,11 @@ def get_performance_metrics(db: Session):
         cache_hit_rate = _get_real_cache_hit_rate()
         cache_miss_rate = _get_real_cache_miss_rate()
 
-        # Get system metrics (placeholder values since psutil is not available)
-        cpu_percent = 25.0  # Placeholder
-        memory_percent = 60.0  # Placeholder
-        disk_percent = 45.0  # Placeholder
+        # Get system metrics from the background sampler
+        sample = get_system_metrics_sampler().latest()
+        cpu_percent = sample.cpu_percent
+        memory_percent = sample.memory_percent
+        disk_percent = sample.disk_percent
 
         return ResponseFactory.success(
             message="Performance metrics retrieved successfully",
@@ -279,39 +290,32 @@ def get_performance_metrics(db: Session):
 
 def _get_real_response_time():
     """Get real average response time from monitoring"""
-    # TODO: Integrate with actual monitoring system
-    # Example: return prometheus_client.get_metric('http_request_duration_seconds').avg()
-    return 150  # Placeholder - replace with real monitoring
+    return get_avg_response_time()
 
 
 def _get_real_p95_response_time():
     """Get real P95 response time from monitoring"""
-    # TODO: Integrate with actual monitoring system
-    return 300  # Placeholder - replace with real monitoring
+    return get_p95_response_time()
 
 
 def _get_real_p99_response_time():
     """Get real P99 response time from monitoring"""
-    # TODO: Integrate with actual monitoring system
-    return 500  # Placeholder - replace with real monitoring
+    return get_p99_response_time()
 
 
 def _get_real_requests_per_minute():
     """Get real requests per minute from monitoring"""
-    # TODO: Integrate with actual monitoring system
-    return 120  # Placeholder - replace with real monitoring
+    return get_requests_per_minute()
 
 
 def _get_real_requests_per_hour():
     """Get real requests per hour from monitoring"""
-    # TODO: Integrate with actual monitoring system
-    return 7200  # Placeholder - replace with real monitoring
+    return get_requests_per_hour()
 
 
 def _get_real_error_rate_24h():
     """Get real 24h error rate from monitoring"""
-    # TODO: Integrate with actual monitoring system
-    return 0.5  # Placeholder - replace with real monitoring
+    return get_error_rate_24h()
 
 
 def _get_real_error_rate_7d():
@@ -322,8 +326,7 @@ def _get_real_error_rate_7d():
 
 def _get_real_db_connections():
     """Get real database connections from monitoring"""
-    # TODO: Integrate with actual monitoring system
-    return 15  # Placeholder - replace with real monitoring
+    return get_db_connections()
 
 
 def _get_real_db_query_time():
@@ -334,11 +337,9 @@ def _get_real_db_query_time():
 
 def _get_real_cache_hit_rate():
     """Get real cache hit rate from monitoring"""
-    # TODO: Integrate with actual monitoring system
-    return 85  # Placeholder - replace with real monitoring
+    return get_cache_hit_rate()
 
 
 def _get_real_cache_miss_rate():
     """Get real cache miss rate from monitoring"""
-    # TODO: Integrate with actual monitoring system
-    return 15  # Placeholder - replace with real monitoring
+    return round(100 - get_cache_hit_rate(), 2)
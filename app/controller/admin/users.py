@@ -10,7 +10,30 @@ from app.model.m_user import User
 from app.model.m_church import Church
 from app.model.m_donation_batch import DonationBatch
 from app.model.m_donation_preference import DonationPreference
+from app.services.principal_cache import principal_cache
 from app.core.responses import ResponseFactory
+from app.services.export_service import stream_query_export
+from app.services.user_search import filter_by_search_term, order_by_relevance
+from app.utils.enrichment import aggregate_by_ids, rows_by_ids
+from app.utils.pagination import apply_order, estimated_count, keyset_page, keyset_pagination
+
+# Newest first; id keeps the order total for keyset cursors
+USER_LIST_ORDER = ((User.created_at, True), (User.id, True))
+USER_DONATIONS_ORDER = ((DonationBatch.created_at, True), (DonationBatch.id, True))
+
+
+def _filter_user_list(query, search: str = "", role: Optional[str] = None):
+    """Apply the admin user list filters (role, name/email search)"""
+    # Filter by role - default to only donor users for users page
+    if role:
+        query = query.filter(User.role == role)
+    else:
+        # Default: exclude church_admin and manna_admin users
+        query = query.filter(User.role.in_(["donor", "congregant", "user"]))
+
+    if search:
+        query = filter_by_search_term(query, search)
+    return query
 
 
 def get_all_users(
@@ -20,64 +43,64 @@ def get_all_users(
     church_id: Optional[int] = None,
     role: Optional[str] = None,
     db: Optional[Session] = None,
+    cursor: Optional[str] = None,
+    with_total: bool = False,
 ):
-    """Get all users with pagination and filtering"""
+    """
+    Get all users with pagination and filtering
+
+    Passing a cursor (empty for the first page) switches to keyset pagination;
+    with_total then adds an estimated total. Page/limit results of a search
+    are ranked by relevance; keyset pages keep the newest-first order.
+    """
     try:
         if db is None:
             raise HTTPException(status_code=500, detail="Database session required")
         
-        query = db.query(User)
-
-        # Filter by role - default to only donor users for users page
-        if role:
-            query = query.filter(User.role == role)
-        else:
-            # Default: exclude church_admin and manna_admin users
-            query = query.filter(User.role.in_(["donor", "congregant", "user"]))
-
-        if search:
-            search_filter = f"%{search}%"
-            query = query.filter(
-                (User.email.ilike(search_filter))
-                | (User.first_name.ilike(search_filter))
-                | (User.last_name.ilike(search_filter))
-            )
+        query = _filter_user_list(db.query(User), search, role)
         if church_id and church_id > 0:
             # Note: This filter needs to be updated to use ChurchMembership relationship
             # For now, we'll skip this filter as User.church_id doesn't exist
             pass
 
-        total = query.count()
-        users = query.offset((page - 1) * limit).limit(limit).all()
+        if cursor is not None:
+            users, next_cursor = keyset_page(query, USER_LIST_ORDER, limit, cursor)
+            pagination = keyset_pagination(
+                limit,
+                next_cursor,
+                estimated_count(query, ("admin_users", search, role)) if with_total else None
+            )
+        else:
+            total = query.count()
+            ordered = order_by_relevance(query, search) if search else query
+            users = apply_order(ordered, USER_LIST_ORDER).offset((page - 1) * limit).limit(limit).all()
+            pagination = {
+                "page": page,
+                "limit": limit,
+                "total": total,
+                "pages": (total + limit - 1) // limit,
+            }
+
+        # Churches and donation stats for the whole page
+        churches = rows_by_ids(db, Church, Church.id, [user.church_id for user in users])
+        donation_stats = aggregate_by_ids(
+            db,
+            DonationBatch.user_id,
+            [user.id for user in users],
+            {
+                "total_donations": func.sum(DonationBatch.amount),
+                "donation_count": func.count(DonationBatch.id),
+            },
+            DonationBatch.status == "completed",
+            empty={"total_donations": 0.0, "donation_count": 0},
+        )
 
         users_data = []
         for user in users:
             try:
-                # Get user's primary church
-                primary_church = user.get_primary_church(db)
-                church = primary_church
-
-                # Get user's total donations
-                total_donations = (
-                    db.query(func.sum(DonationBatch.amount))
-                    .filter(
-                        DonationBatch.user_id == user.id,
-                        DonationBatch.status == "completed",
-                    )
-                    .scalar()
-                    or 0.0
-                )
-
-                # Get user's donation count
-                donation_count = (
-                    db.query(func.count(DonationBatch.id))
-                    .filter(
-                        DonationBatch.user_id == user.id,
-                        DonationBatch.status == "completed",
-                    )
-                    .scalar()
-                    or 0
-                )
+                church = churches.get(user.church_id)
+                total_donations = donation_stats[user.id]["total_donations"]
+                donation_count = donation_stats[user.id]["donation_count"]
 
                 users_data.append(
                     {
@@ -113,19 +136,133 @@ def get_all_users(
             message="Users retrieved successfully",
             data={
                 "users": users_data,
-                "pagination": {
-                    "page": page,
-                    "limit": limit,
-                    "total": total,
-                    "pages": (total + limit - 1) // limit,
-                },
+                "pagination": pagination,
             },
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail="Failed to retrieve users")
 
 
+def search_users(
+    term: str,
+    role: Optional[str] = None,
+    limit: int = 20,
+    db: Optional[Session] = None,
+):
+    """Best name/email matches for a search term (defaults to donor users only)"""
+    try:
+        if db is None:
+            raise HTTPException(status_code=500, detail="Database session required")
+        term = (term or "").strip()
+        if not term:
+            raise HTTPException(status_code=400, detail="Search term is required")
+
+        query = _filter_user_list(db.query(User), term, role)
+        users = (
+            apply_order(order_by_relevance(query, term), USER_LIST_ORDER)
+            .limit(limit)
+            .all()
+        )
+
+        return ResponseFactory.success(
+            message="User search completed successfully",
+            data={
+                "users": [
+                    {
+                        "id": user.id,
+                        "email": user.email,
+                        "first_name": user.first_name,
+                        "last_name": user.last_name,
+                        "role": user.role,
+                        "is_active": user.is_active,
+                        "church_id": user.church_id,
+                    }
+                    for user in users
+                ],
+                "search_term": term,
+                "limit": limit,
+            },
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Failed to search users")
+
+
+USER_EXPORT_COLUMNS = [
+    "id", "email", "phone", "first_name", "last_name", "role", "is_active",
+    "is_email_verified", "is_phone_verified", "church_id", "church_name",
+    "created_at", "last_login", "total_donations", "donation_count",
+]
+
+
+def export_users(
+    search: str = "",
+    role: Optional[str] = None,
+    format_type: str = "csv",
+    gzip: bool = False,
+):
+    """Stream the filtered admin user list, with donation stats, as CSV or NDJSON"""
+    def build(db: Session):
+        donations = (
+            db.query(
+                DonationBatch.user_id.label("user_id"),
+                func.sum(DonationBatch.amount).label("total_donations"),
+                func.count(DonationBatch.id).label("donation_count"),
+            )
+            .filter(DonationBatch.status == "completed")
+            .group_by(DonationBatch.user_id)
+            .subquery()
+        )
+        query = (
+            db.query(
+                User.id,
+                User.email,
+                User.phone,
+                User.first_name,
+                User.last_name,
+                User.role,
+                User.is_active,
+                User.is_email_verified,
+                User.is_phone_verified,
+                User.church_id,
+                Church.name.label("church_name"),
+                User.created_at,
+                User.last_login,
+                donations.c.total_donations,
+                donations.c.donation_count,
+            )
+            .outerjoin(Church, Church.id == User.church_id)
+            .outerjoin(donations, donations.c.user_id == User.id)
+        )
+        return _filter_user_list(query, search, role).order_by(User.id)
+
+    def serialize(user) -> dict:
+        return {
+            "id": user.id,
+            "email": user.email,
+            "phone": user.phone,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "role": user.role,
+            "is_active": user.is_active,
+            "is_email_verified": user.is_email_verified,
+            "is_phone_verified": user.is_phone_verified,
+            "church_id": user.church_id,
+            "church_name": user.church_name,
+            "created_at": user.created_at.isoformat() if user.created_at else None,
+            "last_login": user.last_login.isoformat() if user.last_login else None,
+            "total_donations": round(float(user.total_donations or 0), 2),
+            "donation_count": user.donation_count or 0,
+        }
+
+    return stream_query_export(build, serialize, USER_EXPORT_COLUMNS, format_type, filename="users", gzip=gzip)
+
+
 def get_user_details(user_id: int, db: Session):
     """Get detailed user information"""
     try:
@@ -260,6 +397,7 @@ def update_user_status(user_id: int, is_active: bool, db: Session):
         user.is_active = is_active
         user.updated_at = datetime.now(timezone.utc)
         db.commit()
+        principal_cache.invalidate_user(user_id)
 
         return ResponseFactory.success(
             message="User status updated successfully",
@@ -395,9 +533,14 @@ def get_user_analytics(
 
 
 def get_user_donations(
-    user_id: int, page: int = 1, limit: int = 20, db: Optional[Session] = None
+    user_id: int,
+    page: int = 1,
+    limit: int = 20,
+    db: Optional[Session] = None,
+    cursor: Optional[str] = None,
+    with_total: bool = False,
 ):
-    """Get user donations"""
+    """Get user donations (keyset pages when a cursor is passed)"""
     try:
         if db is None:
             raise HTTPException(status_code=500, detail="Database session required")
@@ -408,13 +551,27 @@ def get_user_donations(
         query = db.query(DonationBatch).filter(
             DonationBatch.user_id == user_id, DonationBatch.status == "completed"
         )
-        total = query.count()
-        donations = (
-            query.order_by(DonationBatch.created_at.desc())
-            .offset((page - 1) * limit)
-            .limit(limit)
-            .all()
-        )
+        if cursor is not None:
+            donations, next_cursor = keyset_page(query, USER_DONATIONS_ORDER, limit, cursor)
+            pagination = keyset_pagination(
+                limit,
+                next_cursor,
+                estimated_count(query, ("admin_user_donations", user_id)) if with_total else None
+            )
+        else:
+            total = query.count()
+            donations = (
+                apply_order(query, USER_DONATIONS_ORDER)
+                .offset((page - 1) * limit)
+                .limit(limit)
+                .all()
+            )
+            pagination = {
+                "page": page,
+                "limit": limit,
+                "total": total,
+                "pages": (total + limit - 1) // limit,
+            }
 
         donations_data = []
         for donation in donations:
@@ -437,12 +594,7 @@ def get_user_donations(
             message="User donations retrieved successfully",
             data={
                 "donations": donations_data,
-                "pagination": {
-                    "page": page,
-                    "limit": limit,
-                    "total": total,
-                    "pages": (total + limit - 1) // limit,
-                },
+                "pagination": pagination,
             },
         )
 
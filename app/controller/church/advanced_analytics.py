@@ -17,11 +17,9 @@ from typing import List, Dict, Any, Optional
 import math
 
 from app.model.m_church import Church
-from app.model.m_user import User
 from app.model.m_roundup_new import DonorPayout, ChurchPayout
 from app.model.m_donation_preference import DonationPreference
-from app.model.m_plaid_items import PlaidItem
-from app.services.plaid_client import get_transactions
+from app.services.church_spending_rollup_service import ChurchSpendingRollupService
 from app.core.responses import ResponseFactory
 from app.core.exceptions import UserNotFoundError, ValidationError
 from app.utils.error_handler import handle_controller_errors
@@ -159,7 +157,7 @@ def get_spending_categories_analytics(
     limit: int = 10,
     db: Session = None
 ) -> ResponseFactory:
-    """Get spending categories analytics from donor transactions"""
+    """Get spending categories analytics from the church spending rollups"""
     try:
         # Validate church exists
         church = db.query(Church).filter(Church.id == church_id).first()
@@ -172,67 +170,23 @@ def get_spending_categories_analytics(
         if not start_date:
             start_date = (datetime.now(timezone.utc) - timedelta(days=90)).strftime("%Y-%m-%d")
 
-        # Get church donors
-        donors = db.query(User).filter(
-            User.church_id == church_id,
-            User.role == "donor",
-            User.is_active == True
-        ).all()
+        # Daily category buckets fed by the transaction sync, merged over the range
+        categories_data = ChurchSpendingRollupService.get_rollup(
+            db,
+            church_id,
+            "category",
+            datetime.strptime(start_date, "%Y-%m-%d").date(),
+            datetime.strptime(end_date, "%Y-%m-%d").date()
+        )
 
-        if not donors:
+        if not categories_data:
             return ResponseFactory.success(
-                message="No donors found for analytics",
+                message="No spending data found for analytics",
                 data={"categories": [], "summary": {}}
             )
 
-        # Get spending data from Plaid for all donors
-        categories_data = {}
-        total_spending = 0.0
-        total_transactions = 0
-
-        for donor in donors:
-            plaid_item = db.query(PlaidItem).filter(
-                PlaidItem.user_id == donor.id,
-                PlaidItem.status == "active"
-            ).first()
-
-            if plaid_item:
-                try:
-                    # Get transactions from Plaid
-                    transactions_data = get_transactions(
-                        access_token=plaid_item.access_token,
-                        days_back=90
-                    )
-                    
-                    transactions = transactions_data.get("transactions", [])
-                    
-                    for transaction in transactions:
-                        if transaction["amount"] < 0:  # Spending transactions
-                            amount = abs(transaction["amount"])
-                            categories = transaction.get("category", [])
-                            
-                            if categories:
-                                # Use the first category as primary
-                                primary_category = categories[0]
-                                
-                                if primary_category not in categories_data:
-                                    categories_data[primary_category] = {
-                                        "category": primary_category,
-                                        "total_amount": 0.0,
-                                        "transaction_count": 0,
-                                        "donors_count": set()
-                                    }
-                                
-                                categories_data[primary_category]["total_amount"] += amount
-                                categories_data[primary_category]["transaction_count"] += 1
-                                categories_data[primary_category]["donors_count"].add(donor.id)
-                                
-                                total_spending += amount
-                                total_transactions += 1
-
-                except Exception as e:
-                    logging.error(f"Error getting transactions for donor {donor.id}: {str(e)}")
-                    continue
+        total_spending = sum(data["total_amount"] for data in categories_data.values())
+        total_transactions = sum(data["transaction_count"] for data in categories_data.values())
 
         # Convert to list and sort by total amount
         categories_list = []
@@ -241,7 +195,7 @@ def get_spending_categories_analytics(
                 "category": category,
                 "total_amount": round(data["total_amount"], 2),
                 "transaction_count": data["transaction_count"],
-                "donors_count": len(data["donors_count"]),
+                "donors_count": data["donors_count"],
                 "percentage": round((data["total_amount"] / max(total_spending, 1)) * 100, 2)
             })
 
@@ -280,7 +234,7 @@ def get_top_merchants_analytics(
     limit: int = 10,
     db: Session = None
 ) -> ResponseFactory:
-    """Get top merchants analytics from donor transactions"""
+    """Get top merchants analytics from the church spending rollups"""
     try:
         # Validate church exists
         church = db.query(Church).filter(Church.id == church_id).first()
@@ -293,63 +247,23 @@ def get_top_merchants_analytics(
         if not start_date:
             start_date = (datetime.now(timezone.utc) - timedelta(days=90)).strftime("%Y-%m-%d")
 
-        # Get church donors
-        donors = db.query(User).filter(
-            User.church_id == church_id,
-            User.role == "donor",
-            User.is_active == True
-        ).all()
+        # Daily merchant buckets fed by the transaction sync, merged over the range
+        merchants_data = ChurchSpendingRollupService.get_rollup(
+            db,
+            church_id,
+            "merchant",
+            datetime.strptime(start_date, "%Y-%m-%d").date(),
+            datetime.strptime(end_date, "%Y-%m-%d").date()
+        )
 
-        if not donors:
+        if not merchants_data:
             return ResponseFactory.success(
-                message="No donors found for analytics",
+                message="No spending data found for analytics",
                 data={"merchants": [], "summary": {}}
             )
 
-        # Get merchant data from Plaid for all donors
-        merchants_data = {}
-        total_spending = 0.0
-        total_transactions = 0
-
-        for donor in donors:
-            plaid_item = db.query(PlaidItem).filter(
-                PlaidItem.user_id == donor.id,
-                PlaidItem.status == "active"
-            ).first()
-
-            if plaid_item:
-                try:
-                    # Get transactions from Plaid
-                    transactions_data = get_transactions(
-                        access_token=plaid_item.access_token,
-                        days_back=90
-                    )
-                    
-                    transactions = transactions_data.get("transactions", [])
-                    
-                    for transaction in transactions:
-                        if transaction["amount"] < 0:  # Spending transactions
-                            amount = abs(transaction["amount"])
-                            merchant = transaction.get("merchant_name") or transaction.get("name", "Unknown")
-                            
-                            if merchant not in merchants_data:
-                                merchants_data[merchant] = {
-                                    "merchant": merchant,
-                                    "total_amount": 0.0,
-                                    "transaction_count": 0,
-                                    "donors_count": set()
-                                }
-                            
-                            merchants_data[merchant]["total_amount"] += amount
-                            merchants_data[merchant]["transaction_count"] += 1
-                            merchants_data[merchant]["donors_count"].add(donor.id)
-                            
-                            total_spending += amount
-                            total_transactions += 1
-
-                except Exception as e:
-                    logging.error(f"Error getting transactions for donor {donor.id}: {str(e)}")
-                    continue
+        total_spending = sum(data["total_amount"] for data in merchants_data.values())
+        total_transactions = sum(data["transaction_count"] for data in merchants_data.values())
 
         # Convert to list and sort by total amount
         merchants_list = []
@@ -358,7 +272,7 @@ def get_top_merchants_analytics(
                 "merchant": merchant,
                 "total_amount": round(data["total_amount"], 2),
                 "transaction_count": data["transaction_count"],
-                "donors_count": len(data["donors_count"]),
+                "donors_count": data["donors_count"],
                 "percentage": round((data["total_amount"] / max(total_spending, 1)) * 100, 2)
             })
 
@@ -10,6 +10,7 @@ from app.model.m_church import Church
 from app.model.m_roundup_new import DonorPayout, ChurchPayout
 from app.model.m_user import User
 from app.core.responses import ResponseFactory
+from app.utils.enrichment import rows_by_ids
 
 
 def get_church_analytics(
@@ -118,9 +119,10 @@ def get_donor_analytics(church_id: int, db: Session):
         top_donors = sorted(
             donor_stats, key=lambda x: float(x.total_donated), reverse=True
         )[:10]
+        users = rows_by_ids(db, User, User.id, [donor.user_id for donor in top_donors])
         top_donors_data = []
         for donor in top_donors:
-            user = db.query(User).filter(User.id == donor.user_id).first()
+            user = users.get(donor.user_id)
             top_donors_data.append(
                 {
                     "user_id": donor.user_id,
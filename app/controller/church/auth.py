@@ -14,6 +14,7 @@ from app.utils.jwt_handler import create_access_token, create_refresh_token
 from app.core.messages import get_auth_message
 from app.core.responses import ResponseFactory, SuccessResponse
 from app.utils.token_manager import token_manager
+from app.services.principal_cache import principal_cache
 
 
 def register_church_admin(admin_data: dict, db: Session) -> SuccessResponse:
@@ -206,9 +207,7 @@ def login_church_admin(
         if session_id:
             from app.services.session_service import session_manager
 
-            session = session_manager.get_session(session_id)
-            if session:
-                session.refresh_token = str(new_refresh_token)
+            session_manager.update_session_tokens(session_id, refresh_token=str(new_refresh_token))
 
         return ResponseFactory.success(
             message="Login successful",
@@ -311,9 +310,7 @@ def refresh_church_token(
         if session_id:
             from app.services.session_service import session_manager
 
-            session = session_manager.get_session(session_id)
-            if session:
-                session.refresh_token = str(new_refresh_token)
+            session_manager.update_session_tokens(session_id, refresh_token=str(new_refresh_token))
 
         # Get church info
         church = db.query(Church).filter(Church.id == admin.church_id).first()
@@ -363,6 +360,7 @@ def logout_church(admin_id: int, refresh_token: str, db: Session) -> SuccessResp
         if token_record:
             db.delete(token_record)
             db.commit()
+        principal_cache.invalidate_user(admin_id)
 
         return ResponseFactory.success(message="Logged out successfully")
 
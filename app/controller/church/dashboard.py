@@ -12,7 +12,7 @@ from fastapi import HTTPException
 import logging
 import traceback
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, desc, or_
+from sqlalchemy import func, and_, desc, or_, event, inspect
 from datetime import datetime, timezone, timedelta
 from typing import Optional
 from app.model.m_church import Church
@@ -31,6 +31,10 @@ from app.core.responses import ResponseFactory
 from app.services.analytics_service import ChurchDashboardService
 from app.services.analytics_service import ChurchDashboardService
 from app.services.analytics_service import get_church_spending_analytics
+from app.utils.time_series import aggregate_by_period, fill_periods
+from app.utils.enrichment import aggregate_by_ids, rows_by_ids
+from app.services.cache_service import get_cache_service
+from app.core.constants import CHURCH_DASHBOARD_CACHE_TTL
 import math
 
 
@@ -93,424 +97,405 @@ def get_church_referral_info(church_id: int, db: Session) -> dict:
         }
 
 
+def church_dashboard_cache_key(church_id: int) -> str:
+    """Cache key of a church's dashboard payload"""
+    return f"church:dashboard:{church_id}"
+
+
+def invalidate_church_dashboard_cache(church_id: int):
+    """Drop a church's cached dashboard payload"""
+    get_cache_service().delete(church_dashboard_cache_key(church_id))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_completed_payout_churches(session, flush_context):
+    """Remember churches whose donor or church payouts completed in this flush"""
+    churches = session.info.setdefault("church_dashboard_churches", set())
+    for obj in session.new:
+        if isinstance(obj, (DonorPayout, ChurchPayout)) and obj.status == "completed":
+            churches.add(obj.church_id)
+    for obj in session.dirty:
+        if isinstance(obj, (DonorPayout, ChurchPayout)) and "completed" in inspect(obj).attrs.status.history.added:
+            churches.add(obj.church_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_completed_payout_churches(session):
+    for church_id in session.info.pop("church_dashboard_churches", ()):
+        invalidate_church_dashboard_cache(church_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_completed_payout_churches(session, previous_transaction):
+    session.info.pop("church_dashboard_churches", None)
+
+
 def get_church_dashboard(
     church_id: int, db: Session, current_user: Optional[dict] = None
 ):
     """Get simplified church dashboard data for MVP"""
     try:
-        # Get church info
-        church = db.query(Church).filter_by(id=church_id).first()
-        if not church:
-            raise HTTPException(status_code=404, detail="Church not found")
-
-        # Get total members (donors) for this church
-        total_members = (
-            db.query(func.count(User.id))
-            .filter(
-                User.church_id == church_id,
-                User.role == "donor",
-                User.is_active == True,
+        if CHURCH_DASHBOARD_CACHE_TTL > 0:
+            # Per-church result cache, dropped when one of the church's payouts completes
+            data = get_cache_service().get_or_set(
+                church_dashboard_cache_key(church_id),
+                lambda: _build_church_dashboard(church_id, db),
+                ttl=CHURCH_DASHBOARD_CACHE_TTL
             )
-            .scalar()
+        else:
+            data = _build_church_dashboard(church_id, db)
+
+        return ResponseFactory.success(
+            message="Church dashboard retrieved successfully",
+            data=data,
         )
-        # Alias for clarity: existing donors equals current total active donors
-        existing_donors_total = int(total_members or 0)
 
-        # Get active donors - users who have made donations (simplified for MVP)
-        active_donors = (
-            db.query(func.count(func.distinct(DonorPayout.user_id)))
-            .filter(
-                DonorPayout.church_id == church_id, 
-                DonorPayout.status == "completed"
-            )
-            .scalar()
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Church dashboard error for church_id {church_id}: {str(e)}")
+        logging.error(f"Traceback: {traceback.format_exc()}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to retrieve church dashboard: {str(e)}"
         )
 
-        # Get total donations (simplified for MVP)
-        total_donations = (
-            db.query(func.sum(DonorPayout.donation_amount))
-            .filter(
-                DonorPayout.church_id == church_id,
-                DonorPayout.status == "completed",
-            )
-            .scalar()
-            or 0
+
+def _add_months(dt: datetime, months: int) -> datetime:
+    year = dt.year + (dt.month - 1 + months) // 12
+    month = (dt.month - 1 + months) % 12 + 1
+    return dt.replace(year=year, month=month, day=1)
+
+
+def _build_church_dashboard(church_id: int, db: Session) -> dict:
+    """Compute the church dashboard payload"""
+    # Get church info
+    church = db.query(Church).filter_by(id=church_id).first()
+    if not church:
+        raise HTTPException(status_code=404, detail="Church not found")
+
+    # Get total members (donors) for this church
+    total_members = (
+        db.query(func.count(User.id))
+        .filter(
+            User.church_id == church_id,
+            User.role == "donor",
+            User.is_active == True,
+        )
+        .scalar()
+    )
+    # Alias for clarity: existing donors equals current total active donors
+    existing_donors_total = int(total_members or 0)
+
+    # Donation overview (simplified for MVP): one conditional aggregate over completed payouts
+    current_month = datetime.now(timezone.utc).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+    active_donors, total_donations, this_month_donations, donation_count = (
+        db.query(
+            func.count(func.distinct(DonorPayout.user_id)),
+            func.sum(DonorPayout.donation_amount),
+            func.sum(DonorPayout.donation_amount).filter(DonorPayout.created_at >= current_month),
+            func.count(DonorPayout.id),
+        )
+        .filter(
+            DonorPayout.church_id == church_id,
+            DonorPayout.status == "completed",
+        )
+        .one()
+    )
+    total_donations = float(total_donations) if total_donations else 0.0
+    this_month_donations = float(this_month_donations) if this_month_donations else 0.0
+
+    # Get recent donations (simplified for MVP)
+    recent_donations = (
+        db.query(DonorPayout)
+        .filter(
+            DonorPayout.church_id == church_id,
+            DonorPayout.status == "completed",
+        )
+        .order_by(DonorPayout.created_at.desc())
+        .limit(10)
+        .all()
+    )
+
+    # Get church admin info
+    church_admin = db.query(ChurchAdmin).filter_by(church_id=church_id).first()
+
+    # Load every user the page references (recent donors, admin) in one IN query
+    user_ids = {donation.user_id for donation in recent_donations}
+    if church_admin:
+        user_ids.add(church_admin.user_id)
+    users_by_id = (
+        {user.id: user for user in db.query(User).filter(User.id.in_(user_ids)).all()}
+        if user_ids
+        else {}
+    )
+    admin_user = users_by_id.get(church_admin.user_id) if church_admin else None
+
+    recent_donations_data = []
+    for donation in recent_donations:
+        user = users_by_id.get(donation.user_id)
+        recent_donations_data.append(
+            {
+                "id": donation.id,
+                "amount": float(donation.donation_amount),
+                "date": donation.created_at.isoformat(),
+                "donor_name": (
+                    f"{user.first_name} {user.last_name}" if user else "Unknown"
+                ),
+                "transaction_count": donation.plaid_transaction_count or 1,
+            }
         )
-        total_donations = float(total_donations) if total_donations else 0.0
 
-        # Get this month's donations
-        current_month = datetime.now(timezone.utc).replace(
-            day=1, hour=0, minute=0, second=0, microsecond=0
+    # Get top donors (simplified for MVP)
+    top_donors = (
+        db.query(
+            User.id,
+            User.first_name,
+            User.last_name,
+            func.sum(DonorPayout.donation_amount).label("total_donated"),
         )
-        this_month_donations = (
-            db.query(func.sum(DonorPayout.donation_amount))
-            .filter(
-                DonorPayout.church_id == church_id,
-                DonorPayout.status == "completed",
-                DonorPayout.created_at >= current_month,
-            )
-            .scalar()
-            or 0
+        .join(DonorPayout)
+        .filter(
+            User.church_id == church_id,
+            User.role == "donor",
+            User.is_active == True,
+            DonorPayout.status == "completed",
+        )
+        .group_by(User.id)
+        .order_by(desc("total_donated"))
+        .limit(5)
+        .all()
+    )
+
+    top_donors_data = []
+    for donor in top_donors:
+        total_donated_dollars = float(donor.total_donated) if donor.total_donated else 0.0
+        top_donors_data.append(
+            {
+                "id": donor.id,
+                "name": f"{donor.first_name} {donor.last_name}",
+                "total_donated": round(total_donated_dollars, 2),
+            }
         )
-        this_month_donations = float(this_month_donations) if this_month_donations else 0.0
 
-        # Get donation count
-        donation_count = (
-            db.query(func.count(DonorPayout.id))
-            .filter(
-                DonorPayout.church_id == church_id,
-                DonorPayout.status == "completed",
-            )
-            .scalar()
+    # Get payout data (simplified for MVP)
+    from app.controller.admin.dashboard import calculate_next_payout_date
+    next_payout_date = calculate_next_payout_date().strftime("%Y-%m-%d")
+    next_payout_amount = round(
+        float(this_month_donations) * 0.95, 2
+    )  # 95% of this month's donations
+
+    # Get payouts history (simplified for MVP)
+    payouts_query = (
+        db.query(ChurchPayout)
+        .filter(ChurchPayout.church_id == church_id)
+        .order_by(ChurchPayout.created_at.desc())
+        .limit(10)
+        .all()
+    )
+
+    payouts = []
+    for payout in payouts_query:
+        payouts.append(
+            {
+                "id": payout.id,
+                "amount": float(payout.net_payout_amount),
+                "gross_amount": float(payout.gross_donation_amount),
+                "system_fee": float(payout.system_fee_amount),
+                "donor_count": payout.donor_count,
+                "donation_count": payout.donation_count,
+                "period_start": payout.period_start,
+                "period_end": payout.period_end,
+                "stripe_transfer_id": payout.stripe_transfer_id,
+                "date": payout.created_at.strftime("%Y-%m-%d"),
+                "status": payout.status,
+                "created_at": payout.created_at.isoformat(),
+                "processed_at": (
+                    payout.processed_at.isoformat()
+                    if payout.processed_at
+                    else None
+                ),
+                "reference": f"PAY-{payout.id:06d}-{payout.created_at.strftime('%Y%m')}",
+            }
         )
 
-        # Get recent donations (simplified for MVP)
-        recent_donations = (
-            db.query(DonorPayout)
-            .filter(
-                DonorPayout.church_id == church_id,
-                DonorPayout.status == "completed",
-            )
-            .order_by(DonorPayout.created_at.desc())
-            .limit(10)
-            .all()
+    # Get pending payouts summary
+    pending_payouts_summary = (
+        db.query(
+            func.sum(ChurchPayout.net_payout_amount).label("total_pending_amount"),
+            func.count(ChurchPayout.id).label("pending_count"),
+        )
+        .filter(
+            ChurchPayout.church_id == church_id,
+            ChurchPayout.status.in_(["pending", "processing"]),
         )
+        .first()
+    )
 
-        recent_donations_data = []
-        for donation in recent_donations:
-            user = db.query(User).filter_by(id=donation.user_id).first()
-            recent_donations_data.append(
-                {
-                    "id": donation.id,
-                    "amount": float(donation.donation_amount),
-                    "date": donation.created_at.isoformat(),
-                    "donor_name": (
-                        f"{user.first_name} {user.last_name}" if user else "Unknown"
-                    ),
-                    "transaction_count": donation.plaid_transaction_count or 1,
-                }
-            )
+    pending_amount = (
+        float(pending_payouts_summary.total_pending_amount)
+        if pending_payouts_summary.total_pending_amount
+        else 0.0
+    )
+    pending_count = pending_payouts_summary.pending_count or 0
 
-        # Get top donors (simplified for MVP)
-        top_donors = (
-            db.query(
-                User.id,
-                User.first_name,
-                User.last_name,
-                func.sum(DonorPayout.donation_amount).label("total_donated"),
-            )
-            .join(DonorPayout)
-            .filter(
+    # Build monthly donor growth trend (last 6 full months including current month)
+    try:
+        now_utc = datetime.now(timezone.utc)
+        anchor = now_utc.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        months = [_add_months(anchor, -i) for i in range(5, -1, -1)]  # last 6 months
+        window_end = _add_months(anchor, 1)
+
+        # New donors per month in one grouped query; cumulative totals are running sums
+        new_donors_by_month = aggregate_by_period(
+            db.query(func.count(User.id)).filter(
                 User.church_id == church_id,
                 User.role == "donor",
                 User.is_active == True,
-                DonorPayout.status == "completed",
-            )
-            .group_by(User.id)
-            .order_by(desc("total_donated"))
-            .limit(5)
-            .all()
+                User.created_at < window_end,
+            ),
+            User.created_at
         )
-
-        top_donors_data = []
-        for donor in top_donors:
-            total_donated_dollars = float(donor.total_donated) if donor.total_donated else 0.0
-            top_donors_data.append(
-                {
-                    "id": donor.id,
-                    "name": f"{donor.first_name} {donor.last_name}",
-                    "total_donated": round(total_donated_dollars, 2),
-                }
-            )
-
-        # Get church admin info
-        church_admin = db.query(ChurchAdmin).filter_by(church_id=church_id).first()
-        admin_user = None
-        if church_admin:
-            admin_user = db.query(User).filter_by(id=church_admin.user_id).first()
-
-        # Get payout data (simplified for MVP)
-        from app.controller.admin.dashboard import calculate_next_payout_date
-        next_payout_date = calculate_next_payout_date().strftime("%Y-%m-%d")
-        next_payout_amount = round(
-            float(this_month_donations) * 0.95, 2
-        )  # 95% of this month's donations
-
-        # Get payouts history (simplified for MVP)
-        payouts_query = (
-            db.query(ChurchPayout)
-            .filter(ChurchPayout.church_id == church_id)
-            .order_by(ChurchPayout.created_at.desc())
-            .limit(10)
-            .all()
+        first_month = months[0].strftime("%Y-%m")
+        total_donors_cumulative = sum(
+            count for month, (count,) in new_donors_by_month.items() if month < first_month
         )
 
-        payouts = []
-        for payout in payouts_query:
-            payouts.append(
+        monthly_donor_trend = []
+        for month, (new_donors_count,) in fill_periods(
+            new_donors_by_month, months[0], months[-1], empty=(0,)
+        ):
+            total_donors_cumulative += new_donors_count
+            monthly_donor_trend.append(
                 {
-                    "id": payout.id,
-                    "amount": float(payout.net_payout_amount),
-                    "gross_amount": float(payout.gross_donation_amount),
-                    "system_fee": float(payout.system_fee_amount),
-                    "donor_count": payout.donor_count,
-                    "donation_count": payout.donation_count,
-                    "period_start": payout.period_start,
-                    "period_end": payout.period_end,
-                    "stripe_transfer_id": payout.stripe_transfer_id,
-                    "date": payout.created_at.strftime("%Y-%m-%d"),
-                    "status": payout.status,
-                    "created_at": payout.created_at.isoformat(),
-                    "processed_at": (
-                        payout.processed_at.isoformat()
-                        if payout.processed_at
-                        else None
-                    ),
-                    "reference": f"PAY-{payout.id:06d}-{payout.created_at.strftime('%Y%m')}",
+                    "month": month,
+                    "new_donors": int(new_donors_count),
+                    "existing_donors": int(total_donors_cumulative) - int(new_donors_count),
+                    "total_donors": int(total_donors_cumulative),
                 }
             )
+    except Exception as trend_err:
+        logging.error(f"Failed building monthly donor trend: {trend_err}")
+        monthly_donor_trend = []
 
-        # Get pending payouts summary
-        pending_payouts_summary = (
+    # Build impact analytics for "Share Your Impact" card
+    try:
+        # Totals, this month's and last month's stories in one conditional aggregate
+        month_start = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        prev_month_start = _add_months(month_start, -1)
+        total_stories, total_impact_amount, monthly_stories, prev_month_stories = (
             db.query(
-                func.sum(ChurchPayout.net_payout_amount).label("total_pending_amount"),
-                func.count(ChurchPayout.id).label("pending_count"),
+                func.count(ImpactStory.id),
+                func.sum(ImpactStory.amount_used),
+                func.count(ImpactStory.id).filter(ImpactStory.created_at >= month_start),
+                func.count(ImpactStory.id).filter(
+                    ImpactStory.created_at >= prev_month_start,
+                    ImpactStory.created_at < month_start,
+                ),
             )
             .filter(
-                ChurchPayout.church_id == church_id,
-                ChurchPayout.status.in_(["pending", "processing"]),
+                ImpactStory.church_id == church_id,
+                ImpactStory.is_active == True,
             )
-            .first()
+            .one()
         )
+        total_impact_amount = float(total_impact_amount) if total_impact_amount else 0.0
 
-        pending_amount = (
-            float(pending_payouts_summary.total_pending_amount)
-            if pending_payouts_summary.total_pending_amount
-            else 0.0
-        )
-        pending_count = pending_payouts_summary.pending_count or 0
-
-        # Build monthly donor growth trend (last 6 full months including current month)
-        try:
-            now_utc = datetime.now(timezone.utc)
-            anchor = now_utc.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-            def add_months(dt, months):
-                year = dt.year + (dt.month - 1 + months) // 12
-                month = (dt.month - 1 + months) % 12 + 1
-                return dt.replace(year=year, month=month, day=1)
-
-            months = [add_months(anchor, -i) for i in range(5, -1, -1)]  # last 6 months
-
-            monthly_donor_trend = []
-            for month_start in months:
-                month_end = add_months(month_start, 1)
-
-                new_donors_count = (
-                    db.query(func.count(User.id))
-                    .filter(
-                        User.church_id == church_id,
-                        User.role == "donor",
-                        User.is_active == True,
-                        User.created_at >= month_start,
-                        User.created_at < month_end,
-                    )
-                    .scalar()
-                    or 0
-                )
-
-                total_donors_cumulative = (
-                    db.query(func.count(User.id))
-                    .filter(
-                        User.church_id == church_id,
-                        User.role == "donor",
-                        User.is_active == True,
-                        User.created_at < month_end,
-                    )
-                    .scalar()
-                    or 0
-                )
-
-                existing_donors = int(total_donors_cumulative) - int(new_donors_count)
-                if existing_donors < 0:
-                    existing_donors = 0
-
-                monthly_donor_trend.append(
-                    {
-                        "month": month_start.strftime("%Y-%m"),
-                        "new_donors": int(new_donors_count),
-                        "existing_donors": existing_donors,
-                        "total_donors": int(total_donors_cumulative),
-                    }
-                )
-        except Exception as trend_err:
-            logging.error(f"Failed building monthly donor trend: {trend_err}")
-            monthly_donor_trend = []
-
-        # Build impact analytics for "Share Your Impact" card
-        try:
-            # Total active stories
-            total_stories = (
-                db.query(func.count(ImpactStory.id))
-                .filter(
-                    ImpactStory.church_id == church_id,
-                    ImpactStory.is_active == True,
-                )
-                .scalar()
-                or 0
-            )
-
-            # Total impact is the sum of amount_used across active stories
-            total_impact_amount = (
-                db.query(func.sum(ImpactStory.amount_used))
-                .filter(
-                    ImpactStory.church_id == church_id,
-                    ImpactStory.is_active == True,
-                )
-                .scalar()
-                or 0
-            )
-            total_impact_amount = float(total_impact_amount) if total_impact_amount else 0.0
-
-            # Stories created this month
-            month_start = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            monthly_stories = (
-                db.query(func.count(ImpactStory.id))
-                .filter(
-                    ImpactStory.church_id == church_id,
-                    ImpactStory.is_active == True,
-                    ImpactStory.created_at >= month_start,
-                )
-                .scalar()
-                or 0
-            )
+        if prev_month_stories == 0:
+            monthly_growth = 100.0 if monthly_stories > 0 else 0.0
+        else:
+            monthly_growth = ((monthly_stories - prev_month_stories) / prev_month_stories) * 100.0
 
-            # Previous month stories for growth
-            def add_months(dt, months):
-                year = dt.year + (dt.month - 1 + months) // 12
-                month = (dt.month - 1 + months) % 12 + 1
-                return dt.replace(year=year, month=month, day=1)
-
-            prev_month_start = add_months(month_start, -1)
-            prev_month_end = month_start
-            prev_month_stories = (
-                db.query(func.count(ImpactStory.id))
-                .filter(
-                    ImpactStory.church_id == church_id,
-                    ImpactStory.is_active == True,
-                    ImpactStory.created_at >= prev_month_start,
-                    ImpactStory.created_at < prev_month_end,
-                )
-                .scalar()
-                or 0
-            )
-
-            if prev_month_stories == 0:
-                monthly_growth = 100.0 if monthly_stories > 0 else 0.0
-            else:
-                monthly_growth = ((monthly_stories - prev_month_stories) / prev_month_stories) * 100.0
-
-            # Top category among active stories
-            top_category_row = (
-                db.query(ImpactStory.category, func.count(ImpactStory.id).label("cnt"))
-                .filter(
-                    ImpactStory.church_id == church_id,
-                    ImpactStory.is_active == True,
-                )
-                .group_by(ImpactStory.category)
-                .order_by(desc("cnt"))
-                .first()
+        # Top category among active stories
+        top_category_row = (
+            db.query(ImpactStory.category, func.count(ImpactStory.id).label("cnt"))
+            .filter(
+                ImpactStory.church_id == church_id,
+                ImpactStory.is_active == True,
             )
-            top_category = top_category_row[0] if top_category_row else None
-
-            impact_analytics = {
-                "total_stories": int(total_stories),
-                "total_impact": round(total_impact_amount, 2),
-                "monthly_stories": int(monthly_stories),
-                # Placeholders for unavailable metrics in MVP
-                "engagement_rate": 0.0,
-                "avg_story_views": 0,
-                "conversion_rate": 0.0,
-                "top_category": top_category or "No stories",
-                "monthly_growth": round(monthly_growth, 1),
-            }
-        except Exception as impact_err:
-            logging.error(f"Failed building impact analytics: {impact_err}")
-            impact_analytics = {
-                "total_stories": 0,
-                "total_impact": 0.0,
-                "monthly_stories": 0,
-                "engagement_rate": 0.0,
-                "avg_story_views": 0,
-                "conversion_rate": 0.0,
-                "top_category": "No stories",
-                "monthly_growth": 0.0,
-            }
-
-        return ResponseFactory.success(
-            message="Church dashboard retrieved successfully",
-            data={
-                "admin": {
-                    "id": admin_user.id if admin_user else None,
-                    "name": (
-                        f"{admin_user.first_name} {admin_user.last_name}"
-                        if admin_user
-                        else "Church Admin"
-                    ),
-                    "email": admin_user.email if admin_user else church.email,
-                },
-                "church": {
-                    "id": church.id,
-                    "name": church.name,
-                    "email": church.email,
-                    "status": church.status,
-                    "kyc_status": church.kyc_status,
-                    "is_active": church.is_active,
-                    "charges_enabled": church.charges_enabled,
-                    "payouts_enabled": church.payouts_enabled,
-                    "referral_code": church.referral_code,
-                },
-                "overview": {
-                    "total_members": total_members,
-                    "active_donors": active_donors,
-                    "existing_donors_total": existing_donors_total,
-                    "total_donations": round(float(total_donations or 0), 2),
-                    "this_month_donations": round(float(this_month_donations or 0), 2),
-                    "donation_count": donation_count,
-                    "average_donation": (
-                        round(float(total_donations or 0) / donation_count, 2)
-                        if donation_count > 0
-                        else 0.0
-                    ),
-                },
-                "payouts": {
-                    "next_payout_date": next_payout_date,
-                    "next_payout_amount": next_payout_amount,
-                    "pending_amount": round(pending_amount, 2),
-                    "pending_count": pending_count,
-                    "history": payouts,
-                },
-                "monthly_donor_trend": monthly_donor_trend,
-                "existing_donors_total": existing_donors_total,
-                "recent_donations": recent_donations_data,
-                "top_donors": top_donors_data,
-                "impact_analytics": impact_analytics,
-                "kyc_status": {
-                    "status": church.kyc_status,
-                    "submitted_at": church.kyc_submitted_at.isoformat() if church.kyc_submitted_at else None,
-                    "next_step": "complete_kyc" if church.kyc_status == "not_submitted" else "dashboard"
-                }
-            },
+            .group_by(ImpactStory.category)
+            .order_by(desc("cnt"))
+            .first()
         )
+        top_category = top_category_row[0] if top_category_row else None
+
+        impact_analytics = {
+            "total_stories": int(total_stories or 0),
+            "total_impact": round(total_impact_amount, 2),
+            "monthly_stories": int(monthly_stories or 0),
+            # Placeholders for unavailable metrics in MVP
+            "engagement_rate": 0.0,
+            "avg_story_views": 0,
+            "conversion_rate": 0.0,
+            "top_category": top_category or "No stories",
+            "monthly_growth": round(monthly_growth, 1),
+        }
+    except Exception as impact_err:
+        logging.error(f"Failed building impact analytics: {impact_err}")
+        impact_analytics = {
+            "total_stories": 0,
+            "total_impact": 0.0,
+            "monthly_stories": 0,
+            "engagement_rate": 0.0,
+            "avg_story_views": 0,
+            "conversion_rate": 0.0,
+            "top_category": "No stories",
+            "monthly_growth": 0.0,
+        }
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logging.error(f"Church dashboard error for church_id {church_id}: {str(e)}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
-        raise HTTPException(
-            status_code=500, detail=f"Failed to retrieve church dashboard: {str(e)}"
-        )
+    return {
+        "admin": {
+            "id": admin_user.id if admin_user else None,
+            "name": (
+                f"{admin_user.first_name} {admin_user.last_name}"
+                if admin_user
+                else "Church Admin"
+            ),
+            "email": admin_user.email if admin_user else church.email,
+        },
+        "church": {
+            "id": church.id,
+            "name": church.name,
+            "email": church.email,
+            "status": church.status,
+            "kyc_status": church.kyc_status,
+            "is_active": church.is_active,
+            "charges_enabled": church.charges_enabled,
+            "payouts_enabled": church.payouts_enabled,
+            "referral_code": church.referral_code,
+        },
+        "overview": {
+            "total_members": total_members,
+            "active_donors": active_donors,
+            "existing_donors_total": existing_donors_total,
+            "total_donations": round(float(total_donations or 0), 2),
+            "this_month_donations": round(float(this_month_donations or 0), 2),
+            "donation_count": donation_count,
+            "average_donation": (
+                round(float(total_donations or 0) / donation_count, 2)
+                if donation_count > 0
+                else 0.0
+            ),
+        },
+        "payouts": {
+            "next_payout_date": next_payout_date,
+            "next_payout_amount": next_payout_amount,
+            "pending_amount": round(pending_amount, 2),
+            "pending_count": pending_count,
+            "history": payouts,
+        },
+        "monthly_donor_trend": monthly_donor_trend,
+        "existing_donors_total": existing_donors_total,
+        "recent_donations": recent_donations_data,
+        "top_donors": top_donors_data,
+        "impact_analytics": impact_analytics,
+        "kyc_status": {
+            "status": church.kyc_status,
+            "submitted_at": church.kyc_submitted_at.isoformat() if church.kyc_submitted_at else None,
+            "next_step": "complete_kyc" if church.kyc_status == "not_submitted" else "dashboard"
+        }
+    }
 
 
 def get_church_analytics(
@@ -527,8 +512,11 @@ def get_church_analytics(
         if not church:
             raise HTTPException(status_code=404, detail="Church not found")
 
-        # Build query for donations using DonorPayout model
-        query = db.query(DonorPayout).filter(
+        # Monthly donation totals from DonorPayout, grouped in the database
+        query = db.query(
+            func.sum(DonorPayout.donation_amount),
+            func.count(DonorPayout.id)
+        ).filter(
             DonorPayout.church_id == church_id,
             DonorPayout.status == "completed",
         )
@@ -538,11 +526,11 @@ def get_church_analytics(
         if end_date:
             query = query.filter(DonorPayout.created_at <= end_date)
 
-        donations = query.all()
+        monthly_data = aggregate_by_period(query, DonorPayout.created_at)
 
         # Calculate analytics
-        total_amount = sum(float(d.donation_amount) for d in donations)
-        donation_count = len(donations)
+        total_amount = sum(float(amount or 0) for amount, _ in monthly_data.values())
+        donation_count = sum(count for _, count in monthly_data.values())
         avg_donation = total_amount / donation_count if donation_count > 0 else 0.0
 
         # Get donor count
@@ -555,16 +543,7 @@ def get_church_analytics(
             .scalar()
         )
 
-        # Monthly breakdown
-        monthly_data = {}
-        for donation in donations:
-            month_key = donation.created_at.strftime("%Y-%m")
-            if month_key not in monthly_data:
-                monthly_data[month_key] = {"amount": 0.0, "count": 0}
-            monthly_data[month_key]["amount"] += float(donation.donation_amount)
-            monthly_data[month_key]["count"] += 1
-
-        sorted_monthly = sorted(monthly_data.items(), key=lambda x: x[0])
+        sorted_monthly = fill_periods(monthly_data, empty=(0, 0))
 
         return ResponseFactory.success(
             message="Church analytics retrieved successfully",
@@ -580,10 +559,10 @@ def get_church_analytics(
                 "monthly_breakdown": [
                     {
                         "month": month,
-                        "amount": round(data["amount"], 2),
-                        "count": data["count"],
+                        "amount": round(float(amount or 0), 2),
+                        "count": count,
                     }
-                    for month, data in sorted_monthly
+                    for month, (amount, count) in sorted_monthly
                 ],
                 "date_range": {"start_date": start_date, "end_date": end_date},
             },
@@ -614,24 +593,24 @@ def get_church_members(
         total = query.count()
         members = query.offset((page - 1) * limit).limit(limit).all()
 
+        # Donation totals and preferences of every member on the page
+        member_ids = [member.id for member in members]
+        donation_totals = aggregate_by_ids(
+            db,
+            DonorPayout.user_id,
+            member_ids,
+            {"total_donations": func.sum(DonorPayout.donation_amount)},
+            DonorPayout.status == "completed",
+            empty={"total_donations": 0},
+        )
+        preferences_by_user = rows_by_ids(
+            db, DonationPreference, DonationPreference.user_id, member_ids
+        )
+
         members_data = []
         for member in members:
-            # Get member's total donations
-            total_donations = (
-                db.query(func.sum(DonorPayout.donation_amount))
-                .filter(
-                    DonorPayout.user_id == member.id,
-                    DonorPayout.status == "completed",
-                )
-                .scalar()
-                or 0
-            )
-            total_donations = float(total_donations) if total_donations else 0.0
-
-            # Get member's donation preferences
-            preferences = (
-                db.query(DonationPreference).filter_by(user_id=member.id).first()
-            )
+            total_donations = float(donation_totals[member.id]["total_donations"])
+            preferences = preferences_by_user.get(member.id)
 
             members_data.append(
                 {
@@ -697,9 +676,11 @@ def get_church_donations(
             .all()
         )
 
+        donors = rows_by_ids(db, User, User.id, [donation.user_id for donation in donations])
+
         donations_data = []
         for donation in donations:
-            user = db.query(User).filter_by(id=donation.user_id).first()
+            user = donors.get(donation.user_id)
             donations_data.append(
                 {
                     "id": donation.id,
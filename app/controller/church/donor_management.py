@@ -23,6 +23,8 @@ from app.model.m_audit_log import AuditLog
 # TransactionStatus and TransactionType enums removed - using DonationBatch status instead
 from app.model.m_donation_preference import DonationPreference
 from app.core.responses import ResponseFactory
+from app.services.export_service import stream_query_export
+from app.utils.enrichment import aggregate_by_ids, rows_by_ids
 
 
 def get_active_donors(
@@ -138,12 +140,31 @@ def get_active_donors(
             )
             members = fallback_query.all()
 
+        # Preferences (and, for fallback rows, donation stats) for the whole page
+        member_ids = [member.id for member in members]
+        preferences_by_user = rows_by_ids(
+            db, DonationPreference, DonationPreference.user_id, member_ids
+        )
+        fallback_stats = {}
+        if members and not hasattr(members[0], 'total_donated'):
+            fallback_stats = aggregate_by_ids(
+                db,
+                DonorPayout.user_id,
+                member_ids,
+                {
+                    "total_donated": func.sum(DonorPayout.donation_amount),
+                    "donation_count": func.count(DonorPayout.id),
+                    "last_donation_date": func.max(DonorPayout.processed_at),
+                },
+                DonorPayout.church_id == church_id,
+                DonorPayout.status == "completed",
+                empty={"total_donated": 0, "donation_count": 0, "last_donation_date": None},
+            )
+
         # Process member data
         donors_data = []
         for member in members:
-            preferences = (
-                db.query(DonationPreference).filter_by(user_id=member.id).first()
-            )
+            preferences = preferences_by_user.get(member.id)
 
             # Handle both regular query (with donations) and fallback query (without donations)
             if hasattr(member, 'total_donated'):
@@ -153,23 +174,11 @@ def get_active_donors(
                 donation_count = member.donation_count or 0
                 last_donation_date = member.last_donation_date
             else:
-                # Fallback query - get donation data separately
-                donation_stats = (
-                    db.query(
-                        func.coalesce(func.sum(DonorPayout.donation_amount), 0).label("total_donated"),
-                        func.coalesce(func.count(DonorPayout.id), 0).label("donation_count"),
-                        func.max(DonorPayout.processed_at).label("last_donation_date"),
-                    )
-                    .filter(
-                        DonorPayout.user_id == member.id,
-                        DonorPayout.church_id == church_id,
-                        DonorPayout.status == "completed",
-                    )
-                    .first()
-                )
-                total_donated_dollars = float(donation_stats.total_donated) if donation_stats else 0.0
-                donation_count = donation_stats.donation_count if donation_stats else 0
-                last_donation_date = donation_stats.last_donation_date if donation_stats else None
+                # Fallback query - donation data loaded separately above
+                donation_stats = fallback_stats[member.id]
+                total_donated_dollars = float(donation_stats["total_donated"])
+                donation_count = donation_stats["donation_count"]
+                last_donation_date = donation_stats["last_donation_date"]
 
             avg_donation = (
                 total_donated_dollars / donation_count
@@ -544,26 +553,15 @@ def get_donor_retention_metrics(church_id: int, db: Optional[Session] = None):
         )
 
 
-def export_donor_data(
-    church_id: int,
-    format_type: str = "csv",
-    filters: Optional[Dict[str, Any]] = None,
-    db: Optional[Session] = None,
-):
-    """Export donor data with optional filtering"""
-    if db is None:
-        raise HTTPException(status_code=500, detail="Database session required")
+DONOR_EXPORT_COLUMNS = [
+    "id", "first_name", "last_name", "email", "phone", "joined_date",
+    "last_login", "total_donated", "donation_count", "average_donation",
+]
 
-    try:
-        church = db.query(Church).filter_by(id=church_id).first()
-        if not church:
-            raise HTTPException(status_code=404, detail="Church not found")
-
-        if format_type not in ["csv", "json"]:
-            raise HTTPException(
-                status_code=400, detail="Format must be 'csv' or 'json'"
-            )
 
+def _donor_export_query(church_id: int, filters: Optional[Dict[str, Any]] = None):
+    """Active donors with completed donation totals, aggregated in one GROUP BY join"""
+    def build(db: Session):
         query = (
             db.query(
                 User.id,
@@ -586,6 +584,7 @@ def export_donor_data(
             )
             .filter(User.church_id == church_id, User.is_active == True)
             .group_by(User.id)
+            .order_by(User.id)
         )
 
         if filters:
@@ -597,55 +596,67 @@ def export_donor_data(
                 query = query.having(
                     func.sum(DonorPayout.donation_amount) >= filters["min_amount"]
                 )
+        return query
+    return build
+
+
+def _donor_export_row(donor) -> Dict[str, Any]:
+    total_donated_dollars = (
+        float(donor.total_donated) if donor.total_donated else 0.0
+    )
+    return {
+        "id": donor.id,
+        "first_name": donor.first_name,
+        "last_name": donor.last_name,
+        "email": donor.email,
+        "phone": donor.phone,
+        "joined_date": (
+            donor.created_at.strftime("%Y-%m-%d")
+            if donor.created_at
+            else ""
+        ),
+        "last_login": (
+            donor.last_login.strftime("%Y-%m-%d")
+            if donor.last_login
+            else ""
+        ),
+        "total_donated": round(total_donated_dollars, 2),
+        "donation_count": donor.donation_count,
+        "average_donation": (
+            round(total_donated_dollars / donor.donation_count, 2)
+            if donor.donation_count > 0
+            else 0.0
+        ),
+    }
 
-        donors = query.all()
 
-        export_data = []
-        for donor in donors:
-            total_donated_dollars = (
-                float(donor.total_donated) if donor.total_donated else 0.0
-            )
+def export_donor_data(
+    church_id: int,
+    format_type: str = "csv",
+    filters: Optional[Dict[str, Any]] = None,
+    db: Optional[Session] = None,
+    gzip: bool = False,
+):
+    """Stream donor data with optional filtering as CSV or NDJSON"""
+    if db is None:
+        raise HTTPException(status_code=500, detail="Database session required")
 
-            export_data.append(
-                {
-                    "id": donor.id,
-                    "first_name": donor.first_name,
-                    "last_name": donor.last_name,
-                    "email": donor.email,
-                    "phone": donor.phone,
-                    "joined_date": (
-                        donor.created_at.strftime("%Y-%m-%d")
-                        if donor.created_at
-                        else ""
-                    ),
-                    "last_login": (
-                        donor.last_login.strftime("%Y-%m-%d")
-                        if donor.last_login
-                        else ""
-                    ),
-                    "total_donated": round(total_donated_dollars, 2),
-                    "donation_count": donor.donation_count,
-                    "average_donation": (
-                        round(total_donated_dollars / donor.donation_count, 2)
-                        if donor.donation_count > 0
-                        else 0.0
-                    ),
-                }
-            )
+    try:
+        church = db.query(Church).filter_by(id=church_id).first()
+        if not church:
+            raise HTTPException(status_code=404, detail="Church not found")
 
-        return ResponseFactory.success(
-            message=f"Donor data exported in {format_type} format",
-            data={
-                "format": format_type,
-                "total_donors": len(export_data),
-                "donors": export_data,
-                "exported_at": datetime.now(timezone.utc).isoformat(),
-                "filters_applied": filters or {},
-            },
+        return stream_query_export(
+            _donor_export_query(church_id, filters),
+            _donor_export_row,
+            DONOR_EXPORT_COLUMNS,
+            format_type,
+            filename=f"church_{church_id}_donors",
+            gzip=gzip,
         )
 
     except HTTPException:
         raise
     except Exception as e:
-
+        logging.error(f"Error exporting donors for church {church_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to export donor data")
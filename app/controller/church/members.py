@@ -10,12 +10,47 @@ from app.model.m_user import User
 from app.model.m_donation_batch import DonationBatch
 from app.model.m_audit_log import AuditLog
 from app.core.responses import ResponseFactory
+from app.services.export_service import stream_query_export
+from app.services.user_search import filter_by_search_term, order_by_relevance
+from app.utils.enrichment import aggregate_by_ids
+from app.utils.pagination import apply_order, estimated_count, keyset_page, keyset_pagination
+
+# id keeps both orderings total for keyset cursors
+MEMBER_LIST_ORDER = ((User.created_at, True), (User.id, True))
+MEMBER_SEARCH_ORDER = ((User.first_name, False), (User.last_name, False), (User.id, False))
+
+
+def _member_donation_stats(db: Session, church_id: int, member_ids: list) -> dict:
+    """member id -> completed donation total and count at this church"""
+    return aggregate_by_ids(
+        db,
+        DonationBatch.user_id,
+        member_ids,
+        {
+            "total_donated": func.sum(DonationBatch.amount),
+            "donation_count": func.count(DonationBatch.id),
+        },
+        DonationBatch.church_id == church_id,
+        DonationBatch.status == "completed",
+        empty={"total_donated": 0.0, "donation_count": 0},
+    )
 
 
 def get_church_members(
-    church_id: int, page: int = 1, limit: int = 20, anonymized: bool = True, db: Optional[Session] = None
+    church_id: int,
+    page: int = 1,
+    limit: int = 20,
+    anonymized: bool = True,
+    db: Optional[Session] = None,
+    cursor: Optional[str] = None,
+    with_total: bool = False,
 ):
-    """Get church members list with optional anonymization"""
+    """
+    Get church members list with optional anonymization
+
+    Passing a cursor (empty for the first page) switches to keyset pagination;
+    with_total then adds an estimated total.
+    """
     if db is None:
         raise HTTPException(status_code=500, detail="Database session required")
     
@@ -32,46 +67,39 @@ def get_church_members(
         if not church:
             raise HTTPException(status_code=404, detail="Church not found")
 
-        offset = (page - 1) * limit
-
         # Get users associated with this church
-        members = (
-            db.query(User)
-            .filter(User.church_id == church_id)
-            .order_by(User.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
-        )
+        query = db.query(User).filter(User.church_id == church_id)
+        if cursor is not None:
+            members, next_cursor = keyset_page(query, MEMBER_LIST_ORDER, limit, cursor)
+            pagination = keyset_pagination(
+                limit,
+                next_cursor,
+                estimated_count(query, ("church_members", church_id)) if with_total else None
+            )
+        else:
+            members = (
+                apply_order(query, MEMBER_LIST_ORDER)
+                .offset((page - 1) * limit)
+                .limit(limit)
+                .all()
+            )
+            total_count = (
+                db.query(func.count(User.id)).filter(User.church_id == church_id).scalar()
+            )
+            pagination = {
+                "page": page,
+                "limit": limit,
+                "total_count": total_count,
+                "total_pages": (total_count + limit - 1) // limit,
+            }
 
-        total_count = (
-            db.query(func.count(User.id)).filter(User.church_id == church_id).scalar()
-        )
+        # Donation summary of every member on the page
+        donation_stats = _member_donation_stats(db, church_id, [member.id for member in members])
 
         members_data = []
         for member in members:
-            # Get member's donation summary
-            total_donated = (
-                db.query(func.sum(DonationBatch.total_amount))
-                .filter(
-                    DonationBatch.user_id == member.id,
-                    DonationBatch.church_id == church_id,
-                    DonationBatch.status == "completed",
-                )
-                .scalar()
-                or 0.0
-            )
-
-            donation_count = (
-                db.query(func.count(DonationBatch.id))
-                .filter(
-                    DonationBatch.user_id == member.id,
-                    DonationBatch.church_id == church_id,
-                    DonationBatch.status == "completed",
-                )
-                .scalar()
-                or 0
-            )
+            total_donated = donation_stats[member.id]["total_donated"]
+            donation_count = donation_stats[member.id]["donation_count"]
 
             if anonymized:
                 # Anonymized data for general church admin viewing
@@ -113,12 +141,7 @@ def get_church_members(
             data={
                 "members": members_data,
                 "view_type": "anonymized" if anonymized else "detailed",
-                "pagination": {
-                    "page": page,
-                    "limit": limit,
-                    "total_count": total_count,
-                    "total_pages": (total_count + limit - 1) // limit,
-                },
+                "pagination": pagination,
             },
         )
 
@@ -147,7 +170,7 @@ def get_member_details(member_id: int, church_id: int, db: Session):
 
         # Get member's donation statistics
         total_donated = (
-            db.query(func.sum(DonationBatch.total_amount))
+            db.query(func.sum(DonationBatch.amount))
             .filter(
                 DonationBatch.user_id == member.id,
                 DonationBatch.church_id == church_id,
@@ -311,8 +334,15 @@ def search_members(
     limit: int = 20,
     anonymized: bool = True,
     db: Optional[Session] = None,
+    cursor: Optional[str] = None,
+    with_total: bool = False,
 ):
-    """Search church members with optional anonymization"""
+    """
+    Search church members with optional anonymization
+
+    Page/limit results are ranked by relevance where the database supports it.
+    Passing a cursor switches to keyset pages in name order.
+    """
     if db is None:
         raise HTTPException(status_code=500, detail="Database session required")
     try:
@@ -320,62 +350,39 @@ def search_members(
         if not church:
             raise HTTPException(status_code=404, detail="Church not found")
 
-        offset = (page - 1) * limit
-
         # Search members by name or email
-        members = (
-            db.query(User)
-            .filter(
-                User.church_id == church_id,
-                (
-                    User.first_name.ilike(f"%{search_term}%")
-                    | User.last_name.ilike(f"%{search_term}%")
-                    | User.email.ilike(f"%{search_term}%")
-                ),
-            )
-            .order_by(User.first_name, User.last_name)
-            .offset(offset)
-            .limit(limit)
-            .all()
+        query = filter_by_search_term(
+            db.query(User).filter(User.church_id == church_id), search_term
         )
-
-        total_count = (
-            db.query(func.count(User.id))
-            .filter(
-                User.church_id == church_id,
-                (
-                    User.first_name.ilike(f"%{search_term}%")
-                    | User.last_name.ilike(f"%{search_term}%")
-                    | User.email.ilike(f"%{search_term}%")
-                ),
+        if cursor is not None:
+            members, next_cursor = keyset_page(query, MEMBER_SEARCH_ORDER, limit, cursor)
+            pagination = keyset_pagination(
+                limit,
+                next_cursor,
+                estimated_count(query, ("church_member_search", church_id, search_term)) if with_total else None
             )
-            .scalar()
-        )
+        else:
+            members = (
+                apply_order(order_by_relevance(query, search_term), MEMBER_SEARCH_ORDER)
+                .offset((page - 1) * limit)
+                .limit(limit)
+                .all()
+            )
+            total_count = query.count()
+            pagination = {
+                "page": page,
+                "limit": limit,
+                "total_count": total_count,
+                "total_pages": (total_count + limit - 1) // limit,
+            }
+
+        # Donation summary of every member on the page
+        donation_stats = _member_donation_stats(db, church_id, [member.id for member in members])
 
         members_data = []
         for member in members:
-            # Get member's donation summary
-            total_donated = (
-                db.query(func.sum(DonationBatch.total_amount))
-                .filter(
-                    DonationBatch.user_id == member.id,
-                    DonationBatch.church_id == church_id,
-                    DonationBatch.status == "completed",
-                )
-                .scalar()
-                or 0.0
-            )
-
-            donation_count = (
-                db.query(func.count(DonationBatch.id))
-                .filter(
-                    DonationBatch.user_id == member.id,
-                    DonationBatch.church_id == church_id,
-                    DonationBatch.status == "completed",
-                )
-                .scalar()
-                or 0
-            )
+            total_donated = donation_stats[member.id]["total_donated"]
+            donation_count = donation_stats[member.id]["donation_count"]
 
             if anonymized:
                 # Anonymized data for general church admin viewing
@@ -417,12 +424,7 @@ def search_members(
                 "members": members_data,
                 "search_term": search_term,
                 "view_type": "anonymized" if anonymized else "detailed",
-                "pagination": {
-                    "page": page,
-                    "limit": limit,
-                    "total_count": total_count,
-                    "total_pages": (total_count + limit - 1) // limit,
-                },
+                "pagination": pagination,
             },
         )
 
@@ -625,10 +627,76 @@ def get_member_notes(member_id: int, church_id: int, db: Optional[Session] = Non
         raise HTTPException(status_code=500, detail="Failed to get member notes")
 
 
+MEMBER_EXPORT_COLUMNS = [
+    "id", "first_name", "last_name", "email", "phone", "is_active",
+    "total_donated", "donation_count", "joined_date", "last_donation",
+]
+
+
+def _member_export_query(church_id: int):
+    """Members with their completed donation totals, aggregated in one GROUP BY join"""
+    def build(db: Session):
+        donations = (
+            db.query(
+                DonationBatch.user_id.label("user_id"),
+                func.sum(DonationBatch.amount).label("total_donated"),
+                func.count(DonationBatch.id).label("donation_count"),
+                func.max(DonationBatch.created_at).label("last_donation"),
+            )
+            .filter(
+                DonationBatch.church_id == church_id,
+                DonationBatch.status == "completed",
+            )
+            .group_by(DonationBatch.user_id)
+            .subquery()
+        )
+        return (
+            db.query(
+                User.id,
+                User.first_name,
+                User.last_name,
+                User.email,
+                User.phone,
+                User.is_active,
+                User.created_at,
+                donations.c.total_donated,
+                donations.c.donation_count,
+                donations.c.last_donation,
+            )
+            .outerjoin(donations, donations.c.user_id == User.id)
+            .filter(User.church_id == church_id)
+            .order_by(User.id)
+        )
+    return build
+
+
+def _member_export_row(member) -> dict:
+    return {
+        "id": member.id,
+        "first_name": member.first_name,
+        "last_name": member.last_name,
+        "email": member.email,
+        "phone": member.phone,
+        "is_active": member.is_active,
+        "total_donated": round(float(member.total_donated or 0), 2),
+        "donation_count": member.donation_count or 0,
+        "joined_date": (
+            member.created_at.strftime("%Y-%m-%d")
+            if member.created_at
+            else ""
+        ),
+        "last_donation": (
+            member.last_donation.strftime("%Y-%m-%d")
+            if member.last_donation
+            else None
+        ),
+    }
+
+
 def export_members(
-    church_id: int, format_type: str = "csv", db: Optional[Session] = None
+    church_id: int, format_type: str = "csv", gzip: bool = False, db: Optional[Session] = None
 ):
-    """Export church members data"""
+    """Stream church members data as CSV or NDJSON"""
     if db is None:
         raise HTTPException(status_code=500, detail="Database session required")
     try:
@@ -636,67 +704,17 @@ def export_members(
         if not church:
             raise HTTPException(status_code=404, detail="Church not found")
 
-        if format_type not in ["csv", "json"]:
-            raise HTTPException(
-                status_code=400, detail="Format must be 'csv' or 'json'"
-            )
-
-        members = db.query(User).filter(User.church_id == church_id).all()
-
-        export_data = []
-        for member in members:
-            total_donated = (
-                db.query(func.sum(DonationBatch.total_amount))
-                .filter(
-                    DonationBatch.user_id == member.id,
-                    DonationBatch.church_id == church_id,
-                    DonationBatch.status == "completed",
-                )
-                .scalar()
-                or 0.0
-            )
-
-            donation_count = (
-                db.query(func.count(DonationBatch.id))
-                .filter(
-                    DonationBatch.user_id == member.id,
-                    DonationBatch.church_id == church_id,
-                    DonationBatch.status == "completed",
-                )
-                .scalar()
-                or 0
-            )
-
-            export_data.append(
-                {
-                    "id": member.id,
-                    "first_name": member.first_name,
-                    "last_name": member.last_name,
-                    "email": member.email,
-                    "phone": member.phone,
-                    "is_active": member.is_active,
-                    "total_donated": float(total_donated),
-                    "donation_count": donation_count,
-                    "joined_date": (
-                        member.created_at.strftime("%Y-%m-%d")
-                        if member.created_at
-                        else ""
-                    ),
-                    "last_donation": None,
-                }
-            )
-
-        return ResponseFactory.success(
-            message=f"Members exported in {format_type} format",
-            data={
-                "format": format_type,
-                "total_members": len(export_data),
-                "members": export_data,
-                "exported_at": datetime.now(timezone.utc).isoformat(),
-            },
+        return stream_query_export(
+            _member_export_query(church_id),
+            _member_export_row,
+            MEMBER_EXPORT_COLUMNS,
+            format_type,
+            filename=f"church_{church_id}_members",
+            gzip=gzip,
         )
 
     except HTTPException:
         raise
     except Exception as e:
+        logging.error(f"Error exporting members for church {church_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to export members")
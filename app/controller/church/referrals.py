@@ -21,6 +21,7 @@ from app.model.m_roundup_new import DonorPayout, ChurchPayout
 from app.core.responses import ResponseFactory
 from app.core.exceptions import ValidationError, NotFoundError
 from app.utils.error_handler import handle_controller_errors
+from app.utils.enrichment import rows_by_ids
 from fastapi import HTTPException
 
 
@@ -131,9 +132,12 @@ def get_referral_info(church_id: int, db: Session) -> ResponseFactory:
             ChurchReferral.referred_church_id.isnot(None)
         ).order_by(desc(ChurchReferral.created_at)).limit(10).all()
 
+        referred_churches = rows_by_ids(
+            db, Church, Church.id, [ref.referred_church_id for ref in recent_referrals]
+        )
         referrals_data = []
         for ref in recent_referrals:
-            referred_church = db.query(Church).filter(Church.id == ref.referred_church_id).first()
+            referred_church = referred_churches.get(ref.referred_church_id)
             referrals_data.append({
                 "id": ref.id,
                 "name": referred_church.name if referred_church else "Unknown",
@@ -338,10 +342,14 @@ def get_referral_commissions(church_id: int, page: int = 1, limit: int = 20, db:
             ReferralCommission.referring_church_id == church_id
         ).scalar()
 
+        # Referred church info for the whole page
+        referred_churches = rows_by_ids(
+            db, Church, Church.id, [commission.referred_church_id for commission in commissions]
+        )
+
         commissions_data = []
         for commission in commissions:
-            # Get referred church info
-            referred_church = db.query(Church).filter(Church.id == commission.referred_church_id).first()
+            referred_church = referred_churches.get(commission.referred_church_id)
 
             commissions_data.append({
                 "id": commission.id,
@@ -1,7 +1,8 @@
 import logging
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta, timezone
-from sqlalchemy import func, and_
+from sqlalchemy import case, func, and_, select
 
 from app.model.m_user import User
 from app.model.m_roundup_new import DonorPayout
@@ -12,6 +13,74 @@ from app.core.exceptions import UserNotFoundError
 from app.utils.error_handler import handle_controller_errors
 from fastapi import HTTPException
 
+def _overview_data(user, primary_church, preferences, recent_payouts, total_donated, this_month_donations):
+    """Donor dashboard overview payload; recent_payouts are newest first"""
+    # Get church information if user is associated with one
+    church_info = None
+    if primary_church:
+        church_info = {
+            "id": primary_church.id,
+            "name": primary_church.name,
+            "website": primary_church.website,
+            "is_verified": getattr(primary_church, 'kyc_status', 'not_submitted') == 'approved'
+        }
+
+    # Calculate pending roundups (simplified)
+    pending_amount = 0.0
+    transaction_count = 0
+    next_collection_date = None
+    
+    if preferences and not preferences.pause:
+        # Estimate next collection from the last payout
+        last_payout = recent_payouts[0] if recent_payouts else None
+        
+        if last_payout:
+            if preferences.frequency == "biweekly":
+                next_collection_date = last_payout.created_at + timedelta(days=14)
+            else:  # monthly
+                next_collection_date = last_payout.created_at + timedelta(days=30)
+
+    return {
+        "user": {
+            "id": user.id,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "email": user.email,
+            "phone": user.phone,
+            "is_email_verified": user.is_email_verified,
+            "is_phone_verified": user.is_phone_verified
+        },
+        "church": church_info,
+        "preferences": {
+            "frequency": preferences.frequency if preferences else None,
+            "multiplier": preferences.multiplier if preferences else None,
+            "pause": preferences.pause if preferences else False,
+            "cover_processing_fees": preferences.cover_processing_fees if preferences else False,
+            "monthly_cap": preferences.monthly_cap if preferences else None
+        },
+        "pending_roundups": {
+            "amount": pending_amount,
+            "next_collection_date": next_collection_date.isoformat() if next_collection_date else None,
+            "transaction_count": transaction_count
+        },
+        "summary": {
+            "total_donated": float(total_donated or 0),
+            "this_month_donations": float(this_month_donations or 0),
+            "total_payouts": len(recent_payouts),
+            "is_active": preferences.pause == False if preferences else False
+        },
+        "recent_activity": [
+            {
+                "id": payout.id,
+                "amount": float(payout.donation_amount),
+                "status": payout.status,
+                "created_at": payout.created_at.isoformat(),
+                "type": "donor_payout"
+            }
+            for payout in recent_payouts
+        ]
+    }
+
 @handle_controller_errors
 def get_dashboard_overview(current_user: dict, db: Session):
     """Get donor dashboard overview with key metrics"""
@@ -30,16 +99,7 @@ def get_dashboard_overview(current_user: dict, db: Session):
         DonorPayout.user_id == user.id
     ).order_by(DonorPayout.created_at.desc()).limit(5).all()
 
-    # Get church information if user is associated with one
-    church_info = None
     primary_church = user.get_primary_church(db)
-    if primary_church:
-        church_info = {
-            "id": primary_church.id,
-            "name": primary_church.name,
-            "website": primary_church.website,
-            "is_verified": getattr(primary_church, 'kyc_status', 'not_submitted') == 'approved'
-        }
 
     # Calculate total donated
     total_donated = db.query(func.sum(DonorPayout.donation_amount)).filter(
@@ -55,65 +115,42 @@ def get_dashboard_overview(current_user: dict, db: Session):
         DonorPayout.created_at >= start_of_month
     ).scalar() or 0.0
 
-    # Calculate pending roundups (simplified)
-    pending_amount = 0.0
-    transaction_count = 0
-    next_collection_date = None
+    return ResponseFactory.success(
+        message="Dashboard overview retrieved successfully",
+        data=_overview_data(user, primary_church, preferences, recent_payouts, total_donated, this_month_donations)
+    )
+
+@handle_controller_errors
+async def get_dashboard_overview_async(current_user: dict, db: AsyncSession):
+    """Get donor dashboard overview on the async database path"""
     
-    if preferences and not preferences.pause:
-        # Get last payout to estimate next collection
-        last_payout = db.query(DonorPayout).filter(
-            DonorPayout.user_id == user.id
-        ).order_by(DonorPayout.created_at.desc()).first()
-        
-        if last_payout:
-            if preferences.frequency == "biweekly":
-                next_collection_date = last_payout.created_at + timedelta(days=14)
-            else:  # monthly
-                next_collection_date = last_payout.created_at + timedelta(days=30)
+    user = await db.get(User, current_user["user_id"])
+    if not user:
+        raise UserNotFoundError(details={"message": "User not found"})
+
+    preferences = (await db.execute(
+        select(DonationPreference).where(DonationPreference.user_id == user.id).limit(1)
+    )).scalars().first()
+
+    recent_payouts = (await db.execute(
+        select(DonorPayout).where(DonorPayout.user_id == user.id)
+        .order_by(DonorPayout.created_at.desc()).limit(5)
+    )).scalars().all()
+
+    primary_church = await db.get(Church, user.church_id) if user.church_id else None
+
+    # All-time and this month's completed totals in one pass
+    start_of_month = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    total_donated, this_month_donations = (await db.execute(
+        select(
+            func.sum(DonorPayout.donation_amount),
+            func.sum(case((DonorPayout.created_at >= start_of_month, DonorPayout.donation_amount)))
+        ).where(DonorPayout.user_id == user.id, DonorPayout.status == "completed")
+    )).one()
 
     return ResponseFactory.success(
         message="Dashboard overview retrieved successfully",
-        data={
-            "user": {
-                "id": user.id,
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-                "email": user.email,
-                "phone": user.phone,
-                "is_email_verified": user.is_email_verified,
-                "is_phone_verified": user.is_phone_verified
-            },
-            "church": church_info,
-            "preferences": {
-                "frequency": preferences.frequency if preferences else None,
-                "multiplier": preferences.multiplier if preferences else None,
-                "pause": preferences.pause if preferences else False,
-                "cover_processing_fees": preferences.cover_processing_fees if preferences else False,
-                "monthly_cap": preferences.monthly_cap if preferences else None
-            },
-            "pending_roundups": {
-                "amount": pending_amount,
-                "next_collection_date": next_collection_date.isoformat() if next_collection_date else None,
-                "transaction_count": transaction_count
-            },
-            "summary": {
-                "total_donated": float(total_donated),
-                "this_month_donations": float(this_month_donations),
-                "total_payouts": len(recent_payouts),
-                "is_active": preferences.pause == False if preferences else False
-            },
-            "recent_activity": [
-                {
-                    "id": payout.id,
-                    "amount": float(payout.donation_amount),
-                    "status": payout.status,
-                    "created_at": payout.created_at.isoformat(),
-                    "type": "donor_payout"
-                }
-                for payout in recent_payouts
-            ]
-        }
+        data=_overview_data(user, primary_church, preferences, recent_payouts, total_donated, this_month_donations)
     )
 
 @handle_controller_errors
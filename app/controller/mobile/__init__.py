@@ -34,13 +34,13 @@ from app.controller.mobile.roundups import (
 
 # Import notifications controllers
 from app.controller.mobile.notifications import (
-    get_mobile_notifications, mark_notification_read, mark_all_notifications_read,
+    get_mobile_notifications, get_mobile_notifications_async, mark_notification_read, mark_all_notifications_read,
     delete_notification, get_notification_preferences, update_notification_preferences
 )
 
 # Import dashboard controllers
 from app.controller.mobile.dashboard import (
-    get_mobile_dashboard
+    get_mobile_dashboard, get_mobile_dashboard_async
 )
 
 __all__ = [
@@ -66,9 +66,9 @@ __all__ = [
     "get_mobile_impact_summary",
 
     # Notifications
-    "get_mobile_notifications", "mark_notification_read", "mark_all_notifications_read",
+    "get_mobile_notifications", "get_mobile_notifications_async", "mark_notification_read", "mark_all_notifications_read",
     "delete_notification", "get_notification_preferences", "update_notification_preferences",
 
     # Dashboard
-    "get_mobile_dashboard",
+    "get_mobile_dashboard", "get_mobile_dashboard_async",
 ]
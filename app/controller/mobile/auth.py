@@ -9,6 +9,7 @@ from app.model.m_access_codes import AccessCode
 from app.utils.security import hash_password, verify_password, generate_access_code
 from app.utils.jwt_handler import create_refresh_token, REFRESH_TOKEN_EXPIRE_DAYS, create_access_token
 from app.utils.token_manager import token_manager
+from app.services.principal_cache import principal_cache
 from app.utils.send_email import send_email_with_sendgrid
 from app.utils.send_sms import send_otp_sms
 from app.model.m_refresh_token import RefreshToken
@@ -374,8 +375,10 @@ def logout(data: AuthLogoutRequest, db: Session):
         ).first()
         
         if token_record:
+            user_id = token_record.user_id
             db.delete(token_record)
             db.commit()
+            principal_cache.invalidate_user(user_id)
 
         return ResponseFactory.success(message=get_auth_message("LOGOUT_SUCCESS"))
 
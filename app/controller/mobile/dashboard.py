@@ -1,9 +1,12 @@
+import asyncio
 from fastapi import HTTPException
 import logging
 import traceback
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
-from sqlalchemy import func
+from sqlalchemy import case, func, select
+from starlette.concurrency import run_in_threadpool
 
 from app.model.m_user import User
 from app.model.m_donation_batch import DonationBatch
@@ -12,6 +15,68 @@ from app.model.m_plaid_items import PlaidItem
 # PlaidAccount import removed - using on-demand Plaid API fetching
 from app.model.m_church import Church
 from app.core.responses import ResponseFactory
+from app.utils.database import SessionLocal
+
+def _month_start() -> datetime:
+    return datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _count_bank_accounts(user_id: int) -> int:
+    """Linked account count from the Plaid API, on a session of its own (runs in a worker thread)"""
+    from app.services.plaid_account_service import plaid_account_service
+    db = SessionLocal()
+    try:
+        return plaid_account_service.get_accounts_count(user_id, db)
+    finally:
+        db.close()
+
+
+def _dashboard_data(user, church, settings, total_donations, this_month_donations, bank_accounts_count, recent_donations):
+    """Mobile dashboard payload"""
+    recent_donations_data = []
+    for donation in recent_donations:
+        recent_donations_data.append({
+            "id": donation.id,
+            "amount": float(donation.amount),
+            "created_at": donation.created_at.isoformat() if donation.created_at else None,
+            "church_name": church.name if church else "Unknown Church"
+        })
+
+    return {
+        "user": {
+            "id": user.id,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "email": user.email,
+            "phone": user.phone,
+            "profile_picture_url": user.profile_picture_url,
+            "is_email_verified": user.is_email_verified,
+            "is_phone_verified": user.is_phone_verified
+        },
+        "church": {
+            "id": church.id if church else None,
+            "name": church.name if church else None,
+            "address": church.address if church else None,
+            "city": church.city if church else None,
+            "state": church.state if church else None,
+            "website": church.website if church else None,
+            "is_verified": getattr(church, 'kyc_status', 'not_submitted') == 'approved' if church else False
+        },
+        "roundup_settings": {
+            "is_enabled": not settings.pause if settings else False,
+            "collection_frequency": settings.frequency if settings else "biweekly",
+            "cover_processing_fees": settings.cover_processing_fees if settings else True,
+            "multiplier": settings.multiplier if settings else "2x"
+        },
+        "summary": {
+            "total_donated": round(float(total_donations or 0), 2),
+            "this_month_donated": round(float(this_month_donations or 0), 2),
+            "bank_accounts_linked": bank_accounts_count,
+            "currency": "USD"
+        },
+        "recent_donations": recent_donations_data
+    }
+
 
 def get_mobile_dashboard(user_id: int, db: Session):
     """Get mobile dashboard overview"""
@@ -24,8 +89,7 @@ def get_mobile_dashboard(user_id: int, db: Session):
             )
 
         # Get user's primary church
-        primary_church = user.get_primary_church(db)
-        church = primary_church
+        church = user.get_primary_church(db)
 
         # Get roundup settings
         settings = db.query(DonationPreference).filter(
@@ -33,17 +97,16 @@ def get_mobile_dashboard(user_id: int, db: Session):
         ).first()
 
         # Get total donations
-        total_donations = db.query(func.sum(DonationBatch.total_amount)).filter(
+        total_donations = db.query(func.sum(DonationBatch.amount)).filter(
             DonationBatch.user_id == user_id,
             DonationBatch.status == "completed"
         ).scalar() or 0.0
 
         # Get this month's donations
-        current_month = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        this_month_donations = db.query(func.sum(DonationBatch.total_amount)).filter(
+        this_month_donations = db.query(func.sum(DonationBatch.amount)).filter(
             DonationBatch.user_id == user_id,
             DonationBatch.status == "completed",
-            DonationBatch.created_at >= current_month
+            DonationBatch.created_at >= _month_start()
         ).scalar() or 0.0
 
         # Get bank accounts count from Plaid API
@@ -56,56 +119,75 @@ def get_mobile_dashboard(user_id: int, db: Session):
             DonationBatch.status == "completed"
         ).order_by(DonationBatch.created_at.desc()).limit(5).all()
 
-        recent_donations_data = []
-        for donation in recent_donations:
-            recent_donations_data.append({
-                "id": donation.id,
-                "amount": float(donation.total_amount),
-                "created_at": donation.created_at.isoformat() if donation.created_at else None,
-                "church_name": church.name if church else "Unknown Church"
-            })
+        return ResponseFactory.success(
+            message="Mobile dashboard retrieved successfully",
+            data=_dashboard_data(
+                user, church, settings, total_donations, this_month_donations,
+                bank_accounts_count, recent_donations
+            )
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to get dashboard"
+        )
+
+
+async def get_mobile_dashboard_async(user_id: int, db: AsyncSession):
+    """Get mobile dashboard overview on the async database path"""
+    try:
+        user = await db.get(User, user_id)
+        if not user:
+            raise HTTPException(
+                status_code=404,
+                detail="User not found"
+            )
+
+        # The Plaid lookup is a network call; overlap it with the queries below
+        bank_accounts_task = asyncio.create_task(run_in_threadpool(_count_bank_accounts, user_id))
+        try:
+            church = await db.get(Church, user.church_id) if user.church_id else None
+
+            settings = (await db.execute(
+                select(DonationPreference).where(DonationPreference.user_id == user_id).limit(1)
+            )).scalars().first()
+
+            # All-time and this month's totals in one pass
+            completed = (DonationBatch.user_id == user_id, DonationBatch.status == "completed")
+            total_donations, this_month_donations = (await db.execute(
+                select(
+                    func.sum(DonationBatch.amount),
+                    func.sum(case((DonationBatch.created_at >= _month_start(), DonationBatch.amount)))
+                ).where(*completed)
+            )).one()
+
+            recent_donations = (await db.execute(
+                select(DonationBatch).where(*completed).order_by(DonationBatch.created_at.desc()).limit(5)
+            )).scalars().all()
+
+            bank_accounts_count = await bank_accounts_task
+        finally:
+            # A failed query above must not leave the lookup orphaned
+            if not bank_accounts_task.done():
+                bank_accounts_task.cancel()
+            elif not bank_accounts_task.cancelled():
+                bank_accounts_task.exception()  # Retrieved, so no "never retrieved" warning
 
         return ResponseFactory.success(
             message="Mobile dashboard retrieved successfully",
-            data={
-                "user": {
-                    "id": user.id,
-                    "first_name": user.first_name,
-                    "last_name": user.last_name,
-                    "email": user.email,
-                    "phone": user.phone,
-                    "profile_picture_url": user.profile_picture_url,
-                    "is_email_verified": user.is_email_verified,
-                    "is_phone_verified": user.is_phone_verified
-                },
-                "church": {
-                    "id": church.id if church else None,
-                    "name": church.name if church else None,
-                    "address": church.address if church else None,
-                    "city": church.city if church else None,
-                    "state": church.state if church else None,
-                    "website": church.website if church else None,
-                    "is_verified": getattr(church, 'kyc_status', 'not_submitted') == 'approved' if church else False
-                },
-                "roundup_settings": {
-                    "is_enabled": not settings.pause if settings else False,
-                    "collection_frequency": settings.frequency if settings else "biweekly",
-                    "cover_processing_fees": settings.cover_processing_fees if settings else True,
-                    "multiplier": settings.multiplier if settings else "2x"
-                },
-                "summary": {
-                    "total_donated": round(float(total_donations or 0), 2),
-                    "this_month_donated": round(float(this_month_donations), 2),
-                    "bank_accounts_linked": bank_accounts_count,
-                    "currency": "USD"
-                },
-                "recent_donations": recent_donations_data
-            }
+            data=_dashboard_data(
+                user, church, settings, total_donations, this_month_donations,
+                bank_accounts_count, recent_donations
+            )
         )
 
     except HTTPException:
         raise
     except Exception as e:
+        logging.error(f"Error getting mobile dashboard for user {user_id}: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail="Failed to get dashboard"
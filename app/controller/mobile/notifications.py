@@ -1,6 +1,7 @@
 from fastapi import HTTPException
 import logging
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import and_, desc
 from datetime import datetime, timezone
 from typing import Dict, Any, List
@@ -46,6 +47,39 @@ def get_mobile_notifications(user_id: int, db: Session, limit: int = 50, offset:
         raise HTTPException(status_code=500, detail="Failed to get notifications")
 
 
+async def get_mobile_notifications_async(user_id: int, db: AsyncSession, limit: int = 50, offset: int = 0):
+    """Get notifications for mobile app on the async database path"""
+    try:
+        result = await database_notification_service.get_user_notifications_async(
+            user_id=user_id,
+            limit=limit,
+            offset=offset,
+            unread_only=False,
+            db=db
+        )
+        
+        if result["success"]:
+            return ResponseFactory.success(
+                message="Notifications retrieved successfully",
+                data={
+                    "notifications": result["notifications"],
+                    "total": result["total_count"],
+                    "unread_count": result["unread_count"],
+                    "limit": result["limit"],
+                    "offset": result["offset"],
+                    "has_more": result.get("has_more", False)
+                }
+            )
+        else:
+            raise HTTPException(status_code=500, detail=result.get("error", "Failed to get notifications"))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Error getting notifications for user {user_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to get notifications")
+
+
 def mark_notification_read(user_id: int, notification_id: int, db: Session):
     """Mark a notification as read using database notification service"""
     try:
@@ -34,6 +34,7 @@ from app.model.m_church import Church
 from app.model.m_user import User
 from app.model.m_donation_batch import DonationBatch
 from app.config import config
+from app.services.system_metrics_sampler import get_system_metrics_sampler
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -159,21 +160,12 @@ class HealthChecker:
             }
 
     def check_system_resources(self) -> Dict[str, Any]:
-        """Check system resource usage"""
+        """Check system resource usage from the background sampler's latest sample"""
         try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
-
-            # Memory usage
-            memory = psutil.virtual_memory()
-            memory_percent = memory.percent
-
-            # Disk usage
-            disk = psutil.disk_usage('/')
-            disk_percent = disk.percent
-
-            # Network stats
-            network = psutil.net_io_counters()
+            sample = get_system_metrics_sampler().latest()
+            cpu_percent = sample.cpu_percent
+            memory_percent = sample.memory_percent
+            disk_percent = sample.disk_percent
 
             # Determine overall status
             status = "healthy"
@@ -186,14 +178,14 @@ class HealthChecker:
                 'status': status,
                 'cpu_percent': cpu_percent,
                 'memory_percent': memory_percent,
-                'memory_total_gb': round(memory.total / 1024**3, 2),
-                'memory_available_gb': round(memory.available / 1024**3, 2),
+                'memory_total_gb': sample.memory_total_gb,
+                'memory_available_gb': sample.memory_available_gb,
                 'disk_percent': disk_percent,
-                'disk_total_gb': round(disk.total / 1024**3, 2),
-                'disk_free_gb': round(disk.free / 1024**3, 2),
-                'network_bytes_sent': network.bytes_sent,
-                'network_bytes_recv': network.bytes_recv,
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'disk_total_gb': sample.disk_total_gb,
+                'disk_free_gb': sample.disk_free_gb,
+                'network_bytes_sent': sample.network_bytes_sent,
+                'network_bytes_recv': sample.network_bytes_recv,
+                'timestamp': sample.timestamp.isoformat()
             }
 
         except Exception as e:
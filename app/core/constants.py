@@ -71,11 +71,26 @@ PLAID_RATE_LIMIT_DELAY = 1.0  # Base delay in seconds
 PLAID_MAX_RETRIES = 3
 PLAID_BACKOFF_MULTIPLIER = 2.0
 PLAID_CACHE_TTL = 300  # 5 minutes cache TTL
+PLAID_REQUESTS_PER_SECOND = 10.0  # Process-wide token bucket refill rate
+PLAID_RATE_LIMIT_BURST = 10  # Token bucket capacity
+PLAID_MAX_CONCURRENT_REQUESTS = 8  # Worker pool size for multi-item fetches
 
 # Plaid API Timeout Configuration
-PLAID_TIMEOUT = 30  # 30 seconds timeout
 PLAID_CONNECT_TIMEOUT = 10  # 10 seconds connection timeout
 PLAID_READ_TIMEOUT = 30  # 30 seconds read timeout
+PLAID_CONNECTION_POOL_SIZE = 16  # Keep-alive connections held open to Plaid
+
+# Dashboard Caching
+ADMIN_DASHBOARD_CACHE_TTL = 60  # Admin dashboard overview result cache, seconds
+CHURCH_DASHBOARD_CACHE_TTL = 60  # Per-church dashboard result cache, seconds (0 disables)
+
+# List Pagination
+PAGINATION_COUNT_CACHE_TTL = 60  # Cached list totals for keyset pages, seconds
+
+# System Metrics Sampling
+SYSTEM_METRICS_SAMPLE_INTERVAL = 15  # Background CPU/memory/disk sample period, seconds
+SYSTEM_METRICS_CONNECTIONS_INTERVAL = 60  # Network connection count refresh period, seconds
+SYSTEM_METRICS_HISTORY_SIZE = 240  # Samples kept in the ring buffer (1 hour at 15s)
 
 # Business Constants
 MAX_DONATION_AMOUNT = 50.0
@@ -1,17 +1,23 @@
 import os
 import sys
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Callable, cast, Any
 from fastapi import FastAPI, Request, HTTPException
 from starlette.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from app.core.constants import get_auth_constant, get_business_constant
 from app.utils.logger import Logger, get_logger
+from app.middleware.asgi import ResponseHeadersMiddleware
 from app.middleware.exception_handler import setup_global_exception_handler
+from app.middleware.monitoring_middleware import setup_monitoring_middleware
+from app.utils.database import connect_async_database, dispose_async_database
+from app.services.system_metrics_sampler import get_system_metrics_sampler, setup_system_metrics_sampler
+from app.tasks.scheduler import start_scheduler, stop_scheduler
 import json
 import logging
 
@@ -54,8 +60,20 @@ def custom_rate_limit_handler(request, exc):
 # Initialize rate limiter
 limiter = Limiter(key_func=get_remote_address)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the async database pool, start the system metrics sampler and, if enabled, the job scheduler"""
+    await connect_async_database()
+    setup_system_metrics_sampler()
+    start_scheduler()
+    yield
+    stop_scheduler()
+    get_system_metrics_sampler().stop()
+    await dispose_async_database()
+
 # Create FastAPI app with comprehensive documentation
 app = FastAPI(
+    lifespan=lifespan,
     title="Manna API",
     description="""
 A comprehensive church donation management system that enables seamless roundup donations, 
@@ -186,12 +204,19 @@ def get_cors_origins():
             "http://127.0.0.1:4200"
         ]
 
+def get_cors_origin_regex():
+    """Get the CORS origin pattern; any local port is only allowed in development"""
+    from app.config import config
+    if config.IS_DEVELOPMENT:
+        return r"^(https?:\/\/localhost:(5173|3000|8080|4200)|http:\/\/localhost:\d+)$"
+    return r"^https?:\/\/localhost:(5173|3000|8080|4200)$"
+
 # Enhanced CORS middleware with comprehensive error handling
 # Note: Using Middleware class to avoid type compatibility issues
 app.add_middleware(
     cast(Any, CORSMiddleware),
     allow_origins=get_cors_origins(),
-    allow_origin_regex=r"^https?:\/\/localhost:(5173|3000|8080|4200)$",
+    allow_origin_regex=get_cors_origin_regex(),
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH", "HEAD"],
     allow_headers=[
@@ -221,29 +246,20 @@ app.add_middleware(
     max_age=86400,  # Cache preflight requests for 24 hours
 )
 
-# Additional CORS middleware to ensure headers are always present
-@app.middleware("http")
-async def add_cors_headers(request: Request, call_next):
-    response = await call_next(request)
-    
-    # Add CORS headers for all responses
-    origin = request.headers.get("origin")
-    if origin and origin.startswith("http://localhost:"):
-        response.headers["Access-Control-Allow-Origin"] = origin
-        response.headers["Access-Control-Allow-Credentials"] = "true"
-        response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS, PATCH, HEAD"
-        response.headers["Access-Control-Allow-Headers"] = "Accept, Accept-Language, Content-Language, Content-Type, Authorization, X-Requested-With, Origin, Access-Control-Request-Method, Access-Control-Request-Headers, X-API-Key, X-Client-Version, User-Agent, Cache-Control, Pragma, Expires"
-        response.headers["Access-Control-Expose-Headers"] = "Content-Length, Content-Type, X-Total-Count, X-Page-Count"
-        response.headers["Vary"] = "Origin"
-    
-    # Add basic security headers for development
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Content-Security-Policy"] = "default-src 'self'; script-src 'self' 'unsafe-inline'; style-src 'self' 'unsafe-inline'; img-src 'self' data: https: blob:; font-src 'self' data:; connect-src 'self' http://localhost:* https://api.plaid.com https://api.stripe.com;"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    
-    return response
+# Basic security headers for development, added to every response in one pass
+app.add_middleware(
+    ResponseHeadersMiddleware,
+    headers={
+        "X-Content-Type-Options": "nosniff",
+        "X-Frame-Options": "DENY",
+        "X-XSS-Protection": "1; mode=block",
+        "Content-Security-Policy": "default-src 'self'; script-src 'self' 'unsafe-inline'; style-src 'self' 'unsafe-inline'; img-src 'self' data: https: blob:; font-src 'self' data:; connect-src 'self' http://localhost:* https://api.plaid.com https://api.stripe.com;",
+        "Referrer-Policy": "strict-origin-when-cross-origin",
+    },
+)
+
+# Per-route latency histograms and request counters, exported at /metrics
+setup_monitoring_middleware(app)
 
 # Setup comprehensive global exception handler AFTER CORS middleware
 # This must be called before including routers to ensure all exceptions are caught
@@ -445,6 +461,23 @@ async def database_health_check():
 
 
 # Favicon endpoint (to prevent 405 errors)
+# Prometheus metrics endpoint
+@app.get("/metrics", tags=["System"], response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """
+    Prometheus Metrics
+    
+    Request latency histograms and request counters per route template since
+    startup, plus database pool and cache gauges, in the Prometheus text
+    exposition format. Each worker process reports its own metrics.
+    """
+    from app.services.monitoring_service import get_monitoring_service
+    
+    return PlainTextResponse(
+        get_monitoring_service().get_prometheus_metrics(),
+        media_type="text/plain; version=0.0.4"
+    )
+
 @app.get("/favicon.ico", include_in_schema=False)
 async def favicon():
     """Favicon endpoint to prevent 405 errors"""
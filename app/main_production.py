@@ -16,7 +16,7 @@ import logging
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
 
 # Import all production middleware and services
@@ -28,6 +28,9 @@ from app.services.cache_service import setup_cache_service
 from app.services.monitoring_service import get_monitoring_service
 from app.services.notification_service import get_notification_service
 from app.services.backup_service import get_backup_service
+from app.services.system_metrics_sampler import get_system_metrics_sampler, setup_system_metrics_sampler
+from app.utils.database import connect_async_database, dispose_async_database
+from app.tasks.scheduler import start_scheduler, stop_scheduler
 
 # Import routers
 from app.router.v1.donor import auth as donor_auth
@@ -79,6 +82,15 @@ async def lifespan(app: FastAPI):
     # Setup cache service
     setup_cache_service()
     
+    # Start sampling system metrics in the background
+    setup_system_metrics_sampler()
+    
+    # Open the async database pool
+    await connect_async_database()
+    
+    # Start the data sync job scheduler (only where SCHEDULER_ENABLED is set)
+    start_scheduler()
+    
     # Perform initial health check
     try:
         health_status = monitoring_service.check_health(None)
@@ -93,6 +105,9 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Manna Production Application")
+    stop_scheduler()
+    get_system_metrics_sampler().stop()
+    await dispose_async_database()
 
 # Create FastAPI application
 app = FastAPI(
@@ -182,10 +197,20 @@ async def detailed_health_check():
     monitoring_service = get_monitoring_service()
     return monitoring_service.get_metrics_summary(None)
 
-# Metrics endpoint for monitoring
-@app.get("/metrics")
+# Metrics endpoint for monitoring systems (Prometheus text format)
+@app.get("/metrics", response_class=PlainTextResponse)
 async def get_metrics():
-    """Get application metrics for monitoring systems"""
+    """Get request and pool metrics for monitoring systems"""
+    monitoring_service = get_monitoring_service()
+    return PlainTextResponse(
+        monitoring_service.get_prometheus_metrics(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+# Monitoring dashboard data
+@app.get("/metrics/dashboard")
+async def get_metrics_dashboard():
+    """Get application metrics for the monitoring dashboard"""
     monitoring_service = get_monitoring_service()
     return monitoring_service.get_dashboard_data(None)
 
@@ -19,7 +19,6 @@ from functools import wraps
 from fastapi import Request, HTTPException, status, Depends
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from redis import Redis
 from ipaddress import ip_address, ip_network
 import re
 from urllib.parse import unquote
@@ -28,25 +27,11 @@ from app.utils.database import get_db
 from app.model.m_admin_audit_log import AdminAuditLog
 from app.model.m_admin_user import AdminUser
 from app.config import config
+from app.services.rate_limit_service import RateLimit, get_rate_limit_service
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Initialize Redis for rate limiting (fallback to in-memory if Redis not available)
-try:
-    redis_client = Redis(
-        host=getattr(config, 'REDIS_HOST', 'localhost'),
-        port=getattr(config, 'REDIS_PORT', 6379),
-        db=getattr(config, 'REDIS_DB', 0),
-        decode_responses=True
-    )
-    redis_client.ping()
-    REDIS_AVAILABLE = True
-except:
-    REDIS_AVAILABLE = False
-    # Fallback to in-memory storage
-    rate_limit_cache: Dict[str, Dict] = {}
-
 # Rate limiting configurations
 RATE_LIMITS = {
     'login': {'requests': 5, 'window': 300},  # 5 attempts per 5 minutes
@@ -146,53 +131,14 @@ class RateLimiter:
         window = limit_config['window']
         max_requests = limit_config['requests']
 
-        current_time = int(time.time())
-        window_start = current_time - window
-        key = f"rate_limit:{client_id}:{endpoint}:{limit_type}"
-
-        if REDIS_AVAILABLE:
-            try:
-                # Use Redis for distributed rate limiting
-                pipe = redis_client.pipeline()
-                pipe.zremrangebyscore(key, 0, window_start)
-                pipe.zadd(key, {current_time: current_time})
-                pipe.zcard(key)
-                pipe.expire(key, window)
-                results = pipe.execute()
-
-                request_count = results[2]
-                remaining = max(0, max_requests - request_count)
-
-                return request_count > max_requests, {
-                    'limit': max_requests,
-                    'remaining': remaining,
-                    'reset': current_time + window
-                }
-            except Exception as e:
-                logger.error(f"Redis rate limiting error: {e}")
-                # Fallback to in-memory
-                pass
-
-        # In-memory fallback
-        if key not in rate_limit_cache:
-            rate_limit_cache[key] = []
-
-        # Clean old requests
-        rate_limit_cache[key] = [
-            req_time for req_time in rate_limit_cache[key]
-            if req_time > window_start
-        ]
-
-        # Add current request
-        rate_limit_cache[key].append(current_time)
-
-        request_count = len(rate_limit_cache[key])
-        remaining = max(0, max_requests - request_count)
+        key = f"admin:{client_id}:{endpoint}:{limit_type}"
+        result = get_rate_limit_service().hit(key, RateLimit(max_requests, window))
 
-        return request_count > max_requests, {
+        return not result.allowed, {
             'limit': max_requests,
-            'remaining': remaining,
-            'reset': current_time + window
+            'remaining': result.remaining,
+            'reset': int(time.time()) + result.reset_after,
+            'retry_after': result.retry_after
         }
 
 class AdminAuditor:
@@ -314,10 +260,10 @@ async def admin_security_middleware(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 content={
                     "error": "Too many requests",
-                    "retry_after": rate_info.get('reset', 60)
+                    "retry_after": rate_info['retry_after']
                 }
             )
-            response.headers["Retry-After"] = str(rate_info.get('reset', 60))
+            response.headers["Retry-After"] = str(rate_info['retry_after'])
             return add_security_headers(response)
 
         # Request validation for POST/PUT requests
@@ -391,7 +337,7 @@ def rate_limit(limit_type: str = 'default'):
                 raise HTTPException(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                     detail="Rate limit exceeded",
-                    headers={"Retry-After": str(rate_info.get('reset', 60))}
+                    headers={"Retry-After": str(rate_info['retry_after'])}
                 )
 
             return await func(request, *args, **kwargs)
@@ -479,7 +425,7 @@ def get_security_config():
     """Get current security configuration"""
     return {
         'rate_limits': RATE_LIMITS,
-        'redis_available': REDIS_AVAILABLE,
+        'redis_available': get_rate_limit_service().shared,
         'ip_whitelist_enabled': bool(ADMIN_IP_WHITELIST),
         'ip_whitelist_count': len(ADMIN_IP_WHITELIST),
         'suspicious_patterns_count': len(SUSPICIOUS_PATTERNS)
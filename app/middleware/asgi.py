@@ -0,0 +1,67 @@
+"""
+Raw ASGI Middleware Helpers
+
+The HTTP middleware of the application is written as plain ASGI callables
+instead of Starlette's BaseHTTPMiddleware, which runs every downstream call
+in a separate task and pipes the response through a memory stream. The
+layers added with app.add_middleware are composed once when the application
+starts; per request each one is a plain function call.
+
+Response headers are added by wrapping `send` and extending the raw header
+list of the `http.response.start` message. Static headers are encoded once
+when the middleware is built.
+"""
+
+from typing import List, Mapping, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+RawHeaders = List[Tuple[bytes, bytes]]
+
+
+def encode_headers(headers: Mapping[str, str]) -> RawHeaders:
+    """Encode headers into ASGI raw header pairs"""
+    return [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers.items()]
+
+
+def set_response_headers(message: Message, headers: RawHeaders) -> None:
+    """Set headers on an http.response.start message, replacing any the response already has"""
+    names = {name for name, _ in headers}
+    message['headers'] = [
+        header for header in message.get('headers', ()) if header[0].lower() not in names
+    ] + headers
+
+
+def replay_body(body: bytes, receive: Receive) -> Receive:
+    """Receive callable that hands an already read request body to the next app"""
+    delivered = False
+
+    async def replay() -> Message:
+        nonlocal delivered
+        if not delivered:
+            delivered = True
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+        return await receive()
+
+    return replay
+
+
+class ResponseHeadersMiddleware:
+    """Add a fixed set of headers to every HTTP response"""
+
+    def __init__(self, app: ASGIApp, headers: Mapping[str, str]):
+        self.app = app
+        self.headers = encode_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message):
+            if message['type'] == 'http.response.start':
+                set_response_headers(message, self.headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
@@ -6,6 +6,7 @@ from app.utils.database import get_db
 from app.model.m_user import User
 from app.model.m_church_admin import ChurchAdmin
 from app.model.m_church import Church
+from app.services.principal_cache import principal_cache
 import logging
 
 security = HTTPBearer(auto_error=True)
@@ -39,6 +40,11 @@ def get_current_user(
             detail="Invalid authentication token"
         )
 
+    # Recently resolved principal
+    principal = principal_cache.get("donor", payload["user_id"])
+    if principal:
+        return principal
+
     # Get user from database
     user = db.query(User).filter(User.id == payload["user_id"]).first()
     if not user or not user.is_active:
@@ -57,7 +63,7 @@ def get_current_user(
     # Get church_id from user's direct church association
     church_id = user.church_id
 
-    return {
+    principal = {
         "user_id": user.id,
         "email": user.email,
         "first_name": user.first_name,
@@ -65,6 +71,8 @@ def get_current_user(
         "church_id": church_id,
         "role": user.role  # Use actual user role from database
     }
+    principal_cache.set("donor", user.id, principal)
+    return principal
 
 def jwt_auth(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -121,6 +129,11 @@ def jwt_church_admin_auth(
                 detail="AUTH.ADMIN.TOKEN.INVALID"
             )
 
+        # Recently resolved principal
+        principal = principal_cache.get("church_admin", payload["user_id"])
+        if principal:
+            return principal
+
         # Get user directly using user_id
         user = db.query(User).filter_by(id=payload["user_id"]).first()
         if not user:
@@ -152,7 +165,7 @@ def jwt_church_admin_auth(
             logging.error(f"Church {church.id} is disabled with status: {church.status}")
             raise HTTPException(status_code=403, detail="Church is disabled.")
 
-        return {
+        principal = {
             "user_id": user.id,
             "email": user.email,
             "first_name": user.first_name,
@@ -161,6 +174,8 @@ def jwt_church_admin_auth(
             "role": "church_admin",
             "admin_id": admin.id  # Keep for backward compatibility
         }
+        principal_cache.set("church_admin", user.id, principal)
+        return principal
     except HTTPException:
         raise
     except Exception as e:
@@ -13,30 +13,45 @@ from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from pydantic import ValidationError as PydanticValidationError
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.exceptions import MannaException
 from app.core.responses import ResponseFactory
 from app.core.constants import HTTP_STATUS
 
 
-class GlobalExceptionHandler(BaseHTTPMiddleware):
+class GlobalExceptionHandler:
     """Global exception handler middleware for consistent error responses"""
 
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next):
         # Generate unique request ID for tracing
         request_id = str(uuid.uuid4())
+        request = Request(scope)
         request.state.request_id = request_id
-        
+        response_started = False
+
+        async def track_response_start(message: Message):
+            nonlocal response_started
+            if message['type'] == 'http.response.start':
+                response_started = True
+            await send(message)
+
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, track_response_start)
         except Exception as exc:
+            # A response that is already being sent cannot be replaced
+            if response_started:
+                raise
             # Catch ALL exceptions, including MannaException
-            if isinstance(exc, MannaException):
-                pass
-            return await self.handle_exception(request, exc, request_id)
+            response = await self.handle_exception(request, exc, request_id)
+            await response(scope, receive, send)
 
     async def handle_exception(self, request: Request, exc: Exception, request_id: str) -> JSONResponse:
         """Handle different types of exceptions and return appropriate responses"""
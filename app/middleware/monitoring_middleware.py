@@ -13,57 +13,65 @@ import time
 import logging
 from typing import Dict, Any
 from datetime import datetime, timezone
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from fastapi import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.middleware.asgi import RawHeaders, encode_headers, set_response_headers
 from app.services.monitoring_service import get_monitoring_service
 
 logger = logging.getLogger(__name__)
 
-class MonitoringMiddleware(BaseHTTPMiddleware):
+class MonitoringMiddleware:
     """Middleware for tracking application metrics"""
     
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
         self.monitoring_service = get_monitoring_service()
         self.request_count = 0
         self.error_count = 0
         self.total_response_time = 0.0
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        
         # Start timing
         start_time = time.time()
         
         # Track request
         self.request_count += 1
+        request = Request(scope)
+        
+        response_started = False
         
-        # Get request context
-        request_context = self._get_request_context(request)
+        async def send_with_monitoring(message: Message):
+            nonlocal response_started
+            if message['type'] == 'http.response.start':
+                response_started = True
+                # Calculate response time
+                response_time = time.time() - start_time
+                self.total_response_time += response_time
+                
+                # Track successful request
+                self.monitoring_service.track_request(request, response_time, message['status'])
+                
+                # Add monitoring headers
+                set_response_headers(message, self._monitoring_headers(response_time))
+            await send(message)
         
         try:
             # Process request
-            response = await call_next(request)
-            
-            # Calculate response time
-            response_time = time.time() - start_time
-            self.total_response_time += response_time
-            
-            # Track successful request
-            self.monitoring_service.track_request(request, response_time, response.status_code)
-            
-            # Add monitoring headers
-            self._add_monitoring_headers(response, response_time)
-            
-            return response
+            await self.app(scope, receive, send_with_monitoring)
             
         except Exception as e:
             # Track error
             self.error_count += 1
-            response_time = time.time() - start_time
+            if not response_started:
+                self.monitoring_service.track_request(request, time.time() - start_time, 500)
             
             # Track error in monitoring service
-            self.monitoring_service.track_error(e, request_context)
+            self.monitoring_service.track_error(e, self._get_request_context(request))
             
             # Re-raise the exception
             raise
@@ -94,20 +102,23 @@ class MonitoringMiddleware(BaseHTTPMiddleware):
         
         return request.client.host if request.client else "unknown"
     
-    def _add_monitoring_headers(self, response: Response, response_time: float):
-        """Add monitoring headers to response"""
-        response.headers['X-Response-Time'] = f"{response_time:.3f}s"
-        response.headers['X-Request-Count'] = str(self.request_count)
-        response.headers['X-Error-Count'] = str(self.error_count)
+    def _monitoring_headers(self, response_time: float) -> RawHeaders:
+        """Monitoring headers for a response"""
+        headers = {
+            'X-Response-Time': f"{response_time:.3f}s",
+            'X-Request-Count': str(self.request_count),
+            'X-Error-Count': str(self.error_count)
+        }
         
         if self.request_count > 0:
             avg_response_time = self.total_response_time / self.request_count
-            response.headers['X-Avg-Response-Time'] = f"{avg_response_time:.3f}s"
+            headers['X-Avg-Response-Time'] = f"{avg_response_time:.3f}s"
         
         if self.request_count > 0:
             error_rate = (self.error_count / self.request_count) * 100
-            response.headers['X-Error-Rate'] = f"{error_rate:.2f}%"
-
+            headers['X-Error-Rate'] = f"{error_rate:.2f}%"
+        
+        return encode_headers(headers)
 
 def setup_monitoring_middleware(app):
     """Setup monitoring middleware"""
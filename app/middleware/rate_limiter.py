@@ -2,8 +2,8 @@
 Advanced Rate Limiting Middleware
 
 Implements:
-- Redis-based distributed rate limiting
-- Sliding window algorithm
+- Distributed rate limiting (Redis) through the shared limiter engine
+- Sliding window counter algorithm (app/services/rate_limit_service.py)
 - Per-user and per-IP rate limits
 - Burst protection
 - Rate limit headers
@@ -16,34 +16,22 @@ from typing import Dict, Optional, Tuple
 from datetime import datetime, timezone, timedelta
 from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.responses import ResponseFactory
+from app.middleware.asgi import encode_headers, set_response_headers
+from app.services.rate_limit_service import RateLimit, RateLimitService, get_rate_limit_service
 
 logger = logging.getLogger(__name__)
 
-try:
-    import redis
-    REDIS_AVAILABLE = True
-except ImportError:
-    REDIS_AVAILABLE = False
-    logger.warning("Redis not available, using in-memory rate limiting")
+# Burst limits apply over this many trailing seconds
+BURST_WINDOW = 10
 
 class RateLimiter:
-    """Advanced rate limiter with Redis support"""
+    """Per-client rate limits with burst protection, on the shared limiter engine"""
     
     def __init__(self, redis_url: Optional[str] = None):
-        self.redis_client = None
-        self.memory_cache: Dict[str, Dict] = {}
-        
-        if REDIS_AVAILABLE and redis_url:
-            try:
-                self.redis_client = redis.from_url(redis_url, decode_responses=True)
-                self.redis_client.ping()  # Test connection
-                logger.info("Redis rate limiting enabled")
-            except Exception as e:
-                logger.warning(f"Redis connection failed: {e}, using memory cache")
-                self.redis_client = None
+        self.engine = RateLimitService(redis_url) if redis_url else get_rate_limit_service()
         
         # Rate limit configurations
         self.limits = {
@@ -55,198 +43,73 @@ class RateLimiter:
             'admin': {'requests': 500, 'window': 60, 'burst': 50},
         }
     
+    def _rate_limits(self, limit_type: str) -> Tuple[RateLimit, RateLimit]:
+        """Window limit and burst limit of a limit type"""
+        config = self.limits.get(limit_type, self.limits['default'])
+        return RateLimit(config['requests'], config['window']), RateLimit(config['burst'], BURST_WINDOW)
+    
     def is_rate_limited(
         self, 
         key: str, 
         limit_type: str = 'default',
         user_id: Optional[str] = None
     ) -> Tuple[bool, Dict]:
-        """Check if request is rate limited using sliding window algorithm"""
-        
-        config = self.limits.get(limit_type, self.limits['default'])
-        current_time = time.time()
+        """Check if request is rate limited, counting it if not"""
         
         # Add user context to key if available
         if user_id:
             key = f"{key}:user:{user_id}"
         
-        # Use Redis if available, otherwise memory
-        if self.redis_client:
-            return self._check_redis_rate_limit(key, config, current_time)
-        else:
-            return self._check_memory_rate_limit(key, config, current_time)
-    
-    def _check_redis_rate_limit(self, key: str, config: Dict, current_time: float) -> Tuple[bool, Dict]:
-        """Check rate limit using Redis with sliding window"""
-        window = config['window']
-        max_requests = config['requests']
-        burst_limit = config['burst']
-        
-        pipe = self.redis_client.pipeline()
-        
-        # Remove old entries
-        cutoff_time = current_time - window
-        pipe.zremrangebyscore(key, 0, cutoff_time)
-        
-        # Count current requests
-        pipe.zcard(key)
+        window_limit, burst_limit = self._rate_limits(limit_type)
+        result = self.engine.hit(f"api:{limit_type}:{key}", window_limit, burst_limit)
+        reset_time = time.time() + result.reset_after
         
-        # Add current request
-        pipe.zadd(key, {str(current_time): current_time})
-        
-        # Set expiration
-        pipe.expire(key, window + 10)
-        
-        results = pipe.execute()
-        current_count = results[1]
-        
-        # Check burst limit
-        if current_count >= burst_limit:
-            # Check if we're in burst mode (recent requests)
-            recent_cutoff = current_time - 10  # Last 10 seconds
-            recent_count = self.redis_client.zcount(key, recent_cutoff, current_time)
-            
-            if recent_count > burst_limit:
-                retry_after = 10  # Wait 10 seconds for burst
-                return True, {
-                    'retry_after': retry_after,
-                    'limit': max_requests,
-                    'window': window,
-                    'current_requests': current_count,
-                    'burst_exceeded': True
-                }
-        
-        # Check regular limit
-        if current_count > max_requests:
-            # Get oldest request time
-            oldest_requests = self.redis_client.zrange(key, 0, 0, withscores=True)
-            if oldest_requests:
-                oldest_time = oldest_requests[0][1]
-                retry_after = int(window - (current_time - oldest_time)) + 1
-            else:
-                retry_after = window
-            
+        if not result.allowed:
             return True, {
-                'retry_after': retry_after,
-                'limit': max_requests,
-                'window': window,
-                'current_requests': current_count,
-                'burst_exceeded': False
+                'retry_after': result.retry_after,
+                'limit': result.limit,
+                'window': result.window,
+                'current_requests': result.current_requests,
+                'burst_exceeded': result.exceeded == burst_limit,
+                'reset_time': reset_time
             }
         
         return False, {
-            'limit': max_requests,
-            'window': window,
-            'current_requests': current_count,
-            'remaining': max_requests - current_count
-        }
-    
-    def _check_memory_rate_limit(self, key: str, config: Dict, current_time: float) -> Tuple[bool, Dict]:
-        """Check rate limit using memory cache with sliding window"""
-        window = config['window']
-        max_requests = config['requests']
-        burst_limit = config['burst']
-        
-        # Initialize key if not exists
-        if key not in self.memory_cache:
-            self.memory_cache[key] = {
-                'requests': [],
-                'last_cleanup': current_time
-            }
-        
-        cache = self.memory_cache[key]
-        
-        # Cleanup old entries periodically
-        if current_time - cache['last_cleanup'] > 60:  # Cleanup every minute
-            cutoff_time = current_time - window
-            cache['requests'] = [req_time for req_time in cache['requests'] if req_time > cutoff_time]
-            cache['last_cleanup'] = current_time
-        
-        # Remove old entries
-        cutoff_time = current_time - window
-        cache['requests'] = [req_time for req_time in cache['requests'] if req_time > cutoff_time]
-        
-        current_count = len(cache['requests'])
-        
-        # Check burst limit
-        if current_count >= burst_limit:
-            recent_cutoff = current_time - 10  # Last 10 seconds
-            recent_count = sum(1 for req_time in cache['requests'] if req_time > recent_cutoff)
-            
-            if recent_count > burst_limit:
-                retry_after = 10
-                return True, {
-                    'retry_after': retry_after,
-                    'limit': max_requests,
-                    'window': window,
-                    'current_requests': current_count,
-                    'burst_exceeded': True
-                }
-        
-        # Check regular limit
-        if current_count >= max_requests:
-            if cache['requests']:
-                oldest_time = min(cache['requests'])
-                retry_after = int(window - (current_time - oldest_time)) + 1
-            else:
-                retry_after = window
-            
-            return True, {
-                'retry_after': retry_after,
-                'limit': max_requests,
-                'window': window,
-                'current_requests': current_count,
-                'burst_exceeded': False
-            }
-        
-        # Add current request
-        cache['requests'].append(current_time)
-        
-        return False, {
-            'limit': max_requests,
-            'window': window,
-            'current_requests': current_count + 1,
-            'remaining': max_requests - (current_count + 1)
+            'limit': result.limit,
+            'window': result.window,
+            'current_requests': result.current_requests,
+            'remaining': result.remaining,
+            'reset_time': reset_time
         }
     
     def get_rate_limit_info(self, key: str, limit_type: str = 'default') -> Dict:
         """Get current rate limit information without consuming a request"""
-        config = self.limits.get(limit_type, self.limits['default'])
-        current_time = time.time()
-        
-        if self.redis_client:
-            # Get current count from Redis
-            cutoff_time = current_time - config['window']
-            current_count = self.redis_client.zcount(key, cutoff_time, current_time)
-        else:
-            # Get current count from memory
-            if key in self.memory_cache:
-                cutoff_time = current_time - config['window']
-                cache = self.memory_cache[key]
-                current_count = sum(1 for req_time in cache['requests'] if req_time > cutoff_time)
-            else:
-                current_count = 0
+        window_limit, _ = self._rate_limits(limit_type)
+        result = self.engine.peek(f"api:{limit_type}:{key}", window_limit)
         
         return {
-            'limit': config['requests'],
-            'window': config['window'],
-            'current_requests': current_count,
-            'remaining': max(0, config['requests'] - current_count),
-            'reset_time': current_time + config['window']
+            'limit': result.limit,
+            'window': result.window,
+            'current_requests': result.current_requests,
+            'remaining': result.remaining,
+            'reset_time': time.time() + result.reset_after
         }
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """Rate limiting middleware"""
     
-    def __init__(self, app, redis_url: Optional[str] = None):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, redis_url: Optional[str] = None):
+        self.app = app
         self.rate_limiter = RateLimiter(redis_url)
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         # Skip rate limiting for health checks
-        if request.url.path in ['/health', '/health/detailed']:
-            return await call_next(request)
+        if scope['type'] != 'http' or scope['path'] in ['/health', '/health/detailed']:
+            await self.app(scope, receive, send)
+            return
+        
+        request = Request(scope)
         
         # Get client identifier
         client_id = self._get_client_identifier(request)
@@ -262,15 +125,18 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         )
         
         if is_limited:
-            return self._create_rate_limit_response(rate_info, request)
+            await self._create_rate_limit_response(rate_info, request)(scope, receive, send)
+            return
         
-        # Process request
-        response = await call_next(request)
+        # Process request, adding rate limit headers to the response
+        rate_limit_headers = encode_headers(self._rate_limit_headers(rate_info))
         
-        # Add rate limit headers
-        self._add_rate_limit_headers(response, rate_info)
+        async def send_with_rate_limit_headers(message: Message):
+            if message['type'] == 'http.response.start':
+                set_response_headers(message, rate_limit_headers)
+            await send(message)
         
-        return response
+        await self.app(scope, receive, send_with_rate_limit_headers)
     
     def _get_client_identifier(self, request: Request) -> str:
         """Get unique client identifier"""
@@ -315,24 +181,24 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             }
         )
         
-        response = JSONResponse(
+        return JSONResponse(
             status_code=200,  # Always return 200 for consistency
-            content=error_response.model_dump(mode='json')
+            content=error_response.model_dump(mode='json'),
+            headers=self._rate_limit_headers(rate_info)
         )
-        
-        # Add rate limit headers
-        self._add_rate_limit_headers(response, rate_info)
-        
-        return response
     
-    def _add_rate_limit_headers(self, response: JSONResponse, rate_info: Dict):
-        """Add rate limit headers to response"""
-        response.headers['X-RateLimit-Limit'] = str(rate_info['limit'])
-        response.headers['X-RateLimit-Remaining'] = str(rate_info.get('remaining', 0))
-        response.headers['X-RateLimit-Reset'] = str(int(rate_info.get('reset_time', time.time())))
+    def _rate_limit_headers(self, rate_info: Dict) -> Dict[str, str]:
+        """Rate limit headers for a response"""
+        headers = {
+            'X-RateLimit-Limit': str(rate_info['limit']),
+            'X-RateLimit-Remaining': str(rate_info.get('remaining', 0)),
+            'X-RateLimit-Reset': str(int(rate_info.get('reset_time', time.time())))
+        }
         
         if 'retry_after' in rate_info:
-            response.headers['Retry-After'] = str(rate_info['retry_after'])
+            headers['Retry-After'] = str(rate_info['retry_after'])
+        
+        return headers
 
 
 def setup_rate_limiting(app, redis_url: Optional[str] = None):
@@ -16,24 +16,171 @@ import secrets
 import logging
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone, timedelta
-from fastapi import Request, HTTPException, Response
+from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import re
 import json
 
 from app.core.responses import ResponseFactory
 from app.core.exceptions import MannaException
+from app.middleware.asgi import encode_headers, replay_body, set_response_headers
+from app.services.rate_limit_service import RateLimit, get_rate_limit_service
 
 logger = logging.getLogger(__name__)
 
-class SecurityMiddleware(BaseHTTPMiddleware):
+# Patterns checked in URLs and query parameters
+MALICIOUS_PATTERNS = [
+    r'<script[^>]*>.*?</script>',
+    r'javascript:',
+    r'vbscript:',
+    r'onload\s*=',
+    r'onerror\s*=',
+    r'<iframe[^>]*>',
+    r'<object[^>]*>',
+    r'<embed[^>]*>',
+    r'<link[^>]*>',
+    r'<meta[^>]*>',
+    r'\.\./',  # Directory traversal
+    r'\.\.\\',  # Windows directory traversal
+]
+
+# Patterns checked in request bodies
+SQL_INJECTION_PATTERNS = [
+    r'union\s+select',
+    r'drop\s+table',
+    r'delete\s+from',
+    r'insert\s+into',
+    r'update\s+set',
+    r'exec\s*\(',
+    r'execute\s*\(',
+    r'--',
+    r'/\*.*?\*/',
+    r';\s*drop',
+    r';\s*delete',
+    r';\s*insert',
+    r';\s*update',
+]
+
+XSS_PATTERNS = [
+    r'<script[^>]*>',
+    r'javascript:',
+    r'vbscript:',
+    r'on\w+\s*=',
+    r'<iframe[^>]*>',
+    r'<object[^>]*>',
+    r'<embed[^>]*>',
+    r'<link[^>]*>',
+    r'<meta[^>]*>',
+    r'expression\s*\(',
+    r'url\s*\(',
+]
+
+def _compile_patterns(*pattern_lists: List[str]) -> 're.Pattern':
+    """
+    Compile patterns into one alternation, matched against lowercased text
+    
+    Patterns starting with the same literal character share a branch, so at
+    each position the engine tries only the patterns that can start there.
+    Matching lowercased text without re.IGNORECASE keeps the literal fast paths.
+    """
+    branches: Dict[str, List[str]] = {}
+    others: List[str] = []
+    for pattern in dict.fromkeys(p for patterns in pattern_lists for p in patterns):
+        if pattern[0] in '\\.[](){}*+?|^$':
+            others.append(f'(?:{pattern})')
+        else:
+            branches.setdefault(pattern[0], []).append(pattern[1:])
+    alternatives = [f"{re.escape(first)}(?:{'|'.join(rests)})" for first, rests in branches.items()]
+    return re.compile('|'.join(alternatives + others))
+
+# Precompiled scanners, each searching the text in a single pass
+MALICIOUS_REGEX = _compile_patterns(MALICIOUS_PATTERNS)
+BODY_THREAT_REGEX = _compile_patterns(SQL_INJECTION_PATTERNS, XSS_PATTERNS)
+SQL_INJECTION_REGEX = _compile_patterns(SQL_INJECTION_PATTERNS)
+
+# Body scanning bounds: only the first BODY_SCAN_MAX_BYTES are scanned, in
+# chunks overlapping by BODY_SCAN_OVERLAP so matches across chunk edges are found
+BODY_SCAN_MAX_BYTES = 1024 * 1024
+BODY_SCAN_CHUNK_SIZE = 64 * 1024
+BODY_SCAN_OVERLAP = 256
+
+# Body content types that are scanned; anything else (images, PDFs, octet streams) is binary
+TEXT_CONTENT_TYPES = (
+    'application/json',
+    'application/x-www-form-urlencoded',
+    'application/xml',
+    'text/',
+)
+
+def _scan_text(data: bytes) -> Optional[str]:
+    """Threat category ('sql' or 'xss') of the first match in data, or None"""
+    limit = min(len(data), BODY_SCAN_MAX_BYTES)
+    start = 0
+    while start < limit:
+        end = min(start + BODY_SCAN_CHUNK_SIZE, limit)
+        chunk = data[max(0, start - BODY_SCAN_OVERLAP):end].decode('utf-8', errors='replace').lower()
+        match = BODY_THREAT_REGEX.search(chunk)
+        if match:
+            return 'sql' if SQL_INJECTION_REGEX.fullmatch(match.group()) else 'xss'
+        start = end
+    return None
+
+def _multipart_boundary(content_type: str) -> Optional[bytes]:
+    """Boundary parameter of a multipart content type"""
+    for parameter in content_type.split(';')[1:]:
+        name, _, value = parameter.strip().partition('=')
+        if name.lower() == 'boundary' and value:
+            return value.strip('"').encode('latin-1')
+    return None
+
+def _multipart_text_fields(body: bytes, boundary: bytes):
+    """Contents of the non-file parts of a multipart body; file parts are skipped"""
+    delimiter = b'--' + boundary
+    position = body.find(delimiter)
+    while position != -1:
+        start = position + len(delimiter)
+        if body[start:start + 2] == b'--':  # closing delimiter
+            return
+        position = body.find(delimiter, start)
+        end = position if position != -1 else len(body)
+        header_end = body.find(b'\r\n\r\n', start, end)
+        if header_end != -1 and b'filename=' not in body[start:header_end].lower():
+            yield body[header_end + 4:end]
+
+def scan_request_body(body: bytes, content_type: str) -> Optional[str]:
+    """
+    Scan a buffered request body for SQL injection and XSS patterns
+    
+    Returns the threat category of the first match ('sql' or 'xss'), or None.
+    Binary content types and multipart file parts are not scanned.
+    """
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    
+    if media_type == 'multipart/form-data':
+        boundary = _multipart_boundary(content_type)
+        if not boundary:
+            return None
+        scanned = 0
+        for field in _multipart_text_fields(body, boundary):
+            if scanned >= BODY_SCAN_MAX_BYTES:
+                break
+            threat = _scan_text(field[:BODY_SCAN_MAX_BYTES - scanned])
+            if threat:
+                return threat
+            scanned += len(field)
+        return None
+    
+    if media_type and not media_type.startswith(TEXT_CONTENT_TYPES):
+        return None
+    
+    return _scan_text(body)
+
+class SecurityMiddleware:
     """Comprehensive security middleware for production"""
     
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
-        self.rate_limit_cache: Dict[str, Dict] = {}
+        self.app = app
         self.blocked_ips: set = set()
         self.whitelisted_ips: set = set()
         self.csrf_tokens: Dict[str, str] = {}
@@ -46,7 +193,7 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             'donation': {'requests': 20, 'window': 60},  # 20 donations per minute
         }
         
-        # Security headers
+        # Security headers, encoded once for every response
         self.security_headers = {
             'X-Content-Type-Options': 'nosniff',
             'X-Frame-Options': 'DENY',
@@ -56,38 +203,53 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             'Permissions-Policy': 'geolocation=(), microphone=(), camera=()',
             'Content-Security-Policy': "default-src 'self'; script-src 'self' 'unsafe-inline'; style-src 'self' 'unsafe-inline'; img-src 'self' data: https: blob:; font-src 'self' data:; connect-src 'self' https://api.plaid.com https://api.stripe.com;"
         }
+        self.raw_security_headers = encode_headers(self.security_headers)
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        
         # Generate request ID for tracking
         request_id = secrets.token_hex(8)
+        request = Request(scope, receive)
         request.state.request_id = request_id
+        status_code = None
+        
+        async def send_with_security_headers(message: Message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                set_response_headers(message, self.raw_security_headers)
+            await send(message)
         
         try:
             # Security checks
-            await self._perform_security_checks(request)
+            body = await self._perform_security_checks(request)
+            if body is not None:
+                receive = replay_body(body, receive)
             
             # Process request
-            response = await call_next(request)
-            
-            # Add security headers
-            response = self._add_security_headers(response)
+            await self.app(scope, receive, send_with_security_headers)
             
             # Log request
-            self._log_request(request, response)
-            
-            return response
+            self._log_request(request, status_code)
             
         except SecurityException as e:
-            return self._create_security_error_response(e, request_id)
+            if status_code is not None:
+                raise
+            await self._create_security_error_response(e, request_id)(scope, receive, send)
         except Exception as e:
+            if status_code is not None:
+                raise
             logger.error(f"Security middleware error: {e}")
-            return self._create_security_error_response(
+            await self._create_security_error_response(
                 SecurityException("Internal security error", "INTERNAL_ERROR"), 
                 request_id
-            )
+            )(scope, receive, send)
     
-    async def _perform_security_checks(self, request: Request):
-        """Perform all security checks"""
+    async def _perform_security_checks(self, request: Request) -> Optional[bytes]:
+        """Perform all security checks, returning the request body if they read it"""
         
         # 1. IP-based security
         await self._check_ip_security(request)
@@ -95,14 +257,16 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         # 2. Rate limiting
         await self._check_rate_limits(request)
         
-        # 3. Input validation
-        await self._validate_input(request)
+        # 3. Request size limits (before the body is read)
+        await self._check_request_size(request)
+        
+        # 4. Input validation
+        body = await self._validate_input(request)
         
-        # 4. CSRF protection for state-changing operations
+        # 5. CSRF protection for state-changing operations
         await self._check_csrf_protection(request)
         
-        # 5. Request size limits
-        await self._check_request_size(request)
+        return body
     
     async def _check_ip_security(self, request: Request):
         """Check IP whitelist/blacklist"""
@@ -134,8 +298,8 @@ class SecurityMiddleware(BaseHTTPMiddleware):
                 {"retry_after": rate_info['retry_after']}
             )
     
-    async def _validate_input(self, request: Request):
-        """Validate and sanitize input data"""
+    async def _validate_input(self, request: Request) -> Optional[bytes]:
+        """Validate and sanitize input data, returning the request body if it was read"""
         
         # Check for malicious patterns in URL
         if self._contains_malicious_patterns(request.url.path):
@@ -147,19 +311,21 @@ class SecurityMiddleware(BaseHTTPMiddleware):
                 raise SecurityException(f"Malicious pattern in parameter: {param}", "MALICIOUS_INPUT")
         
         # Check request body for POST/PUT requests
+        body = None
         if request.method in ['POST', 'PUT', 'PATCH']:
             try:
+                # The body is read here once and replayed to the application
                 body = await request.body()
                 if body:
-                    # Check for SQL injection patterns
-                    if self._contains_sql_injection(str(body)):
+                    threat = scan_request_body(body, request.headers.get('content-type', ''))
+                    if threat == 'sql':
                         raise SecurityException("SQL injection pattern detected", "MALICIOUS_INPUT")
-                    
-                    # Check for XSS patterns
-                    if self._contains_xss_patterns(str(body)):
+                    if threat == 'xss':
                         raise SecurityException("XSS pattern detected", "MALICIOUS_INPUT")
             except Exception as e:
                 logger.warning(f"Error validating request body: {e}")
+        
+        return body
     
     async def _check_csrf_protection(self, request: Request):
         """Check CSRF protection for state-changing operations"""
@@ -223,107 +389,26 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             return 'default'
     
     def _is_rate_limited(self, client_id: str, endpoint: str, limit_type: str) -> Tuple[bool, Dict]:
-        """Check if client is rate limited"""
-        current_time = time.time()
+        """Check if client is rate limited, counting the request if not"""
         window = self.rate_limits[limit_type]['window']
         max_requests = self.rate_limits[limit_type]['requests']
         
-        key = f"{client_id}:{endpoint}:{limit_type}"
+        key = f"security:{client_id}:{endpoint}:{limit_type}"
+        result = get_rate_limit_service().hit(key, RateLimit(max_requests, window))
         
-        # Clean old entries
-        if key in self.rate_limit_cache:
-            self.rate_limit_cache[key] = [
-                req_time for req_time in self.rate_limit_cache[key]
-                if current_time - req_time < window
-            ]
-        else:
-            self.rate_limit_cache[key] = []
-        
-        # Check if limit exceeded
-        if len(self.rate_limit_cache[key]) >= max_requests:
-            oldest_request = min(self.rate_limit_cache[key])
-            retry_after = int(window - (current_time - oldest_request)) + 1
-            
+        if not result.allowed:
             return True, {
-                'retry_after': retry_after,
+                'retry_after': result.retry_after,
                 'limit': max_requests,
                 'window': window,
-                'current_requests': len(self.rate_limit_cache[key])
+                'current_requests': result.current_requests
             }
         
-        # Add current request
-        self.rate_limit_cache[key].append(current_time)
-        
         return False, {}
     
     def _contains_malicious_patterns(self, text: str) -> bool:
         """Check for malicious patterns in text"""
-        malicious_patterns = [
-            r'<script[^>]*>.*?</script>',
-            r'javascript:',
-            r'vbscript:',
-            r'onload\s*=',
-            r'onerror\s*=',
-            r'<iframe[^>]*>',
-            r'<object[^>]*>',
-            r'<embed[^>]*>',
-            r'<link[^>]*>',
-            r'<meta[^>]*>',
-            r'\.\./',  # Directory traversal
-            r'\.\.\\',  # Windows directory traversal
-        ]
-        
-        for pattern in malicious_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-        
-        return False
-    
-    def _contains_sql_injection(self, text: str) -> bool:
-        """Check for SQL injection patterns"""
-        sql_patterns = [
-            r'union\s+select',
-            r'drop\s+table',
-            r'delete\s+from',
-            r'insert\s+into',
-            r'update\s+set',
-            r'exec\s*\(',
-            r'execute\s*\(',
-            r'--',
-            r'/\*.*?\*/',
-            r';\s*drop',
-            r';\s*delete',
-            r';\s*insert',
-            r';\s*update',
-        ]
-        
-        for pattern in sql_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-        
-        return False
-    
-    def _contains_xss_patterns(self, text: str) -> bool:
-        """Check for XSS patterns"""
-        xss_patterns = [
-            r'<script[^>]*>',
-            r'javascript:',
-            r'vbscript:',
-            r'on\w+\s*=',
-            r'<iframe[^>]*>',
-            r'<object[^>]*>',
-            r'<embed[^>]*>',
-            r'<link[^>]*>',
-            r'<meta[^>]*>',
-            r'expression\s*\(',
-            r'url\s*\(',
-        ]
-        
-        for pattern in xss_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-        
-        return False
+        return MALICIOUS_REGEX.search(text.lower()) is not None
     
     def _validate_csrf_token(self, token: str, request: Request) -> bool:
         """Validate CSRF token"""
@@ -346,14 +431,7 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         
         return True
     
-    def _add_security_headers(self, response: Response) -> Response:
-        """Add security headers to response"""
-        for header, value in self.security_headers.items():
-            response.headers[header] = value
-        
-        return response
-    
-    def _log_request(self, request: Request, response: Response):
+    def _log_request(self, request: Request, status_code: Optional[int]):
         """Log security-relevant requests"""
         client_ip = self._get_client_ip(request)
         user_id = getattr(request.state, 'user_id', None)
@@ -364,13 +442,13 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             'user_id': user_id,
             'method': request.method,
             'url': str(request.url),
-            'status_code': response.status_code,
+            'status_code': status_code,
             'user_agent': request.headers.get('user-agent', ''),
             'referer': request.headers.get('referer', ''),
         }
         
         # Log suspicious activity
-        if response.status_code >= 400:
+        if status_code is None or status_code >= 400:
             logger.warning(f"Security event: {log_data}")
         else:
             logger.info(f"Request: {log_data}")
@@ -393,7 +471,7 @@ class SecurityMiddleware(BaseHTTPMiddleware):
 class SecurityException(MannaException):
     """Custom security exception"""
     def __init__(self, message: str, error_code: str, details: Optional[Dict] = None):
-        super().__init__(message, error_code, details)
+        super().__init__(message, error_code=error_code, details=details)
 
 
 def generate_csrf_token(session_id: str) -> str:
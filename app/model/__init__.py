@@ -55,6 +55,9 @@ from .m_pending_roundup import PendingRoundup
 from .m_donation_batch import DonationBatch
 from .m_referral import ReferralCommission
 from .m_donor_settings import DonorSettings
+from .m_scheduled_payout_run import ScheduledPayoutRun, ScheduledPayoutRunItem
+from .m_church_spending_rollup import ChurchSpendingRollup, ChurchSpendingRollupTransaction
+from .m_platform_counter import PlatformCounter
 
 # Main exports - core models and payment transaction models
 __all__ = [
@@ -92,5 +95,14 @@ __all__ = [
     
     # New models - RoundupTransaction removed
     "ReferralCommission",
-    "DonorSettings"
+    "DonorSettings",
+    
+    # Scheduled payout run checkpoints
+    "ScheduledPayoutRun",
+    "ScheduledPayoutRunItem",
+    
+    # Analytics rollups
+    "ChurchSpendingRollup",
+    "ChurchSpendingRollupTransaction",
+    "PlatformCounter"
 ]
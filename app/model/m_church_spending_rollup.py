@@ -0,0 +1,46 @@
+"""
+Church Spending Rollup Model
+
+Per (church, day) spend of the church's donors by category and by merchant,
+accumulated as Plaid transactions are synced. Backs the church spending
+analytics endpoints with a single range query instead of live Plaid calls.
+
+ChurchSpendingRollupTransaction records which Plaid transactions have already
+been folded into a church's rollups, so a sync replaying a transaction the
+backfill already counted does not add it twice.
+"""
+
+from sqlalchemy import Column, Integer, String, Date, DateTime, Numeric, LargeBinary, ForeignKey, UniqueConstraint, Index
+from datetime import datetime, timezone
+from app.utils.database import Base
+
+
+class ChurchSpendingRollup(Base):
+    __tablename__ = "church_spending_rollups"
+    __table_args__ = (
+        UniqueConstraint("church_id", "dimension", "day", "key", name="uq_church_spending_rollups_bucket"),
+        Index("ix_church_spending_rollups_range", "church_id", "dimension", "day"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    church_id = Column(Integer, ForeignKey("churches.id"), nullable=False)
+    dimension = Column(String(20), nullable=False)  # category, merchant
+    day = Column(Date, nullable=False)
+    key = Column(String(255), nullable=False)  # category or merchant name
+
+    total_amount = Column(Numeric(12, 2), default=0, nullable=False)
+    transaction_count = Column(Integer, default=0, nullable=False)
+    donor_sketch = Column(LargeBinary, nullable=True)  # HyperLogLog registers of contributing donor ids
+
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+
+
+class ChurchSpendingRollupTransaction(Base):
+    __tablename__ = "church_spending_rollup_transactions"
+    __table_args__ = (
+        Index("ix_church_spending_rollup_transactions_day", "church_id", "day"),
+    )
+
+    church_id = Column(Integer, ForeignKey("churches.id"), primary_key=True)
+    transaction_id = Column(String(255), primary_key=True)  # Plaid transaction_id
+    day = Column(Date, nullable=False)
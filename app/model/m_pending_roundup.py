@@ -22,7 +22,7 @@ class PendingRoundup(Base):
     
     # User and transaction references
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    transaction_id = Column(String(255), nullable=False, index=True)  # Plaid transaction ID
+    transaction_id = Column(String(255), nullable=False, unique=True, index=True)  # Plaid transaction ID
     account_id = Column(String(255), nullable=False)  # Plaid account ID
     payout_id = Column(Integer, ForeignKey("donor_payouts.id"), nullable=True)  # Set when collected
     
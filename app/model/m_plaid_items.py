@@ -25,6 +25,10 @@ class PlaidItem(Base):
     error_code = Column(String(50), nullable=True)
     error_message = Column(Text, nullable=True)
     
+    # /transactions/sync state
+    transactions_cursor = Column(Text, nullable=True)  # next_cursor from the last successful sync
+    transactions_synced_at = Column(DateTime, nullable=True)
+    
     # Timestamps
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
@@ -0,0 +1,23 @@
+"""
+Platform Counter Model
+
+Named platform-wide totals (users, churches, payouts, referrals) maintained
+incrementally as rows change and periodically reconciled, so admin and
+monitoring endpoints read a handful of rows instead of scanning history.
+
+Each counter is split across a few shard rows so concurrent writers rarely
+queue on the same row; a counter's value is the sum of its shards.
+"""
+
+from sqlalchemy import Column, String, Integer, DateTime, Numeric
+from datetime import datetime, timezone
+from app.utils.database import Base
+
+
+class PlatformCounter(Base):
+    __tablename__ = "platform_counters"
+
+    name = Column(String(100), primary_key=True)  # e.g. "users.total", "donor_payouts.completed_amount"
+    shard = Column(Integer, primary_key=True, default=0)  # 0 .. COUNTER_SHARDS - 1
+    value = Column(Numeric(18, 2), default=0, nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
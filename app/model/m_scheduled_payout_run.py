@@ -0,0 +1,69 @@
+"""
+Scheduled Payout Run Models
+
+Checkpoint tables for the daily scheduled donor payout run. Each run records
+the donors that were due, and each item tracks one donor's progress so a
+restarted run only processes donors that have not finished.
+"""
+
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
+from app.utils.database import Base
+
+
+class ScheduledPayoutRun(Base):
+    """
+    One scheduled donor payout run per day
+    """
+    __tablename__ = "scheduled_payout_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_date = Column(Date, unique=True, nullable=False, index=True)
+    
+    # Status tracking
+    status = Column(String(20), default="running", nullable=False)  # running, completed
+    total_donors = Column(Integer, default=0, nullable=False)
+    processed_count = Column(Integer, default=0, nullable=False)
+    failed_count = Column(Integer, default=0, nullable=False)
+    
+    # Timestamps
+    started_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Relationships
+    items = relationship("ScheduledPayoutRunItem", back_populates="run")
+
+    def __repr__(self):
+        return f"<ScheduledPayoutRun(id={self.id}, run_date={self.run_date}, status={self.status})>"
+
+
+class ScheduledPayoutRunItem(Base):
+    """
+    Progress of a single donor within a scheduled payout run
+    """
+    __tablename__ = "scheduled_payout_run_items"
+    __table_args__ = (
+        UniqueConstraint("run_id", "user_id", name="uq_scheduled_payout_run_items_run_user"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("scheduled_payout_runs.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    
+    # Status tracking
+    status = Column(String(20), default="pending", nullable=False, index=True)  # pending, processing, completed, failed
+    attempts = Column(Integer, default=0, nullable=False)
+    donor_payout_id = Column(Integer, ForeignKey("donor_payouts.id"), nullable=True)
+    payment_intent_id = Column(String(255), nullable=True)
+    error_message = Column(Text, nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+    
+    # Relationships
+    run = relationship("ScheduledPayoutRun", back_populates="items")
+
+    def __repr__(self):
+        return f"<ScheduledPayoutRunItem(id={self.id}, run_id={self.run_id}, user_id={self.user_id}, status={self.status})>"
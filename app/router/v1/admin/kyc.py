@@ -18,11 +18,13 @@ async def get_kyc_list_route(
     page: int = Query(default=1, ge=1, description="Page number"),
     limit: int = Query(default=20, ge=1, le=100, description="Items per page"),
     state: Optional[str] = Query(default=None, description="Filter by KYC state"),
+    cursor: Optional[str] = Query(default=None, description="Keyset cursor (next_cursor of the previous page; empty for the first page)"),
+    with_total: bool = Query(default=False, description="Include an estimated total with keyset pages"),
     current_user: dict = Depends(admin_auth),
     db: Session = Depends(get_db)
 ):
     """Get list of churches with KYC status for admin review"""
-    return get_kyc_list(db, page, limit, state)
+    return get_kyc_list(db, page, limit, state, cursor, with_total)
 
 @kyc_router.get("/confirmation-queue", response_model=SuccessResponse)
 async def get_kyc_confirmation_queue_route(
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.controller.admin.users import (
     get_all_users, get_user_details, update_user_status, get_user_analytics,
-    get_user_donations, get_user_church, get_user_activity
+    get_user_donations, get_user_church, get_user_activity, export_users, search_users
 )
 from app.utils.database import get_db
 from app.middleware.admin_auth import admin_auth
@@ -20,6 +21,8 @@ def list_users_route(
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
     role: str = Query(default=None, description="Filter by user role"),
+    cursor: Optional[str] = Query(default=None, description="Keyset cursor (next_cursor of the previous page; empty for the first page)"),
+    with_total: bool = Query(default=False, description="Include an estimated total with keyset pages"),
     current_user: dict = Depends(admin_auth),
     db: Session = Depends(get_db)
 ):
@@ -27,7 +30,29 @@ def list_users_route(
     page = (offset // limit) + 1
     # For admin, we pass 0 to get all users regardless of church
     # If no role specified, defaults to donor users only
-    return get_all_users(page, limit, search, 0, role, db)
+    return get_all_users(page, limit, search, 0, role, db, cursor, with_total)
+
+@users_router.get("/search", response_model=SuccessResponse)
+def search_users_route(
+    q: str = Query(..., min_length=1, description="Name or email to search for"),
+    role: str = Query(default=None, description="Filter by user role"),
+    limit: int = Query(default=20, ge=1, le=100),
+    current_user: dict = Depends(admin_auth),
+    db: Session = Depends(get_db)
+):
+    """Search users by name or email, best matches first"""
+    return search_users(q, role, limit, db)
+
+@users_router.get("/export")
+def export_users_route(
+    search: str = Query(default="", description="Search by name or email"),
+    role: str = Query(default=None, description="Filter by user role"),
+    format_type: str = Query(default="csv", description="Export format: csv or ndjson"),
+    gzip: bool = Query(default=False, description="Gzip-compress the export"),
+    current_user: dict = Depends(admin_auth),
+):
+    """Stream the user list (defaults to donor users only) as a CSV or NDJSON download"""
+    return export_users(search, role, format_type, gzip)
 
 @users_router.get("/{user_id}", response_model=SuccessResponse)
 async def get_user_details_route(
@@ -64,11 +89,13 @@ async def get_user_donations_route(
     user_id: int,
     page: int = Query(default=1, ge=1, description="Page number"),
     limit: int = Query(default=20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(default=None, description="Keyset cursor (next_cursor of the previous page; empty for the first page)"),
+    with_total: bool = Query(default=False, description="Include an estimated total with keyset pages"),
     current_user: dict = Depends(admin_auth),
     db: Session = Depends(get_db)
 ):
     """Get user donations"""
-    return get_user_donations(user_id, page, limit, db)
+    return get_user_donations(user_id, page, limit, db, cursor, with_total)
 
 @users_router.get("/{user_id}/activity", response_model=SuccessResponse)
 async def get_user_activity_route(
@@ -69,15 +69,16 @@ def get_donor_retention_metrics_endpoint(
     church_id = current_user["church_id"]
     return get_donor_retention_metrics(church_id, db)
 
-@donor_management_router.get("/export", response_model=SuccessResponse)
+@donor_management_router.get("/export")
 def export_donor_data_endpoint(
-    format_type: str = Query("csv", description="Export format (csv, excel, json)"),
+    format_type: str = Query("csv", description="Export format (csv, ndjson)"),
+    gzip: bool = Query(False, description="Gzip-compress the export"),
     current_user: Dict[str, Any] = Depends(church_admin_auth),
     db: Session = Depends(get_db)
 ):
-    """Export donor data in various formats"""
+    """Stream donor data as a CSV or NDJSON download"""
     church_id = current_user["church_id"]
-    return export_donor_data(church_id, format_type, None, db)
+    return export_donor_data(church_id, format_type, None, db, gzip=gzip)
 
 @donor_management_router.get("/{donor_id}/messages", response_model=SuccessResponse)
 def get_donor_messages_endpoint(
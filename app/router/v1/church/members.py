@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.controller.church.members import (
     get_church_members, get_member_details, get_member_giving_history, search_members,
     update_member_status, add_member_note, get_member_notes, export_members
@@ -14,11 +15,40 @@ members_router = APIRouter(tags=["Church Members"])
 async def get_members_route(
     page: int = Query(default=1, ge=1, description="Page number"),
     limit: int = Query(default=20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(default=None, description="Keyset cursor (next_cursor of the previous page; empty for the first page)"),
+    with_total: bool = Query(default=False, description="Include an estimated total with keyset pages"),
     current_user: dict = Depends(church_admin_auth),
     db: Session = Depends(get_db)
 ):
     """Get church members"""
-    return get_church_members(current_user["church_id"], page, limit, db)
+    return get_church_members(
+        current_user["church_id"], page, limit, db=db, cursor=cursor, with_total=with_total
+    )
+
+@members_router.get("/search", response_model=SuccessResponse)
+async def search_members_route(
+    query: str = Query(..., description="Search query"),
+    page: int = Query(default=1, ge=1, description="Page number"),
+    limit: int = Query(default=20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(default=None, description="Keyset cursor (next_cursor of the previous page; empty for the first page)"),
+    with_total: bool = Query(default=False, description="Include an estimated total with keyset pages"),
+    current_user: dict = Depends(church_admin_auth),
+    db: Session = Depends(get_db)
+):
+    """Search members"""
+    return search_members(
+        current_user["church_id"], query, page, limit, db=db, cursor=cursor, with_total=with_total
+    )
+
+@members_router.get("/export")
+def export_members_route(
+    format_type: str = Query(default="csv", description="Export format: csv or ndjson"),
+    gzip: bool = Query(default=False, description="Gzip-compress the export"),
+    current_user: dict = Depends(church_admin_auth),
+    db: Session = Depends(get_db)
+):
+    """Stream members data as a CSV or NDJSON download"""
+    return export_members(current_user["church_id"], format_type, gzip, db)
 
 @members_router.get("/{member_id}", response_model=SuccessResponse)
 async def get_member_details_route(
@@ -40,17 +70,6 @@ async def get_member_giving_route(
     """Get member giving history"""
     return get_member_giving_history(member_id, current_user["church_id"], page, limit, db)
 
-@members_router.get("/search", response_model=SuccessResponse)
-async def search_members_route(
-    query: str = Query(..., description="Search query"),
-    page: int = Query(default=1, ge=1, description="Page number"),
-    limit: int = Query(default=20, ge=1, le=100, description="Items per page"),
-    current_user: dict = Depends(church_admin_auth),
-    db: Session = Depends(get_db)
-):
-    """Search members"""
-    return search_members(current_user["church_id"], query, page, limit, db)
-
 @members_router.put("/{member_id}/status", response_model=SuccessResponse)
 async def update_member_status_route(
     member_id: int,
@@ -80,12 +99,3 @@ async def get_member_notes_route(
 ):
     """Get all notes for a member"""
     return get_member_notes(member_id, current_user["church_id"], db)
-
-@members_router.get("/export", response_model=SuccessResponse)
-async def export_members_route(
-    format_type: str = Query(default="csv", description="Export format: csv or json"),
-    current_user: dict = Depends(church_admin_auth),
-    db: Session = Depends(get_db)
-):
-    """Export members data"""
-    return export_members(current_user["church_id"], format_type, db)
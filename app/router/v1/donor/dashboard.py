@@ -1,17 +1,18 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from app.utils.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.database import get_db, get_async_db
 from app.middleware.auth_middleware import jwt_auth
 from app.controller.donor.dashboard import (
-    get_dashboard_overview, get_impact_analytics, get_summary_stats, get_recent_activity, get_church_impact_stories
+    get_dashboard_overview_async, get_impact_analytics, get_summary_stats, get_recent_activity, get_church_impact_stories
 )
 
 router = APIRouter()
 
 @router.get("/overview")
-def donor_get_dashboard_overview(current_user: dict = Depends(jwt_auth), db: Session = Depends(get_db)):
+async def donor_get_dashboard_overview(current_user: dict = Depends(jwt_auth), db: AsyncSession = Depends(get_async_db)):
     """Get donor dashboard overview"""
-    return get_dashboard_overview(current_user, db)
+    return await get_dashboard_overview_async(current_user, db)
 
 @router.get("/impact")
 def donor_get_impact_analytics(current_user: dict = Depends(jwt_auth), db: Session = Depends(get_db)):
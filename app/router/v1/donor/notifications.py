@@ -6,10 +6,11 @@ Handles donor notification endpoints for fetching, marking as read, and managing
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any
 
 from app.controller.mobile.notifications import (
-    get_mobile_notifications,
+    get_mobile_notifications_async,
     mark_notification_read,
     mark_all_notifications_read,
     delete_notification,
@@ -18,7 +19,7 @@ from app.controller.mobile.notifications import (
 )
 from app.core.responses import ResponseFactory
 from app.middleware.auth_middleware import get_current_user
-from app.utils.database import get_db
+from app.utils.database import get_db, get_async_db
 
 router = APIRouter(tags=["Donor Notifications"])
 
@@ -58,7 +59,7 @@ async def get_notifications(
     limit: int = Query(default=50, description="Number of notifications to return"),
     offset: int = Query(default=0, description="Number of notifications to skip"),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get donor notifications
@@ -67,7 +68,7 @@ async def get_notifications(
     Includes church messages, system notifications, and other relevant alerts.
     """
     user_id = current_user["user_id"]
-    return get_mobile_notifications(user_id, db, limit, offset)
+    return await get_mobile_notifications_async(user_id, db, limit, offset)
 
 
 @router.post("/{notification_id}/read", response_model=None)
@@ -8,7 +8,8 @@ Handles mobile app endpoints for:
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
 from sqlalchemy.orm import Session
-from app.utils.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.database import get_db, get_async_db
 from app.middleware.auth_middleware import jwt_auth
 from app.core.responses import SuccessResponse, ResponseFactory
 from typing import Optional, Dict, Any
@@ -43,7 +44,7 @@ from app.controller.mobile.church import (
     refresh_user_data_after_church_selection,
     get_user_church_status
 )
-from app.controller.mobile.dashboard import get_mobile_dashboard
+from app.controller.mobile.dashboard import get_mobile_dashboard_async
 from app.controller.mobile.roundups import (
     get_mobile_pending_roundups, get_mobile_roundup_settings, 
     update_mobile_roundup_settings, get_mobile_impact_summary, quick_toggle_roundups
@@ -54,7 +55,7 @@ from app.controller.mobile.profile import (
     send_phone_verification, confirm_phone_verification
 )
 from app.controller.mobile.notifications import (
-    get_mobile_notifications, mark_notification_read, mark_all_notifications_read,
+    get_mobile_notifications_async, mark_notification_read, mark_all_notifications_read,
     delete_notification, get_notification_preferences, update_notification_preferences
 )
 from app.controller.mobile.messages import (
@@ -616,10 +617,10 @@ async def get_church_messages_route(
     limit: int = Query(default=50, description="Number of messages to return"),
     offset: int = Query(default=0, description="Number of messages to skip"),
     current_user: dict = Depends(jwt_auth),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get church messages"""
-    return get_mobile_notifications(current_user["id"], db, limit, offset)
+    return await get_mobile_notifications_async(current_user["id"], db, limit, offset)
 
 @mobile_router.get("/church-messages/unread-count", response_model=SuccessResponse)
 async def get_church_messages_unread_count_route(
@@ -756,10 +757,10 @@ async def get_user_analytics_route(
 @mobile_router.get("/dashboard", response_model=SuccessResponse)
 async def get_dashboard_route(
     current_user: dict = Depends(jwt_auth),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get dashboard data"""
-    return get_mobile_dashboard(current_user["id"], db)
+    return await get_mobile_dashboard_async(current_user["id"], db)
 
 # Profile Endpoints
 @mobile_router.get("/profile", response_model=SuccessResponse)
@@ -846,10 +847,10 @@ async def get_notifications_route(
     limit: int = Query(default=50, description="Number of notifications to return"),
     offset: int = Query(default=0, description="Number of notifications to skip"),
     current_user: dict = Depends(jwt_auth),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get notifications"""
-    return get_mobile_notifications(current_user["id"], db, limit, offset)
+    return await get_mobile_notifications_async(current_user["id"], db, limit, offset)
 
 @mobile_router.post("/donor/notifications/{notification_id}/read", response_model=SuccessResponse)
 async def mark_notification_read_route(
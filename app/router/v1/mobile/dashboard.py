@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from app.controller.mobile.dashboard import get_mobile_dashboard
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.controller.mobile.dashboard import get_mobile_dashboard_async
 from app.controller.mobile.roundups import (
     get_mobile_enhanced_roundup_status, get_mobile_transactions, get_mobile_impact_summary
 )
 from app.controller.mobile.messages import get_mobile_notifications
-from app.utils.database import get_db
+from app.utils.database import get_db, get_async_db
 from app.middleware.auth_middleware import jwt_auth
 from app.core.responses import SuccessResponse
 
@@ -14,10 +15,10 @@ dashboard_router = APIRouter(tags=["Mobile Dashboard"])
 @dashboard_router.get("/", response_model=SuccessResponse)
 async def get_mobile_dashboard_route(
     current_user: dict = Depends(jwt_auth),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get comprehensive dashboard for mobile"""
-    return get_mobile_dashboard(current_user["id"], db)
+    return await get_mobile_dashboard_async(current_user["id"], db)
 
 @dashboard_router.get("/roundup-status", response_model=SuccessResponse)
 async def get_roundup_status_route(
@@ -56,10 +57,10 @@ async def get_dashboard_notifications_route(
 @dashboard_router.get("/summary", response_model=SuccessResponse)
 async def get_dashboard_summary_route(
     current_user: dict = Depends(jwt_auth),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get dashboard summary for mobile (alias for main dashboard)"""
-    return get_mobile_dashboard(current_user["id"], db)
+    return await get_mobile_dashboard_async(current_user["id"], db)
 
 @dashboard_router.get("/history", response_model=SuccessResponse)
 async def get_dashboard_history_route(
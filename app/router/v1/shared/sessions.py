@@ -10,6 +10,7 @@ from app.utils.database import get_db
 from app.middleware.auth_middleware import jwt_auth
 from app.utils.token_manager import token_manager
 from app.services.session_service import session_manager
+from app.services.principal_cache import principal_cache
 from app.core.responses import ResponseFactory
 from typing import Dict, Any, Optional
 
@@ -163,6 +164,7 @@ async def logout_all_sessions(
         
         # Logout from all sessions
         session_manager.logout_user(user_id)
+        principal_cache.invalidate_user(user_id)
         
         return ResponseFactory.success(
             message="All sessions logged out successfully",
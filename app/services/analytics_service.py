@@ -21,6 +21,9 @@ from app.model.m_donation_preference import DonationPreference
 from app.model.m_plaid_items import PlaidItem
 # PlaidAccount import removed - using on-demand Plaid API fetching
 from app.config import config
+from app.utils.time_series import aggregate_by_period, fill_periods
+
+logger = logging.getLogger(__name__)
 
 class AnalyticsService:
     """Service for generating analytics and reports"""
@@ -536,29 +539,27 @@ def get_church_monthly_trends(
         end_date = datetime.now(timezone.utc)
         start_date = end_date - timedelta(days=months_back * 30)
         
-        payouts = db.query(ChurchPayout).filter(
-            ChurchPayout.church_id == church_id,
-            ChurchPayout.created_at >= start_date,
-            ChurchPayout.created_at <= end_date
-        ).all()
-        
-        # Group by month
-        monthly_data = {}
-        for payout in payouts:
-            month_key = payout.created_at.strftime("%Y-%m")
-            if month_key not in monthly_data:
-                monthly_data[month_key] = {
-                    "month": month_key,
-                    "total_amount": 0,
-                    "payout_count": 0
-                }
-            
-            monthly_data[month_key]["total_amount"] += float(payout.amount)
-            monthly_data[month_key]["payout_count"] += 1
+        # Group by month in the database
+        monthly_data = aggregate_by_period(
+            db.query(
+                func.sum(ChurchPayout.net_payout_amount),
+                func.count(ChurchPayout.id)
+            ).filter(
+                ChurchPayout.church_id == church_id,
+                ChurchPayout.created_at >= start_date,
+                ChurchPayout.created_at <= end_date
+            ),
+            ChurchPayout.created_at
+        )
         
-        # Convert to list and sort by month
-        trends = list(monthly_data.values())
-        trends.sort(key=lambda x: x["month"])
+        trends = [
+            {
+                "month": month,
+                "total_amount": float(total_amount or 0),
+                "payout_count": payout_count
+            }
+            for month, (total_amount, payout_count) in fill_periods(monthly_data, start_date, end_date, empty=(0, 0))
+        ]
         
         return {
             "success": True,
@@ -3,7 +3,8 @@ Comprehensive Caching Service for Production
 
 Implements:
 - Redis-based distributed caching
-- Memory-based fallback caching
+- Memory-based fallback caching (bounded LRU with TTL)
+- Single-flight loading so concurrent misses trigger one fetch
 - Cache invalidation strategies
 - Cache warming
 - Performance metrics
@@ -11,14 +12,20 @@ Implements:
 """
 
 import json
+import time
+import fnmatch
 import logging
 import pickle
 import hashlib
-from typing import Any, Optional, Dict, List, Union
-from datetime import datetime, timezone, timedelta
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Dict, List, Union, Callable
+from datetime import datetime, timezone
 from functools import wraps
 from dataclasses import dataclass
 
+from app.config import config
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -28,6 +35,76 @@ except ImportError:
     REDIS_AVAILABLE = False
     logger.warning("Redis not available, using memory cache")
 
+# Default bound for the in-process cache
+DEFAULT_MAX_ENTRIES = 10000
+
+# Sentinel to tell a cached None apart from a miss
+_MISSING = object()
+
+
+def hash_key(*parts: Any) -> str:
+    """Hash key parts so secrets such as access tokens never appear in cache keys"""
+    raw = ":".join(str(part) for part in parts)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class FakeRedis:
+    """
+    Minimal in-process stand-in for the redis client
+    
+    Implements the subset of commands CacheService uses so the shared backend
+    code path can be exercised in tests and local development without Redis.
+    """
+    
+    def __init__(self):
+        self._data: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+    
+    def _live(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._data[key]
+            return None
+        return value
+    
+    def ping(self) -> bool:
+        return True
+    
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._live(key)
+    
+    def set(self, key: str, value: Any, ex: Optional[int] = None, px: Optional[int] = None, nx: bool = False) -> bool:
+        with self._lock:
+            if nx and self._live(key) is not None:
+                return False
+            ttl = px / 1000.0 if px else ex
+            self._data[key] = (value, time.monotonic() + ttl if ttl else None)
+            return True
+    
+    def setex(self, key: str, ttl: int, value: Any) -> bool:
+        return self.set(key, value, ex=ttl)
+    
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(1 for key in keys if self._data.pop(key, None) is not None)
+    
+    def exists(self, *keys: str) -> int:
+        with self._lock:
+            return sum(1 for key in keys if self._live(key) is not None)
+    
+    def keys(self, pattern: str = "*") -> List[str]:
+        with self._lock:
+            return [key for key in list(self._data) if self._live(key) is not None and fnmatch.fnmatch(key, pattern)]
+    
+    def flushdb(self) -> bool:
+        with self._lock:
+            self._data.clear()
+            return True
+
 @dataclass
 class CacheConfig:
     """Cache configuration"""
@@ -39,11 +116,22 @@ class CacheConfig:
 class CacheService:
     """Comprehensive caching service"""
     
-    def __init__(self, redis_url: Optional[str] = None):
-        self.redis_client = None
-        self.memory_cache: Dict[str, Dict] = {}
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        redis_client: Optional[Any] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        self.redis_client = redis_client
+        self.memory_cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self.max_entries = max_entries
+        self._lock = threading.RLock()
+        
+        # In-flight loads for single-flight deduplication
+        self._inflight: Dict[str, threading.Event] = {}
+        self._inflight_lock = threading.Lock()
         
-        if REDIS_AVAILABLE and redis_url:
+        if self.redis_client is None and REDIS_AVAILABLE and redis_url:
             try:
                 self.redis_client = redis.from_url(redis_url, decode_responses=False)
                 self.redis_client.ping()
@@ -58,6 +146,7 @@ class CacheService:
             'misses': 0,
             'sets': 0,
             'deletes': 0,
+            'evictions': 0,
             'errors': 0
         }
     
@@ -135,12 +224,105 @@ class CacheService:
             'misses': self.stats['misses'],
             'sets': self.stats['sets'],
             'deletes': self.stats['deletes'],
+            'evictions': self.stats['evictions'],
             'errors': self.stats['errors'],
             'hit_rate': round(hit_rate, 2),
             'total_requests': total_requests,
-            'backend': 'redis' if self.redis_client else 'memory'
+            'backend': 'redis' if self.redis_client else 'memory',
+            'size': len(self.memory_cache),
+            'max_entries': self.max_entries
         }
     
+    def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: Optional[int] = None,
+        lock_timeout: float = 30.0
+    ) -> Any:
+        """
+        Return the cached value for key, calling loader once on a miss
+        
+        Concurrent callers missing on the same key wait for the first caller's
+        load instead of issuing their own. With a shared backend the first
+        caller also takes a short-lived lock so other workers wait as well.
+        If the leading load fails, waiters fall back to calling loader themselves.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        
+        with self._inflight_lock:
+            event = self._inflight.get(key)
+            is_leader = event is None
+            if is_leader:
+                event = threading.Event()
+                self._inflight[key] = event
+        
+        if not is_leader:
+            event.wait(lock_timeout)
+            value = self.get(key, _MISSING)
+            return value if value is not _MISSING else loader()
+        
+        lock_key = f"{key}:lock"
+        has_shared_lock = False
+        try:
+            if self.redis_client:
+                has_shared_lock = self._acquire_shared_lock(lock_key, lock_timeout)
+                if not has_shared_lock:
+                    value = self._wait_for_shared_value(key, lock_timeout)
+                    if value is not _MISSING:
+                        return value
+            
+            # A leader that finished between our miss and taking over has stored the value
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            
+            value = loader()
+            self.set(key, value, ttl)
+            return value
+        finally:
+            if has_shared_lock:
+                self._release_shared_lock(lock_key)
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            event.set()
+    
+    def _acquire_shared_lock(self, lock_key: str, lock_timeout: float) -> bool:
+        """Take the cross-worker load lock for a key"""
+        try:
+            return bool(self.redis_client.set(lock_key, b"1", px=int(lock_timeout * 1000), nx=True))
+        except Exception as e:
+            logger.error(f"Redis lock error: {e}")
+            self.stats['errors'] += 1
+            # Without a working lock, load locally rather than block
+            return False
+    
+    def _release_shared_lock(self, lock_key: str) -> None:
+        """Release the cross-worker load lock for a key"""
+        try:
+            self.redis_client.delete(lock_key)
+        except Exception as e:
+            logger.error(f"Redis unlock error: {e}")
+            self.stats['errors'] += 1
+    
+    def _wait_for_shared_value(self, key: str, lock_timeout: float) -> Any:
+        """Poll for a value another worker is loading, until its lock goes away"""
+        deadline = time.monotonic() + lock_timeout
+        lock_key = f"{key}:lock"
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            try:
+                if not self.redis_client.exists(lock_key):
+                    break
+            except Exception:
+                break
+        return self.get(key, _MISSING)
+    
     def _get_redis(self, key: str, default: Any) -> Any:
         """Get value from Redis"""
         try:
@@ -208,33 +390,38 @@ class CacheService:
     
     def _get_memory(self, key: str, default: Any) -> Any:
         """Get value from memory cache"""
-        if key not in self.memory_cache:
-            self.stats['misses'] += 1
-            return default
-        
-        cache_entry = self.memory_cache[key]
-        
-        # Check TTL
-        if datetime.now(timezone.utc) > cache_entry['expires_at']:
-            del self.memory_cache[key]
-            self.stats['misses'] += 1
-            return default
-        
-        self.stats['hits'] += 1
-        return cache_entry['value']
+        with self._lock:
+            cache_entry = self.memory_cache.get(key)
+            if cache_entry is None:
+                self.stats['misses'] += 1
+                return default
+            
+            # Check TTL
+            if time.monotonic() > cache_entry['expires_at']:
+                del self.memory_cache[key]
+                self.stats['misses'] += 1
+                return default
+            
+            self.memory_cache.move_to_end(key)
+            self.stats['hits'] += 1
+            return cache_entry['value']
     
     def _set_memory(self, key: str, value: Any, ttl: int, config: CacheConfig) -> bool:
-        """Set value in memory cache"""
+        """Set value in memory cache, evicting least recently used entries past max_entries"""
         try:
-            expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
-            
-            self.memory_cache[key] = {
-                'value': value,
-                'expires_at': expires_at,
-                'created_at': datetime.now(timezone.utc)
-            }
-            
-            self.stats['sets'] += 1
+            with self._lock:
+                self.memory_cache[key] = {
+                    'value': value,
+                    'expires_at': time.monotonic() + ttl,
+                    'created_at': datetime.now(timezone.utc)
+                }
+                self.memory_cache.move_to_end(key)
+                
+                while len(self.memory_cache) > self.max_entries:
+                    self.memory_cache.popitem(last=False)
+                    self.stats['evictions'] += 1
+                
+                self.stats['sets'] += 1
             return True
         except Exception as e:
             logger.error(f"Memory set error: {e}")
@@ -243,36 +430,39 @@ class CacheService:
     
     def _delete_memory(self, key: str) -> bool:
         """Delete value from memory cache"""
-        if key in self.memory_cache:
-            del self.memory_cache[key]
-            self.stats['deletes'] += 1
-            return True
-        return False
+        with self._lock:
+            if key in self.memory_cache:
+                del self.memory_cache[key]
+                self.stats['deletes'] += 1
+                return True
+            return False
     
     def _exists_memory(self, key: str) -> bool:
         """Check if key exists in memory cache"""
-        if key not in self.memory_cache:
-            return False
-        
-        # Check TTL
-        cache_entry = self.memory_cache[key]
-        if datetime.now(timezone.utc) > cache_entry['expires_at']:
-            del self.memory_cache[key]
-            return False
-        
-        return True
+        with self._lock:
+            cache_entry = self.memory_cache.get(key)
+            if cache_entry is None:
+                return False
+            
+            # Check TTL
+            if time.monotonic() > cache_entry['expires_at']:
+                del self.memory_cache[key]
+                return False
+            
+            return True
     
     def _clear_memory(self, pattern: str = None) -> int:
         """Clear memory cache entries"""
-        if pattern:
-            keys_to_delete = [k for k in self.memory_cache.keys() if pattern in k]
-            for key in keys_to_delete:
-                del self.memory_cache[key]
-            return len(keys_to_delete)
-        else:
-            count = len(self.memory_cache)
-            self.memory_cache.clear()
-            return count
+        with self._lock:
+            if pattern:
+                keys_to_delete = [k for k in self.memory_cache.keys() if pattern in k]
+                for key in keys_to_delete:
+                    del self.memory_cache[key]
+                return len(keys_to_delete)
+            else:
+                count = len(self.memory_cache)
+                self.memory_cache.clear()
+                return count
     
     def _serialize(self, value: Any, config: CacheConfig) -> bytes:
         """Serialize value for storage"""
@@ -361,7 +551,7 @@ def cache_invalidate(pattern: str = None):
 
 
 # Global cache service instance
-cache_service = CacheService()
+cache_service = CacheService(config.REDIS_URL, max_entries=config.CACHE_MAX_ENTRIES)
 
 
 def get_cache_service() -> CacheService:
@@ -369,7 +559,11 @@ def get_cache_service() -> CacheService:
     return cache_service
 
 
-def setup_cache_service(redis_url: Optional[str] = None):
-    """Setup cache service with Redis"""
+def setup_cache_service(redis_url: Optional[str] = None, redis_client: Optional[Any] = None):
+    """Setup cache service with Redis (or a FakeRedis client in tests)"""
     global cache_service
-    cache_service = CacheService(redis_url)
+    cache_service = CacheService(
+        redis_url or config.REDIS_URL,
+        redis_client=redis_client,
+        max_entries=config.CACHE_MAX_ENTRIES
+    )
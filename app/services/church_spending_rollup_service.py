@@ -0,0 +1,253 @@
+"""
+Church Spending Rollup Service
+
+Maintains church_spending_rollups: per (church, day) category and merchant
+spend of a church's donors, with a HyperLogLog sketch of contributing donors
+so daily buckets can be merged into distinct-donor counts for any range.
+
+Rollups are fed from the Plaid /transactions/sync deltas in the same commit
+that advances the item cursor. Every counted transaction id is recorded in
+church_spending_rollup_transactions and skipped if seen again, so a sync that
+replays transactions a rebuild already pulled counts each one once.
+Pending transactions are skipped (Plaid re-adds them under a new id once they
+post); modified and removed posted transactions are not reversed. Use
+rebuild_church_rollups to recompute a window from Plaid.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timezone, timedelta
+from decimal import Decimal
+from typing import Dict, List, Any, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.model.m_church_spending_rollup import ChurchSpendingRollup, ChurchSpendingRollupTransaction
+from app.model.m_user import User
+from app.model.m_plaid_items import PlaidItem
+from app.utils.hyperloglog import HyperLogLog
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = ("category", "merchant")
+
+
+def _transaction_buckets(transaction: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """(dimension, key) buckets a spending transaction contributes to"""
+    buckets = []
+    categories = transaction.get("category") or []
+    if categories:
+        # Use the first category as primary
+        buckets.append(("category", str(categories[0])[:255]))
+    merchant = transaction.get("merchant_name") or transaction.get("name") or "Unknown"
+    buckets.append(("merchant", str(merchant)[:255]))
+    return buckets
+
+
+def _transaction_day(transaction: Dict[str, Any]) -> Optional[date]:
+    value = transaction.get("date")
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except (TypeError, ValueError):
+        return None
+
+
+class ChurchSpendingRollupService:
+    """Accumulates and reads church spending rollups"""
+
+    @staticmethod
+    def record_transactions(db: Session, church_id: int, user_id: int, transactions: List[Dict[str, Any]]) -> int:
+        """
+        Fold a donor's newly synced transactions into the church rollups
+
+        Transactions already counted for the church (by transaction_id) are
+        skipped. Does not commit; the caller commits together with the sync cursor.
+
+        Returns:
+            Number of transactions counted
+        """
+        # (dimension, day, key) -> [amount, count]
+        deltas: Dict[Tuple[str, date, str], List[Any]] = defaultdict(lambda: [Decimal("0"), 0])
+        counted = 0
+
+        spending = []
+        for transaction in transactions:
+            if transaction.get("pending") or transaction.get("amount") is None:
+                continue
+            if transaction["amount"] >= 0:  # Spending transactions only
+                continue
+            day = _transaction_day(transaction)
+            if day is None:
+                continue
+            spending.append((transaction, day))
+
+        transaction_ids = {t["transaction_id"] for t, _ in spending if t.get("transaction_id")}
+        seen = set()
+        if transaction_ids:
+            seen = {
+                row.transaction_id
+                for row in db.query(ChurchSpendingRollupTransaction.transaction_id).filter(
+                    ChurchSpendingRollupTransaction.church_id == church_id,
+                    ChurchSpendingRollupTransaction.transaction_id.in_(transaction_ids)
+                ).all()
+            }
+
+        for transaction, day in spending:
+            transaction_id = transaction.get("transaction_id")
+            if transaction_id:
+                if transaction_id in seen:
+                    continue
+                seen.add(transaction_id)
+                db.add(ChurchSpendingRollupTransaction(
+                    church_id=church_id,
+                    transaction_id=transaction_id,
+                    day=day
+                ))
+
+            amount = Decimal(str(abs(transaction["amount"])))
+            for dimension, key in _transaction_buckets(transaction):
+                bucket = deltas[(dimension, day, key)]
+                bucket[0] += amount
+                bucket[1] += 1
+            counted += 1
+
+        if not deltas:
+            return 0
+
+        # Lock the buckets that already exist, in one query
+        existing = {
+            (row.dimension, row.day, row.key): row
+            for row in db.query(ChurchSpendingRollup).filter(
+                ChurchSpendingRollup.church_id == church_id,
+                or_(*[
+                    and_(
+                        ChurchSpendingRollup.dimension == dimension,
+                        ChurchSpendingRollup.day == day,
+                        ChurchSpendingRollup.key == key
+                    )
+                    for dimension, day, key in deltas
+                ])
+            ).with_for_update().all()
+        }
+
+        for bucket_key, (amount, count) in deltas.items():
+            row = existing.get(bucket_key)
+            if row is None:
+                dimension, day, key = bucket_key
+                row = ChurchSpendingRollup(
+                    church_id=church_id,
+                    dimension=dimension,
+                    day=day,
+                    key=key,
+                    total_amount=Decimal("0"),
+                    transaction_count=0
+                )
+                db.add(row)
+
+            sketch = HyperLogLog.from_bytes(row.donor_sketch)
+            sketch.add(user_id)
+            row.total_amount = Decimal(str(row.total_amount or 0)) + amount
+            row.transaction_count = (row.transaction_count or 0) + count
+            row.donor_sketch = sketch.to_bytes()
+
+        return counted
+
+    @staticmethod
+    def record_user_transactions(db: Session, user_id: int, transactions: List[Dict[str, Any]]) -> int:
+        """record_transactions for a donor's current church (no-op without one)"""
+        church_id = db.query(User.church_id).filter(User.id == user_id).scalar()
+        if not church_id:
+            return 0
+        return ChurchSpendingRollupService.record_transactions(db, church_id, user_id, transactions)
+
+    @staticmethod
+    def get_rollup(
+        db: Session,
+        church_id: int,
+        dimension: str,
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Merge daily buckets over [start_date, end_date]
+
+        Returns:
+            Dict of key -> {total_amount, transaction_count, donors_count}
+        """
+        rows = db.query(
+            ChurchSpendingRollup.key,
+            ChurchSpendingRollup.total_amount,
+            ChurchSpendingRollup.transaction_count,
+            ChurchSpendingRollup.donor_sketch
+        ).filter(
+            ChurchSpendingRollup.church_id == church_id,
+            ChurchSpendingRollup.dimension == dimension,
+            ChurchSpendingRollup.day >= start_date,
+            ChurchSpendingRollup.day <= end_date
+        ).all()
+
+        merged: Dict[str, Dict[str, Any]] = {}
+        for key, total_amount, transaction_count, donor_sketch in rows:
+            entry = merged.get(key)
+            if entry is None:
+                entry = merged[key] = {"total_amount": 0.0, "transaction_count": 0, "sketch": HyperLogLog()}
+            entry["total_amount"] += float(total_amount or 0)
+            entry["transaction_count"] += transaction_count or 0
+            if donor_sketch:
+                entry["sketch"].merge(HyperLogLog.from_bytes(donor_sketch))
+
+        return {
+            key: {
+                "total_amount": entry["total_amount"],
+                "transaction_count": entry["transaction_count"],
+                "donors_count": entry["sketch"].count()
+            }
+            for key, entry in merged.items()
+        }
+
+    @staticmethod
+    def rebuild_church_rollups(db: Session, church_id: int, days_back: int = 90) -> Dict[str, Any]:
+        """
+        Recompute a church's rollups for the trailing window straight from Plaid
+
+        For backfills and repairs; runs the per-donor Plaid fan-out once, off the
+        request path. Commits.
+        """
+        from app.services.plaid_client import get_transactions
+
+        start_date = datetime.now(timezone.utc).date() - timedelta(days=days_back)
+
+        db.query(ChurchSpendingRollup).filter(
+            ChurchSpendingRollup.church_id == church_id,
+            ChurchSpendingRollup.day >= start_date
+        ).delete(synchronize_session=False)
+        db.query(ChurchSpendingRollupTransaction).filter(
+            ChurchSpendingRollupTransaction.church_id == church_id,
+            ChurchSpendingRollupTransaction.day >= start_date
+        ).delete(synchronize_session=False)
+
+        donor_items = db.query(PlaidItem.user_id, PlaidItem.access_token).join(
+            User, User.id == PlaidItem.user_id
+        ).filter(
+            User.church_id == church_id,
+            User.role == "donor",
+            User.is_active == True,
+            PlaidItem.status == "active"
+        ).all()
+
+        counted = 0
+        failed = 0
+        for user_id, access_token in donor_items:
+            try:
+                transactions = get_transactions(access_token=access_token, days_back=days_back).get("transactions", [])
+                counted += ChurchSpendingRollupService.record_transactions(db, church_id, user_id, transactions)
+                db.flush()
+            except Exception as e:
+                failed += 1
+                logger.error(f"Error rebuilding spending rollups for donor {user_id}: {str(e)}")
+
+        db.commit()
+        return {"church_id": church_id, "transactions_counted": counted, "items_failed": failed}
@@ -7,6 +7,8 @@ Handles creation, delivery, and management of notifications through the database
 
 import logging
 from typing import Dict, Any, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 
@@ -193,7 +195,7 @@ class DatabaseNotificationService:
                 actor_type="system",
                 actor_id=user_id,
                 action="USER_NOTIFICATION",
-                details_json={
+                additional_data={
                     "type": notification_type,
                     "title": title,
                     "content": content,
@@ -262,6 +264,62 @@ class DatabaseNotificationService:
                 "error": str(e)
             }
     
+    @staticmethod
+    def _church_message_columns():
+        """Columns of a user's church message notifications"""
+        return (
+            UserMessage.id.label('user_message_id'),
+            UserMessage.is_read,
+            UserMessage.read_at,
+            UserMessage.created_at.label('user_message_created_at'),
+            ChurchMessage.id.label('church_message_id'),
+            ChurchMessage.title,
+            ChurchMessage.content,
+            ChurchMessage.type,
+            ChurchMessage.priority,
+            ChurchMessage.created_at.label('church_message_created_at')
+        )
+    
+    @staticmethod
+    def _merge_notifications(church_messages, audit_notifications) -> List[Dict[str, Any]]:
+        """Format church message rows and audit log notifications, most recent first"""
+        notifications = []
+        
+        # Process church messages
+        for msg in church_messages:
+            notifications.append({
+                "id": f"church_{msg.user_message_id}",
+                "type": "church_message",
+                "title": msg.title or "Church Message",
+                "content": msg.content or "",
+                "message_type": msg.type.value if msg.type else "general",
+                "priority": msg.priority.value if msg.priority else "medium",
+                "is_read": msg.is_read,
+                "read_at": msg.read_at.isoformat() if msg.read_at else None,
+                "created_at": msg.user_message_created_at.isoformat() if msg.user_message_created_at else None,
+                "church_message_id": msg.church_message_id
+            })
+        
+        # Process audit log notifications
+        for audit_log in audit_notifications:
+            details = audit_log.additional_data or {}
+            notifications.append({
+                "id": f"audit_{audit_log.id}",
+                "type": "system_notification",
+                "title": details.get("title", "System Notification"),
+                "content": details.get("content", audit_log.action),
+                "message_type": details.get("type", "info"),
+                "priority": details.get("priority", "medium"),
+                "is_read": False,  # Audit logs don't track read status
+                "read_at": None,
+                "created_at": audit_log.created_at.isoformat() if audit_log.created_at else None,
+                "audit_log_id": audit_log.id
+            })
+        
+        # Sort by created_at (most recent first)
+        notifications.sort(key=lambda x: x["created_at"] or "1970-01-01T00:00:00", reverse=True)
+        return notifications
+    
     @staticmethod
     def get_user_notifications(
         user_id: int,
@@ -288,16 +346,7 @@ class DatabaseNotificationService:
             
             # Get church messages with church message details in one query
             church_messages_query = db.query(
-                UserMessage.id.label('user_message_id'),
-                UserMessage.is_read,
-                UserMessage.read_at,
-                UserMessage.created_at.label('user_message_created_at'),
-                ChurchMessage.id.label('church_message_id'),
-                ChurchMessage.title,
-                ChurchMessage.content,
-                ChurchMessage.type,
-                ChurchMessage.priority,
-                ChurchMessage.created_at.label('church_message_created_at')
+                *DatabaseNotificationService._church_message_columns()
             ).join(
                 ChurchMessage, UserMessage.message_id == ChurchMessage.id
             ).filter(
@@ -321,41 +370,9 @@ class DatabaseNotificationService:
                 desc(AuditLog.created_at)
             ).all()
             
-            notifications = []
-            
-            # Process church messages
-            for msg in church_messages:
-                notifications.append({
-                    "id": f"church_{msg.user_message_id}",
-                    "type": "church_message",
-                    "title": msg.title or "Church Message",
-                    "content": msg.content or "",
-                    "message_type": msg.type.value if msg.type else "general",
-                    "priority": msg.priority.value if msg.priority else "medium",
-                    "is_read": msg.is_read,
-                    "read_at": msg.read_at.isoformat() if msg.read_at else None,
-                    "created_at": msg.user_message_created_at.isoformat() if msg.user_message_created_at else None,
-                    "church_message_id": msg.church_message_id
-                })
-            
-            # Process audit log notifications
-            for audit_log in audit_notifications:
-                details = audit_log.details_json or {}
-                notifications.append({
-                    "id": f"audit_{audit_log.id}",
-                    "type": "system_notification",
-                    "title": details.get("title", "System Notification"),
-                    "content": details.get("content", audit_log.action),
-                    "message_type": details.get("type", "info"),
-                    "priority": details.get("priority", "medium"),
-                    "is_read": False,  # Audit logs don't track read status
-                    "read_at": None,
-                    "created_at": audit_log.created_at.isoformat() if audit_log.created_at else None,
-                    "audit_log_id": audit_log.id
-                })
-            
-            # Sort by created_at (most recent first)
-            notifications.sort(key=lambda x: x["created_at"] or "1970-01-01T00:00:00", reverse=True)
+            notifications = DatabaseNotificationService._merge_notifications(
+                church_messages, audit_notifications
+            )
             
             # Apply pagination to combined results
             total_count = len(notifications)
@@ -390,6 +407,88 @@ class DatabaseNotificationService:
                 "has_more": False
             }
     
+    @staticmethod
+    async def get_user_notifications_async(
+        user_id: int,
+        limit: int = 50,
+        offset: int = 0,
+        unread_only: bool = False,
+        db: AsyncSession = None
+    ) -> Dict[str, Any]:
+        """
+        Get notifications for a user on the async database path
+        
+        Same result as get_user_notifications. Only the first offset + limit
+        rows of each source can land on the requested page, so each source is
+        read up to that bound and the totals come from a single count query.
+        """
+        try:
+            window = offset + limit
+            
+            church_filters = [UserMessage.user_id == user_id]
+            if unread_only:
+                church_filters.append(UserMessage.is_read == False)
+            audit_filters = (
+                AuditLog.actor_id == user_id,
+                AuditLog.action == "USER_NOTIFICATION"
+            )
+            
+            church_messages = (await db.execute(
+                select(*DatabaseNotificationService._church_message_columns())
+                .join(ChurchMessage, UserMessage.message_id == ChurchMessage.id)
+                .where(*church_filters)
+                .order_by(UserMessage.created_at.desc())
+                .limit(window)
+            )).all()
+            
+            audit_notifications = (await db.execute(
+                select(AuditLog).where(*audit_filters)
+                .order_by(AuditLog.created_at.desc())
+                .limit(window)
+            )).scalars().all()
+            
+            church_count, audit_count, unread_count = (await db.execute(
+                select(
+                    select(func.count()).select_from(UserMessage)
+                    .join(ChurchMessage, UserMessage.message_id == ChurchMessage.id)
+                    .where(*church_filters).scalar_subquery(),
+                    select(func.count()).select_from(AuditLog)
+                    .where(*audit_filters).scalar_subquery(),
+                    # Unread count covers church messages only (audit logs don't track read status)
+                    select(func.count()).select_from(UserMessage)
+                    .where(UserMessage.user_id == user_id, UserMessage.is_read == False)
+                    .scalar_subquery()
+                )
+            )).one()
+            
+            notifications = DatabaseNotificationService._merge_notifications(
+                church_messages, audit_notifications
+            )
+            total_count = church_count + audit_count
+            
+            return {
+                "success": True,
+                "notifications": notifications[offset:window],
+                "total_count": total_count,
+                "unread_count": unread_count,
+                "limit": limit,
+                "offset": offset,
+                "has_more": window < total_count
+            }
+            
+        except Exception as e:
+            logging.error(f"Error getting user notifications for user {user_id}: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e),
+                "notifications": [],
+                "total_count": 0,
+                "unread_count": 0,
+                "limit": limit,
+                "offset": offset,
+                "has_more": False
+            }
+    
     @staticmethod
     def mark_notification_read(
         user_id: int,
@@ -542,7 +641,7 @@ class DatabaseNotificationService:
                 actor_type="system",
                 actor_id=user_id,
                 action="USER_NOTIFICATION",
-                details_json={
+                additional_data={
                     "title": "Account Setup Complete",
                     "content": "Your Manna account has been successfully set up. You can now start making donations and managing your giving preferences.",
                     "type": "success",
@@ -9,7 +9,7 @@ Handles individual donor payout scheduling based on:
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import and_, or_, func, case
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Any, Optional
 import logging
@@ -43,7 +43,7 @@ class DonorScheduleService:
                 DonorPayout.user_id == user.id,
                 DonorPayout.status == "completed"
             )
-        ).order_by(DonorPayout.processed_at.desc()).first()
+        ).order_by(DonorPayout.processed_at.desc().nullslast()).first()
         
         if last_donation:
             # Calculate next donation based on frequency from last donation
@@ -80,69 +80,101 @@ class DonorScheduleService:
         if target_date is None:
             target_date = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
         
-        # Get all active donors with preferences
-        donors_with_preferences = db.query(
+        day_start = datetime(target_date.year, target_date.month, target_date.day, tzinfo=target_date.tzinfo or timezone.utc)
+        
+        # Rank each donor's completed payouts newest first, so the last payout date and the
+        # rolling 3-payout average come out of one windowed pass over donor_payouts
+        ranked_payouts = db.query(
+            DonorPayout.user_id.label("user_id"),
+            DonorPayout.processed_at.label("processed_at"),
+            DonorPayout.donation_amount.label("donation_amount"),
+            func.row_number().over(
+                partition_by=DonorPayout.user_id,
+                order_by=DonorPayout.processed_at.desc().nullslast()
+            ).label("rn")
+        ).filter(
+            DonorPayout.status == "completed"
+        ).subquery()
+        
+        payout_history = db.query(
+            ranked_payouts.c.user_id,
+            func.max(case((ranked_payouts.c.rn == 1, ranked_payouts.c.processed_at))).label("last_processed_at"),
+            func.avg(case((ranked_payouts.c.rn <= 3, ranked_payouts.c.donation_amount))).label("recent_average")
+        ).filter(
+            ranked_payouts.c.rn <= 3
+        ).group_by(
+            ranked_payouts.c.user_id
+        ).subquery()
+        
+        # Next donation = last payout (or signup) + 14 days, or + 30 days for monthly donors.
+        # Filter on the base date so the due-date check runs in the database.
+        base_date = func.coalesce(payout_history.c.last_processed_at, User.created_at)
+        is_monthly = DonationPreference.frequency == "monthly"
+        
+        def due_window(days: int):
+            window_start = day_start - timedelta(days=days)
+            return and_(base_date >= window_start, base_date < window_start + timedelta(days=1))
+        
+        due_donor_rows = db.query(
             User.id,
             User.first_name,
             User.last_name,
             User.email,
-            User.created_at,
             User.stripe_customer_id,
             DonationPreference.frequency,
             DonationPreference.multiplier,
             DonationPreference.target_church_id,
             DonationPreference.minimum_roundup,
-            DonationPreference.monthly_cap
+            DonationPreference.monthly_cap,
+            base_date.label("base_date"),
+            payout_history.c.recent_average
         ).join(
             DonationPreference, User.id == DonationPreference.user_id
+        ).outerjoin(
+            payout_history, payout_history.c.user_id == User.id
         ).filter(
             and_(
                 User.is_active == True,
                 User.role == "donor",
                 DonationPreference.pause == False,
                 DonationPreference.roundups_enabled == True,
-                User.stripe_customer_id.isnot(None)
+                User.stripe_customer_id.isnot(None),
+                or_(
+                    and_(is_monthly, due_window(30)),
+                    and_(or_(DonationPreference.frequency.is_(None), ~is_monthly), due_window(14))
+                )
             )
         ).all()
         
         due_donors = []
         
-        for donor_data in donors_with_preferences:
-            user_id, first_name, last_name, email, created_at, stripe_customer_id, frequency, multiplier, target_church_id, minimum_roundup, monthly_cap = donor_data
+        for donor_data in due_donor_rows:
+            user_id, first_name, last_name, email, stripe_customer_id, frequency, multiplier, target_church_id, minimum_roundup, monthly_cap, donor_base_date, recent_average = donor_data
             
-            # Create temporary objects for calculation
-            user = User()
-            user.id = user_id
-            user.created_at = created_at
+            next_donation_date = donor_base_date + timedelta(days=30 if frequency == "monthly" else 14)
             
-            preference = DonationPreference()
-            preference.frequency = frequency
-            preference.multiplier = multiplier
-            preference.target_church_id = target_church_id
-            preference.minimum_roundup = minimum_roundup
-            preference.monthly_cap = monthly_cap
+            # Same estimate as calculate_estimated_donation_amount, from the pre-aggregated history
+            if recent_average is not None:
+                estimated_amount = float(recent_average)
+            else:
+                estimated_amount = float(minimum_roundup) if minimum_roundup else 1.0
             
-            # Calculate next donation date
-            next_donation_date = DonorScheduleService.calculate_next_donation_date(user, preference, db)
+            if monthly_cap and estimated_amount > float(monthly_cap):
+                estimated_amount = float(monthly_cap)
             
-            # Check if this donor is due today
-            if next_donation_date.date() == target_date.date():
-                # Calculate estimated donation amount
-                estimated_amount = DonorScheduleService.calculate_estimated_donation_amount(user, preference, db)
-                
-                due_donors.append({
-                    "user_id": user_id,
-                    "name": f"{first_name} {last_name}",
-                    "email": email,
-                    "frequency": frequency,
-                    "multiplier": multiplier,
-                    "target_church_id": target_church_id,
-                    "estimated_amount": estimated_amount,
-                    "minimum_roundup": float(minimum_roundup) if minimum_roundup else 1.0,
-                    "monthly_cap": float(monthly_cap) if monthly_cap else None,
-                    "next_donation_date": next_donation_date.isoformat(),
-                    "stripe_customer_id": stripe_customer_id
-                })
+            due_donors.append({
+                "user_id": user_id,
+                "name": f"{first_name} {last_name}",
+                "email": email,
+                "frequency": frequency,
+                "multiplier": multiplier,
+                "target_church_id": target_church_id,
+                "estimated_amount": round(estimated_amount, 2),
+                "minimum_roundup": float(minimum_roundup) if minimum_roundup else 1.0,
+                "monthly_cap": float(monthly_cap) if monthly_cap else None,
+                "next_donation_date": next_donation_date.isoformat(),
+                "stripe_customer_id": stripe_customer_id
+            })
         
         return due_donors
     
@@ -165,7 +197,7 @@ class DonorScheduleService:
                 DonorPayout.user_id == user.id,
                 DonorPayout.status == "completed"
             )
-        ).order_by(DonorPayout.processed_at.desc()).limit(3).all()
+        ).order_by(DonorPayout.processed_at.desc().nullslast()).limit(3).all()
         
         if recent_donations:
             # Calculate average from recent donations
@@ -182,17 +214,31 @@ class DonorScheduleService:
         return round(average_amount, 2)
     
     @staticmethod
-    def process_donor_payout(user_id: int, db: Session) -> Dict[str, Any]:
+    def payout_idempotency_key(user_id: int, period: str) -> str:
+        """Stripe idempotency key for a donor's scheduled payout in a period"""
+        return f"scheduled-donor-payout:{user_id}:{period}"
+    
+    @staticmethod
+    def process_donor_payout(user_id: int, db: Session, period: Optional[str] = None) -> Dict[str, Any]:
         """
         Process payout for a specific donor
         
+        Safe to retry for the same period: an existing scheduled payout for the
+        period is returned as-is, and the Stripe payment intent is created with
+        an idempotency key derived from (user_id, period).
+        
         Args:
             user_id: User ID to process
             db: Database session
+            period: Payout period (YYYY-MM-DD, defaults to today UTC)
             
         Returns:
             Dict with processing result
         """
+        if period is None:
+            period = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        collection_period = f"{period}_{period}"
+        
         try:
             # Get user and preference
             user = db.query(User).filter_by(id=user_id).first()
@@ -203,6 +249,22 @@ class DonorScheduleService:
             if not preference:
                 return {"success": False, "error": "Donation preference not found"}
             
+            # A previous attempt for this period already completed
+            existing_payout = db.query(DonorPayout).filter(
+                DonorPayout.user_id == user_id,
+                DonorPayout.collection_period == collection_period,
+                DonorPayout.donation_type == "scheduled"
+            ).first()
+            if existing_payout:
+                return {
+                    "success": True,
+                    "donor_payout_id": existing_payout.id,
+                    "amount": float(existing_payout.donation_amount),
+                    "payment_intent_id": None,
+                    "user_name": user.full_name,
+                    "already_processed": True
+                }
+            
             # Calculate donation amount
             donation_amount = DonorScheduleService.calculate_estimated_donation_amount(user, preference, db)
             
@@ -220,8 +282,10 @@ class DonorScheduleService:
                     "church_id": str(preference.target_church_id) if preference.target_church_id else "default",
                     "type": "scheduled_donation",
                     "frequency": preference.frequency,
-                    "multiplier": preference.multiplier
-                }
+                    "multiplier": preference.multiplier,
+                    "period": period
+                },
+                idempotency_key=DonorScheduleService.payout_idempotency_key(user_id, period)
             )
             
             # Create DonorPayout record
@@ -232,7 +296,7 @@ class DonorScheduleService:
                 roundup_multiplier=float(preference.multiplier.replace('x', '')),
                 base_roundup_amount=donation_amount / float(preference.multiplier.replace('x', '')),
                 plaid_transaction_count=1,  # Placeholder
-                collection_period=f"{datetime.now(timezone.utc).strftime('%Y-%m-%d')}_{datetime.now(timezone.utc).strftime('%Y-%m-%d')}",
+                collection_period=collection_period,
                 donation_type="scheduled",
                 status="completed",
                 processed_at=datetime.now(timezone.utc)
@@ -11,7 +11,6 @@ Implements:
 """
 
 import time
-import psutil
 import logging
 import json
 from typing import Dict, List, Optional, Any
@@ -22,9 +21,12 @@ from sqlalchemy import text, func
 from fastapi import Request
 
 from app.model.m_user import User
-from app.model.m_church import Church
 from app.model.m_roundup_new import DonorPayout, ChurchPayout
 from app.core.responses import ResponseFactory
+from app.services.platform_counters import get_platform_counters
+from app.services.request_metrics import get_request_metrics
+from app.services.system_metrics_sampler import get_system_metrics_sampler
+from app.utils.database import checked_out_connections
 
 logger = logging.getLogger(__name__)
 
@@ -84,38 +86,20 @@ class MonitoringService:
         self.alerts: List[Dict[str, Any]] = []
     
     def collect_system_metrics(self) -> SystemMetrics:
-        """Collect current system metrics"""
+        """Current system metrics, from the background sampler's latest sample"""
         try:
-            # CPU metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
-            
-            # Memory metrics
-            memory = psutil.virtual_memory()
-            memory_percent = memory.percent
-            memory_available_gb = memory.available / (1024**3)
-            
-            # Disk metrics
-            disk = psutil.disk_usage('/')
-            disk_percent = (disk.used / disk.total) * 100
-            disk_free_gb = disk.free / (1024**3)
-            
-            # Process metrics
-            process = psutil.Process()
-            process_memory_mb = process.memory_info().rss / (1024**2)
-            
-            # Network connections
-            active_connections = len(psutil.net_connections())
+            sample = get_system_metrics_sampler().latest()
             
             return SystemMetrics(
-                timestamp=datetime.now(timezone.utc).isoformat(),
-                cpu_percent=cpu_percent,
-                memory_percent=memory_percent,
-                memory_available_gb=round(memory_available_gb, 2),
-                disk_percent=disk_percent,
-                disk_free_gb=round(disk_free_gb, 2),
-                process_memory_mb=round(process_memory_mb, 2),
-                active_connections=active_connections,
-                database_connections=0  # Will be set by database monitoring
+                timestamp=sample.timestamp.isoformat(),
+                cpu_percent=sample.cpu_percent,
+                memory_percent=sample.memory_percent,
+                memory_available_gb=sample.memory_available_gb,
+                disk_percent=sample.disk_percent,
+                disk_free_gb=sample.disk_free_gb,
+                process_memory_mb=sample.process_memory_mb,
+                active_connections=sample.active_connections,
+                database_connections=checked_out_connections()
             )
         except Exception as e:
             logger.error(f"Error collecting system metrics: {e}")
@@ -138,44 +122,31 @@ class MonitoringService:
             yesterday = now - timedelta(days=1)
             one_hour_ago = now - timedelta(hours=1)
             
-            # User metrics
-            total_users = db.query(User).count()
+            # All-time totals from the incrementally maintained counters
+            counters = get_platform_counters(db)
+            total_users = int(counters.get("users.total", 0))
+            total_churches = int(counters.get("churches.total", 0))
+            active_churches = int(counters.get("churches.active", 0))
+            total_donations = float(counters.get("donor_payouts.completed_amount", 0))
+            total_roundups = float(counters.get("donor_payouts.completed_roundup_amount", 0))
+            
+            # Windowed metrics stay index range scans
             active_users_24h = db.query(User).filter(
                 User.last_login >= yesterday
             ).count()
             
-            # Church metrics
-            total_churches = db.query(Church).count()
-            active_churches = db.query(Church).filter(
-                Church.is_active == True
-            ).count()
-            
-            # Donation metrics
-            total_donations_result = db.query(func.sum(DonorPayout.donation_amount)).filter(
-                DonorPayout.status == "completed"
-            ).scalar()
-            total_donations = float(total_donations_result) if total_donations_result else 0.0
-            
-            donations_24h_result = db.query(func.sum(DonorPayout.donation_amount)).filter(
+            donations_24h_result, roundups_24h_result = db.query(
+                func.sum(DonorPayout.donation_amount),
+                func.sum(DonorPayout.donation_amount).filter(DonorPayout.donation_type == "roundup")
+            ).filter(
                 DonorPayout.status == "completed",
                 DonorPayout.created_at >= yesterday
-            ).scalar()
+            ).one()
             donations_24h = float(donations_24h_result) if donations_24h_result else 0.0
-            
-            # Roundup metrics
-            total_roundups_result = db.query(func.sum(DonorPayout.donation_amount)).filter(
-                DonorPayout.status == "completed",
-                DonorPayout.donation_type == "roundup"
-            ).scalar()
-            total_roundups = float(total_roundups_result) if total_roundups_result else 0.0
-            
-            roundups_24h_result = db.query(func.sum(DonorPayout.donation_amount)).filter(
-                DonorPayout.status == "completed",
-                DonorPayout.donation_type == "roundup",
-                DonorPayout.created_at >= yesterday
-            ).scalar()
             roundups_24h = float(roundups_24h_result) if roundups_24h_result else 0.0
             
+            requests_1h = get_request_metrics().summary('1h')
+            
             return ApplicationMetrics(
                 timestamp=now.isoformat(),
                 total_users=total_users,
@@ -186,9 +157,9 @@ class MonitoringService:
                 donations_24h=round(donations_24h, 2),
                 total_roundups=round(total_roundups, 2),
                 roundups_24h=round(roundups_24h, 2),
-                api_requests_1h=0,  # Will be tracked by middleware
-                error_rate_1h=0.0,  # Will be calculated from logs
-                response_time_avg=0.0  # Will be tracked by middleware
+                api_requests_1h=requests_1h['requests'],
+                error_rate_1h=requests_1h['error_rate'],
+                response_time_avg=requests_1h['avg_ms'] / 1000  # seconds, like the alert threshold
             )
         except Exception as e:
             logger.error(f"Error collecting application metrics: {e}")
@@ -277,9 +248,14 @@ class MonitoringService:
         return all(checks)
     
     def track_request(self, request: Request, response_time: float, status_code: int):
-        """Track API request metrics"""
-        # This would be called by middleware
-        pass
+        """Track API request metrics, labelled by the matched route template"""
+        route = request.scope.get('route')
+        get_request_metrics().record(
+            request.method,
+            getattr(route, 'path', None),
+            response_time,
+            status_code
+        )
     
     def track_error(self, error: Exception, context: Dict[str, Any]):
         """Track application errors"""
@@ -329,17 +305,33 @@ class MonitoringService:
         app_metrics = self.collect_application_metrics(db)
         health_status = self.check_health(db)
         
+        from app.services.plaid_client import get_plaid_client_stats
+        
         return {
             'timestamp': datetime.now(timezone.utc).isoformat(),
             'health': health_status,
             'system': asdict(system_metrics),
             'application': asdict(app_metrics),
+            'plaid': get_plaid_client_stats(),
             'alerts': {
                 'active': len([a for a in self.alerts if a['status'] == 'active']),
                 'total': len(self.alerts)
             }
         }
     
+    def get_prometheus_metrics(self) -> str:
+        """Request metrics and pool/cache gauges in the Prometheus text format"""
+        from app.services.cache_service import get_cache_service
+        
+        return get_request_metrics().render_prometheus({
+            'db_pool_connections_checked_out': (
+                'Database connections checked out of the pools', checked_out_connections()
+            ),
+            'cache_hit_rate_percent': (
+                'Application cache hit rate', get_cache_service().get_stats()['hit_rate']
+            ),
+        })
+    
     def get_dashboard_data(self, db: Session) -> Dict[str, Any]:
         """Get data for monitoring dashboard"""
         metrics = self.get_metrics_summary(db)
@@ -1,12 +1,16 @@
 import os
 import time
 import random
+import socket
 import threading
+import urllib3
+from urllib3.connection import HTTPConnection
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Callable
 from plaid.api import plaid_api
 from plaid.configuration import Configuration
 from plaid.api_client import ApiClient
+from plaid.rest import RESTClientObject
 from plaid.api.plaid_api import (
     ItemPublicTokenExchangeRequest,
     AccountsGetRequest,
@@ -22,14 +26,17 @@ from plaid.model.country_code import CountryCode
 from plaid.exceptions import ApiException
 
 from app.config import config
+from app.services.cache_service import get_cache_service, hash_key
 from app.core.constants import (
     PLAID_RATE_LIMIT_DELAY,
     PLAID_MAX_RETRIES,
     PLAID_BACKOFF_MULTIPLIER,
     PLAID_CACHE_TTL,
-    PLAID_TIMEOUT,
+    PLAID_REQUESTS_PER_SECOND,
+    PLAID_RATE_LIMIT_BURST,
     PLAID_CONNECT_TIMEOUT,
-    PLAID_READ_TIMEOUT
+    PLAID_READ_TIMEOUT,
+    PLAID_CONNECTION_POOL_SIZE
 )
 import logging
 
@@ -56,8 +63,51 @@ configuration = Configuration(
     }
 )
 
+# Pooled keep-alive connections; retries are owned by _handle_plaid_rate_limit
+configuration.connection_pool_maxsize = PLAID_CONNECTION_POOL_SIZE
+configuration.retries = False
+configuration.socket_options = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+]
+
+# Default (connect, read) timeout applied at the transport level
+REQUEST_TIMEOUT = (PLAID_CONNECT_TIMEOUT, PLAID_READ_TIMEOUT)
+
+# In-flight call tracking so Plaid slowness is visible before workers run out
+_stats_lock = threading.Lock()
+_plaid_stats = {
+    'in_flight': 0,
+    'peak_in_flight': 0,
+    'requests': 0,
+    'timeouts': 0
+}
+
+class _PlaidRESTClient(RESTClientObject):
+    """REST client that enforces socket timeouts and counts in-flight calls"""
+    
+    def request(self, *args, _request_timeout=None, **kwargs):
+        with _stats_lock:
+            _plaid_stats['in_flight'] += 1
+            _plaid_stats['requests'] += 1
+            _plaid_stats['peak_in_flight'] = max(_plaid_stats['peak_in_flight'], _plaid_stats['in_flight'])
+        try:
+            return super().request(*args, _request_timeout=_request_timeout or REQUEST_TIMEOUT, **kwargs)
+        except urllib3.exceptions.TimeoutError:
+            with _stats_lock:
+                _plaid_stats['timeouts'] += 1
+            raise
+        finally:
+            with _stats_lock:
+                _plaid_stats['in_flight'] -= 1
+
+def get_plaid_client_stats() -> Dict[str, int]:
+    """Snapshot of Plaid HTTP call counters (in-flight, peak, totals)"""
+    with _stats_lock:
+        return dict(_plaid_stats)
+
 # Create client
 api_client = ApiClient(configuration)
+api_client.rest_client = _PlaidRESTClient(configuration)
 plaid_client = plaid_api.PlaidApi(api_client)
 
 # Rate limiting configuration
@@ -65,63 +115,61 @@ RATE_LIMIT_DELAY = PLAID_RATE_LIMIT_DELAY
 MAX_RETRIES = PLAID_MAX_RETRIES
 BACKOFF_MULTIPLIER = PLAID_BACKOFF_MULTIPLIER
 
-# Simple cache for transactions (in production, use Redis)
-_transaction_cache = {}
+class TokenBucket:
+    """Thread-safe token bucket shared by every Plaid call in the process"""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Take a token, sleeping only if the bucket is empty"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                wait = (1 - self._tokens) / self.rate
+            
+            time.sleep(wait)
+
+_rate_limiter = TokenBucket(PLAID_REQUESTS_PER_SECOND, PLAID_RATE_LIMIT_BURST)
+
+# Transactions are cached through the shared CacheService (bounded LRU/TTL, optional Redis)
 CACHE_TTL = PLAID_CACHE_TTL  # 5 minutes cache TTL
 
 def _get_cache_key(access_token: str, days_back: int) -> str:
-    """Generate cache key for transactions"""
-    return f"transactions:{access_token}:{days_back}"
-
-def _is_cache_valid(cache_entry: dict) -> bool:
-    """Check if cache entry is still valid"""
-    if not cache_entry:
-        return False
-    return time.time() - cache_entry.get('timestamp', 0) < CACHE_TTL
+    """Generate cache key for transactions (the access token is hashed, never stored raw)"""
+    return f"plaid:transactions:{hash_key(access_token)}:{days_back}"
 
 class TimeoutError(Exception):
     """Custom timeout exception"""
     pass
 
-def _execute_with_timeout(func, timeout_seconds=PLAID_TIMEOUT, *args, **kwargs):
-    """Execute function with timeout using threading"""
-    result: List[Any] = [None]
-    exception: List[Any] = [None]
-    
-    def target():
-        try:
-            result[0] = func(*args, **kwargs)
-        except Exception as e:
-            exception[0] = e
-    
-    thread = threading.Thread(target=target)
-    thread.daemon = True
-    thread.start()
-    thread.join(timeout_seconds)
-    
-    if thread.is_alive():
-        
-        raise TimeoutError(f"Request timed out after {timeout_seconds} seconds")
-    
-    if exception[0]:
-        raise exception[0]
-    
-    return result[0]
-
 def _handle_plaid_rate_limit(max_retries: int = MAX_RETRIES) -> Callable:
-    """Decorator to handle Plaid rate limiting with exponential backoff and timeout"""
+    """Decorator to handle Plaid rate limiting with exponential backoff and timeout retries"""
     def decorator(func):
         def wrapper(*args, **kwargs):
             last_exception = None
             
             for attempt in range(max_retries):
                 try:
-                    # Add jitter to prevent thundering herd
-                    jitter = random.uniform(0, 0.1)
-                    time.sleep(RATE_LIMIT_DELAY + jitter)
+                    # Only waits when the process-wide request budget is used up
+                    _rate_limiter.acquire()
                     
-                    # Execute with timeout
-                    return _execute_with_timeout(func, PLAID_TIMEOUT, *args, **kwargs)
+                    # Timeouts are enforced by the HTTP client, not a watchdog thread
+                    try:
+                        return func(*args, **kwargs)
+                    except urllib3.exceptions.TimeoutError as e:
+                        raise TimeoutError(f"Plaid request timed out: {e}") from e
                     
                 except ApiException as e:
                     last_exception = e
@@ -293,6 +341,37 @@ def get_transactions_by_date(access_token: str, start_date: str, end_date: str)
         
         raise Exception(f"Failed to get transactions: {e.body}")
 
+def _serialize_transaction(transaction) -> dict:
+    """Convert a Plaid transaction model into the dict format used across the app"""
+    return {
+        "transaction_id": transaction.transaction_id,
+        "account_id": transaction.account_id,
+        "amount": transaction.amount,
+        "date": transaction.date.isoformat() if hasattr(transaction.date, 'isoformat') else str(transaction.date),
+        "name": transaction.name,
+        "merchant_name": transaction.merchant_name,
+        "category": transaction.category,
+        "category_id": transaction.category_id,
+        "pending": transaction.pending,
+        "iso_currency_code": transaction.iso_currency_code,
+        "unofficial_currency_code": transaction.unofficial_currency_code,
+        "location": {
+            "address": transaction.location.address if transaction.location else None,
+            "city": transaction.location.city if transaction.location else None,
+            "region": transaction.location.region if transaction.location else None,
+            "postal_code": transaction.location.postal_code if transaction.location else None,
+            "country": transaction.location.country if transaction.location else None,
+            "lat": transaction.location.lat if transaction.location else None,
+            "lon": transaction.location.lon if transaction.location else None,
+        } if transaction.location else None,
+        "payment_meta": {
+            "reference_number": transaction.payment_meta.reference_number if transaction.payment_meta else None,
+            "ppd_id": transaction.payment_meta.ppd_id if transaction.payment_meta else None,
+            "payment_method": transaction.payment_meta.payment_method if transaction.payment_meta else None,
+            "payment_processor": transaction.payment_meta.payment_processor if transaction.payment_meta else None,
+        } if transaction.payment_meta else None,
+    }
+
 # Get balances with timeout handling
 @_handle_plaid_rate_limit()
 def get_balances(access_token: str):
@@ -337,39 +416,14 @@ def get_transactions_sync(access_token: str, cursor: str = None, count: int = 10
         logging.info(f"Plaid sync response - Added: {len(response.added)}, Modified: {len(response.modified)}, Removed: {len(response.removed)}")
         
         # Convert response to dict format
-        transactions = []
-        for transaction in response.added:
-            transactions.append({
-                "transaction_id": transaction.transaction_id,
-                "account_id": transaction.account_id,
-                "amount": transaction.amount,
-                "date": transaction.date.isoformat() if hasattr(transaction.date, 'isoformat') else str(transaction.date),
-                "name": transaction.name,
-                "merchant_name": transaction.merchant_name,
-                "category": transaction.category,
-                "category_id": transaction.category_id,
-                "pending": transaction.pending,
-                "iso_currency_code": transaction.iso_currency_code,
-                "unofficial_currency_code": transaction.unofficial_currency_code,
-                "location": {
-                    "address": transaction.location.address if transaction.location else None,
-                    "city": transaction.location.city if transaction.location else None,
-                    "region": transaction.location.region if transaction.location else None,
-                    "postal_code": transaction.location.postal_code if transaction.location else None,
-                    "country": transaction.location.country if transaction.location else None,
-                    "lat": transaction.location.lat if transaction.location else None,
-                    "lon": transaction.location.lon if transaction.location else None,
-                } if transaction.location else None,
-                "payment_meta": {
-                    "reference_number": transaction.payment_meta.reference_number if transaction.payment_meta else None,
-                    "ppd_id": transaction.payment_meta.ppd_id if transaction.payment_meta else None,
-                    "payment_method": transaction.payment_meta.payment_method if transaction.payment_meta else None,
-                    "payment_processor": transaction.payment_meta.payment_processor if transaction.payment_meta else None,
-                } if transaction.payment_meta else None,
-            })
+        transactions = [_serialize_transaction(transaction) for transaction in response.added]
+        modified = [_serialize_transaction(transaction) for transaction in response.modified]
+        removed = [transaction.transaction_id for transaction in response.removed]
         
         return {
             "transactions": transactions,
+            "modified": modified,
+            "removed": removed,
             "next_cursor": response.next_cursor,
             "has_more": response.has_more,
             "request_id": response.request_id
@@ -378,53 +432,82 @@ def get_transactions_sync(access_token: str, cursor: str = None, count: int = 10
     except Exception as e:
         raise e
 
-# Legacy function for backward compatibility - now uses sync endpoint
-@_handle_plaid_rate_limit()
-def get_transactions(access_token: str, days_back: int = 30):
+def sync_transactions(access_token: str, cursor: Optional[str] = None) -> dict:
     """
-    Legacy function that uses /transactions/sync for backward compatibility
-    This function fetches all transactions from the last N days
+    Pull all /transactions/sync deltas for an item since the given cursor
+    
+    Pages through the sync endpoint until has_more is False. If Plaid reports
+    that the item changed mid-pagination, the whole pull restarts from the
+    original cursor as recommended by Plaid.
+    
+    Args:
+        access_token: Plaid access token
+        cursor: Cursor persisted from the previous sync (None for full history)
+    
+    Returns:
+        Dict with added, modified and removed deltas plus the next_cursor to persist
     """
-    try:
-        # Check cache first
-        cache_key = _get_cache_key(access_token, days_back)
-        cached_data = _transaction_cache.get(cache_key)
-        
-        if cached_data and _is_cache_valid(cached_data):
-            return cached_data['data']
-        
-        # Fetch all transactions using sync endpoint
-        all_transactions = []
-        cursor = None
+    for attempt in range(MAX_RETRIES):
+        added, modified, removed = [], [], []
+        next_cursor = cursor
         has_more = True
         
-        while has_more:
-            sync_response = get_transactions_sync(access_token, cursor=cursor, count=500)
-            all_transactions.extend(sync_response['transactions'])
-            cursor = sync_response['next_cursor']
-            has_more = sync_response['has_more']
-        
-        # Return all transactions without date filtering for now
-        # This ensures we get all available transactions from Plaid
-        filtered_transactions = all_transactions
-        
-        # Cache the response
-        _transaction_cache[cache_key] = {
-            'data': {
-                'transactions': filtered_transactions,
-                'total_transactions': len(filtered_transactions)
-            },
-            'timestamp': time.time()
-        }
+        try:
+            while has_more:
+                sync_response = get_transactions_sync(access_token, cursor=next_cursor, count=500)
+                added.extend(sync_response['transactions'])
+                modified.extend(sync_response['modified'])
+                removed.extend(sync_response['removed'])
+                next_cursor = sync_response['next_cursor']
+                has_more = sync_response['has_more']
+        except ApiException as e:
+            if "TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION" in str(getattr(e, 'body', '')) and attempt < MAX_RETRIES - 1:
+                logger.warning("Plaid item changed during sync pagination, restarting from saved cursor")
+                continue
+            raise
         
         return {
-            'transactions': filtered_transactions,
-            'total_transactions': len(filtered_transactions)
+            "added": added,
+            "modified": modified,
+            "removed": removed,
+            "next_cursor": next_cursor
         }
+
+def _filter_transactions_since(transactions: List[dict], days_back: int) -> List[dict]:
+    """Keep only transactions dated within the last days_back days"""
+    cutoff = (datetime.today().date() - timedelta(days=days_back)).isoformat()
+    return [t for t in transactions if str(t.get('date', ''))[:10] >= cutoff]
+
+# Legacy function for backward compatibility - now uses sync endpoint
+def get_transactions(access_token: str, days_back: int = 30):
+    """
+    Legacy function that uses /transactions/sync for backward compatibility
+    This function fetches all transactions from the last N days
+    
+    Incremental consumers (roundup processing) should use sync_transactions with
+    the cursor stored on the PlaidItem instead of replaying the full history.
+    """
+    try:
+        # Concurrent requests for the same item share one Plaid fetch
+        return get_cache_service().get_or_set(
+            _get_cache_key(access_token, days_back),
+            lambda: _fetch_transactions(access_token, days_back),
+            ttl=CACHE_TTL
+        )
         
     except Exception as e:
         raise e
 
+def _fetch_transactions(access_token: str, days_back: int) -> dict:
+    """Fetch transactions for the last days_back days from Plaid, bypassing the cache"""
+    sync_result = sync_transactions(access_token)
+    filtered_transactions = _filter_transactions_since(sync_result['added'], days_back)
+    
+    return {
+        'transactions': filtered_transactions,
+        'total_transactions': len(filtered_transactions)
+    }
+
 # Get transactions with options and timeout handling
 @_handle_plaid_rate_limit()
 def get_transactions_with_options(access_token: str, days_back: int = 30, options: Optional[dict] = None):
@@ -6,15 +6,47 @@ Transactions are NOT stored in the database to avoid scalability issues.
 Instead, we fetch them on-demand when needed for roundup calculations.
 """
 
+import heapq
 import logging
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
 from app.model.m_plaid_items import PlaidItem
 # PlaidAccount import removed - using on-demand Plaid API fetching
-from app.services.plaid_client import get_transactions, get_accounts
+from app.services.plaid_client import get_transactions, get_accounts, sync_transactions
+from app.core.constants import PLAID_MAX_CONCURRENT_REQUESTS
 from app.utils.encryption import decrypt_token
 
+# Bounded pool shared by all requests so multi-bank users fetch items in parallel
+_plaid_executor = ThreadPoolExecutor(
+    max_workers=PLAID_MAX_CONCURRENT_REQUESTS,
+    thread_name_prefix="plaid-fetch"
+)
+
+
+def _fetch_items_concurrently(items: List[Dict[str, Any]], fetch: Callable[[Dict[str, Any]], Any]) -> List[Any]:
+    """
+    Run fetch for each item on the shared Plaid pool
+    
+    Items are plain dicts (not ORM objects) so no Session is touched off-thread.
+    Results come back in item order; failed items yield None and are logged.
+    """
+    futures = [_plaid_executor.submit(fetch, item) for item in items]
+    results = []
+    for item, future in zip(items, futures):
+        try:
+            results.append(future.result())
+        except Exception as e:
+            logging.error(f"Error fetching Plaid data for item {item['item_id']}: {str(e)}")
+            results.append(None)
+    return results
+
+
+def _transaction_date_key(transaction: Dict[str, Any]) -> str:
+    """Sort key for transactions by date"""
+    return str(transaction.get('date', ''))
+
 class PlaidTransactionService:
     """Service for fetching transactions on-demand from Plaid"""
     
@@ -51,56 +83,42 @@ class PlaidTransactionService:
                     "total_count": 0
                 }
             
-            all_transactions = []
-            total_count = 0
-            
-            for item in plaid_items:
+            # Snapshot what the workers need; ORM objects stay on this thread
+            items = [
+                {"item_id": item.item_id, "id": item.id, "access_token": item.access_token}
+                for item in plaid_items
                 # Skip if specific items requested and this one not included
-                if account_ids and item.item_id not in account_ids:
-                    continue
+                if not account_ids or item.item_id in account_ids
+            ]
+            
+            def fetch_item_transactions(item: Dict[str, Any]) -> List[Dict[str, Any]]:
+                transactions_response = get_transactions(
+                    access_token=item["access_token"],
+                    days_back=days_back
+                )
+                
+                if transactions_response and hasattr(transactions_response, 'transactions'):
+                    transactions = [t.to_dict() for t in transactions_response.transactions]
+                elif isinstance(transactions_response, dict) and 'transactions' in transactions_response:
+                    transactions = transactions_response['transactions']
+                else:
+                    transactions = []
                 
-                try:
-                    # Get access token directly from PlaidItem (not encrypted in this model)
-                    access_token = item.access_token
-                    
-                    # Fetch transactions from Plaid
-                    transactions_response = get_transactions(
-                        access_token=access_token,
-                        days_back=days_back,
-                        account_ids=None  # PlaidItem doesn't have individual account_ids, fetch all accounts for this item
-                    )
-                    
-                    if transactions_response and hasattr(transactions_response, 'transactions'):
-                        transactions = transactions_response.transactions
-                        
-                        # Add item info to each transaction
-                        for transaction in transactions:
-                            transaction_dict = transaction.to_dict()
-                            transaction_dict['item_id'] = item.item_id
-                            transaction_dict['plaid_item_id'] = item.id
-                            all_transactions.append(transaction_dict)
-                        
-                        total_count += len(transactions)
-                        logging.info(f"Fetched {len(transactions)} transactions for item {item.item_id}")
-                    elif isinstance(transactions_response, dict) and 'transactions' in transactions_response:
-                        # Handle dict response format
-                        transactions = transactions_response['transactions']
-                        
-                        # Add item info to each transaction
-                        for transaction in transactions:
-                            transaction['item_id'] = item.item_id
-                            transaction['plaid_item_id'] = item.id
-                            all_transactions.append(transaction)
-                        
-                        total_count += len(transactions)
-                        logging.info(f"Fetched {len(transactions)} transactions for item {item.item_id}")
-                    
-                except Exception as e:
-                    logging.error(f"Error fetching transactions for item {item.item_id}: {str(e)}")
-                    continue
-            
-            # Sort transactions by date (newest first)
-            all_transactions.sort(key=lambda x: x.get('date', ''), reverse=True)
+                # Copy so cached transaction dicts are never mutated; newest first for the merge
+                item_transactions = [
+                    dict(transaction, item_id=item["item_id"], plaid_item_id=item["id"])
+                    for transaction in transactions
+                ]
+                item_transactions.sort(key=_transaction_date_key, reverse=True)
+                
+                logging.info(f"Fetched {len(item_transactions)} transactions for item {item['item_id']}")
+                return item_transactions
+            
+            per_item = [r for r in _fetch_items_concurrently(items, fetch_item_transactions) if r]
+            
+            # k-way merge of the per-item lists by date (newest first)
+            all_transactions = list(heapq.merge(*per_item, key=_transaction_date_key, reverse=True))
+            total_count = len(all_transactions)
             
             return {
                 "success": True,
@@ -118,6 +136,63 @@ class PlaidTransactionService:
                 "total_count": 0
             }
     
+    @staticmethod
+    def sync_item_transactions(
+        item: PlaidItem,
+        days_back: int = 30
+    ) -> Dict[str, Any]:
+        """
+        Pull transaction deltas for a Plaid item since its stored sync cursor
+        
+        The cursor is NOT saved here; callers persist next_cursor on the item
+        once the deltas have been applied so a failure replays them next time.
+        
+        Args:
+            item: Plaid item to sync
+            days_back: Window for added transactions on the first sync (no cursor yet)
+            
+        Returns:
+            Dict with added, modified and removed deltas and the next_cursor
+        """
+        try:
+            is_initial_sync = not item.transactions_cursor
+            delta = sync_transactions(item.access_token, cursor=item.transactions_cursor)
+            
+            added = delta["added"]
+            if is_initial_sync:
+                # Don't backfill roundups for the item's whole history on first link
+                cutoff = (datetime.now(timezone.utc).date() - timedelta(days=days_back)).isoformat()
+                added = [t for t in added if str(t.get('date', ''))[:10] >= cutoff]
+            
+            for transaction in added + delta["modified"]:
+                transaction['item_id'] = item.item_id
+                transaction['plaid_item_id'] = item.id
+            
+            logging.info(
+                f"Synced item {item.item_id}: {len(added)} added, "
+                f"{len(delta['modified'])} modified, {len(delta['removed'])} removed"
+            )
+            
+            return {
+                "success": True,
+                "added": added,
+                "modified": delta["modified"],
+                "removed": delta["removed"],
+                "next_cursor": delta["next_cursor"],
+                "initial_sync": is_initial_sync
+            }
+            
+        except Exception as e:
+            logging.error(f"Error syncing transactions for item {item.item_id}: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e),
+                "added": [],
+                "modified": [],
+                "removed": [],
+                "next_cursor": item.transactions_cursor
+            }
+    
     @staticmethod
     def get_transactions_for_roundup(
         user_id: int,
@@ -283,41 +358,35 @@ class PlaidTransactionService:
                     "accounts": []
                 }
             
-            account_balances = []
+            items = [{"item_id": item.item_id, "access_token": item.access_token} for item in plaid_items]
             
-            for item in plaid_items:
-                try:
-                    # Get access token from PlaidItem
-                    access_token = item.access_token
-                    
-                    # Get account balances from Plaid
-                    accounts_response = get_accounts(access_token)
-                    
-                    # Handle different response formats
-                    if accounts_response:
-                        if hasattr(accounts_response, 'accounts'):
-                            accounts = accounts_response.accounts
-                        elif isinstance(accounts_response, dict) and 'accounts' in accounts_response:
-                            accounts = accounts_response['accounts']
-                        else:
-                            accounts = []
-                        
-                        for plaid_account in accounts:
-                            account_balances.append({
-                                "account_id": plaid_account.account_id if hasattr(plaid_account, 'account_id') else plaid_account.get('account_id'),
-                                "name": plaid_account.name if hasattr(plaid_account, 'name') else plaid_account.get('name'),
-                                "mask": plaid_account.mask if hasattr(plaid_account, 'mask') else plaid_account.get('mask'),
-                                "type": plaid_account.type if hasattr(plaid_account, 'type') else plaid_account.get('type'),
-                                "subtype": plaid_account.subtype if hasattr(plaid_account, 'subtype') else plaid_account.get('subtype'),
-                                "current_balance": plaid_account.balances.current if hasattr(plaid_account, 'balances') and hasattr(plaid_account.balances, 'current') else plaid_account.get('balances', {}).get('current'),
-                                "available_balance": plaid_account.balances.available if hasattr(plaid_account, 'balances') and hasattr(plaid_account.balances, 'available') else plaid_account.get('balances', {}).get('available'),
-                                "limit": plaid_account.balances.limit if hasattr(plaid_account, 'balances') and hasattr(plaid_account.balances, 'limit') else plaid_account.get('balances', {}).get('limit'),
-                                "currency_code": plaid_account.balances.iso_currency_code if hasattr(plaid_account, 'balances') and hasattr(plaid_account.balances, 'iso_currency_code') else plaid_account.get('balances', {}).get('iso_currency_code', 'USD')
-                            })
+            def fetch_item_accounts(item: Dict[str, Any]) -> List[Any]:
+                # Get account balances from Plaid
+                accounts_response = get_accounts(item["access_token"])
                 
-                except Exception as e:
-                    logging.error(f"Error fetching balance for item {item.item_id}: {str(e)}")
-                    continue
+                # Handle different response formats
+                if accounts_response:
+                    if hasattr(accounts_response, 'accounts'):
+                        return accounts_response.accounts
+                    elif isinstance(accounts_response, dict) and 'accounts' in accounts_response:
+                        return accounts_response['accounts']
+                return []
+            
+            account_balances = []
+            
+            for accounts in _fetch_items_concurrently(items, fetch_item_accounts):
+                for plaid_account in accounts or []:
+                    account_balances.append({
+                        "account_id": plaid_account.account_id if hasattr(plaid_account, 'account_id') else plaid_account.get('account_id'),
+                        "name": plaid_account.name if hasattr(plaid_account, 'name') else plaid_account.get('name'),
+                        "mask": plaid_account.mask if hasattr(plaid_account, 'mask') else plaid_account.get('mask'),
+                        "type": plaid_account.type if hasattr(plaid_account, 'type') else plaid_account.get('type'),
+                        "subtype": plaid_account.subtype if hasattr(plaid_account, 'subtype') else plaid_account.get('subtype'),
+                        "current_balance": plaid_account.balances.current if hasattr(plaid_account, 'balances') and hasattr(plaid_account.balances, 'current') else plaid_account.get('balances', {}).get('current'),
+                        "available_balance": plaid_account.balances.available if hasattr(plaid_account, 'balances') and hasattr(plaid_account.balances, 'available') else plaid_account.get('balances', {}).get('available'),
+                        "limit": plaid_account.balances.limit if hasattr(plaid_account, 'balances') and hasattr(plaid_account.balances, 'limit') else plaid_account.get('balances', {}).get('limit'),
+                        "currency_code": plaid_account.balances.iso_currency_code if hasattr(plaid_account, 'balances') and hasattr(plaid_account.balances, 'iso_currency_code') else plaid_account.get('balances', {}).get('iso_currency_code', 'USD')
+                    })
             
             return {
                 "success": True,
@@ -0,0 +1,368 @@
+"""
+Platform Counters for Manna Backend
+
+Incrementally maintained platform-wide totals (users, churches, donor and
+church payouts, referrals) stored as named rows in platform_counters.
+
+Every ORM flush that inserts, updates or deletes a counted row applies the
+resulting deltas with an atomic INSERT ... ON CONFLICT DO UPDATE in the same
+transaction, so the counters commit or roll back with the change itself.
+Each transaction writes to one of COUNTER_SHARDS rows per counter, picked at
+random, so concurrent signups or payout workers rarely wait on the same row.
+Bulk query.update()/delete() calls bypass the ORM events; the hourly
+reconcile_platform_counters job recomputes everything and repairs any drift.
+
+Readers get every all-time total from one small table scan instead of
+aggregating the full history of each table.
+"""
+
+import time
+import random
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Callable, Any, List, Optional, Tuple
+
+from sqlalchemy import event, inspect, func
+from sqlalchemy.orm import Session
+
+from app.model.m_platform_counter import PlatformCounter
+from app.model.m_user import User
+from app.model.m_church import Church
+from app.model.m_church_referral import ChurchReferral
+from app.model.m_referral import ReferralCommission
+from app.model.m_roundup_new import DonorPayout, ChurchPayout
+
+logger = logging.getLogger(__name__)
+
+# Re-check for the table this often while the migration has not run yet
+_TABLE_CHECK_SECONDS = 60
+
+# Rows each counter is spread over; readers sum them
+COUNTER_SHARDS = 8
+
+
+def _money(value) -> Decimal:
+    return Decimal(str(value or 0))
+
+
+def _user_counters(v: Dict[str, Any]) -> Dict[str, Decimal]:
+    return {"users.total": Decimal(1)}
+
+
+def _church_counters(v: Dict[str, Any]) -> Dict[str, Decimal]:
+    return {
+        "churches.total": Decimal(1),
+        "churches.active": Decimal(1 if v["is_active"] else 0),
+        f"churches.kyc_status.{v['kyc_status']}": Decimal(1),
+        f"churches.status.{v['status']}": Decimal(1),
+    }
+
+
+def _donor_payout_counters(v: Dict[str, Any]) -> Dict[str, Decimal]:
+    completed = v["status"] == "completed"
+    return {
+        "donor_payouts.total": Decimal(1),
+        f"donor_payouts.status.{v['status']}": Decimal(1),
+        "donor_payouts.completed_amount": _money(v["donation_amount"]) if completed else Decimal(0),
+        "donor_payouts.completed_roundup_amount": (
+            _money(v["donation_amount"]) if completed and v["donation_type"] == "roundup" else Decimal(0)
+        ),
+    }
+
+
+def _church_payout_counters(v: Dict[str, Any]) -> Dict[str, Decimal]:
+    completed = v["status"] == "completed"
+    return {
+        "church_payouts.total": Decimal(1),
+        f"church_payouts.status.{v['status']}": Decimal(1),
+        "church_payouts.completed_net_amount": _money(v["net_payout_amount"]) if completed else Decimal(0),
+    }
+
+
+def _referral_counters(v: Dict[str, Any]) -> Dict[str, Decimal]:
+    return {
+        "referrals.total": Decimal(1),
+        f"referrals.status.{v['status']}": Decimal(1),
+    }
+
+
+def _commission_counters(v: Dict[str, Any]) -> Dict[str, Decimal]:
+    return {"referral_commissions.amount": _money(v["amount"])}
+
+
+# model -> (columns the counters depend on, contribution of one row)
+_COUNTED_MODELS: Dict[type, Tuple[Tuple[str, ...], Callable[[Dict[str, Any]], Dict[str, Decimal]]]] = {
+    User: ((), _user_counters),
+    Church: (("is_active", "kyc_status", "status"), _church_counters),
+    DonorPayout: (("status", "donation_amount", "donation_type"), _donor_payout_counters),
+    ChurchPayout: (("status", "net_payout_amount"), _church_payout_counters),
+    ChurchReferral: (("status",), _referral_counters),
+    ReferralCommission: (("amount",), _commission_counters),
+}
+
+
+def _current_values(obj, fields) -> Dict[str, Any]:
+    return {field: getattr(obj, field) for field in fields}
+
+
+def _known_previous_values(obj, fields) -> Optional[Dict[str, Any]]:
+    """Pre-flush values from attribute history, or None if one was never loaded"""
+    state = inspect(obj)
+    values = {}
+    for field in fields:
+        history = state.attrs[field].history
+        if history.deleted:
+            values[field] = history.deleted[0]
+        elif history.unchanged:
+            values[field] = history.unchanged[0]
+        elif history.added:
+            # Assigned over an expired attribute: the old value is only in the database
+            return None
+        else:
+            values[field] = getattr(obj, field)
+    return values
+
+
+def _accumulate(deltas: Dict[str, Decimal], contribution: Dict[str, Decimal], sign: int):
+    for name, value in contribution.items():
+        deltas[name] += sign * value
+
+
+@event.listens_for(Session, "before_flush")
+def _capture_previous_values(session, flush_context, instances):
+    """Snapshot the stored values of counted rows the flush will update or delete"""
+    previous = session.info.setdefault("platform_counter_previous", {})
+    unknown: Dict[type, Dict[Any, Any]] = defaultdict(dict)
+
+    with session.no_autoflush:
+        for obj in list(session.dirty) + list(session.deleted):
+            spec = _COUNTED_MODELS.get(type(obj))
+            state = inspect(obj)
+            if not spec or not spec[0] or state.key is None or state.key in previous:
+                continue
+            values = _known_previous_values(obj, spec[0])
+            if values is None:
+                unknown[type(obj)][obj.id] = state.key
+            else:
+                previous[state.key] = values
+
+        for model, keys in unknown.items():
+            fields = _COUNTED_MODELS[model][0]
+            for row in session.query(model.id, *[getattr(model, field) for field in fields]).filter(
+                model.id.in_(list(keys))
+            ).all():
+                previous[keys[row[0]]] = dict(zip(fields, row[1:]))
+
+
+def collect_deltas(session: Session) -> Dict[str, Decimal]:
+    """Counter deltas for the objects a flush inserted, updated or deleted"""
+    deltas: Dict[str, Decimal] = defaultdict(Decimal)
+    previous = session.info.get("platform_counter_previous", {})
+
+    for obj in session.new:
+        spec = _COUNTED_MODELS.get(type(obj))
+        if spec:
+            _accumulate(deltas, spec[1](_current_values(obj, spec[0])), 1)
+
+    for obj in session.dirty:
+        spec = _COUNTED_MODELS.get(type(obj))
+        if not spec or not spec[0]:
+            continue
+        old_values = previous.get(inspect(obj).key)
+        new_values = _current_values(obj, spec[0])
+        if old_values is None or old_values == new_values:
+            continue
+        _accumulate(deltas, spec[1](old_values), -1)
+        _accumulate(deltas, spec[1](new_values), 1)
+
+    for obj in session.deleted:
+        spec = _COUNTED_MODELS.get(type(obj))
+        if not spec:
+            continue
+        old_values = previous.get(inspect(obj).key) if spec[0] else {}
+        if old_values is not None:
+            _accumulate(deltas, spec[1](old_values), -1)
+
+    return {name: value for name, value in deltas.items() if value}
+
+
+def _upsert_statement(dialect_name: str, rows: List[Dict[str, Any]], increment: bool):
+    """INSERT ... ON CONFLICT (name, shard) DO UPDATE, adding to or replacing the value"""
+    if dialect_name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+
+    stmt = insert(PlatformCounter).values(rows)
+    value = PlatformCounter.value + stmt.excluded.value if increment else stmt.excluded.value
+    return stmt.on_conflict_do_update(
+        index_elements=['name', 'shard'],
+        set_={"value": value, "updated_at": stmt.excluded.updated_at}
+    )
+
+
+_table_state = {"exists": False, "checked_at": None}
+
+
+def _counters_table_exists(connection) -> bool:
+    if _table_state["exists"]:
+        return True
+    now = time.monotonic()
+    if _table_state["checked_at"] is None or now - _table_state["checked_at"] >= _TABLE_CHECK_SECONDS:
+        _table_state["checked_at"] = now
+        _table_state["exists"] = inspect(connection).has_table(PlatformCounter.__tablename__)
+    return _table_state["exists"]
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_counter_deltas(session, flush_context):
+    """Fold the flush's changes into platform_counters inside the same transaction"""
+    deltas = collect_deltas(session)
+    session.info.pop("platform_counter_previous", None)
+    if not deltas:
+        return
+
+    connection = session.connection()
+    if not _counters_table_exists(connection):
+        return
+
+    # One shard for the whole transaction, so its flushes never lock rows across shards
+    shard = session.info.setdefault("platform_counter_shard", random.randrange(COUNTER_SHARDS))
+    now = datetime.now(timezone.utc)
+    rows = [
+        {"name": name, "shard": shard, "value": value, "updated_at": now}
+        for name, value in sorted(deltas.items())  # Fixed order avoids lock-order deadlocks
+    ]
+    connection.execute(_upsert_statement(connection.dialect.name, rows, increment=True))
+
+
+@event.listens_for(Session, "after_commit")
+def _release_shard(session):
+    session.info.pop("platform_counter_shard", None)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_previous_values(session, previous_transaction):
+    session.info.pop("platform_counter_previous", None)
+    session.info.pop("platform_counter_shard", None)
+
+
+def compute_platform_counters(db: Session) -> Dict[str, Decimal]:
+    """Recompute every counter from the source tables"""
+    counters: Dict[str, Decimal] = defaultdict(Decimal)
+
+    counters["users.total"] = Decimal(db.query(func.count(User.id)).scalar() or 0)
+
+    for is_active, kyc_status, status, count in db.query(
+        Church.is_active, Church.kyc_status, Church.status, func.count(Church.id)
+    ).group_by(Church.is_active, Church.kyc_status, Church.status).all():
+        _accumulate(counters, _church_counters(
+            {"is_active": is_active, "kyc_status": kyc_status, "status": status}
+        ), count)
+
+    for status, donation_type, count, amount in db.query(
+        DonorPayout.status, DonorPayout.donation_type,
+        func.count(DonorPayout.id), func.sum(DonorPayout.donation_amount)
+    ).group_by(DonorPayout.status, DonorPayout.donation_type).all():
+        counters["donor_payouts.total"] += count
+        counters[f"donor_payouts.status.{status}"] += count
+        if status == "completed":
+            counters["donor_payouts.completed_amount"] += _money(amount)
+            if donation_type == "roundup":
+                counters["donor_payouts.completed_roundup_amount"] += _money(amount)
+
+    for status, count, amount in db.query(
+        ChurchPayout.status, func.count(ChurchPayout.id), func.sum(ChurchPayout.net_payout_amount)
+    ).group_by(ChurchPayout.status).all():
+        counters["church_payouts.total"] += count
+        counters[f"church_payouts.status.{status}"] += count
+        if status == "completed":
+            counters["church_payouts.completed_net_amount"] += _money(amount)
+
+    for status, count in db.query(
+        ChurchReferral.status, func.count(ChurchReferral.id)
+    ).group_by(ChurchReferral.status).all():
+        counters["referrals.total"] += count
+        counters[f"referrals.status.{status}"] += count
+
+    counters["referral_commissions.amount"] = _money(
+        db.query(func.sum(ReferralCommission.amount)).scalar()
+    )
+
+    return dict(counters)
+
+
+def _stored_counters(db: Session) -> Dict[str, Decimal]:
+    """Stored counter values by name, summed over shards"""
+    return {
+        name: _money(value)
+        for name, value in db.query(
+            PlatformCounter.name, func.sum(PlatformCounter.value)
+        ).group_by(PlatformCounter.name).all()
+    }
+
+
+def _snapshot_counters(db: Session) -> Tuple[Dict[str, Decimal], Dict[str, Decimal]]:
+    """Recomputed and stored counters, both read from one snapshot on a separate connection"""
+    with db.get_bind().connect() as connection:
+        if connection.dialect.name == 'postgresql':
+            connection.execution_options(isolation_level="REPEATABLE READ")
+        snapshot = Session(bind=connection)
+        try:
+            return compute_platform_counters(snapshot), _stored_counters(snapshot)
+        finally:
+            snapshot.close()
+
+
+def reconcile_platform_counters(db: Session) -> Dict[str, Decimal]:
+    """
+    Recompute all counters and correct drift in the stored values
+
+    The source tables and the stored counters are read from the same snapshot
+    without locking, so their difference is exactly the drift: a transaction
+    committed after the snapshot is in neither side. The drift is then added to
+    shard 0 in one short upsert, leaving those later increments intact.
+    Counters whose source rows are gone go back to zero. Commits.
+    """
+    computed, stored = _snapshot_counters(db)
+    for name in stored:
+        computed.setdefault(name, Decimal(0))
+
+    drift = {
+        name: value - stored.get(name, Decimal(0))
+        for name, value in computed.items()
+        if value != stored.get(name, Decimal(0))
+    }
+
+    try:
+        if drift:
+            now = datetime.now(timezone.utc)
+            rows = [
+                {"name": name, "shard": 0, "value": value, "updated_at": now}
+                for name, value in sorted(drift.items())
+            ]
+            db.execute(_upsert_statement(db.get_bind().dialect.name, rows, increment=True))
+        db.commit()
+        return computed
+    except Exception:
+        db.rollback()
+        raise
+
+
+def get_platform_counters(db: Session) -> Dict[str, Decimal]:
+    """All counters by name, seeding them on first use"""
+    counters = _stored_counters(db)
+    if not counters:
+        counters = reconcile_platform_counters(db)
+    return counters
+
+
+def counter_breakdown(counters: Dict[str, Decimal], prefix: str) -> Dict[str, int]:
+    """Non-zero counts under a prefix, e.g. "churches.kyc_status." -> {status: count}"""
+    return {
+        name[len(prefix):]: int(value)
+        for name, value in counters.items()
+        if name.startswith(prefix) and value
+    }
@@ -0,0 +1,144 @@
+"""
+Authenticated Principal Cache for Manna Backend
+
+Short-TTL in-process cache of the identity dicts returned by the auth
+dependencies (get_current_user, jwt_church_admin_auth), keyed by user_id.
+Saves the User / ChurchAdmin / Church lookups on every authenticated request.
+
+Entries are invalidated explicitly (status changes, logout) and automatically
+after any committed change to a user's active flag, role or church, to a
+ChurchAdmin row, or to a church's active flag or status. Other workers see a
+change within the TTL.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Any, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.config import config
+from app.model.m_user import User
+from app.model.m_church_admin import ChurchAdmin
+from app.model.m_church import Church
+
+# User columns that appear in, or decide, a cached principal
+_USER_FIELDS = ("is_active", "role", "church_id", "email", "first_name", "last_name")
+
+# Church columns checked by jwt_church_admin_auth
+_CHURCH_FIELDS = ("is_active", "status")
+
+# Principal kinds cached per user: get_current_user, jwt_church_admin_auth
+PRINCIPAL_KINDS = ("donor", "church_admin")
+
+
+class PrincipalCache:
+    """Bounded TTL cache of resolved principals"""
+
+    def __init__(self, ttl_seconds: int = 30, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._church_users: Dict[int, Set[int]] = {}  # church_id -> user_ids with a cached principal
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, kind: str, user_id: int) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached principal, or None"""
+        if self.ttl_seconds <= 0:
+            return None
+
+        with self._lock:
+            entry = self._entries.get((kind, user_id))
+            if entry is None or entry[0] < time.monotonic():
+                self.stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end((kind, user_id))
+            self.stats["hits"] += 1
+            return dict(entry[1])
+
+    def set(self, kind: str, user_id: int, principal: Dict[str, Any]):
+        """Cache a resolved principal"""
+        if self.ttl_seconds <= 0:
+            return
+
+        with self._lock:
+            self._entries[(kind, user_id)] = (time.monotonic() + self.ttl_seconds, dict(principal))
+            self._entries.move_to_end((kind, user_id))
+
+            church_id = principal.get("church_id")
+            if church_id is not None:
+                self._church_users.setdefault(church_id, set()).add(user_id)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int):
+        """Drop every cached principal for a user"""
+        with self._lock:
+            for kind in PRINCIPAL_KINDS:
+                self._entries.pop((kind, user_id), None)
+            self.stats["invalidations"] += 1
+
+    def invalidate_church(self, church_id: int):
+        """Drop cached principals of users attached to a church"""
+        with self._lock:
+            for user_id in self._church_users.pop(church_id, set()):
+                self.invalidate_user(user_id)
+
+    def clear(self):
+        """Drop everything"""
+        with self._lock:
+            self._entries.clear()
+            self._church_users.clear()
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=config.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=config.CACHE_MAX_ENTRIES
+)
+
+
+def _changed(obj, fields) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_principal_changes(session, flush_context):
+    """Remember which principals a flush touched; they are dropped on commit"""
+    users = session.info.setdefault("principal_cache_users", set())
+    churches = session.info.setdefault("principal_cache_churches", set())
+
+    for obj in session.new:
+        if isinstance(obj, ChurchAdmin):
+            users.add(obj.user_id)
+    for obj in session.dirty:
+        if isinstance(obj, User) and _changed(obj, _USER_FIELDS):
+            users.add(obj.id)
+        elif isinstance(obj, ChurchAdmin):
+            users.add(obj.user_id)
+        elif isinstance(obj, Church) and _changed(obj, _CHURCH_FIELDS):
+            churches.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, (User, ChurchAdmin)):
+            users.add(obj.id if isinstance(obj, User) else obj.user_id)
+        elif isinstance(obj, Church):
+            churches.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_principals(session):
+    for user_id in session.info.pop("principal_cache_users", ()):
+        principal_cache.invalidate_user(user_id)
+    for church_id in session.info.pop("principal_cache_churches", ()):
+        principal_cache.invalidate_church(church_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_principal_changes(session, previous_transaction):
+    session.info.pop("principal_cache_users", None)
+    session.info.pop("principal_cache_churches", None)
@@ -0,0 +1,331 @@
+"""
+Rate Limiting Service
+
+One limiter engine shared by every rate-limited entry point (the API rate
+limit middleware, the security middleware and the admin security checks).
+
+Implements a sliding window counter: per key and window it keeps only the
+current and previous fixed-window counts, and estimates the requests in the
+trailing window as
+
+    previous * (time left in current window / window) + current
+
+so each key costs O(1) memory however many requests it makes. Denied requests
+are not counted.
+
+Backends:
+- In-process: bounded LRU of keys, least recently checked keys evicted first
+- Redis (optional, shared across workers): all limits of a check are read,
+  decided and updated by one Lua script, i.e. one round trip per check
+"""
+
+import math
+import time
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    logger.warning("Redis not available, using in-memory rate limiting")
+
+# Default bound on keys tracked in-process
+DEFAULT_MAX_KEYS = 100000
+
+# KEYS: one hash per limit. ARGV: consume flag, then requests and window per limit.
+# Replies the allowed flag, then previous count, current count and elapsed
+# seconds of each limit's window as seen before this request.
+_SLIDING_WINDOW_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local consume = ARGV[1] == '1'
+local allowed = 1
+local states = {}
+for i, key in ipairs(KEYS) do
+    local requests = tonumber(ARGV[2 * i])
+    local window = tonumber(ARGV[2 * i + 1])
+    local idx = math.floor(now / window)
+    local saved = redis.call('HMGET', key, 'idx', 'cur', 'prev')
+    local saved_idx = tonumber(saved[1])
+    local cur, prev = 0, 0
+    if saved_idx == idx then
+        cur, prev = tonumber(saved[2]), tonumber(saved[3])
+    elseif saved_idx == idx - 1 then
+        prev = tonumber(saved[2])
+    end
+    local elapsed = now - idx * window
+    if prev * (window - elapsed) / window + cur + 1 > requests then
+        allowed = 0
+    end
+    states[i] = {idx, cur, prev, elapsed, window}
+end
+local reply = {allowed}
+for i, key in ipairs(KEYS) do
+    local s = states[i]
+    if allowed == 1 and consume then
+        redis.call('HSET', key, 'idx', s[1], 'cur', s[2] + 1, 'prev', s[3])
+        redis.call('PEXPIRE', key, math.ceil(s[5] * 2000))
+    end
+    table.insert(reply, tostring(s[3]))
+    table.insert(reply, tostring(s[2]))
+    table.insert(reply, tostring(s[4]))
+end
+return reply
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """At most `requests` requests per trailing `window` seconds"""
+    requests: int
+    window: int
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of a rate limit check"""
+    allowed: bool
+    limit: int  # requests allowed per window of the reported limit
+    window: int
+    remaining: int
+    current_requests: int  # estimated requests in the trailing window
+    retry_after: int  # seconds until a request would be allowed (0 when allowed)
+    reset_after: int  # seconds until the trailing window is empty
+    exceeded: Optional[RateLimit] = None
+
+
+def _window_result(
+    rate_limit: RateLimit,
+    previous: float,
+    current: float,
+    elapsed: float,
+    allowed: bool,
+    consumed: bool
+) -> RateLimitResult:
+    """Result for one limit from its window state as seen before the request"""
+    window = rate_limit.window
+    requests = rate_limit.requests
+    estimate = previous * (window - elapsed) / window + current
+    if consumed:
+        estimate += 1
+        current += 1
+
+    retry_after = 0
+    if estimate + (0 if consumed else 1) > requests:
+        if current + 1 <= requests and previous > 0:
+            # The previous window's weight decays enough within this window
+            wait = window * (1 - (requests - 1 - current) / previous) - elapsed
+        else:
+            # Wait for this window to roll over and its count to decay
+            wait = window - elapsed
+            if current:
+                wait += max(0.0, window * (1 - (requests - 1) / current))
+        retry_after = max(1, math.ceil(wait))
+
+    if current:
+        reset_after = math.ceil(2 * window - elapsed)
+    elif previous:
+        reset_after = math.ceil(window - elapsed)
+    else:
+        reset_after = 0
+
+    return RateLimitResult(
+        allowed=allowed,
+        limit=requests,
+        window=window,
+        remaining=max(0, int(requests - estimate)),
+        current_requests=math.ceil(estimate),
+        retry_after=0 if allowed and consumed else retry_after,
+        reset_after=reset_after,
+        exceeded=None if allowed else rate_limit
+    )
+
+
+def _combine(
+    limits: Sequence[RateLimit],
+    states: Sequence[Tuple[float, float, float]],
+    allowed: bool,
+    consumed: bool
+) -> RateLimitResult:
+    """Report the first limit when allowed, otherwise the exceeded limit with the longest wait"""
+    results = [
+        _window_result(rate_limit, previous, current, elapsed, allowed, consumed)
+        for rate_limit, (previous, current, elapsed) in zip(limits, states)
+    ]
+    if allowed:
+        return results[0]
+
+    exceeded = [
+        result for result, rate_limit, (previous, current, elapsed) in zip(results, limits, states)
+        if previous * (rate_limit.window - elapsed) / rate_limit.window + current + 1 > rate_limit.requests
+    ]
+    return max(exceeded or results, key=lambda result: result.retry_after)
+
+
+class RateLimitService:
+    """Sliding window counter rate limiter with an optional Redis backend"""
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        redis_client: Optional[Any] = None,
+        max_keys: int = DEFAULT_MAX_KEYS,
+        namespace: str = "manna:ratelimit"
+    ):
+        self.redis_client = redis_client
+        self.namespace = namespace
+        self.max_keys = max_keys
+        self.memory_state: "OrderedDict[str, Dict[int, List[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._script = None
+
+        if self.redis_client is None and REDIS_AVAILABLE and redis_url:
+            try:
+                self.redis_client = redis.from_url(redis_url, decode_responses=True)
+                self.redis_client.ping()
+                logger.info("Redis rate limiting enabled")
+            except Exception as e:
+                logger.warning(f"Redis connection failed: {e}, using in-memory rate limiting")
+                self.redis_client = None
+
+        if self.redis_client is not None:
+            self._script = self.redis_client.register_script(_SLIDING_WINDOW_SCRIPT)
+
+        self.stats = {
+            'checks': 0,
+            'denied': 0,
+            'evictions': 0,
+            'errors': 0
+        }
+
+    @property
+    def shared(self) -> bool:
+        """Whether limits are shared across processes through Redis"""
+        return self._script is not None
+
+    def hit(self, key: str, *limits: RateLimit) -> RateLimitResult:
+        """Count a request against every limit of key; it is allowed only if all of them allow it"""
+        return self._check(key, limits, consume=True)
+
+    def peek(self, key: str, *limits: RateLimit) -> RateLimitResult:
+        """Check key's limits without counting a request"""
+        return self._check(key, limits, consume=False)
+
+    def reset(self, key: str, *limits: RateLimit) -> None:
+        """Forget the counts of key"""
+        with self._lock:
+            self.memory_state.pop(key, None)
+        if self.shared:
+            try:
+                self.redis_client.delete(*[self._redis_key(key, rate_limit) for rate_limit in limits])
+            except Exception as e:
+                logger.error(f"Redis rate limit reset error: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Check counters and backend information"""
+        with self._lock:
+            tracked_keys = len(self.memory_state)
+        return {
+            **self.stats,
+            'backend': 'redis' if self.shared else 'memory',
+            'tracked_keys': tracked_keys,
+            'max_keys': self.max_keys
+        }
+
+    def _check(self, key: str, limits: Sequence[RateLimit], consume: bool) -> RateLimitResult:
+        if not limits:
+            raise ValueError("At least one rate limit is required")
+
+        self.stats['checks'] += 1
+        result = None
+        if self.shared:
+            try:
+                result = self._check_redis(key, limits, consume)
+            except Exception as e:
+                logger.error(f"Redis rate limiting error: {e}, falling back to memory")
+                self.stats['errors'] += 1
+        if result is None:
+            result = self._check_memory(key, limits, consume)
+
+        if not result.allowed:
+            self.stats['denied'] += 1
+        return result
+
+    def _redis_key(self, key: str, rate_limit: RateLimit) -> str:
+        return f"{self.namespace}:{key}:{rate_limit.window}"
+
+    def _check_redis(self, key: str, limits: Sequence[RateLimit], consume: bool) -> RateLimitResult:
+        """Read, decide and update all limits in one script call"""
+        args: List[Any] = ['1' if consume else '0']
+        for rate_limit in limits:
+            args.extend([rate_limit.requests, rate_limit.window])
+
+        reply = self._script(keys=[self._redis_key(key, rate_limit) for rate_limit in limits], args=args)
+        allowed = int(reply[0]) == 1
+        values = [float(value) for value in reply[1:]]
+        states = [tuple(values[i:i + 3]) for i in range(0, len(values), 3)]
+        return _combine(limits, states, allowed, consume and allowed)
+
+    def _check_memory(self, key: str, limits: Sequence[RateLimit], consume: bool) -> RateLimitResult:
+        """Same algorithm as the script, on the in-process LRU"""
+        now = time.time()
+        with self._lock:
+            windows = self.memory_state.get(key, {})
+
+            states = []
+            rolled = []
+            allowed = True
+            for rate_limit in limits:
+                idx = math.floor(now / rate_limit.window)
+                saved_idx, current, previous = windows.get(rate_limit.window, (idx, 0, 0))
+                if saved_idx == idx - 1:
+                    current, previous = 0, current
+                elif saved_idx != idx:
+                    current, previous = 0, 0
+                elapsed = now - idx * rate_limit.window
+                if previous * (rate_limit.window - elapsed) / rate_limit.window + current + 1 > rate_limit.requests:
+                    allowed = False
+                states.append((previous, current, elapsed))
+                rolled.append((rate_limit.window, idx, current, previous))
+
+            if allowed and consume:
+                for window, idx, current, previous in rolled:
+                    windows[window] = [idx, current + 1, previous]
+                self.memory_state[key] = windows
+            if key in self.memory_state:
+                # Denied checks count as use too, so a throttled key is not evicted (and reset) first
+                self.memory_state.move_to_end(key)
+
+            while len(self.memory_state) > self.max_keys:
+                self.memory_state.popitem(last=False)
+                self.stats['evictions'] += 1
+
+        return _combine(limits, states, allowed, consume and allowed)
+
+
+# Global rate limit service instance
+rate_limit_service = RateLimitService(config.REDIS_URL, max_keys=config.RATE_LIMIT_MAX_KEYS)
+
+
+def get_rate_limit_service() -> RateLimitService:
+    """Get rate limit service instance"""
+    return rate_limit_service
+
+
+def setup_rate_limit_service(redis_url: Optional[str] = None, redis_client: Optional[Any] = None):
+    """Setup rate limit service with Redis (or a redis-compatible client in tests)"""
+    global rate_limit_service
+    rate_limit_service = RateLimitService(
+        redis_url or config.REDIS_URL,
+        redis_client=redis_client,
+        max_keys=config.RATE_LIMIT_MAX_KEYS
+    )
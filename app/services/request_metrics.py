@@ -0,0 +1,256 @@
+"""
+Request Metrics Service
+
+Per-route request latency histograms and request/error counters, fed by
+MonitoringMiddleware through MonitoringService.track_request.
+
+- Latencies go into HDR-style log buckets: 16 linear sub-buckets per power of
+  two microseconds, so any percentile is within ~6% of the true value while a
+  route only stores the buckets it has seen
+- Rolling windows of the last minute, hour and 24 hours are rings of time
+  slots; a slot is replaced when its ring comes round to it again
+- Routes are labelled by their template (/api/v1/users/{user_id}), never the
+  raw path, so the number of series is bounded by the number of routes
+- Cumulative counts since startup are exported in the Prometheus text format
+
+Recording is lock-free: only the event loop thread writes, and readers copy
+slots (a single C-level dict copy under the GIL) before aggregating them.
+Metrics are per process; each worker reports its own.
+"""
+
+import math
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+# Linear sub-buckets per power of two
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+# Latencies above ~67 seconds share the last bucket
+MAX_LATENCY_US = (1 << 26) - 1
+
+# Rolling windows: name -> (slot length in seconds, slots)
+WINDOWS = {
+    '1m': (5, 12),
+    '1h': (60, 60),
+    '24h': (3600, 24),
+}
+
+# Upper bounds, in seconds, of the exported Prometheus histogram buckets
+PROMETHEUS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Label of requests that matched no route (404s, static mounts)
+UNMATCHED_ROUTE = 'unmatched'
+
+
+def bucket_index(latency_us: int) -> int:
+    """HDR bucket of a latency in microseconds"""
+    if latency_us < SUB_BUCKETS:
+        return max(latency_us, 0)
+    latency_us = min(latency_us, MAX_LATENCY_US)
+    shift = latency_us.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift + 1) * SUB_BUCKETS + (latency_us >> shift) - SUB_BUCKETS
+
+
+def bucket_bounds(index: int) -> Tuple[int, int]:
+    """Lowest and one past the highest latency, in microseconds, of an HDR bucket"""
+    if index < 2 * SUB_BUCKETS:
+        return index, index + 1
+    shift = index // SUB_BUCKETS - 1
+    mantissa = index % SUB_BUCKETS + SUB_BUCKETS
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+class _Slot:
+    """Counts of one time slot (or of all time)"""
+    __slots__ = ('epoch', 'count', 'errors', 'total_us', 'buckets')
+
+    def __init__(self, epoch: int = 0):
+        self.epoch = epoch
+        self.count = 0
+        self.errors = 0
+        self.total_us = 0
+        self.buckets: Dict[int, int] = {}
+
+
+class RouteMetrics:
+    """Latency histograms and counters of one method and route template"""
+
+    def __init__(self, method: str, route: str):
+        self.method = method
+        self.route = route
+        self.rings = {name: [_Slot(-1) for _ in range(slots)] for name, (_, slots) in WINDOWS.items()}
+        # Cumulative counts for Prometheus
+        self.prometheus_buckets = [0] * (len(PROMETHEUS_BUCKETS) + 1)
+        self.total_us = 0
+        self.status_counts: Dict[str, int] = {}
+
+    def record(self, now: float, latency_us: int, status_code: int):
+        bucket = bucket_index(latency_us)
+        error = status_code >= 500
+
+        for name, (slot_seconds, slots) in WINDOWS.items():
+            ring = self.rings[name]
+            epoch = int(now // slot_seconds)
+            slot = ring[epoch % slots]
+            if slot.epoch != epoch:
+                slot = _Slot(epoch)
+                ring[epoch % slots] = slot
+            slot.count += 1
+            slot.errors += error
+            slot.total_us += latency_us
+            slot.buckets[bucket] = slot.buckets.get(bucket, 0) + 1
+
+        self.prometheus_buckets[bisect_left(PROMETHEUS_BUCKETS, latency_us / 1e6)] += 1
+        self.total_us += latency_us
+        status_class = f"{status_code // 100}xx"
+        self.status_counts[status_class] = self.status_counts.get(status_class, 0) + 1
+
+    def window(self, name: str, now: float) -> _Slot:
+        """Counts of the trailing window, merged from its live slots"""
+        slot_seconds, slots = WINDOWS[name]
+        oldest = int(now // slot_seconds) - slots + 1
+        merged = _Slot()
+        for slot in list(self.rings[name]):
+            if slot.epoch < oldest:
+                continue
+            merged.count += slot.count
+            merged.errors += slot.errors
+            merged.total_us += slot.total_us
+            for bucket, count in dict(slot.buckets).items():
+                merged.buckets[bucket] = merged.buckets.get(bucket, 0) + count
+        return merged
+
+
+def _percentile_us(slot: _Slot, fraction: float) -> float:
+    """Latency at a percentile of a merged window, from its buckets' midpoints"""
+    if not slot.count:
+        return 0.0
+    rank = max(1, math.ceil(fraction * slot.count))
+    seen = 0
+    for bucket in sorted(slot.buckets):
+        seen += slot.buckets[bucket]
+        if seen >= rank:
+            low, high = bucket_bounds(bucket)
+            return (low + high - 1) / 2
+    return 0.0
+
+
+class RequestMetrics:
+    """Registry of per-route request metrics"""
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+        self.started_at = time.time()
+
+    def record(self, method: str, route: Optional[str], latency_seconds: float, status_code: int):
+        """Record one request; route is the matched route template, None if unmatched"""
+        key = (method, route or UNMATCHED_ROUTE)
+        metrics = self.routes.get(key)
+        if metrics is None:
+            metrics = self.routes[key] = RouteMetrics(*key)
+        metrics.record(time.time(), int(latency_seconds * 1e6), status_code)
+
+    def window(self, name: str = '1h', route: Optional[str] = None) -> _Slot:
+        """Trailing window counts over all routes, or over one route template"""
+        now = time.time()
+        merged = _Slot()
+        for (_, route_name), metrics in list(self.routes.items()):
+            if route is not None and route_name != route:
+                continue
+            slot = metrics.window(name, now)
+            merged.count += slot.count
+            merged.errors += slot.errors
+            merged.total_us += slot.total_us
+            for bucket, count in slot.buckets.items():
+                merged.buckets[bucket] = merged.buckets.get(bucket, 0) + count
+        return merged
+
+    def summary(self, name: str = '1h', route: Optional[str] = None) -> Dict[str, Any]:
+        """Request count, error rate and latency percentiles (ms) of a trailing window"""
+        slot = self.window(name, route)
+        return {
+            'window': name,
+            'requests': slot.count,
+            'errors': slot.errors,
+            'error_rate': round(slot.errors / slot.count * 100, 2) if slot.count else 0.0,
+            'avg_ms': round(slot.total_us / slot.count / 1000, 2) if slot.count else 0.0,
+            'p50_ms': round(_percentile_us(slot, 0.50) / 1000, 2),
+            'p95_ms': round(_percentile_us(slot, 0.95) / 1000, 2),
+            'p99_ms': round(_percentile_us(slot, 0.99) / 1000, 2),
+        }
+
+    def route_summaries(self, name: str = '1h') -> List[Dict[str, Any]]:
+        """Per-route summaries of a trailing window, busiest first"""
+        now = time.time()
+        summaries = []
+        for (method, route), metrics in list(self.routes.items()):
+            slot = metrics.window(name, now)
+            if not slot.count:
+                continue
+            summaries.append({
+                'method': method,
+                'route': route,
+                'requests': slot.count,
+                'errors': slot.errors,
+                'avg_ms': round(slot.total_us / slot.count / 1000, 2),
+                'p95_ms': round(_percentile_us(slot, 0.95) / 1000, 2),
+                'p99_ms': round(_percentile_us(slot, 0.99) / 1000, 2),
+            })
+        return sorted(summaries, key=lambda summary: summary['requests'], reverse=True)
+
+    def render_prometheus(self, gauges: Optional[Dict[str, Tuple[str, float]]] = None) -> str:
+        """
+        Cumulative metrics in the Prometheus text exposition format
+
+        Args:
+            gauges: Extra gauges, name -> (help text, value)
+        """
+        lines = [
+            '# HELP http_request_duration_seconds HTTP request latency by route template',
+            '# TYPE http_request_duration_seconds histogram',
+        ]
+        routes = sorted(self.routes.items())
+        for (method, route), metrics in routes:
+            labels = f'method="{method}",route="{_escape_label(route)}"'
+            cumulative = 0
+            counts = list(metrics.prometheus_buckets)
+            for bound, count in zip(PROMETHEUS_BUCKETS, counts):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_sum{{{labels}}} {metrics.total_us / 1e6}')
+            lines.append(f'http_request_duration_seconds_count{{{labels}}} {cumulative}')
+
+        lines.append('# HELP http_requests_total HTTP requests by route template and status class')
+        lines.append('# TYPE http_requests_total counter')
+        for (method, route), metrics in routes:
+            labels = f'method="{method}",route="{_escape_label(route)}"'
+            for status, count in sorted(dict(metrics.status_counts).items()):
+                lines.append(f'http_requests_total{{{labels},status="{status}"}} {count}')
+
+        lines.append('# HELP process_start_time_seconds Start time of the process since unix epoch')
+        lines.append('# TYPE process_start_time_seconds gauge')
+        lines.append(f'process_start_time_seconds {self.started_at}')
+
+        for name, (help_text, value) in (gauges or {}).items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Global request metrics instance
+request_metrics = RequestMetrics()
+
+
+def get_request_metrics() -> RequestMetrics:
+    """Get request metrics instance"""
+    return request_metrics
@@ -135,17 +135,21 @@ class RoundupEngine:
             raise
     
     @handle_service_errors
-    def process_user_transactions(self, user_id: int, transactions: List[Dict]) -> Dict:
+    def process_user_transactions(self, user_id: int, transactions: List[Dict], batch: bool = True) -> Dict:
         """
         Process multiple transactions for a user and create pending roundups
         
         Args:
             user_id: User ID
             transactions: List of transaction data from Plaid
+            batch: Use the bulk ingestion path (one INSERT and one commit per user)
         
         Returns:
             Summary of processing results
         """
+        if batch:
+            return self._process_user_transactions_batch(user_id, transactions)
+        
         processed_count = 0
         total_roundup = 0.0
         created_roundups = []
@@ -170,6 +174,209 @@ class RoundupEngine:
             'created_roundups': created_roundups
         }
     
+    def _process_user_transactions_batch(self, user_id: int, transactions: List[Dict], commit: bool = True) -> Dict:
+        """
+        Bulk ingestion path for process_user_transactions
+        
+        Loads preferences and the month-to-date total once, applies the monthly cap
+        in memory and writes all pending roundups with a single multi-row
+        INSERT ... ON CONFLICT (transaction_id) DO NOTHING.
+        """
+        empty_result = {
+            'processed_count': 0,
+            'total_roundup': 0.0,
+            'created_roundups': []
+        }
+        
+        if not transactions:
+            return empty_result
+        
+        preferences = self.db.query(DonationPreference).filter(
+            DonationPreference.user_id == user_id
+        ).first()
+        
+        if not preferences or preferences.pause or not preferences.roundups_enabled:
+            return empty_result
+        
+        # Skip transactions that already have a roundup so they don't eat into the cap
+        transaction_ids = {t.get('transaction_id') for t in transactions if t.get('transaction_id')}
+        existing_ids = {
+            row[0] for row in self.db.query(PendingRoundup.transaction_id).filter(
+                PendingRoundup.transaction_id.in_(transaction_ids)
+            ).all()
+        } if transaction_ids else set()
+        
+        minimum_roundup = float(preferences.minimum_roundup)
+        monthly_cap = float(preferences.monthly_cap) if preferences.monthly_cap else None
+        monthly_total = self._get_monthly_roundup_total(user_id) if monthly_cap is not None else 0.0
+        now = datetime.now(timezone.utc)
+        
+        rows = []
+        seen_ids = set(existing_ids)
+        for transaction in transactions:
+            transaction_id = transaction.get('transaction_id')
+            if not transaction_id or transaction_id in seen_ids:
+                continue
+            
+            try:
+                if not self._is_transaction_eligible(transaction, preferences):
+                    continue
+                
+                transaction_amount = abs(float(transaction.get('amount', 0)))
+                roundup_amount = self.calculate_roundup(transaction_amount, preferences.multiplier)
+                
+                if roundup_amount < minimum_roundup:
+                    continue
+                
+                if monthly_cap is not None and monthly_total + roundup_amount > monthly_cap:
+                    # Adjust roundup to fit within cap
+                    roundup_amount = max(0, monthly_cap - monthly_total)
+                    if roundup_amount < minimum_roundup:
+                        continue
+                
+                rows.append({
+                    'user_id': user_id,
+                    'transaction_id': transaction_id,
+                    'account_id': transaction.get('account_id'),
+                    'original_amount': transaction_amount,
+                    'roundup_amount': roundup_amount,
+                    'merchant_name': transaction.get('merchant_name', 'Unknown'),
+                    'category': transaction.get('category', []),
+                    'transaction_date': datetime.fromisoformat(transaction.get('date', '').replace('Z', '+00:00')),
+                    'status': 'pending',
+                    'created_at': now
+                })
+                seen_ids.add(transaction_id)
+                monthly_total += roundup_amount
+                
+            except Exception as e:
+                logger.error(f"Error processing transaction {transaction_id}: {str(e)}")
+                continue
+        
+        if not rows:
+            return empty_result
+        
+        try:
+            stmt = self._upsert_statement(rows).returning(PendingRoundup)
+            created_roundups = list(self.db.scalars(stmt).all())
+            if commit:
+                self.db.commit()
+        except Exception as e:
+            logger.error(f"Error bulk inserting roundups for user {user_id}: {str(e)}")
+            self.db.rollback()
+            raise
+        
+        total_roundup = sum(float(roundup.roundup_amount) for roundup in created_roundups)
+        logger.info(f"Created {len(created_roundups)} pending roundups totaling {total_roundup} for user {user_id}")
+        
+        return {
+            'processed_count': len(created_roundups),
+            'total_roundup': total_roundup,
+            'created_roundups': created_roundups
+        }
+    
+    @handle_service_errors
+    def apply_transaction_deltas(
+        self,
+        user_id: int,
+        added: List[Dict],
+        modified: Optional[List[Dict]] = None,
+        removed: Optional[List[str]] = None
+    ) -> Dict:
+        """
+        Apply /transactions/sync deltas to a user's pending roundups
+        
+        Added transactions go through the bulk ingestion path. Modified
+        transactions recompute their pending roundup (or cancel it if no longer
+        eligible) and removed transactions cancel theirs. Collected roundups are
+        never touched. The monthly cap is only enforced on newly added roundups.
+        Everything is committed once.
+        
+        Args:
+            user_id: User ID
+            added: New transactions from Plaid
+            modified: Transactions Plaid has changed since the last sync
+            removed: Transaction IDs Plaid has removed since the last sync
+        
+        Returns:
+            Summary of processing results
+        """
+        modified = modified or []
+        removed = removed or []
+        added = list(added)
+        
+        try:
+            cancelled_count = 0
+            if removed:
+                cancelled_count = self.db.query(PendingRoundup).filter(
+                    PendingRoundup.user_id == user_id,
+                    PendingRoundup.transaction_id.in_(removed),
+                    PendingRoundup.status == 'pending'
+                ).update({'status': 'cancelled'}, synchronize_session=False)
+            
+            updated_count = 0
+            modified_by_id = {t.get('transaction_id'): t for t in modified if t.get('transaction_id')}
+            if modified_by_id:
+                existing_rows = self.db.query(PendingRoundup).filter(
+                    PendingRoundup.transaction_id.in_(modified_by_id.keys())
+                ).all()
+                existing_by_id = {row.transaction_id: row for row in existing_rows}
+                
+                # Modified transactions we never saw (e.g. skipped on a previous sync) are treated as new
+                added.extend(t for tid, t in modified_by_id.items() if tid not in existing_by_id)
+                
+                preferences = self.db.query(DonationPreference).filter(
+                    DonationPreference.user_id == user_id
+                ).first()
+                
+                for transaction_id, row in existing_by_id.items():
+                    if row.user_id != user_id or row.status != 'pending' or not preferences:
+                        continue
+                    
+                    transaction = modified_by_id[transaction_id]
+                    if not self._is_transaction_eligible(transaction, preferences):
+                        row.status = 'cancelled'
+                        cancelled_count += 1
+                        continue
+                    
+                    transaction_amount = abs(float(transaction.get('amount', 0)))
+                    roundup_amount = self.calculate_roundup(transaction_amount, preferences.multiplier)
+                    if roundup_amount < float(preferences.minimum_roundup):
+                        row.status = 'cancelled'
+                        cancelled_count += 1
+                        continue
+                    
+                    row.original_amount = transaction_amount
+                    row.roundup_amount = roundup_amount
+                    row.merchant_name = transaction.get('merchant_name', 'Unknown')
+                    row.category = transaction.get('category', [])
+                    if transaction.get('date'):
+                        row.transaction_date = datetime.fromisoformat(transaction['date'].replace('Z', '+00:00'))
+                    updated_count += 1
+            
+            result = self._process_user_transactions_batch(user_id, added, commit=False)
+            self.db.commit()
+            
+        except Exception as e:
+            logger.error(f"Error applying transaction deltas for user {user_id}: {str(e)}")
+            self.db.rollback()
+            raise
+        
+        result['updated_count'] = updated_count
+        result['cancelled_count'] = cancelled_count
+        return result
+    
+    def _upsert_statement(self, rows: List[Dict]):
+        """Build a multi-row INSERT that ignores rows whose transaction_id already exists"""
+        if self.db.bind.dialect.name == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        
+        return insert(PendingRoundup).values(rows).on_conflict_do_nothing(
+            index_elements=['transaction_id']
+        )
+    
     @handle_service_errors
     def get_pending_roundups(self, user_id: int) -> List[PendingRoundup]:
         """Get all pending roundups for a user"""
@@ -6,8 +6,9 @@ It provides session creation, validation, and cleanup functionality.
 """
 
 import time
+import heapq
 import logging
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Tuple
 from datetime import datetime, timezone, timedelta
 from dataclasses import dataclass, asdict
 import threading
@@ -58,6 +59,11 @@ class SessionManager:
     def __init__(self):
         self._sessions: Dict[str, UserSession] = {}
         self._user_sessions: Dict[int, List[str]] = {}  # user_id -> [session_ids]
+        self._jti_index: Dict[str, str] = {}  # access_token_jti -> session_id
+        self._refresh_token_index: Dict[str, str] = {}  # refresh_token -> session_id
+        # Min-heap of (last_activity timestamp, session_id). Entries are lazy: activity
+        # updates do not touch the heap, the sweep re-queues sessions touched since.
+        self._activity_heap: List[Tuple[float, str]] = []
         self._lock = threading.RLock()
         self._cleanup_interval = 300  # 5 minutes
         self._max_idle_minutes = 30
@@ -109,6 +115,8 @@ class SessionManager:
             
             # Generate unique session ID
             session_id = f"sess_{user_id}_{int(time.time())}_{hash(f'{ip_address}{user_agent}')}"
+            if session_id in self._sessions:
+                self._remove_session(session_id)
             
             # Create session
             session = UserSession(
@@ -125,6 +133,11 @@ class SessionManager:
             
             # Store session
             self._sessions[session_id] = session
+            if access_token_jti:
+                self._jti_index[access_token_jti] = session_id
+            if refresh_token:
+                self._refresh_token_index[refresh_token] = session_id
+            heapq.heappush(self._activity_heap, (session.last_activity.timestamp(), session_id))
             
             # Update user sessions mapping
             if user_id not in self._user_sessions:
@@ -168,12 +181,35 @@ class SessionManager:
         if session:
             session.update_activity()
     
+    def update_session_tokens(
+        self,
+        session_id: str,
+        access_token_jti: Optional[str] = None,
+        refresh_token: Optional[str] = None
+    ):
+        """Attach a new access token JTI and/or refresh token to a session"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if not session:
+                return
+            
+            if access_token_jti:
+                self._unindex_session_tokens(session, refresh_token=False)
+                session.access_token_jti = access_token_jti
+                self._jti_index[access_token_jti] = session_id
+            if refresh_token:
+                self._unindex_session_tokens(session, access_token_jti=False)
+                session.refresh_token = refresh_token
+                self._refresh_token_index[refresh_token] = session_id
+    
     def deactivate_session(self, session_id: str):
         """Deactivate a session (soft delete)"""
         with self._lock:
             session = self._sessions.get(session_id)
             if session:
                 session.is_active = False
+                # Due immediately so the next sweep removes it
+                heapq.heappush(self._activity_heap, (0.0, session_id))
     
     def remove_session(self, session_id: str):
         """Remove a session completely"""
@@ -189,9 +225,19 @@ class SessionManager:
             if session_id in user_session_ids:
                 user_session_ids.remove(session_id)
             
+            # Remove from token indexes
+            self._unindex_session_tokens(session)
+            
             # Remove session
             del self._sessions[session_id]
     
+    def _unindex_session_tokens(self, session: UserSession, access_token_jti: bool = True, refresh_token: bool = True):
+        """Drop a session's token index entries (only if they still point at it)"""
+        if access_token_jti and session.access_token_jti and self._jti_index.get(session.access_token_jti) == session.session_id:
+            del self._jti_index[session.access_token_jti]
+        if refresh_token and session.refresh_token and self._refresh_token_index.get(session.refresh_token) == session.session_id:
+            del self._refresh_token_index[session.refresh_token]
+    
     def logout_user(self, user_id: int, session_id: Optional[str] = None):
         """Logout user from specific session or all sessions"""
         with self._lock:
@@ -208,14 +254,22 @@ class SessionManager:
         """Clean up expired sessions"""
         with self._lock:
             expired_sessions = []
-            current_time = datetime.now(timezone.utc)
+            cutoff = (datetime.now(timezone.utc) - timedelta(minutes=self._max_idle_minutes)).timestamp()
             
-            for session_id, session in self._sessions.items():
-                if session.is_expired(self._max_idle_minutes):
+            # Only sessions whose queued activity is past the cutoff are looked at
+            while self._activity_heap and self._activity_heap[0][0] < cutoff:
+                _, session_id = heapq.heappop(self._activity_heap)
+                session = self._sessions.get(session_id)
+                if session is None:
+                    continue
+                
+                last_activity = session.last_activity.timestamp() if session.last_activity else 0.0
+                if not session.is_active or last_activity < cutoff:
                     expired_sessions.append(session_id)
-            
-            for session_id in expired_sessions:
-                self._remove_session(session_id)
+                    self._remove_session(session_id)
+                else:
+                    # Touched since it was queued
+                    heapq.heappush(self._activity_heap, (last_activity, session_id))
             
             if expired_sessions:
                 pass
@@ -237,17 +291,19 @@ class SessionManager:
     
     def find_session_by_token_jti(self, jti: str) -> Optional[UserSession]:
         """Find session by access token JTI"""
-        for session in self._sessions.values():
-            if session.access_token_jti == jti and session.is_active:
+        with self._lock:
+            session = self._sessions.get(self._jti_index.get(jti))
+            if session and session.access_token_jti == jti and session.is_active:
                 return session
-        return None
+            return None
     
     def find_session_by_refresh_token(self, refresh_token: str) -> Optional[UserSession]:
         """Find session by refresh token"""
-        for session in self._sessions.values():
-            if session.refresh_token == refresh_token and session.is_active:
+        with self._lock:
+            session = self._sessions.get(self._refresh_token_index.get(refresh_token))
+            if session and session.refresh_token == refresh_token and session.is_active:
                 return session
-        return None
+            return None
 
 
 # Global session manager instance
@@ -75,10 +75,13 @@ def create_payment_intent(
     payment_method_id: Optional[str] = None,
     description: Optional[str] = None,
     metadata: Optional[Dict[str, Any]] = None,
-    automatic_payment_methods: bool = True
+    automatic_payment_methods: bool = True,
+    idempotency_key: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Create a Payment Intent for processing payments.
+    
+    Pass idempotency_key to make retries return the original intent instead of charging twice.
     """
     try:
         intent_data: Dict[str, Any] = {
@@ -99,6 +102,8 @@ def create_payment_intent(
             intent_data["description"] = description
         if metadata:
             intent_data["metadata"] = metadata
+        if idempotency_key:
+            intent_data["idempotency_key"] = idempotency_key
             
         payment_intent = stripe.PaymentIntent.create(**intent_data)
         
@@ -0,0 +1,187 @@
+"""
+System Metrics Sampler
+
+A background thread samples CPU, memory, disk, network and connection
+metrics on a fixed interval into a ring buffer, so health and monitoring
+endpoints read the latest sample instead of measuring on the request path:
+- CPU usage is psutil's non-blocking reading, i.e. the average since the
+  previous sample, instead of blocking the caller for a one second interval
+- The system-wide connection count (psutil.net_connections walks every
+  socket of the host) is refreshed on its own, longer interval
+
+Readers take the newest sample from the buffer without locking. Before the
+first sample exists, or when no thread is sampling (scripts, tasks) and the
+newest sample is older than the interval, one is taken inline (without the
+CPU wait).
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone, timedelta
+from typing import Deque, List, Optional
+
+from app.core.constants import (
+    SYSTEM_METRICS_CONNECTIONS_INTERVAL,
+    SYSTEM_METRICS_HISTORY_SIZE,
+    SYSTEM_METRICS_SAMPLE_INTERVAL,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+    logger.warning("psutil not available, system metrics will read as zero")
+
+
+@dataclass(frozen=True)
+class SystemSample:
+    """One sample of system metrics"""
+    timestamp: datetime
+    cpu_percent: float
+    memory_percent: float
+    memory_total_gb: float
+    memory_available_gb: float
+    disk_percent: float
+    disk_total_gb: float
+    disk_free_gb: float
+    process_memory_mb: float
+    active_connections: int
+    network_bytes_sent: int
+    network_bytes_recv: int
+
+
+class SystemMetricsSampler:
+    """Samples system metrics on a background thread into a ring buffer"""
+
+    def __init__(
+        self,
+        interval: float = SYSTEM_METRICS_SAMPLE_INTERVAL,
+        connections_interval: float = SYSTEM_METRICS_CONNECTIONS_INTERVAL,
+        history_size: int = SYSTEM_METRICS_HISTORY_SIZE,
+        disk_path: str = '/'
+    ):
+        self.interval = interval
+        self.connections_interval = connections_interval
+        self.disk_path = disk_path
+        self.samples: Deque[SystemSample] = deque(maxlen=history_size)
+        self._active_connections = 0
+        self._connections_sampled_at: Optional[float] = None
+        self._process = psutil.Process(os.getpid()) if PSUTIL_AVAILABLE else None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._sample_lock = threading.Lock()
+
+        if PSUTIL_AVAILABLE:
+            # Start psutil's CPU measurement period; the next reading covers it
+            psutil.cpu_percent(interval=None)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the sampling thread (once)"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="system-metrics-sampler", daemon=True)
+        self._thread.start()
+        logger.info(f"System metrics sampler started ({self.interval}s interval)")
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the sampling thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def latest(self) -> SystemSample:
+        """The newest sample, sampled inline if missing or stale with no thread running"""
+        try:
+            sample = self.samples[-1]
+        except IndexError:
+            return self.sample()
+        if not self.running and datetime.now(timezone.utc) - sample.timestamp >= timedelta(seconds=self.interval):
+            return self.sample()
+        return sample
+
+    def history(self, minutes: int = 60) -> List[SystemSample]:
+        """Samples of the last N minutes, oldest first"""
+        since = datetime.now(timezone.utc) - timedelta(minutes=minutes)
+        return [sample for sample in list(self.samples) if sample.timestamp >= since]
+
+    def sample(self) -> SystemSample:
+        """Take a sample now and add it to the buffer"""
+        with self._sample_lock:
+            sample = self._collect()
+            self.samples.append(sample)
+            return sample
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"Error sampling system metrics: {e}")
+            self._stop.wait(self.interval)
+
+    def _collect(self) -> SystemSample:
+        now = datetime.now(timezone.utc)
+        if not PSUTIL_AVAILABLE:
+            return SystemSample(now, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0, 0, 0)
+
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(self.disk_path)
+        network = psutil.net_io_counters()
+
+        return SystemSample(
+            timestamp=now,
+            cpu_percent=psutil.cpu_percent(interval=None),
+            memory_percent=memory.percent,
+            memory_total_gb=round(memory.total / 1024**3, 2),
+            memory_available_gb=round(memory.available / 1024**3, 2),
+            disk_percent=disk.percent,
+            disk_total_gb=round(disk.total / 1024**3, 2),
+            disk_free_gb=round(disk.free / 1024**3, 2),
+            process_memory_mb=round(self._process.memory_info().rss / 1024**2, 2),
+            active_connections=self._count_connections(),
+            network_bytes_sent=network.bytes_sent if network else 0,
+            network_bytes_recv=network.bytes_recv if network else 0,
+        )
+
+    def _count_connections(self) -> int:
+        """System-wide connection count, refreshed every connections_interval"""
+        now = time.monotonic()
+        if self._connections_sampled_at is None or now - self._connections_sampled_at >= self.connections_interval:
+            self._connections_sampled_at = now
+            try:
+                self._active_connections = len(psutil.net_connections())
+            except (psutil.AccessDenied, OSError) as e:
+                logger.debug(f"Cannot count network connections: {e}")
+        return self._active_connections
+
+
+# Global system metrics sampler instance
+system_metrics_sampler = SystemMetricsSampler()
+
+
+def get_system_metrics_sampler() -> SystemMetricsSampler:
+    """Get system metrics sampler instance"""
+    return system_metrics_sampler
+
+
+def setup_system_metrics_sampler(interval: Optional[float] = None) -> SystemMetricsSampler:
+    """Start the background sampler, optionally with a different interval"""
+    global system_metrics_sampler
+    if interval is not None and interval != system_metrics_sampler.interval:
+        system_metrics_sampler.stop()
+        system_metrics_sampler = SystemMetricsSampler(interval=interval)
+    system_metrics_sampler.start()
+    return system_metrics_sampler
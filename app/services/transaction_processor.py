@@ -15,7 +15,8 @@ from app.model.m_plaid_items import PlaidItem
 # PlaidTransaction import removed - using on-demand Plaid API fetching
 # PlaidService import removed - using PlaidTransactionService for on-demand fetching
 from app.services.roundup_engine import RoundupEngine
-from app.core.exceptions import ValidationError, ExternalServiceError
+from app.services.church_spending_rollup_service import ChurchSpendingRollupService
+from app.core.exceptions import ValidationError, ExternalServiceError, PlaidError
 from app.utils.error_handler import handle_service_errors
 
 logger = logging.getLogger(__name__)
@@ -73,7 +74,7 @@ class TransactionProcessor:
                     all_roundups.extend(result['created_roundups'])
                     
                 except Exception as e:
-                    logger.error(f"Error processing account {plaid_item.account_id}: {str(e)}")
+                    logger.error(f"Error processing account {plaid_item.item_id}: {str(e)}")
                     continue
             
             return {
@@ -199,26 +200,35 @@ class TransactionProcessor:
         }
     
     def _process_account_transactions(self, user_id: int, plaid_item: PlaidItem, days_back: int) -> Dict:
-        """Process transactions for a specific Plaid item"""
+        """Process transaction deltas for a specific Plaid item since its last sync cursor"""
         try:
-            # Fetch transactions from Plaid using PlaidTransactionService
+            # Pull only what changed since the cursor stored on the item
             from app.services.plaid_transaction_service import plaid_transaction_service
-            result = plaid_transaction_service.get_user_transactions(
-                user_id=plaid_item.user_id,
-                db=self.db,
-                days_back=days_back
+            delta = plaid_transaction_service.sync_item_transactions(plaid_item, days_back=days_back)
+            
+            if not delta.get("success"):
+                raise PlaidError(delta.get("error", "Failed to sync transactions"))
+            
+            # Process deltas through roundup engine
+            result = self.roundup_engine.apply_transaction_deltas(
+                user_id,
+                delta['added'],
+                delta['modified'],
+                delta['removed']
             )
-            transactions = result.get("transactions", []) if result.get("success") else []
             
-            # Process transactions through roundup engine
-            result = self.roundup_engine.process_user_transactions(user_id, transactions)
+            # Church spending rollups ride on the cursor commit so each transaction counts once
+            ChurchSpendingRollupService.record_user_transactions(self.db, user_id, delta['added'])
             
-            # Transaction storage removed - using on-demand Plaid API fetching
+            # Only advance the cursor once the deltas are applied; replays are idempotent
+            plaid_item.transactions_cursor = delta['next_cursor']
+            plaid_item.transactions_synced_at = datetime.now(timezone.utc)
+            self.db.commit()
             
             return result
             
         except Exception as e:
-            logger.error(f"Error processing account {plaid_item.account_id}: {str(e)}")
+            logger.error(f"Error processing account {plaid_item.item_id}: {str(e)}")
             raise
     
     # _store_transactions method removed - using on-demand Plaid API fetching instead of database storage
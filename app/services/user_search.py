@@ -0,0 +1,72 @@
+"""
+User Search Service
+
+Name/email search over users for the admin user list and church member search.
+
+On PostgreSQL the match runs against one search document,
+lower(first_name || ' ' || last_name || ' ' || email), which the pg_trgm GIN
+indexes from migrations/add_user_search_indexes.py cover:
+- ix_users_search_trgm for platform-wide searches
+- ix_users_church_search_trgm on (church_id, document) so a church-scoped
+  search only reads that church's index entries
+Results can be ranked by trigram word similarity to the search term.
+
+Other dialects (SQLite in tests) fall back to ILIKE on each column, unranked.
+"""
+
+from sqlalchemy import func, literal_column
+from sqlalchemy.orm import Query
+
+from app.model.m_user import User
+
+# Must stay identical to the indexed expression for the planner to use the index
+_SEPARATOR = literal_column("' '")
+
+
+def user_search_document():
+    """SQL expression of the lowercased name/email search document"""
+    return func.lower(
+        User.first_name + _SEPARATOR + User.last_name + _SEPARATOR + User.email
+    )
+
+
+def _uses_trigram_index(query: Query) -> bool:
+    return query.session.bind.dialect.name == "postgresql"
+
+
+def filter_by_search_term(query: Query, term: str) -> Query:
+    """Restrict a User query to users whose name or email contains term"""
+    pattern = f"%{term}%"
+    if _uses_trigram_index(query):
+        return query.filter(user_search_document().ilike(pattern))
+    return query.filter(
+        User.email.ilike(pattern)
+        | User.first_name.ilike(pattern)
+        | User.last_name.ilike(pattern)
+    )
+
+
+def search_rank(query: Query, term: str):
+    """
+    Relevance of each user to term, higher first
+
+    Returns None where trigram ranking is unavailable; callers keep their
+    regular ordering then.
+    """
+    if not _uses_trigram_index(query):
+        return None
+    return func.word_similarity(term.lower(), user_search_document())
+
+
+def order_by_relevance(query: Query, term: str) -> Query:
+    """
+    Order a searched User query by relevance to term
+
+    Leaves the query unchanged where ranking is unavailable. Orderings added
+    afterwards break ties.
+    """
+    rank = search_rank(query, term)
+    if rank is None:
+        return query
+    return query.order_by(rank.desc())
+
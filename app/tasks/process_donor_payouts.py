@@ -0,0 +1,209 @@
+"""
+Scheduled Donor Payout Run
+
+Runs the daily donor payouts as a partitioned, resumable job:
+1. Create (or resume) the run for the day in scheduled_payout_runs
+2. Checkpoint every due donor as a pending item in scheduled_payout_run_items
+3. Shard unfinished items across a bounded worker pool, one session per worker
+4. Claim each item atomically, process the payout, record the outcome
+
+Stripe payment intents use an idempotency key derived from (user_id, period),
+so a donor retried after a crash is never charged twice.
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, func
+from sqlalchemy.exc import IntegrityError
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone, timedelta, date
+from typing import List, Dict, Any, Optional
+import logging
+
+from app.model.m_scheduled_payout_run import ScheduledPayoutRun, ScheduledPayoutRunItem
+from app.services.donor_schedule_service import DonorScheduleService
+from app.utils.database import SessionLocal
+
+# Worker pool size for a payout run
+PAYOUT_RUN_WORKERS = 4
+
+# Items left in "processing" this long are assumed to belong to a crashed worker
+STALE_ITEM_MINUTES = 30
+
+# Give up on a donor for the day after this many attempts
+MAX_ITEM_ATTEMPTS = 3
+
+
+def _get_or_create_run(db: Session, run_date: date) -> ScheduledPayoutRun:
+    """Return the run for run_date, creating it and checkpointing due donors if new"""
+    run = db.query(ScheduledPayoutRun).filter(ScheduledPayoutRun.run_date == run_date).first()
+    if run:
+        logging.info(f"[PAYOUT RUN] Resuming run {run.id} for {run_date}")
+        return run
+
+    target_date = datetime(run_date.year, run_date.month, run_date.day, tzinfo=timezone.utc)
+    due_donors = DonorScheduleService.get_donors_due_for_donation(db, target_date)
+
+    run = ScheduledPayoutRun(run_date=run_date, status="running", total_donors=len(due_donors))
+    db.add(run)
+    try:
+        db.flush()
+        db.add_all([
+            ScheduledPayoutRunItem(run_id=run.id, user_id=donor["user_id"], status="pending")
+            for donor in due_donors
+        ])
+        db.commit()
+    except IntegrityError:
+        # Another worker process created the run first
+        db.rollback()
+        return db.query(ScheduledPayoutRun).filter(ScheduledPayoutRun.run_date == run_date).one()
+
+    logging.info(f"[PAYOUT RUN] Created run {run.id} for {run_date} with {len(due_donors)} due donors")
+    return run
+
+
+def _claimable_filter():
+    """Items that still need work: pending, retryable failures, or stale in-flight claims"""
+    stale_before = datetime.now(timezone.utc) - timedelta(minutes=STALE_ITEM_MINUTES)
+    return and_(
+        ScheduledPayoutRunItem.attempts < MAX_ITEM_ATTEMPTS,
+        or_(
+            ScheduledPayoutRunItem.status.in_(["pending", "failed"]),
+            and_(
+                ScheduledPayoutRunItem.status == "processing",
+                ScheduledPayoutRunItem.updated_at < stale_before
+            )
+        )
+    )
+
+
+def _process_shard(run_id: int, period: str, item_ids: List[int]) -> Dict[str, int]:
+    """Process one shard of run items in its own session"""
+    db = SessionLocal()
+    processed_count = 0
+    failed_count = 0
+    try:
+        for item_id in item_ids:
+            # Atomic claim so concurrent runners never process the same donor
+            claimed = db.query(ScheduledPayoutRunItem).filter(
+                ScheduledPayoutRunItem.id == item_id,
+                _claimable_filter()
+            ).update({
+                "status": "processing",
+                "attempts": ScheduledPayoutRunItem.attempts + 1,
+                "updated_at": datetime.now(timezone.utc)
+            }, synchronize_session=False)
+            db.commit()
+
+            if not claimed:
+                continue
+
+            item = db.query(ScheduledPayoutRunItem).filter(ScheduledPayoutRunItem.id == item_id).one()
+            try:
+                result = DonorScheduleService.process_donor_payout(item.user_id, db, period=period)
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+
+            if not result.get("success"):
+                db.rollback()
+                item = db.query(ScheduledPayoutRunItem).filter(ScheduledPayoutRunItem.id == item_id).one()
+
+            item.status = "completed" if result.get("success") else "failed"
+            item.donor_payout_id = result.get("donor_payout_id")
+            item.payment_intent_id = result.get("payment_intent_id") or item.payment_intent_id
+            item.error_message = None if result.get("success") else result.get("error")
+            db.commit()
+
+            if result.get("success"):
+                processed_count += 1
+                logging.info(f"[PAYOUT RUN] Processed donation for user {item.user_id}: ${result['amount']}")
+            else:
+                failed_count += 1
+                logging.error(f"[PAYOUT RUN] Failed to process donation for user {item.user_id}: {result.get('error')}")
+
+    except Exception as e:
+        db.rollback()
+        logging.error(f"[PAYOUT RUN] Error in shard for run {run_id}: {str(e)}")
+    finally:
+        db.close()
+
+    return {"processed": processed_count, "failed": failed_count}
+
+
+def run_donor_payouts(run_date: Optional[date] = None, max_workers: int = PAYOUT_RUN_WORKERS) -> Dict[str, Any]:
+    """
+    Run (or resume) the scheduled donor payouts for a day
+
+    Args:
+        run_date: Day to run (defaults to today UTC)
+        max_workers: Number of parallel workers
+
+    Returns:
+        Dict with run summary
+    """
+    if run_date is None:
+        run_date = datetime.now(timezone.utc).date()
+    period = run_date.strftime("%Y-%m-%d")
+
+    db = SessionLocal()
+    try:
+        run = _get_or_create_run(db, run_date)
+        run_id = run.id
+
+        item_ids = [
+            row.id for row in db.query(ScheduledPayoutRunItem.id).filter(
+                ScheduledPayoutRunItem.run_id == run_id,
+                _claimable_filter()
+            ).order_by(ScheduledPayoutRunItem.user_id).all()
+        ]
+    finally:
+        db.close()
+
+    # Round-robin shards keep the workers evenly loaded
+    shard_count = max(1, min(max_workers, len(item_ids)))
+    shards = [item_ids[i::shard_count] for i in range(shard_count)]
+
+    processed_count = 0
+    failed_count = 0
+    if item_ids:
+        with ThreadPoolExecutor(max_workers=shard_count, thread_name_prefix="payout-run") as executor:
+            for shard_result in executor.map(lambda shard: _process_shard(run_id, period, shard), shards):
+                processed_count += shard_result["processed"]
+                failed_count += shard_result["failed"]
+
+    db = SessionLocal()
+    try:
+        run = db.query(ScheduledPayoutRun).filter(ScheduledPayoutRun.id == run_id).one()
+        status_counts = dict(
+            db.query(ScheduledPayoutRunItem.status, func.count(ScheduledPayoutRunItem.id)).filter(
+                ScheduledPayoutRunItem.run_id == run_id
+            ).group_by(ScheduledPayoutRunItem.status).all()
+        )
+        remaining = db.query(func.count(ScheduledPayoutRunItem.id)).filter(
+            ScheduledPayoutRunItem.run_id == run_id,
+            _claimable_filter()
+        ).scalar()
+
+        run.processed_count = status_counts.get("completed", 0)
+        run.failed_count = status_counts.get("failed", 0)
+        if not remaining and not status_counts.get("processing"):
+            run.status = "completed"
+            run.completed_at = datetime.now(timezone.utc)
+        db.commit()
+
+        logging.info(
+            f"[PAYOUT RUN] Run {run_id} for {period}: {processed_count} successful, {failed_count} failed this pass "
+            f"({run.processed_count}/{run.total_donors} completed overall)"
+        )
+
+        return {
+            "run_id": run_id,
+            "run_date": period,
+            "status": run.status,
+            "total_donors": run.total_donors,
+            "processed_count": processed_count,
+            "failed_count": failed_count,
+            "completed_total": run.processed_count,
+            "failed_total": run.failed_count
+        }
+    finally:
+        db.close()
@@ -0,0 +1,50 @@
+"""
+Church Spending Rollup Rebuild Task
+
+Recomputes church_spending_rollups for a trailing window directly from Plaid:
+1. Find churches (all, or one)
+2. Drop their rollup buckets inside the window
+3. Re-aggregate each active donor's transactions into daily buckets
+
+Run once after add_church_spending_rollups to backfill history, or to repair
+a church's rollups. Day-to-day, rollups are fed by sync_donor_transactions on
+the background scheduler; transactions counted here are skipped there.
+"""
+
+import logging
+import sys
+from typing import Optional, Dict, Any
+
+from app.model.m_church import Church
+from app.services.church_spending_rollup_service import ChurchSpendingRollupService
+from app.utils.database import SessionLocal
+
+
+def rebuild_church_spending_rollups(church_id: Optional[int] = None, days_back: int = 90) -> Dict[str, Any]:
+    """Rebuild spending rollups for one church or every active church"""
+    db = SessionLocal()
+    try:
+        query = db.query(Church.id)
+        if church_id is not None:
+            query = query.filter(Church.id == church_id)
+        else:
+            query = query.filter(Church.is_active == True)
+        church_ids = [row.id for row in query.all()]
+
+        results = []
+        for cid in church_ids:
+            try:
+                result = ChurchSpendingRollupService.rebuild_church_rollups(db, cid, days_back=days_back)
+                results.append(result)
+                logging.info(f"[ROLLUPS] Rebuilt church {cid}: {result['transactions_counted']} transactions")
+            except Exception as e:
+                db.rollback()
+                logging.error(f"[ROLLUPS] Error rebuilding church {cid}: {str(e)}")
+
+        return {"churches": len(church_ids), "rebuilt": len(results), "results": results}
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_church_spending_rollups(church_id=int(sys.argv[1]) if len(sys.argv) > 1 else None)
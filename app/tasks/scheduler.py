@@ -2,12 +2,14 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from app.tasks.cleanup_blacklisted_tokens import clean_expired_blacklist
 from app.tasks.process_church_payouts import process_pending_church_payouts, retry_failed_payouts, create_monthly_church_payouts
 from app.tasks.referral_commission_scheduler import process_referral_commissions, calculate_pending_commissions, retry_failed_commission_payouts
-from app.utils.database import SessionLocal
 from app.model.m_user import User
 from app.model.m_donation_preference import DonationPreference
 from app.controller.admin.execute_donation_batch import execute_donation_batch
 from app.tasks.retry_failed_batches import retry_failed_donations
-from app.services.donor_schedule_service import DonorScheduleService
+from app.tasks.process_donor_payouts import run_donor_payouts
+from app.tasks.reconcile_platform_counters import run_platform_counter_reconciliation
+from app.tasks.sync_donor_transactions import sync_donor_transactions
+from app.config import config
 from datetime import datetime, timezone, timedelta
 from app.model.m_donation_batch import DonationBatch
 import logging
@@ -18,45 +20,21 @@ import logging
 
 def run_scheduled_roundups():
     """
-    Main scheduler function that processes individual donor payouts based on their schedules
+    Main scheduler function that processes individual donor payouts based on their schedules.
+    Delegates to the checkpointed payout run, so a crashed run resumes where it stopped.
     """
-    db = SessionLocal()
     try:
         logging.info("[SCHEDULER] Starting scheduled donor payout processing...")
         
-        # Get donors due for donation today
-        due_donors = DonorScheduleService.get_donors_due_for_donation(db)
+        summary = run_donor_payouts()
         
-        logging.info(f"[SCHEDULER] Found {len(due_donors)} donors due for donation today")
-        
-        processed_count = 0
-        failed_count = 0
-        
-        for donor in due_donors:
-            try:
-                logging.info(f"[SCHEDULER] Processing donation for {donor['name']} (User ID: {donor['user_id']})")
-                
-                # Process the donor payout
-                result = DonorScheduleService.process_donor_payout(donor['user_id'], db)
-                
-                if result['success']:
-                    processed_count += 1
-                    logging.info(f"[SCHEDULER] Successfully processed donation for {donor['name']}: ${result['amount']}")
-                else:
-                    failed_count += 1
-                    logging.error(f"[SCHEDULER] Failed to process donation for {donor['name']}: {result['error']}")
-                    
-            except Exception as e:
-                failed_count += 1
-                logging.error(f"[SCHEDULER] Error processing donation for {donor['name']}: {str(e)}")
-                continue
-        
-        logging.info(f"[SCHEDULER] Completed donor payout processing: {processed_count} successful, {failed_count} failed")
+        logging.info(
+            f"[SCHEDULER] Completed donor payout processing: {summary['processed_count']} successful, "
+            f"{summary['failed_count']} failed (run {summary['run_id']}, {summary['status']})"
+        )
                 
     except Exception as e:
         logging.error(f"[SCHEDULER] Error in scheduled donor payout processing: {str(e)}")
-    finally:
-        db.close()
 
 
 def should_process_roundups(preference, current_time, db):
@@ -198,22 +176,56 @@ def add_scheduler_jobs():
     )
 
 
+def add_data_sync_jobs():
+    """
+    Add the jobs that keep derived data current
+    
+    Neither job moves money: one syncs Plaid transactions into pending roundups
+    and church spending rollups, the other repairs platform counter drift.
+    """
+    scheduler.add_job(
+        sync_donor_transactions,
+        'interval',
+        hours=config.TRANSACTION_SYNC_INTERVAL_HOURS,  # Feeds pending roundups and church spending rollups
+        id='sync_donor_transactions',
+        name='Sync donor Plaid transactions'
+    )
+
+    scheduler.add_job(
+        run_platform_counter_reconciliation,
+        'interval',
+        hours=1,  # Repair counter drift hourly
+        id='reconcile_platform_counters',
+        name='Reconcile platform counters'
+    )
+
+
 def start_scheduler():
-    """Start the background scheduler"""
+    """
+    Start the background scheduler with the data sync jobs
+    
+    No-op unless SCHEDULER_ENABLED, which should be set on exactly one process:
+    every process that starts the scheduler runs each job. The charge and
+    payout jobs in add_scheduler_jobs are not started here.
+    """
+    if not config.SCHEDULER_ENABLED or scheduler.running:
+        return
     try:
         # Add jobs first
-        add_scheduler_jobs()
+        add_data_sync_jobs()
         # Then start the scheduler
         scheduler.start()
-        info("[SCHEDULER] Background scheduler started successfully")
+        logging.info("[SCHEDULER] Background scheduler started successfully")
     except Exception as e:
-        error(f"[SCHEDULER] Failed to start scheduler: {e}")
+        logging.error(f"[SCHEDULER] Failed to start scheduler: {e}")
 
 
 def stop_scheduler():
     """Stop the background scheduler"""
+    if not scheduler.running:
+        return
     try:
         scheduler.shutdown()
-        info("[SCHEDULER] Background scheduler stopped")
+        logging.info("[SCHEDULER] Background scheduler stopped")
     except Exception as e:
-        error(f"[SCHEDULER] Error stopping scheduler: {e}")
+        logging.error(f"[SCHEDULER] Error stopping scheduler: {e}")
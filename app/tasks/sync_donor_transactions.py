@@ -0,0 +1,56 @@
+"""
+Donor Transaction Sync Task
+
+Pulls /transactions/sync deltas for every active Plaid item of church donors:
+1. Find active donors with a church and an active Plaid item
+2. Apply each item's deltas to the donor's pending roundups
+3. Fold newly added spending into church_spending_rollups
+
+Each item's cursor advances in the same commit as its deltas, so a failed
+item simply replays on the next run. Registered on the background scheduler.
+"""
+
+import logging
+from typing import Dict, Any
+
+from app.model.m_user import User
+from app.model.m_plaid_items import PlaidItem
+from app.services.transaction_processor import TransactionProcessor
+from app.utils.database import SessionLocal
+
+
+def sync_donor_transactions() -> Dict[str, Any]:
+    """Sync Plaid transactions for every church donor with a linked bank"""
+    db = SessionLocal()
+    try:
+        user_ids = [
+            row.id for row in db.query(User.id).join(
+                PlaidItem, PlaidItem.user_id == User.id
+            ).filter(
+                User.church_id.isnot(None),
+                User.role == "donor",
+                User.is_active == True,
+                PlaidItem.status == "active"
+            ).distinct().all()
+        ]
+
+        processor = TransactionProcessor(db)
+        synced = 0
+        failed = 0
+        for user_id in user_ids:
+            try:
+                result = processor.process_user_transactions(user_id)
+                synced += result.get('processed_count', 0)
+            except Exception as e:
+                db.rollback()
+                failed += 1
+                logging.error(f"[TRANSACTION SYNC] Error syncing donor {user_id}: {str(e)}")
+
+        logging.info(f"[TRANSACTION SYNC] Synced {len(user_ids)} donors: {synced} roundups created, {failed} failed")
+        return {"donors": len(user_ids), "processed_count": synced, "failed": failed}
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sync_donor_transactions()
@@ -32,9 +32,10 @@ from app.utils.jwt_handler import (
 # Database utilities
 from app.utils.database import (
     get_db,
-    database,
+    get_async_db,
     engine,
     SessionLocal,
+    AsyncSessionLocal,
     Base,
     db_session
 )
@@ -87,9 +88,10 @@ __all__ = [
     
     # Database
     "get_db",
-    "database",
+    "get_async_db",
     "engine", 
     "SessionLocal",
+    "AsyncSessionLocal",
     "Base",
     "db_session",
     
@@ -1,5 +1,7 @@
-import databases
-from sqlalchemy import create_engine
+from typing import AsyncIterator, Optional
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config import config
 import logging
@@ -43,9 +45,6 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create base class for models
 Base = declarative_base()
 
-# Database instance for async operations
-database = databases.Database(config.get_database_url)
-
 from contextlib import contextmanager
 
 @contextmanager
@@ -68,13 +67,72 @@ def get_db():
     finally:
         db.close()
 
-async def get_async_db():
-    """Async dependency for FastAPI to get database session"""
-    await database.connect()
+# libpq-only URL options that asyncpg rejects; sslmode is mapped to its ssl argument
+_LIBPQ_ONLY_OPTIONS = ("sslmode", "channel_binding")
+
+def create_async_database_engine() -> AsyncEngine:
+    """Create the asyncpg engine for async routes, pooled like the sync engine"""
+    url = make_url(config.get_database_url).set(drivername="postgresql+asyncpg")
+    sslmode = url.query.get("sslmode")
+    url = url.difference_update_query(_LIBPQ_ONLY_OPTIONS)
+
+    connect_args = {}
+    if (sslmode and sslmode != "disable") or "neon.tech" in (url.host or ""):
+        connect_args["ssl"] = "require"
+        connect_args["server_settings"] = {"application_name": "manna_backend"}
+
+    return create_async_engine(
+        url,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        echo=False,
+        connect_args=connect_args
+    )
+
+# Async engine, created on first use so importing this module never needs asyncpg
+_async_engine: Optional[AsyncEngine] = None
+
+def get_async_engine() -> AsyncEngine:
+    """Get the process-wide async engine"""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_database_engine()
+    return _async_engine
+
+# Async session factory; bound to the engine when first used
+AsyncSessionLocal = async_sessionmaker(class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+async def connect_async_database():
+    """Open the async pool at startup so the first requests don't pay for connecting"""
     try:
-        yield database
-    finally:
-        await database.disconnect()
+        async with get_async_engine().connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    except Exception as e:
+        logging.error(f"Async database connection failed at startup: {e}")
+
+async def dispose_async_database():
+    """Close the async pool's connections at shutdown"""
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Async dependency for FastAPI to get a pooled database session"""
+    async with AsyncSessionLocal(bind=get_async_engine()) as session:
+        yield session
+
+def checked_out_connections() -> int:
+    """Connections currently checked out of the sync and async pools"""
+    connections = 0
+    for pool in (engine.pool, _async_engine.pool if _async_engine is not None else None):
+        checkedout = getattr(pool, "checkedout", None)
+        if checkedout is not None:
+            connections += checkedout()
+    return connections
 
 def test_database_connection():
     """Test database connection and return status"""
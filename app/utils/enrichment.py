@@ -0,0 +1,118 @@
+"""
+Per-page enrichment helpers for list endpoints.
+
+List endpoints page a set of rows and then decorate each with related data
+(donation totals, preferences, churches). Looking those up row by row costs
+one or more queries per listed item. These helpers load them for the whole
+page at once, so a page costs a constant number of queries whatever its size.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+
+def aggregate_by_ids(
+    db: Session,
+    key_column,
+    ids: Iterable[Any],
+    aggregates: Mapping[str, Any],
+    *filters,
+    empty: Optional[Mapping[str, Any]] = None
+) -> Dict[Any, Dict[str, Any]]:
+    """
+    Per-id aggregates from one GROUP BY query.
+
+    Args:
+        db: Session
+        key_column: Column holding the id to group by, e.g. DonationBatch.user_id
+        ids: The page's ids
+        aggregates: Result name -> aggregate expression, e.g. {"total": func.sum(...)}
+        *filters: Extra WHERE criteria
+        empty: Values for ids without matching rows (default: None for every aggregate)
+
+    Returns:
+        Dict of id -> {result name: value}, with an entry for every requested id
+    """
+    ids = list(dict.fromkeys(i for i in ids if i is not None))
+    empty = dict(empty) if empty is not None else dict.fromkeys(aggregates)
+    if not ids:
+        return {}
+
+    names = list(aggregates)
+    rows = (
+        db.query(key_column, *[aggregates[name] for name in names])
+        .filter(key_column.in_(ids), *filters)
+        .group_by(key_column)
+        .all()
+    )
+
+    result = {i: dict(empty) for i in ids}
+    for row in rows:
+        values = result[row[0]]
+        for name, value in zip(names, row[1:]):
+            if value is not None:
+                values[name] = value
+    return result
+
+
+def rows_by_ids(db: Session, model, key_column, ids: Iterable[Any], *filters) -> Dict[Any, Any]:
+    """
+    One row of model per id from a single IN query.
+
+    When several rows share an id the one with the lowest primary key wins;
+    ids without a row are absent from the result.
+    """
+    ids = list(dict.fromkeys(i for i in ids if i is not None))
+    if not ids:
+        return {}
+
+    result: Dict[Any, Any] = {}
+    for row in (
+        db.query(model)
+        .filter(key_column.in_(ids), *filters)
+        .order_by(*model.__mapper__.primary_key)
+        .all()
+    ):
+        result.setdefault(getattr(row, key_column.key), row)
+    return result
+
+
+def latest_rows_by_ids(
+    db: Session,
+    model,
+    key_column,
+    ids: Iterable[Any],
+    order_by,
+    per_id: int,
+    *filters
+) -> Dict[Any, List[Any]]:
+    """
+    The first per_id rows of model for each id, in order_by order.
+
+    One query ranking rows with ROW_NUMBER() per id; ids without rows map to
+    an empty list.
+    """
+    ids = list(dict.fromkeys(i for i in ids if i is not None))
+    if not ids:
+        return {}
+
+    ranked = (
+        db.query(
+            model.id.label("row_id"),
+            func.row_number().over(partition_by=key_column, order_by=order_by).label("row_rank"),
+        )
+        .filter(key_column.in_(ids), *filters)
+        .subquery()
+    )
+    result: Dict[Any, List[Any]] = {i: [] for i in ids}
+    for row in (
+        db.query(model)
+        .join(ranked, model.id == ranked.c.row_id)
+        .filter(ranked.c.row_rank <= per_id)
+        .order_by(key_column, ranked.c.row_rank)
+        .all()
+    ):
+        result[getattr(row, key_column.key)].append(row)
+    return result
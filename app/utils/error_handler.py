@@ -5,6 +5,7 @@ Provides decorators and utilities to standardize error handling across controlle
 and ensure consistent error responses to the frontend.
 """
 
+import inspect
 import logging
 import traceback
 from functools import wraps
@@ -21,142 +22,159 @@ from app.core.exceptions import (
 from app.core.responses import ResponseFactory
 
 
-def handle_controller_errors(func: Callable) -> Callable:
-    """
-    Decorator to handle common controller errors and convert them to appropriate exceptions
-    
-    This decorator catches common exceptions in controllers and converts them to
-    proper MannaException instances that the global exception handler can process.
-    """
+def _raise_controller_error(func: Callable, error: Exception) -> None:
+    """Re-raise an error escaping a controller as the matching MannaException"""
+    try:
+        raise error
+    except MannaException:
+        # Re-raise our custom exceptions as-is
+        raise
     
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        try:
-            return func(*args, **kwargs)
+    except SQLAlchemyError as e:
         
-        except MannaException:
-            # Re-raise our custom exceptions as-is
-            raise
-        
-        except SQLAlchemyError as e:
+        if isinstance(e, IntegrityError):
+            error_msg = str(e.orig) if hasattr(e, 'orig') else str(e)
             
-            if isinstance(e, IntegrityError):
-                error_msg = str(e.orig) if hasattr(e, 'orig') else str(e)
-                
-                if "UNIQUE constraint failed" in error_msg or "duplicate key" in error_msg.lower():
-                    if "email" in error_msg.lower():
-                        raise UserExistsError(details={"field": "email"})
-                    elif "phone" in error_msg.lower():
-                        raise UserExistsError(details={"field": "phone"})
-                    else:
-                        raise ValidationError(
-                            message="A record with this information already exists",
-                            error_code="DUPLICATE_RECORD"
-                        )
-                
-                elif "FOREIGN KEY constraint failed" in error_msg:
+            if "UNIQUE constraint failed" in error_msg or "duplicate key" in error_msg.lower():
+                if "email" in error_msg.lower():
+                    raise UserExistsError(details={"field": "email"})
+                elif "phone" in error_msg.lower():
+                    raise UserExistsError(details={"field": "phone"})
+                else:
                     raise ValidationError(
-                        message="Referenced record does not exist",
-                        error_code="INVALID_REFERENCE"
-                    )
-                
-                elif "NOT NULL constraint failed" in error_msg:
-                    # Extract field name from error message
-                    field_name = "field"
-                    if "." in error_msg:
-                        try:
-                            field_name = error_msg.split(".")[-1].split()[0]
-                        except:
-                            pass
-                    
-                    raise ValidationError(
-                        message=f"Required field '{field_name}' is missing",
-                        error_code="MISSING_REQUIRED_FIELD",
-                        details={"field": field_name}
+                        message="A record with this information already exists",
+                        error_code="DUPLICATE_RECORD"
                     )
             
-            # Generic database error
-            raise DatabaseError(
-                message="Database operation failed. Please try again.",
-                details={"error_type": type(e).__name__}
+            elif "FOREIGN KEY constraint failed" in error_msg:
+                raise ValidationError(
+                    message="Referenced record does not exist",
+                    error_code="INVALID_REFERENCE"
+                )
+            
+            elif "NOT NULL constraint failed" in error_msg:
+                # Extract field name from error message
+                field_name = "field"
+                if "." in error_msg:
+                    try:
+                        field_name = error_msg.split(".")[-1].split()[0]
+                    except:
+                        pass
+                
+                raise ValidationError(
+                    message=f"Required field '{field_name}' is missing",
+                    error_code="MISSING_REQUIRED_FIELD",
+                    details={"field": field_name}
+                )
+        
+        # Generic database error
+        raise DatabaseError(
+            message="Database operation failed. Please try again.",
+            details={"error_type": type(e).__name__}
+        )
+    
+    except ValueError as e:
+        raise ValidationError(
+            message=f"Invalid input value: {str(e)}",
+            error_code="INVALID_VALUE"
+        )
+    
+    except PermissionError as e:
+        raise ValidationError(
+            message="Insufficient permissions to perform this action",
+            error_code="PERMISSION_DENIED"
+        )
+    
+    except FileNotFoundError as e:
+        raise ValidationError(
+            message="Requested file or resource not found",
+            error_code="FILE_NOT_FOUND"
+        )
+    
+    except Exception as e:
+        # Log unexpected errors with full traceback
+        logging.error(f"Unexpected error in {func.__name__}: {str(e)}")
+        logging.error(f"Traceback: {traceback.format_exc()}")
+        
+        # Check for specific service errors in the exception message
+        error_msg = str(e).lower()
+        
+        if "stripe" in error_msg:
+            raise StripeError(
+                message=f"Payment processing error: {str(e)}",
+                details={"original_error": str(e), "function": func.__name__}
             )
         
-        except ValueError as e:
-            raise ValidationError(
-                message=f"Invalid input value: {str(e)}",
-                error_code="INVALID_VALUE"
+        elif "plaid" in error_msg:
+            raise PlaidError(
+                message=f"Banking service error: {str(e)}",
+                details={"original_error": str(e), "function": func.__name__}
             )
         
-        except PermissionError as e:
-            raise ValidationError(
-                message="Insufficient permissions to perform this action",
-                error_code="PERMISSION_DENIED"
+        elif "email" in error_msg and ("send" in error_msg or "smtp" in error_msg):
+            raise EmailError(
+                message=f"Email service error: {str(e)}",
+                details={"original_error": str(e), "function": func.__name__}
             )
         
-        except FileNotFoundError as e:
-            raise ValidationError(
-                message="Requested file or resource not found",
-                error_code="FILE_NOT_FOUND"
+        elif "sms" in error_msg or "twilio" in error_msg:
+            raise SMSError(
+                message=f"SMS service error: {str(e)}",
+                details={"original_error": str(e), "function": func.__name__}
             )
         
-        except Exception as e:
-            # Log unexpected errors with full traceback
-            logging.error(f"Unexpected error in {func.__name__}: {str(e)}")
-            logging.error(f"Traceback: {traceback.format_exc()}")
-            
-            # Check for specific service errors in the exception message
-            error_msg = str(e).lower()
-            
-            if "stripe" in error_msg:
-                raise StripeError(
-                    message=f"Payment processing error: {str(e)}",
-                    details={"original_error": str(e), "function": func.__name__}
-                )
-            
-            elif "plaid" in error_msg:
-                raise PlaidError(
-                    message=f"Banking service error: {str(e)}",
-                    details={"original_error": str(e), "function": func.__name__}
-                )
-            
-            elif "email" in error_msg and ("send" in error_msg or "smtp" in error_msg):
-                raise EmailError(
-                    message=f"Email service error: {str(e)}",
-                    details={"original_error": str(e), "function": func.__name__}
-                )
-            
-            elif "sms" in error_msg or "twilio" in error_msg:
-                raise SMSError(
-                    message=f"SMS service error: {str(e)}",
-                    details={"original_error": str(e), "function": func.__name__}
-                )
-            
-            elif "connection" in error_msg:
-                raise MannaException(
-                    message="Connection error. Please refresh the page.",
-                    error_code="CONNECTION_ERROR",
-                    details={"original_error": str(e), "function": func.__name__}
-                )
-            
-            elif "kyc" in error_msg or "compliance" in error_msg:
-                raise MannaException(
-                    message="Compliance verification error. Please check your information and try again.",
-                    error_code="KYC_ERROR",
-                    details={"original_error": str(e), "function": func.__name__}
-                )
-            
-            elif "referral" in error_msg:
-                raise ReferralError(
-                    message=f"Referral system error: {str(e)}",
-                    details={"original_error": str(e), "function": func.__name__}
-                )
-            
-            # Re-raise as generic internal error
+        elif "connection" in error_msg:
             raise MannaException(
-                message="An unexpected error occurred. Please try again later.",
-                error_code="INTERNAL_ERROR",
-                details={"error_type": type(e).__name__, "function": func.__name__}
+                message="Connection error. Please refresh the page.",
+                error_code="CONNECTION_ERROR",
+                details={"original_error": str(e), "function": func.__name__}
+            )
+        
+        elif "kyc" in error_msg or "compliance" in error_msg:
+            raise MannaException(
+                message="Compliance verification error. Please check your information and try again.",
+                error_code="KYC_ERROR",
+                details={"original_error": str(e), "function": func.__name__}
+            )
+        
+        elif "referral" in error_msg:
+            raise ReferralError(
+                message=f"Referral system error: {str(e)}",
+                details={"original_error": str(e), "function": func.__name__}
             )
+        
+        # Re-raise as generic internal error
+        raise MannaException(
+            message="An unexpected error occurred. Please try again later.",
+            error_code="INTERNAL_ERROR",
+            details={"error_type": type(e).__name__, "function": func.__name__}
+        )
+
+
+def handle_controller_errors(func: Callable) -> Callable:
+    """
+    Decorator to handle common controller errors and convert them to appropriate exceptions
+    
+    This decorator catches common exceptions in controllers and converts them to
+    proper MannaException instances that the global exception handler can process.
+    """
+    
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                _raise_controller_error(func, e)
+
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            _raise_controller_error(func, e)
     
     return wrapper
 
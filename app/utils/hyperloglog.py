@@ -0,0 +1,70 @@
+"""
+HyperLogLog distinct counter
+
+Small, mergeable cardinality sketch stored as raw register bytes. Used by the
+church spending rollups so per-day distinct-donor counts can be combined into
+any date range without keeping donor id sets.
+"""
+
+import hashlib
+import math
+from typing import Any, Iterable, Optional
+
+# 2^8 one-byte registers: 256 bytes per sketch, ~6.5% standard error
+DEFAULT_PRECISION = 8
+
+
+class HyperLogLog:
+    """HyperLogLog sketch with linear-counting correction for small cardinalities"""
+
+    def __init__(self, precision: int = DEFAULT_PRECISION, registers: Optional[bytes] = None):
+        self.precision = precision
+        self.size = 1 << precision
+        if registers is not None and len(registers) != self.size:
+            raise ValueError(f"Expected {self.size} registers, got {len(registers)}")
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.size)
+
+    @classmethod
+    def from_bytes(cls, data: Optional[bytes]) -> "HyperLogLog":
+        """Load a sketch from its stored registers (None gives an empty sketch)"""
+        if not data:
+            return cls()
+        return cls(precision=int(math.log2(len(data))), registers=bytes(data))
+
+    def to_bytes(self) -> bytes:
+        """Registers for storage"""
+        return bytes(self.registers)
+
+    def add(self, value: Any):
+        """Add a value to the sketch"""
+        hashed = int.from_bytes(hashlib.sha1(str(value).encode("utf-8")).digest()[:8], "big")
+        index = hashed >> (64 - self.precision)
+        remainder = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable[Any]):
+        """Add several values"""
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "HyperLogLog"):
+        """Fold another sketch of the same precision into this one"""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision")
+        for i, value in enumerate(other.registers):
+            if value > self.registers[i]:
+                self.registers[i] = value
+
+    def count(self) -> int:
+        """Estimated number of distinct values"""
+        m = self.size
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+
+        return int(round(estimate))
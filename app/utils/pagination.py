@@ -0,0 +1,163 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Pages are addressed by an opaque cursor holding the sort key of the last row
+returned, so fetching page N costs the same index range scan as page 1
+instead of reading and discarding (N - 1) * limit rows with OFFSET. Every
+ordering ends in the primary key, which keeps it total and the pages stable
+while rows are inserted.
+
+Totals are optional in keyset mode: an estimate from pg_class statistics for
+unfiltered tables, otherwise an exact count cached for a short TTL.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, text, tuple_
+from sqlalchemy.orm import Query
+
+from app.core.constants import PAGINATION_COUNT_CACHE_TTL
+from app.services.cache_service import get_cache_service, hash_key
+
+# (column, descending) pairs, ending with the primary key
+KeysetOrder = Sequence[Tuple[Any, bool]]
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor for a row's sort key values"""
+    raw = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[List[Any]]:
+    """Sort key values from a cursor; None for an empty cursor (first page)"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = [_decode_value(value) for value in json.loads(raw)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def _after(order: KeysetOrder, values: Sequence[Any]):
+    """Predicate selecting the rows that sort after the given key"""
+    columns = [column for column, _ in order]
+    directions = {descending for _, descending in order}
+    if len(directions) == 1:
+        # Uniform direction: a row-value comparison the index can range-scan
+        if directions.pop():
+            return tuple_(*columns) < tuple_(*values)
+        return tuple_(*columns) > tuple_(*values)
+
+    clauses = []
+    for i, (column, descending) in enumerate(order):
+        equal = [columns[j] == values[j] for j in range(i)]
+        clauses.append(and_(*equal, column < values[i] if descending else column > values[i]))
+    return or_(*clauses)
+
+
+def apply_order(query: Query, order: KeysetOrder) -> Query:
+    """Order a query by the keyset ordering (also used by offset pages)"""
+    return query.order_by(*[column.desc() if descending else column.asc() for column, descending in order])
+
+
+def keyset_page(
+    query: Query,
+    order: KeysetOrder,
+    limit: int,
+    cursor: Optional[str] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one keyset page.
+
+    Args:
+        query: Filtered entity query, without ORDER BY / LIMIT / OFFSET
+        order: (column, descending) pairs ending with the primary key
+        limit: Page size
+        cursor: next_cursor of the previous page, or empty for the first page
+
+    Returns:
+        (rows, next_cursor); next_cursor is None on the last page
+    """
+    values = decode_cursor(cursor, len(order))
+    if values is not None:
+        query = query.filter(_after(order, values))
+
+    rows = apply_order(query, order).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, column.key) for column, _ in order])
+
+
+def estimated_count(
+    query: Query,
+    cache_parts: Sequence[Any],
+    table: Optional[str] = None,
+    ttl: int = PAGINATION_COUNT_CACHE_TTL
+) -> int:
+    """
+    Approximate row count for a list query.
+
+    Pass ``table`` only when the query is an unfiltered scan of that table; on
+    PostgreSQL its planner estimate is read from pg_class. Otherwise the exact
+    count is computed and cached per ``cache_parts`` for ``ttl`` seconds.
+    """
+    db = query.session
+    if table and db.bind.dialect.name == "postgresql":
+        estimate = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": table}
+        ).scalar()
+        if estimate is not None and estimate >= 0:  # -1 until the table is first analyzed
+            return int(estimate)
+
+    return get_cache_service().get_or_set(
+        f"pagination:count:{hash_key(*cache_parts)}",
+        lambda: query.order_by(None).count(),
+        ttl=ttl
+    )
+
+
+def keyset_pagination(limit: int, next_cursor: Optional[str], total_estimate: Optional[int] = None) -> Dict[str, Any]:
+    """Pagination block of a keyset page response"""
+    pagination = {
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
+    }
+    if total_estimate is not None:
+        pagination["total_estimate"] = total_estimate
+    return pagination
@@ -0,0 +1,131 @@
+"""
+Time-series helpers for analytics queries.
+
+Groups aggregate queries into calendar periods inside the database
+(date_trunc on PostgreSQL, strftime on SQLite) and fills the gaps between
+the returned buckets, so breakdowns cost one row per period regardless of
+how many rows fall inside each one.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+
+PERIOD_FORMATS = {
+    "day": "%Y-%m-%d",
+    "month": "%Y-%m",
+}
+KEY_LENGTHS = {"day": 10, "month": 7}
+
+
+def period_bucket(column, dialect_name: str, period: str = "month", tz: str = "UTC"):
+    """
+    SQL expression truncating a timestamp column to the start of its period.
+
+    Timestamps with time zone are converted to ``tz`` first, so buckets follow
+    calendar boundaries in that zone rather than the connection's TimeZone.
+    """
+    if period not in PERIOD_FORMATS:
+        raise ValueError(f"Unsupported period: {period}")
+
+    if dialect_name == "sqlite":
+        # SQLite keeps timestamps as UTC text
+        return func.strftime(PERIOD_FORMATS[period], column)
+
+    if getattr(column.type, "timezone", False):
+        column = func.timezone(tz, column)
+    return func.date_trunc(period, column)
+
+
+def period_key(value: Any, period: str = "month", tz: str = "UTC") -> str:
+    """Bucket key ("YYYY-MM" or "YYYY-MM-DD") for a datetime, date or bucket value"""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(ZoneInfo(tz))
+        return value.strftime(PERIOD_FORMATS[period])
+    if isinstance(value, date):
+        return value.strftime(PERIOD_FORMATS[period])
+    return str(value)[:KEY_LENGTHS[period]]
+
+
+def aggregate_by_period(
+    query: Query,
+    column,
+    period: str = "month",
+    tz: str = "UTC"
+) -> Dict[str, Tuple]:
+    """
+    Group an aggregate query by period.
+
+    Args:
+        query: Query selecting only aggregate columns, filters already applied
+        column: Timestamp column to bucket on
+        period: "day" or "month"
+        tz: Time zone the period boundaries are taken in
+
+    Returns:
+        Dict of period key -> tuple of the query's aggregate values
+    """
+    bucket = period_bucket(column, query.session.bind.dialect.name, period, tz)
+    rows = query.add_columns(bucket).group_by(bucket).all()
+    return {period_key(row[-1], period, tz): tuple(row[:-1]) for row in rows}
+
+
+def _next_period(key: str, period: str) -> str:
+    if period == "day":
+        current = date.fromisoformat(key)
+        return date.fromordinal(current.toordinal() + 1).isoformat()
+    year, month = int(key[:4]), int(key[5:7])
+    year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return f"{year:04d}-{month:02d}"
+
+
+def fill_periods(
+    buckets: Dict[str, Any],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    empty: Any = None,
+    period: str = "month",
+    tz: str = "UTC"
+) -> List[Tuple[str, Any]]:
+    """
+    Continuous, ordered series of (period key, value) from start to end.
+
+    Periods without a bucket get ``empty``. A missing start or end falls back
+    to the first or last bucket (end defaults to now once start is known).
+    """
+    start_key = period_key(start, period, tz) if start else min(buckets, default=None)
+    if start_key is None:
+        return []
+    if end:
+        end_key = period_key(end, period, tz)
+    elif start:
+        end_key = max(period_key(datetime.now(timezone.utc), period, tz), max(buckets, default=start_key))
+    else:
+        end_key = max(buckets)
+
+    series = []
+    key = start_key
+    while key <= end_key:
+        series.append((key, buckets.get(key, empty)))
+        key = _next_period(key, period)
+    return series
+
+
+def complete_periods(
+    series: List[Tuple[str, Any]],
+    period: str = "month",
+    tz: str = "UTC",
+    now: Optional[datetime] = None
+) -> List[Tuple[str, Any]]:
+    """
+    The periods of a series that have ended.
+
+    Drops the period containing ``now`` (and any later ones), whose values are
+    still accumulating, so period-over-period comparisons use whole periods.
+    """
+    current_key = period_key(now or datetime.now(timezone.utc), period, tz)
+    return [(key, value) for key, value in series if key < current_key]
@@ -14,17 +14,91 @@ from typing import Optional, Dict, Any, Tuple
 # BlacklistedToken model removed - using RefreshToken management
 from app.model.m_refresh_token import RefreshToken
 from app.services.session_service import session_manager
+from app.services.principal_cache import principal_cache
 from app.utils.database import SessionLocal
 from app.config import config
 import secrets
 import hashlib
 import logging
 import json
+import threading
+import time
 
 SECRET_KEY = config.SECRET_KEY
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = config.TOKEN_EXPIRE_MINUTES
 REFRESH_TOKEN_EXPIRE_DAYS = config.REFRESH_TOKEN_EXPIRE_DAYS
+REVOKED_TOKEN_REFRESH_SECONDS = config.REVOKED_TOKEN_REFRESH_SECONDS
+
+
+class RevokedTokenFilter:
+    """
+    In-process set of revoked tokens (inactive RefreshToken rows)
+    
+    Seeded from the database on first use and refreshed with a delta query at
+    most every refresh_seconds, so a revocation made on another worker is seen
+    here within that bound. Revocations made in this process are added
+    immediately. Membership is exact, so a miss needs no database round trip.
+    """
+    
+    def __init__(self, refresh_seconds: int = REVOKED_TOKEN_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._revoked: Dict[str, Optional[datetime]] = {}  # token -> expires_at
+        self._lock = threading.Lock()
+        self._seeded = False
+        self._last_refresh = 0.0  # monotonic
+        self._synced_until: Optional[datetime] = None  # created_at high-water mark
+    
+    def add(self, token: str, expires_at: Optional[datetime] = None):
+        """Record a token revoked in this process"""
+        with self._lock:
+            self._revoked[token] = expires_at
+    
+    def is_revoked(self, token: str, db) -> bool:
+        """Check a token, refreshing from the database when the filter is stale"""
+        if not self._seeded or time.monotonic() - self._last_refresh >= self.refresh_seconds:
+            self.refresh(db)
+        return token in self._revoked
+    
+    def refresh(self, db):
+        """Load revoked tokens created since the last refresh (everything on first call)"""
+        # Another thread is already refreshing a seeded filter - use what we have
+        if not self._lock.acquire(blocking=self._seeded is False):
+            return
+        try:
+            if self._seeded and time.monotonic() - self._last_refresh < self.refresh_seconds:
+                return
+            
+            now = datetime.now(timezone.utc)
+            query = db.query(RefreshToken.token, RefreshToken.expires_at).filter(
+                RefreshToken.is_active == False,
+                RefreshToken.expires_at > now
+            )
+            if self._synced_until is not None:
+                # Overlap by one interval so rows committed late are not missed
+                query = query.filter(
+                    RefreshToken.created_at >= self._synced_until - timedelta(seconds=self.refresh_seconds)
+                )
+            
+            for token, expires_at in query.all():
+                self._revoked[token] = expires_at
+            
+            # Drop tokens past their expiry
+            for token, expires_at in list(self._revoked.items()):
+                if expires_at is not None:
+                    if expires_at.tzinfo is None:
+                        expires_at = expires_at.replace(tzinfo=timezone.utc)
+                    if expires_at <= now:
+                        del self._revoked[token]
+            
+            self._synced_until = now
+            self._last_refresh = time.monotonic()
+            self._seeded = True
+        finally:
+            self._lock.release()
+
+
+revoked_token_filter = RevokedTokenFilter()
 
 
 class TokenManager:
@@ -138,16 +212,10 @@ class TokenManager:
                     else:
                         return None
             
-            # Check if JTI is blacklisted (using RefreshToken management)
+            # Check if JTI is blacklisted (inactive RefreshToken rows, held in memory)
             jti = payload.get("jti")
-            if jti:
-                # Check if any refresh token with this JTI is inactive
-                invalid_token = db.query(RefreshToken).filter(
-                    RefreshToken.token == jti,
-                    RefreshToken.is_active == False
-                ).first()
-                if invalid_token:
-                    return None
+            if jti and revoked_token_filter.is_revoked(jti, db):
+                return None
             
             # Check if session is still valid (only for tokens that have JTI)
             if jti:
@@ -207,19 +275,25 @@ class TokenManager:
         """Blacklist access token by its JTI using RefreshToken management"""
         try:
             # Decode token to get JTI and expiration
-            payload = jwt.decode(token, key="", options={"verify_signature": False})
+            payload = jwt.decode(
+                token,
+                key="",
+                options={"verify_signature": False, "verify_aud": False, "verify_iss": False}
+            )
             jti = payload.get("jti")
             
             if jti:
                 # Create an inactive refresh token to mark this JTI as blacklisted
+                expires_at = datetime.now(timezone.utc) + timedelta(days=1)  # Short expiration
                 blacklisted_token = RefreshToken(
                     user_id=user_id or 0,
                     token=jti,
-                    expires_at=datetime.now(timezone.utc) + timedelta(days=1),  # Short expiration
+                    expires_at=expires_at,
                     is_active=False
                 )
                 db.add(blacklisted_token)
                 db.commit()
+                revoked_token_filter.add(jti, expires_at)
                 return True
             return False
         except Exception as e:
@@ -230,6 +304,7 @@ class TokenManager:
         try:
             # Blacklist the access token
             self.blacklist_access_token(access_token, db, user_id, "logout")
+            principal_cache.invalidate_user(user_id)
             
             # Remove refresh token
             token_record = db.query(RefreshToken).filter(
@@ -254,10 +329,14 @@ class TokenManager:
                 RefreshToken.is_active == True
             ).all()
             
+            revoked = [(token.token, token.expires_at) for token in user_tokens]
             for token in user_tokens:
                 token.is_active = False
                 
             db.commit()
+            for token, expires_at in revoked:
+                revoked_token_filter.add(token, expires_at)
+            principal_cache.invalidate_user(user_id)
             return True
         except Exception as e:
             return False
@@ -275,10 +354,12 @@ class TokenManager:
         ).first()
         
         if token_record:
+            revoked = (token_record.token, token_record.expires_at)
             token_record.is_active = False
             # Mark the refresh token as inactive
             token_record.is_active = False
             db.commit()
+            revoked_token_filter.add(*revoked)
             return True
         return False
 
@@ -0,0 +1,46 @@
+"""
+Add church spending rollup transaction ledger
+
+This migration adds church_spending_rollup_transactions, the per church set of
+Plaid transaction ids already counted in church_spending_rollups. Rollup
+writes skip ids found here, so a rebuild followed by a cursor sync of the same
+window does not double-count. Re-run app/tasks/rebuild_church_spending_rollups.py
+afterwards so the ledger covers the existing rollup window.
+"""
+
+import logging
+from sqlalchemy import text
+from app.utils.database import get_db
+
+def run_migration():
+    """Create church spending rollup transaction ledger"""
+    
+    db = next(get_db())
+    
+    try:
+        db.execute(text("""
+            CREATE TABLE IF NOT EXISTS church_spending_rollup_transactions (
+                church_id INTEGER NOT NULL REFERENCES churches(id),
+                transaction_id VARCHAR(255) NOT NULL,
+                day DATE NOT NULL,
+                PRIMARY KEY (church_id, transaction_id)
+            )
+        """))
+        
+        db.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_church_spending_rollup_transactions_day
+            ON church_spending_rollup_transactions (church_id, day)
+        """))
+        
+        db.commit()
+        print("Successfully created church spending rollup transaction ledger")
+        
+    except Exception as e:
+        db.rollback()
+        print(f"Error creating church spending rollup transaction ledger: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run_migration()
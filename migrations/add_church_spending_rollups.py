@@ -0,0 +1,50 @@
+"""
+Add church spending rollup table
+
+This migration adds church_spending_rollups, the per (church, day) category
+and merchant spend summary behind the church spending analytics endpoints.
+Populate existing history afterwards with app/tasks/rebuild_church_spending_rollups.py.
+"""
+
+import logging
+from sqlalchemy import text
+from app.utils.database import get_db
+
+def run_migration():
+    """Create church spending rollup table"""
+    
+    db = next(get_db())
+    
+    try:
+        db.execute(text("""
+            CREATE TABLE IF NOT EXISTS church_spending_rollups (
+                id SERIAL PRIMARY KEY,
+                church_id INTEGER NOT NULL REFERENCES churches(id),
+                dimension VARCHAR(20) NOT NULL,
+                day DATE NOT NULL,
+                key VARCHAR(255) NOT NULL,
+                total_amount NUMERIC(12, 2) NOT NULL DEFAULT 0,
+                transaction_count INTEGER NOT NULL DEFAULT 0,
+                donor_sketch BYTEA,
+                updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                CONSTRAINT uq_church_spending_rollups_bucket UNIQUE (church_id, dimension, day, key)
+            )
+        """))
+        
+        db.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_church_spending_rollups_range
+            ON church_spending_rollups (church_id, dimension, day)
+        """))
+        
+        db.commit()
+        print("Successfully created church spending rollup table")
+        
+    except Exception as e:
+        db.rollback()
+        print(f"Error creating church spending rollup table: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,42 @@
+"""
+Add indexes backing keyset pagination of list endpoints
+
+Keyset pages filter on (sort key, id) past the previous page's last row and
+read the next rows in index order:
+- admin user list: users ordered by created_at DESC, id DESC
+- church member list: users of one church ordered by created_at DESC, id DESC
+- admin user donations: a user's donation_batches ordered by created_at DESC, id DESC
+The KYC list pages on the churches primary key and needs no extra index.
+"""
+
+from sqlalchemy import text
+from app.utils.database import get_db
+
+INDEXES = [
+    ("ix_users_created_at_id", "users (created_at DESC, id DESC)"),
+    ("ix_users_church_id_created_at_id", "users (church_id, created_at DESC, id DESC)"),
+    ("ix_donation_batches_user_id_created_at_id", "donation_batches (user_id, created_at DESC, id DESC)"),
+]
+
+def run_migration():
+    """Add keyset pagination indexes"""
+
+    db = next(get_db())
+
+    try:
+        for name, definition in INDEXES:
+            db.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}"))
+            print(f"Ensured index '{name}'")
+
+        db.commit()
+        print("Successfully added keyset pagination indexes")
+
+    except Exception as e:
+        db.rollback()
+        print(f"Error adding keyset pagination indexes: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,77 @@
+"""
+Add unique index on pending_roundups.transaction_id
+
+The bulk roundup ingestion path inserts pending roundups with
+INSERT ... ON CONFLICT (transaction_id) DO NOTHING, which requires a unique
+index on transaction_id. Duplicate rows left behind by the old per-transaction
+path are removed first, across every status: one row per transaction is kept,
+preferring a collected row and then the lowest id. Transactions with more than
+one collected row are reported before anything is deleted, since those were
+charged more than once and need a manual look.
+"""
+
+import logging
+from sqlalchemy import text
+from app.utils.database import get_db
+
+def run_migration():
+    """Add unique index on pending_roundups.transaction_id"""
+
+    db = next(get_db())
+
+    try:
+        # Check if index already exists
+        result = db.execute(text("""
+            SELECT indexname
+            FROM pg_indexes
+            WHERE tablename = 'pending_roundups' AND indexname = 'uq_pending_roundups_transaction_id'
+        """))
+
+        if result.fetchone():
+            print("Index 'uq_pending_roundups_transaction_id' already exists on pending_roundups table")
+            return
+
+        # Report transactions collected more than once before deduplicating them
+        collected_twice = db.execute(text("""
+            SELECT transaction_id, array_agg(id ORDER BY id) AS ids
+            FROM pending_roundups
+            WHERE status = 'collected'
+            GROUP BY transaction_id
+            HAVING COUNT(*) > 1
+        """)).fetchall()
+        for transaction_id, ids in collected_twice:
+            print(f"Transaction {transaction_id} was collected by more than one roundup: ids {ids}; keeping {ids[0]}")
+
+        # Keep one row per transaction: a collected row if any, then the lowest id
+        result = db.execute(text("""
+            DELETE FROM pending_roundups
+            WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (
+                        PARTITION BY transaction_id
+                        ORDER BY (status = 'collected') DESC, id
+                    ) AS rn
+                    FROM pending_roundups
+                ) ranked
+                WHERE rn > 1
+            )
+        """))
+        print(f"Removed {result.rowcount} duplicate pending roundups")
+
+        db.execute(text("""
+            CREATE UNIQUE INDEX uq_pending_roundups_transaction_id
+            ON pending_roundups (transaction_id)
+        """))
+
+        db.commit()
+        print("Successfully added unique index on pending_roundups.transaction_id")
+
+    except Exception as e:
+        db.rollback()
+        print(f"Error adding unique index on pending_roundups.transaction_id: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,53 @@
+"""
+Add transactions sync cursor columns to plaid_items table
+
+This migration adds transactions_cursor and transactions_synced_at so roundup
+processing can resume /transactions/sync from the last cursor and only pull
+added, modified and removed deltas instead of replaying the item's history.
+"""
+
+import logging
+from sqlalchemy import text
+from app.utils.database import get_db
+
+def run_migration():
+    """Add transactions sync cursor columns to plaid_items table"""
+    
+    db = next(get_db())
+    
+    try:
+        columns = {
+            'transactions_cursor': 'TEXT',
+            'transactions_synced_at': 'TIMESTAMP'
+        }
+        
+        for column_name, column_type in columns.items():
+            # Check if column already exists
+            result = db.execute(text("""
+                SELECT column_name 
+                FROM information_schema.columns 
+                WHERE table_name = 'plaid_items' AND column_name = :column_name
+            """), {"column_name": column_name})
+            
+            if result.fetchone():
+                print(f"Column '{column_name}' already exists in plaid_items table")
+                continue
+            
+            db.execute(text(f"""
+                ALTER TABLE plaid_items 
+                ADD COLUMN {column_name} {column_type}
+            """))
+            print(f"Added {column_name} column to plaid_items table")
+        
+        db.commit()
+        print("Successfully added transactions sync cursor columns to plaid_items table")
+        
+    except Exception as e:
+        db.rollback()
+        print(f"Error adding transactions sync cursor columns: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,36 @@
+"""
+Shard platform counters
+
+This migration adds the shard column to an existing platform_counters table
+and makes (name, shard) its primary key. Existing values stay on shard 0;
+writers spread later increments over the other shards.
+"""
+
+import logging
+from sqlalchemy import text
+from app.utils.database import get_db
+
+def run_migration():
+    """Add the shard column to platform_counters"""
+    
+    db = next(get_db())
+    
+    try:
+        db.execute(text("""
+            ALTER TABLE platform_counters
+            ADD COLUMN IF NOT EXISTS shard INTEGER NOT NULL DEFAULT 0
+        """))
+        db.execute(text("ALTER TABLE platform_counters DROP CONSTRAINT IF EXISTS platform_counters_pkey"))
+        db.execute(text("ALTER TABLE platform_counters ADD PRIMARY KEY (name, shard)"))
+        db.commit()
+        print("Successfully sharded platform_counters")
+        
+    except Exception as e:
+        db.rollback()
+        print(f"Error sharding platform_counters: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,43 @@
+"""
+Add platform counters table
+
+This migration adds platform_counters, the incrementally maintained
+platform-wide totals read by the admin analytics and monitoring endpoints,
+and seeds it from the current data.
+"""
+
+import logging
+from sqlalchemy import text
+from app.utils.database import get_db
+
+def run_migration():
+    """Create and seed platform_counters"""
+    
+    db = next(get_db())
+    
+    try:
+        db.execute(text("""
+            CREATE TABLE IF NOT EXISTS platform_counters (
+                name VARCHAR(100) NOT NULL,
+                shard INTEGER NOT NULL DEFAULT 0,
+                value NUMERIC(18, 2) NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+                PRIMARY KEY (name, shard)
+            )
+        """))
+        db.commit()
+        print("Successfully created platform_counters table")
+        
+        from app.services.platform_counters import reconcile_platform_counters
+        counters = reconcile_platform_counters(db)
+        print(f"Seeded {len(counters)} platform counters")
+        
+    except Exception as e:
+        db.rollback()
+        print(f"Error creating platform_counters table: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,64 @@
+"""
+Add scheduled payout run tables
+
+This migration adds scheduled_payout_runs and scheduled_payout_run_items,
+which checkpoint the daily donor payout run so a restarted run resumes
+only the donors that have not finished.
+"""
+
+import logging
+from sqlalchemy import text
+from app.utils.database import get_db
+
+def run_migration():
+    """Create scheduled payout run checkpoint tables"""
+    
+    db = next(get_db())
+    
+    try:
+        db.execute(text("""
+            CREATE TABLE IF NOT EXISTS scheduled_payout_runs (
+                id SERIAL PRIMARY KEY,
+                run_date DATE NOT NULL UNIQUE,
+                status VARCHAR(20) NOT NULL DEFAULT 'running',
+                total_donors INTEGER NOT NULL DEFAULT 0,
+                processed_count INTEGER NOT NULL DEFAULT 0,
+                failed_count INTEGER NOT NULL DEFAULT 0,
+                started_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+                completed_at TIMESTAMP WITH TIME ZONE
+            )
+        """))
+        
+        db.execute(text("""
+            CREATE TABLE IF NOT EXISTS scheduled_payout_run_items (
+                id SERIAL PRIMARY KEY,
+                run_id INTEGER NOT NULL REFERENCES scheduled_payout_runs(id),
+                user_id INTEGER NOT NULL REFERENCES users(id),
+                status VARCHAR(20) NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                donor_payout_id INTEGER REFERENCES donor_payouts(id),
+                payment_intent_id VARCHAR(255),
+                error_message TEXT,
+                created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+                updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+                CONSTRAINT uq_scheduled_payout_run_items_run_user UNIQUE (run_id, user_id)
+            )
+        """))
+        
+        db.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_scheduled_payout_run_items_run_status
+            ON scheduled_payout_run_items (run_id, status)
+        """))
+        
+        db.commit()
+        print("Successfully created scheduled payout run tables")
+        
+    except Exception as e:
+        db.rollback()
+        print(f"Error creating scheduled payout run tables: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,53 @@
+"""
+Add trigram search indexes on users
+
+User and church member searches match a substring of
+lower(first_name || ' ' || last_name || ' ' || email) (see
+app/services/user_search.py). pg_trgm GIN indexes on that expression let
+ILIKE '%term%' use an index instead of scanning users:
+- ix_users_search_trgm for platform-wide admin searches
+- ix_users_church_search_trgm leads with church_id (via btree_gin) so a
+  church's member search only reads that church's entries
+"""
+
+from sqlalchemy import text
+from app.utils.database import get_db
+
+SEARCH_DOCUMENT = "lower(first_name || ' ' || last_name || ' ' || email)"
+
+def run_migration():
+    """Add trigram search indexes on users"""
+
+    db = next(get_db())
+
+    try:
+        db.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        db.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gin"))
+        print("Ensured pg_trgm and btree_gin extensions")
+
+        db.execute(text(f"""
+            CREATE INDEX IF NOT EXISTS ix_users_search_trgm
+            ON users USING gin (({SEARCH_DOCUMENT}) gin_trgm_ops)
+        """))
+        print("Ensured index 'ix_users_search_trgm'")
+
+        db.execute(text(f"""
+            CREATE INDEX IF NOT EXISTS ix_users_church_search_trgm
+            ON users USING gin (church_id, ({SEARCH_DOCUMENT}) gin_trgm_ops)
+        """))
+        print("Ensured index 'ix_users_church_search_trgm'")
+
+        db.execute(text("ANALYZE users"))
+
+        db.commit()
+        print("Successfully added user search indexes")
+
+    except Exception as e:
+        db.rollback()
+        print(f"Error adding user search indexes: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run_migration()
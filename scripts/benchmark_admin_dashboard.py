@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the admin dashboard overview (query count and latency).
+
+Seeds an in-memory SQLite database with users, churches and donation batches,
+then calls get_dashboard_overview, the controller behind
+GET /admin/dashboard/overview:
+- cold (result cache cleared), with no date range
+- cold, with a 90 day range
+- cached, served from the overview result cache
+
+Every SQL statement is counted with an engine event. Run it on a build before
+and after a dashboard change (same seed sizes) and compare the columns; the
+cached row only applies to builds with the overview cache.
+
+Usage:
+    python scripts/benchmark_admin_dashboard.py [--users 400] [--churches 50] \
+        [--batches 3000] [--runs 20]
+"""
+
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone, timedelta
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+def seed(db, users, churches, batches):
+    """Users spread over churches, batches over the last year"""
+    from app.model.m_user import User
+    from app.model.m_church import Church
+    from app.model.m_donation_batch import DonationBatch
+    from app.model.m_donation_preference import DonationPreference
+
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+
+    church_rows = [
+        Church(
+            name=f"Church {i}",
+            is_active=rng.random() < 0.8,
+            kyc_status=rng.choice(["approved", "pending", "not_submitted"]),
+            status=rng.choice(["active", "pending"]),
+        )
+        for i in range(churches)
+    ]
+    db.add_all(church_rows)
+    db.flush()
+
+    user_rows = [
+        User(
+            email=f"user{i}@example.com",
+            first_name="User",
+            last_name=str(i),
+            church_id=rng.choice(church_rows).id,
+            is_active=rng.random() < 0.9,
+            is_email_verified=rng.random() < 0.7,
+        )
+        for i in range(users)
+    ]
+    db.add_all(user_rows)
+    db.flush()
+
+    db.add_all(
+        DonationPreference(user_id=user.id, pause=False, roundups_enabled=True)
+        for user in user_rows if rng.random() < 0.5
+    )
+
+    for i in range(batches):
+        user = rng.choice(user_rows)
+        amount = Decimal(rng.randint(100, 5000)) / 100
+        collected = now - timedelta(days=rng.randint(0, 365), hours=rng.randint(0, 23))
+        db.add(DonationBatch(
+            user_id=user.id,
+            church_id=user.church_id,
+            batch_number=f"B{i}",
+            amount=amount,
+            net_amount=amount,
+            status=rng.choice(["completed", "completed", "completed", "pending", "failed"]),
+            collection_date=collected,
+            created_at=collected,
+        ))
+    db.commit()
+
+def measure(engine, runs, build):
+    """(queries per call, mean ms, p95 ms) of build()"""
+    queries = []
+
+    def count(*_):
+        queries.append(1)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        build()  # Warm up mappers and the statement cache
+        queries.clear()
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            build()
+            timings.append((time.perf_counter() - started) * 1000)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(0.95 * len(timings)))]
+    return len(queries) / runs, statistics.fmean(timings), p95
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the admin dashboard overview")
+    parser.add_argument("--users", type=int, default=400)
+    parser.add_argument("--churches", type=int, default=50)
+    parser.add_argument("--batches", type=int, default=3000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    import app.model  # noqa: F401  (registers every table)
+    from app.utils.database import Base
+    from app.controller.admin import dashboard
+    from app.services.cache_service import get_cache_service
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    seed(db, args.users, args.churches, args.batches)
+
+    range_end = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    range_start = (datetime.now(timezone.utc) - timedelta(days=90)).strftime("%Y-%m-%d")
+    cache = get_cache_service()
+
+    # Cold rows clear the result cache first, so they also run on builds without it
+    def cold_default():
+        cache.clear()
+        dashboard.get_dashboard_overview(db=db)
+
+    def cold_ranged():
+        cache.clear()
+        dashboard.get_dashboard_overview(start_date=range_start, end_date=range_end, db=db)
+
+    def cached():
+        dashboard.get_dashboard_overview(db=db)
+
+    rows = [
+        ("cold, no range", *measure(engine, args.runs, cold_default)),
+        ("cold, 90 day range", *measure(engine, args.runs, cold_ranged)),
+        ("cached", *measure(engine, args.runs, cached)),
+    ]
+
+    print(f"seed: {args.users} users / {args.churches} churches / {args.batches} batches")
+    print(f"{'request':<22} {'queries':>8} {'mean ms':>9} {'p95 ms':>8}")
+    for name, queries, mean_ms, p95_ms in rows:
+        print(f"{name:<22} {queries:>8.0f} {mean_ms:>9.1f} {p95_ms:>8.1f}")
+
+if __name__ == "__main__":
+    main()
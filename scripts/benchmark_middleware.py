@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of the per-request cost of the middleware stacks.
+
+Runs in-process through httpx's ASGI transport, so no server, network or
+database is involved. Measures:
+- the production stack (security, rate limiting, monitoring, CORS, trusted
+  host, global exception handler) around a trivial /health and JSON route,
+  against the same routes without middleware
+- the development app (app.main) on /health and /
+
+Each request comes from a different X-Forwarded-For address so the rate
+limiters take their normal path instead of rejecting the run. Run it on a
+build before and after a middleware change and compare the overhead column.
+
+Usage:
+    python scripts/benchmark_middleware.py [--requests 3000] [--warmup 200]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.trustedhost import TrustedHostMiddleware
+
+def build_bare_app():
+    """The benchmarked routes without any middleware"""
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.get("/api/v1/sample")
+    async def sample():
+        return {
+            "success": True,
+            "data": [{"id": i, "name": f"item {i}", "amount": i * 1.25} for i in range(20)]
+        }
+
+    return app
+
+def build_production_app():
+    """The benchmarked routes behind the middleware stack of app/main_production.py"""
+    from app.middleware.security_middleware import setup_security_middleware
+    from app.middleware.rate_limiter import setup_rate_limiting
+    from app.middleware.monitoring_middleware import setup_monitoring_middleware
+    from app.middleware.exception_handler import setup_global_exception_handler
+
+    app = build_bare_app()
+    setup_security_middleware(app)
+    setup_rate_limiting(app)
+    setup_monitoring_middleware(app)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["https://manna-frontend.vercel.app", "http://localhost:3000"],
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
+        allow_headers=["*"],
+    )
+    app.add_middleware(TrustedHostMiddleware, allowed_hosts=["localhost", "testserver"])
+    setup_global_exception_handler(app)
+    return app
+
+async def time_requests(app, path, total_requests, warmup):
+    """Mean microseconds per sequential GET of path"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        headers = {"Origin": "http://localhost:3000"}
+
+        async def get(i):
+            headers["X-Forwarded-For"] = f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"
+            response = await client.get(path, headers=headers)
+            if response.status_code != 200:
+                raise RuntimeError(f"{path} returned {response.status_code}")
+
+        for i in range(warmup):
+            await get(i)
+        started = time.perf_counter()
+        for i in range(warmup, warmup + total_requests):
+            await get(i)
+        return (time.perf_counter() - started) / total_requests * 1e6
+
+async def run_benchmark(total_requests, warmup):
+    bare = build_bare_app()
+    production = build_production_app()
+
+    from app.main import app as development
+
+    rows = []
+    for path in ["/health", "/api/v1/sample"]:
+        baseline = await time_requests(bare, path, total_requests, warmup)
+        stacked = await time_requests(production, path, total_requests, warmup)
+        rows.append((f"production {path}", baseline, stacked))
+    for path in ["/health", "/"]:
+        baseline = await time_requests(bare, "/health", total_requests, warmup)
+        stacked = await time_requests(development, path, total_requests, warmup)
+        rows.append((f"development {path}", baseline, stacked))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark middleware overhead per request")
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--warmup", type=int, default=200)
+    args = parser.parse_args()
+
+    # Request logging would dominate the timings
+    logging.disable(logging.INFO)
+
+    rows = asyncio.run(run_benchmark(args.requests, args.warmup))
+
+    print(f"{'stack / route':<32} {'bare us':>9} {'stacked us':>11} {'overhead us':>12}")
+    for name, baseline, stacked in rows:
+        print(f"{name:<32} {baseline:>9.0f} {stacked:>11.0f} {stacked - baseline:>12.0f}")
+
+if __name__ == "__main__":
+    main()
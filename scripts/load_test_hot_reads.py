@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Load test for the high-traffic read endpoints (mobile dashboard, donor
+dashboard overview, notifications).
+
+Fires a fixed number of authenticated GETs at a running server with a given
+concurrency and reports throughput and latency percentiles per endpoint. To
+measure the async database path, run it against a build before and after the
+switch (same database, same worker count) and compare the req/s columns.
+
+Usage:
+    python scripts/load_test_hot_reads.py --token <donor JWT> \
+        [--base-url http://localhost:8000] [--concurrency 50] [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+HOT_READ_ENDPOINTS = [
+    "/api/v1/mobile/dashboard",
+    "/api/v1/donor/dashboard/overview",
+    "/api/v1/donor/notifications?limit=20",
+]
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of sorted samples"""
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, max(0, round(fraction * len(samples)) - 1))
+    return samples[index]
+
+async def run_endpoint(client, path, total_requests, concurrency):
+    """Send total_requests GETs to path, at most concurrency in flight"""
+    latencies = []
+    errors = 0
+    remaining = iter(range(total_requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                if response.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "path": path,
+        "requests": total_requests,
+        "errors": errors,
+        "rps": total_requests / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+    }
+
+async def run_load_test(base_url, token, endpoints, total_requests, concurrency, warmup):
+    """Warm up, then load each endpoint in turn"""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        headers={"Authorization": f"Bearer {token}"},
+        limits=limits,
+        timeout=30.0
+    ) as client:
+        results = []
+        for path in endpoints:
+            if warmup:
+                await run_endpoint(client, path, warmup, min(warmup, concurrency))
+            results.append(await run_endpoint(client, path, total_requests, concurrency))
+        return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the hot read endpoints")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True, help="Bearer token of a donor user")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=50, help="Unmeasured requests per endpoint")
+    parser.add_argument("--endpoint", action="append", help="Endpoint path (repeatable); defaults to the hot reads")
+    args = parser.parse_args()
+
+    endpoints = args.endpoint or HOT_READ_ENDPOINTS
+    print(f"Loading {args.base_url} with {args.requests} requests per endpoint, concurrency {args.concurrency}")
+
+    results = asyncio.run(run_load_test(
+        args.base_url, args.token, endpoints, args.requests, args.concurrency, args.warmup
+    ))
+
+    print(f"{'endpoint':<42} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for result in results:
+        print(
+            f"{result['path']:<42} {result['rps']:>9.1f} {result['p50_ms']:>9.1f} "
+            f"{result['p95_ms']:>9.1f} {result['p99_ms']:>9.1f} {result['errors']:>7}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ Provides:
 - Coverage configuration
 """
 
+import os
 import pytest
 import asyncio
 from typing import Generator, Dict, Any
@@ -16,13 +17,18 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
+from cryptography.fernet import Fernet
+
+# Settings the app refuses to start without
+os.environ.setdefault("FERNET_SECRET", Fernet.generate_key().decode())
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
 
 from app.main import app
 from app.utils.database import get_db, Base
 from app.model.m_user import User
 from app.model.m_church import Church
 from app.model.m_church_admin import ChurchAdmin
-from app.core.config import settings
+from app.config import config
 
 # Test database URL
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -0,0 +1,193 @@
+"""
+Unit Tests for the Raw ASGI Middleware Stack
+
+Tests:
+- Request bodies replayed intact after the security scan
+- Security, development and CORS headers set exactly once
+- Exceptions before the response starts rendered as INTERNAL_ERROR JSON
+- Exceptions after the response starts re-raised without a second response
+- The any-port localhost CORS pattern only applying in development
+"""
+
+import asyncio
+import json
+import re
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from starlette.middleware.cors import CORSMiddleware
+
+from app.config import config
+from app.main import app as main_app, get_cors_origin_regex
+from app.middleware.asgi import ResponseHeadersMiddleware, replay_body, set_response_headers
+from app.middleware.exception_handler import GlobalExceptionHandler
+from app.middleware.security_middleware import SecurityMiddleware
+
+ORIGIN = "http://localhost:5173"
+DEV_HEADERS = {"X-Frame-Options": "DENY", "X-Content-Type-Options": "nosniff"}
+
+
+def _build_app():
+    """The middleware layers of the application around a few test routes"""
+    api = FastAPI()
+
+    @api.post("/api/v1/echo")
+    async def echo(request: Request):
+        return {"body": (await request.body()).decode()}
+
+    @api.get("/api/v1/ok")
+    async def ok():
+        return {"ok": True}
+
+    @api.get("/api/v1/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    api.add_middleware(SecurityMiddleware)
+    api.add_middleware(
+        CORSMiddleware, allow_origins=[ORIGIN], allow_credentials=True, allow_methods=["*"], allow_headers=["*"]
+    )
+    api.add_middleware(ResponseHeadersMiddleware, headers=DEV_HEADERS)
+    api.add_middleware(GlobalExceptionHandler)
+    return api
+
+
+def _header_count(response, name):
+    return sum(1 for key, _ in response.headers.raw if key.decode().lower() == name.lower())
+
+
+def _run(asgi_app, path="/"):
+    """Call an ASGI app with an empty GET request, returning the sent messages and any raised exception"""
+    sent = []
+    scope = {
+        "type": "http", "method": "GET", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "headers": [], "scheme": "http", "server": ("test", 80), "client": ("127.0.0.1", 1234),
+        "http_version": "1.1", "root_path": "",
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    async def call():
+        try:
+            await asgi_app(scope, receive, send)
+        except Exception as exc:
+            return exc
+
+    return sent, asyncio.run(call())
+
+
+async def _fails_after_start(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"partial", "more_body": True})
+    raise RuntimeError("stream broke")
+
+
+async def _fails_before_start(scope, receive, send):
+    raise RuntimeError("boom")
+
+
+class TestHelpers:
+    """Test the header and body helpers"""
+
+    def test_set_response_headers_replaces_existing(self):
+        message = {"type": "http.response.start", "headers": [(b"x-frame-options", b"SAMEORIGIN"), (b"a", b"1")]}
+
+        set_response_headers(message, [(b"x-frame-options", b"DENY")])
+
+        assert message["headers"] == [(b"a", b"1"), (b"x-frame-options", b"DENY")]
+
+    def test_replay_body_delivers_once_then_defers(self):
+        async def receive():
+            return {"type": "http.disconnect"}
+
+        async def scenario():
+            replay = replay_body(b"payload", receive)
+            return await replay(), await replay()
+
+        first, second = asyncio.run(scenario())
+
+        assert first == {"type": "http.request", "body": b"payload", "more_body": False}
+        assert second == {"type": "http.disconnect"}
+
+
+class TestStack:
+    """Test requests through the composed middleware"""
+
+    @pytest.fixture
+    def client(self):
+        return TestClient(_build_app())
+
+    def test_post_body_survives_the_security_scan(self, client):
+        payload = json.dumps({"note": "weekly gift", "amount": 12.5, "padding": "x" * 70000})
+
+        response = client.post(
+            "/api/v1/echo",
+            content=payload,
+            headers={"Content-Type": "application/json", "Authorization": "Bearer token"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["body"] == payload
+
+    def test_headers_set_once(self, client):
+        response = client.get("/api/v1/ok", headers={"Origin": ORIGIN})
+
+        assert response.headers["access-control-allow-origin"] == ORIGIN
+        assert _header_count(response, "access-control-allow-origin") == 1
+        assert _header_count(response, "access-control-allow-credentials") == 1
+        # Set by both SecurityMiddleware and the development headers
+        assert _header_count(response, "x-frame-options") == 1
+        assert _header_count(response, "x-content-type-options") == 1
+        assert _header_count(response, "strict-transport-security") == 1
+
+    def test_exception_before_start_renders_internal_error(self, client):
+        response = client.get("/api/v1/boom")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["success"] is False
+        assert body["error_code"] == "INTERNAL_ERROR"
+
+
+class TestStartedResponses:
+    """Test exceptions raised after http.response.start"""
+
+    def test_exception_handler_renders_before_start(self):
+        sent, exc = _run(GlobalExceptionHandler(_fails_before_start))
+
+        assert exc is None
+        assert [message["type"] for message in sent] == ["http.response.start", "http.response.body"]
+        assert json.loads(sent[1]["body"])["error_code"] == "INTERNAL_ERROR"
+
+    @pytest.mark.parametrize("middleware", [GlobalExceptionHandler, SecurityMiddleware])
+    def test_exception_after_start_is_reraised(self, middleware):
+        sent, exc = _run(middleware(_fails_after_start))
+
+        assert isinstance(exc, RuntimeError)
+        assert [message["type"] for message in sent] == ["http.response.start", "http.response.body"]
+        assert sent[1]["body"] == b"partial"
+
+
+class TestMainApp:
+    """Test the CORS and header configuration of app.main"""
+
+    def test_headers_set_once(self):
+        response = TestClient(main_app).get("/", headers={"Origin": ORIGIN})
+
+        assert _header_count(response, "access-control-allow-origin") == 1
+        assert _header_count(response, "x-frame-options") == 1
+        assert _header_count(response, "content-security-policy") == 1
+
+    @pytest.mark.parametrize("environment,any_port", [("development", True), ("staging", False), ("production", False)])
+    def test_any_local_port_only_in_development(self, monkeypatch, environment, any_port):
+        monkeypatch.setattr(config, "ENVIRONMENT", environment)
+        pattern = re.compile(get_cors_origin_regex())
+
+        assert pattern.fullmatch("http://localhost:5173")
+        assert bool(pattern.fullmatch("http://localhost:9999")) == any_port
+        assert not pattern.fullmatch("http://localhost.evil.com:9999")
@@ -14,7 +14,8 @@ from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
 from app.model.m_user import User
-from app.core.auth import create_access_token, verify_password, get_password_hash
+from app.utils.token_manager import create_access_token
+from app.utils.encryption import hash_password as get_password_hash, verify_password
 
 class TestAuthentication:
     """Test authentication functionality"""
@@ -0,0 +1,177 @@
+"""
+Unit Tests for the Cache Service
+
+Tests:
+- Memory backend TTL expiry and LRU bound
+- Single-flight loads within a process and across workers
+- Key hashing
+"""
+
+import threading
+import time
+import pytest
+from types import SimpleNamespace
+
+from app.services import cache_service as cache_module
+from app.services.cache_service import CacheService, FakeRedis, hash_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic() for the memory backend"""
+    now = {"value": 1000.0}
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=lambda: now["value"], sleep=time.sleep))
+
+    def advance(seconds):
+        now["value"] += seconds
+
+    return advance
+
+
+class TestMemoryBackend:
+    """Test the bounded in-process cache"""
+
+    def test_entries_expire_after_ttl(self, clock):
+        cache = CacheService()
+        cache.set("key", "value", ttl=60)
+
+        clock(60)
+        assert cache.get("key") == "value"
+        clock(1)
+        assert cache.get("key") is None
+        assert cache.get_stats()["size"] == 0
+
+    def test_evicts_least_recently_used(self, clock):
+        cache = CacheService(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # b is now the oldest
+
+        cache.set("c", 3)
+
+        assert cache.exists("a") and cache.exists("c")
+        assert not cache.exists("b")
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_cached_none_is_a_hit(self, clock):
+        cache = CacheService()
+        calls = []
+
+        for _ in range(3):
+            cache.get_or_set("key", lambda: calls.append(1), ttl=60)
+
+        assert len(calls) == 1
+
+
+class TestSingleFlight:
+    """Test that concurrent misses load once"""
+
+    def test_concurrent_misses_call_loader_once(self):
+        cache = CacheService()
+        calls = []
+        started = threading.Barrier(8)
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.1)
+            return "loaded"
+
+        def worker(results):
+            started.wait()
+            results.append(cache.get_or_set("key", loader, ttl=60))
+
+        results = []
+        threads = [threading.Thread(target=worker, args=(results,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["loaded"] * 8
+        assert len(calls) == 1
+
+    def test_waiters_load_themselves_when_the_leader_fails(self):
+        cache = CacheService()
+        leader_started = threading.Event()
+        calls = []
+
+        def failing_loader():
+            calls.append("leader")
+            leader_started.set()
+            time.sleep(0.1)
+            raise RuntimeError("upstream down")
+
+        def waiter():
+            leader_started.wait()
+            result["value"] = cache.get_or_set("key", lambda: calls.append("waiter") or "fallback", ttl=60)
+
+        result = {}
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        with pytest.raises(RuntimeError):
+            cache.get_or_set("key", failing_loader, ttl=60)
+        thread.join()
+
+        assert result["value"] == "fallback"
+        assert calls == ["leader", "waiter"]
+        assert cache._inflight == {}
+
+    def test_leader_rechecks_after_a_previous_load_finishes(self, monkeypatch):
+        """A load that completes between the miss and becoming leader is not repeated"""
+        cache = CacheService()
+        original_get = cache.get
+        gets = []
+
+        def get(key, default=None):
+            gets.append(key)
+            if len(gets) == 1:
+                # The previous leader stores its value and leaves just after this miss
+                value = original_get(key, default)
+                cache.set(key, "from previous leader", ttl=60)
+                return value
+            return original_get(key, default)
+
+        monkeypatch.setattr(cache, "get", get)
+
+        value = cache.get_or_set("key", lambda: pytest.fail("loader called again"), ttl=60)
+
+        assert value == "from previous leader"
+        assert len(gets) == 2
+        assert cache._inflight == {}
+
+    def test_other_worker_waits_for_the_shared_lock(self):
+        """A second process sharing Redis reads the value instead of loading it"""
+        redis = FakeRedis()
+        worker_a, worker_b = CacheService(redis_client=redis), CacheService(redis_client=redis)
+        redis.set("key:lock", b"1", px=5000, nx=True)  # Worker A is loading
+
+        def finish_load():
+            time.sleep(0.1)
+            worker_a.set("key", "from a", ttl=60)
+            redis.delete("key:lock")
+
+        thread = threading.Thread(target=finish_load)
+        thread.start()
+        value = worker_b.get_or_set("key", lambda: "from b", ttl=60, lock_timeout=5)
+        thread.join()
+
+        assert value == "from a"
+
+    def test_shared_lock_is_released(self):
+        redis = FakeRedis()
+        cache = CacheService(redis_client=redis)
+
+        assert cache.get_or_set("key", lambda: {"rows": [1, 2]}, ttl=60) == {"rows": [1, 2]}
+        assert redis.get("key:lock") is None
+        assert CacheService(redis_client=redis).get("key") == {"rows": [1, 2]}
+
+
+class TestHashKey:
+    """Test cache key hashing"""
+
+    def test_secrets_do_not_appear_in_keys(self):
+        key = hash_key("access-sandbox-secret", "2024-01-01")
+
+        assert "secret" not in key
+        assert key == hash_key("access-sandbox-secret", "2024-01-01")
+        assert key != hash_key("access-sandbox-secret", "2024-01-02")
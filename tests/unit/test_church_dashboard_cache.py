@@ -0,0 +1,138 @@
+"""
+Unit Tests for the Church Dashboard Cache
+
+Tests:
+- Completed church payouts evicting their church's cached dashboard on commit
+- Other churches, uncommitted and non-completed payouts leaving the cache alone
+- get_church_dashboard rebuilding after an eviction
+"""
+
+import pytest
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.utils.database import Base
+from app.model.m_church import Church
+from app.model.m_roundup_new import ChurchPayout
+from app.controller.church import dashboard
+from app.controller.church.dashboard import church_dashboard_cache_key, get_church_dashboard
+from app.services.cache_service import CacheService
+from app.services import platform_counters
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = CacheService()
+    monkeypatch.setattr(dashboard, "get_cache_service", lambda: cache)
+    return cache
+
+
+@pytest.fixture
+def db(monkeypatch):
+    # No platform_counters table here; don't reuse another test's cached check
+    monkeypatch.setattr(platform_counters, "_table_state", {"exists": False, "checked_at": None})
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    tables = [Church.__table__, ChurchPayout.__table__]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        Church(id=1, name="Grace Church", email="grace@example.com"),
+        Church(id=2, name="Hope Church", email="hope@example.com"),
+    ])
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine, tables=tables)
+
+
+@pytest.fixture
+def cached(cache):
+    """Both churches have a cached dashboard"""
+    for church_id in (1, 2):
+        cache.set(church_dashboard_cache_key(church_id), {"church_id": church_id}, ttl=60)
+
+    def cached(church_id):
+        return cache.get(church_dashboard_cache_key(church_id)) is not None
+
+    return cached
+
+
+def _payout(church_id, status="completed", transfer_id="tr_1"):
+    return ChurchPayout(
+        church_id=church_id,
+        gross_donation_amount=Decimal("100.00"),
+        net_payout_amount=Decimal("95.00"),
+        period_start="2024-01-01",
+        period_end="2024-01-31",
+        stripe_transfer_id=transfer_id,
+        status=status,
+    )
+
+
+class TestEviction:
+    """Test the session hooks dropping cached dashboards"""
+
+    def test_completed_payout_evicts_its_church_on_commit(self, db, cached):
+        db.add(_payout(1))
+        db.flush()
+        assert cached(1)
+
+        db.commit()
+
+        assert not cached(1)
+        assert cached(2)
+
+    def test_payout_updated_to_completed_evicts(self, db, cached):
+        payout = _payout(1, status="failed")
+        db.add(payout)
+        db.commit()
+        assert cached(1)
+
+        payout.status = "completed"
+        db.commit()
+
+        assert not cached(1)
+
+    def test_other_changes_keep_the_cache(self, db, cached):
+        payout = _payout(1, status="failed")
+        db.add(payout)
+        db.commit()
+
+        payout.failure_reason = "account closed"
+        db.commit()
+
+        assert cached(1)
+
+    def test_rollback_keeps_the_cache(self, db, cached):
+        db.add(_payout(1))
+        db.flush()
+        db.rollback()
+        db.commit()
+
+        assert cached(1)
+
+
+class TestGetChurchDashboard:
+    """Test the cached dashboard endpoint"""
+
+    def test_rebuilds_after_a_payout_completes(self, db, cache, monkeypatch):
+        builds = []
+
+        def build(church_id, session):
+            builds.append(church_id)
+            return {"church_id": church_id, "build": len(builds)}
+
+        monkeypatch.setattr(dashboard, "_build_church_dashboard", build)
+
+        assert get_church_dashboard(1, db).data["build"] == 1
+        assert get_church_dashboard(1, db).data["build"] == 1
+
+        db.add(_payout(1))
+        db.commit()
+
+        assert get_church_dashboard(1, db).data["build"] == 2
+        assert builds == [1, 1]
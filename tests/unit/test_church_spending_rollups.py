@@ -0,0 +1,199 @@
+"""
+Unit Tests for Church Spending Rollups
+
+Tests:
+- HyperLogLog distinct counts and merging
+- Folding synced transactions into daily buckets
+- Rebuild followed by a cursor sync counts each transaction once
+"""
+
+import sys
+import pytest
+from datetime import datetime, timezone, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.utils.database import Base
+from app.utils.hyperloglog import HyperLogLog
+from app.model.m_user import User
+from app.model.m_church import Church
+from app.model.m_plaid_items import PlaidItem
+from app.model.m_church_spending_rollup import ChurchSpendingRollup, ChurchSpendingRollupTransaction
+from app.services import platform_counters
+from app.services.church_spending_rollup_service import ChurchSpendingRollupService
+
+# app.services re-exports a client object under the module's own name
+plaid_client = sys.modules["app.services.plaid_client"]
+
+
+@pytest.fixture
+def rollup_db(monkeypatch):
+    """In-memory database with just the tables the rollups touch"""
+    # No platform_counters table here; don't reuse another test's cached check
+    monkeypatch.setattr(platform_counters, "_table_state", {"exists": False, "checked_at": None})
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    tables = [
+        Church.__table__,
+        User.__table__,
+        PlaidItem.__table__,
+        ChurchSpendingRollup.__table__,
+        ChurchSpendingRollupTransaction.__table__,
+    ]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine, tables=tables)
+
+
+@pytest.fixture
+def church_donor(rollup_db):
+    """A church with one active donor and one linked Plaid item"""
+    church = Church(name="Grace Church", email="grace@example.com", is_active=True)
+    rollup_db.add(church)
+    rollup_db.flush()
+
+    donor = User(email="donor@example.com", first_name="Dana", last_name="Donor", role="donor", church_id=church.id)
+    rollup_db.add(donor)
+    rollup_db.flush()
+
+    rollup_db.add(PlaidItem(user_id=donor.id, item_id="item-1", access_token="access-1", status="active"))
+    rollup_db.commit()
+    return church, donor
+
+
+def _transaction(transaction_id, amount, day, merchant="Coffee Shop", category="Food and Drink", pending=False):
+    return {
+        "transaction_id": transaction_id,
+        "amount": amount,
+        "date": day.isoformat(),
+        "merchant_name": merchant,
+        "category": [category],
+        "pending": pending,
+    }
+
+
+class TestHyperLogLog:
+    """Test the distinct-donor sketch"""
+
+    def test_small_cardinalities_are_exact_enough(self):
+        """Linear counting keeps small counts close to exact"""
+        sketch = HyperLogLog()
+        for donor_id in range(10):
+            sketch.add(donor_id)
+            sketch.add(donor_id)  # Duplicates don't count
+
+        assert sketch.count() == 10
+
+    def test_merge_counts_union(self):
+        """Merging two overlapping sketches counts their union"""
+        first, second = HyperLogLog(), HyperLogLog()
+        for donor_id in range(0, 600):
+            first.add(donor_id)
+        for donor_id in range(400, 1000):
+            second.add(donor_id)
+
+        first.merge(second)
+
+        assert abs(first.count() - 1000) / 1000 < 0.2
+
+    def test_round_trips_through_bytes(self):
+        """Stored registers load back into an identical sketch"""
+        sketch = HyperLogLog()
+        for donor_id in range(50):
+            sketch.add(donor_id)
+
+        loaded = HyperLogLog.from_bytes(sketch.to_bytes())
+
+        assert loaded.count() == sketch.count()
+        assert HyperLogLog.from_bytes(None).count() == 0
+
+
+class TestChurchSpendingRollups:
+    """Test rollup accumulation and rebuilds"""
+
+    def test_record_transactions_buckets_spending(self, rollup_db, church_donor):
+        """Only posted spending is counted, by category and merchant"""
+        church, donor = church_donor
+        today = datetime.now(timezone.utc).date()
+        transactions = [
+            _transaction("t1", -4.50, today),
+            _transaction("t2", -5.50, today),
+            _transaction("t3", 100.00, today),  # Deposit
+            _transaction("t4", -9.99, today, pending=True),
+        ]
+
+        counted = ChurchSpendingRollupService.record_transactions(rollup_db, church.id, donor.id, transactions)
+        rollup_db.commit()
+
+        assert counted == 2
+        merchants = ChurchSpendingRollupService.get_rollup(rollup_db, church.id, "merchant", today, today)
+        assert merchants["Coffee Shop"]["total_amount"] == pytest.approx(10.00)
+        assert merchants["Coffee Shop"]["transaction_count"] == 2
+        assert merchants["Coffee Shop"]["donors_count"] == 1
+        categories = ChurchSpendingRollupService.get_rollup(rollup_db, church.id, "category", today, today)
+        assert categories["Food and Drink"]["transaction_count"] == 2
+
+    def test_replayed_transactions_count_once(self, rollup_db, church_donor):
+        """The same transaction_id is never folded in twice"""
+        church, donor = church_donor
+        today = datetime.now(timezone.utc).date()
+        transactions = [_transaction("t1", -4.50, today)]
+
+        ChurchSpendingRollupService.record_transactions(rollup_db, church.id, donor.id, transactions)
+        rollup_db.commit()
+        counted = ChurchSpendingRollupService.record_transactions(rollup_db, church.id, donor.id, transactions)
+        rollup_db.commit()
+
+        assert counted == 0
+        merchants = ChurchSpendingRollupService.get_rollup(rollup_db, church.id, "merchant", today, today)
+        assert merchants["Coffee Shop"]["transaction_count"] == 1
+
+    def test_rebuild_then_sync_does_not_double_count(self, rollup_db, church_donor, monkeypatch):
+        """A first cursor sync after a backfill only adds transactions the backfill missed"""
+        church, donor = church_donor
+        today = datetime.now(timezone.utc).date()
+        backfilled = [
+            _transaction("t1", -4.50, today - timedelta(days=3)),
+            _transaction("t2", -20.00, today - timedelta(days=1), merchant="Grocer"),
+        ]
+        monkeypatch.setattr(
+            plaid_client, "get_transactions",
+            lambda access_token, days_back: {"transactions": backfilled}
+        )
+
+        result = ChurchSpendingRollupService.rebuild_church_rollups(rollup_db, church.id, days_back=30)
+        assert result["transactions_counted"] == 2
+
+        # The first /transactions/sync (no cursor yet) reports the same history as added
+        synced = backfilled + [_transaction("t3", -3.00, today)]
+        counted = ChurchSpendingRollupService.record_user_transactions(rollup_db, donor.id, synced)
+        rollup_db.commit()
+
+        assert counted == 1
+        merchants = ChurchSpendingRollupService.get_rollup(
+            rollup_db, church.id, "merchant", today - timedelta(days=30), today
+        )
+        assert merchants["Coffee Shop"]["total_amount"] == pytest.approx(7.50)
+        assert merchants["Coffee Shop"]["transaction_count"] == 2
+        assert merchants["Grocer"]["total_amount"] == pytest.approx(20.00)
+        assert merchants["Grocer"]["transaction_count"] == 1
+
+    def test_rebuild_replaces_window(self, rollup_db, church_donor, monkeypatch):
+        """Rebuilding twice leaves the same totals"""
+        church, donor = church_donor
+        today = datetime.now(timezone.utc).date()
+        monkeypatch.setattr(
+            plaid_client, "get_transactions",
+            lambda access_token, days_back: {"transactions": [_transaction("t1", -4.50, today)]}
+        )
+
+        ChurchSpendingRollupService.rebuild_church_rollups(rollup_db, church.id, days_back=30)
+        ChurchSpendingRollupService.rebuild_church_rollups(rollup_db, church.id, days_back=30)
+
+        merchants = ChurchSpendingRollupService.get_rollup(rollup_db, church.id, "merchant", today, today)
+        assert merchants["Coffee Shop"]["transaction_count"] == 1
+        assert rollup_db.query(ChurchSpendingRollupTransaction).count() == 1
@@ -0,0 +1,251 @@
+"""
+Unit Tests for the Scheduled Donor Payout Run
+
+Tests:
+- Atomic claims: an item is processed once
+- Reclaiming stale claims from crashed workers
+- Giving up on an item after MAX_ITEM_ATTEMPTS
+- Stable Stripe idempotency keys across retries
+- process_donor_payout returning an existing payout for the period
+"""
+
+import pytest
+from datetime import date, datetime, timezone, timedelta
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.utils.database import Base
+from app.model.m_user import User
+from app.model.m_church import Church
+from app.model.m_donation_preference import DonationPreference
+from app.model.m_roundup_new import DonorPayout
+from app.model.m_scheduled_payout_run import ScheduledPayoutRun, ScheduledPayoutRunItem
+from app.services import platform_counters
+from app.services import donor_schedule_service as donor_schedule_module
+from app.services.donor_schedule_service import DonorScheduleService
+from app.tasks import process_donor_payouts
+from app.tasks.process_donor_payouts import MAX_ITEM_ATTEMPTS, STALE_ITEM_MINUTES, run_donor_payouts
+
+RUN_DATE = date(2024, 5, 1)
+PERIOD = "2024-05-01"
+
+
+@pytest.fixture
+def payout_db(monkeypatch):
+    """Session factory on an in-memory database, used by the job in place of SessionLocal"""
+    # No platform_counters table here; don't reuse another test's cached check
+    monkeypatch.setattr(platform_counters, "_table_state", {"exists": False, "checked_at": None})
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    tables = [
+        Church.__table__,
+        User.__table__,
+        DonationPreference.__table__,
+        DonorPayout.__table__,
+        ScheduledPayoutRun.__table__,
+        ScheduledPayoutRunItem.__table__,
+    ]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(process_donor_payouts, "SessionLocal", factory)
+    try:
+        yield factory
+    finally:
+        Base.metadata.drop_all(bind=engine, tables=tables)
+
+
+@pytest.fixture
+def donors(payout_db, monkeypatch):
+    """Three donors with preferences, all due on RUN_DATE"""
+    with payout_db() as db:
+        church = Church(name="Grace Church", email="grace@example.com", is_active=True)
+        db.add(church)
+        db.flush()
+        user_ids = []
+        for i in range(3):
+            user = User(
+                email=f"donor{i}@example.com",
+                first_name="Donor",
+                last_name=str(i),
+                role="donor",
+                church_id=church.id,
+                stripe_customer_id=f"cus_{i}",
+            )
+            db.add(user)
+            db.flush()
+            db.add(DonationPreference(user_id=user.id, multiplier="2x", frequency="weekly", target_church_id=church.id))
+            user_ids.append(user.id)
+        db.commit()
+
+    monkeypatch.setattr(
+        DonorScheduleService,
+        "get_donors_due_for_donation",
+        staticmethod(lambda db, target_date: [{"user_id": user_id} for user_id in user_ids])
+    )
+    return user_ids
+
+
+@pytest.fixture
+def payouts(monkeypatch):
+    """Record process_donor_payout calls; results are scripted per user"""
+    calls = []
+    outcomes = {}
+
+    def process_donor_payout(user_id, db, period=None):
+        calls.append(user_id)
+        if outcomes.get(user_id) == "fail":
+            return {"success": False, "error": "card declined"}
+        return {"success": True, "donor_payout_id": None, "amount": 10.0, "payment_intent_id": f"pi_{user_id}"}
+
+    monkeypatch.setattr(DonorScheduleService, "process_donor_payout", staticmethod(process_donor_payout))
+    return calls, outcomes
+
+
+def _items(factory):
+    with factory() as db:
+        return {item.user_id: (item.status, item.attempts) for item in db.query(ScheduledPayoutRunItem)}
+
+
+def _set_item(factory, user_id, **values):
+    with factory() as db:
+        db.query(ScheduledPayoutRunItem).filter_by(user_id=user_id).update(values)
+        db.commit()
+
+
+class TestRunDonorPayouts:
+    """Test the checkpointed run"""
+
+    def test_each_due_donor_is_charged_once(self, payout_db, donors, payouts):
+        calls, _ = payouts
+
+        summary = run_donor_payouts(RUN_DATE, max_workers=1)
+        run_donor_payouts(RUN_DATE, max_workers=1)  # Resuming a finished run does nothing
+
+        assert sorted(calls) == sorted(donors)
+        assert summary["status"] == "completed"
+        assert summary["completed_total"] == 3
+        assert _items(payout_db) == {user_id: ("completed", 1) for user_id in donors}
+
+    def test_item_claimed_by_another_worker_is_skipped(self, payout_db, donors, payouts):
+        """A fresh "processing" claim belongs to a live worker"""
+        calls, outcomes = payouts
+        outcomes[donors[0]] = "fail"
+        run_donor_payouts(RUN_DATE, max_workers=1)
+        calls.clear()
+        _set_item(payout_db, donors[0], status="processing", updated_at=datetime.now(timezone.utc))
+
+        summary = run_donor_payouts(RUN_DATE, max_workers=1)
+
+        assert calls == []
+        assert _items(payout_db)[donors[0]] == ("processing", 1)
+        assert summary["status"] == "running"
+
+    def test_stale_claim_is_reclaimed(self, payout_db, donors, payouts):
+        """A claim older than STALE_ITEM_MINUTES is from a crashed worker and is retried"""
+        calls, outcomes = payouts
+        outcomes[donors[0]] = "fail"
+        run_donor_payouts(RUN_DATE, max_workers=1)
+        calls.clear()
+        outcomes.clear()
+        stale = datetime.now(timezone.utc) - timedelta(minutes=STALE_ITEM_MINUTES + 1)
+        _set_item(payout_db, donors[0], status="processing", updated_at=stale)
+
+        summary = run_donor_payouts(RUN_DATE, max_workers=1)
+
+        assert calls == [donors[0]]
+        assert _items(payout_db)[donors[0]] == ("completed", 2)
+        assert summary["status"] == "completed"
+
+    def test_gives_up_after_max_attempts(self, payout_db, donors, payouts):
+        calls, outcomes = payouts
+        outcomes[donors[0]] = "fail"
+
+        for _ in range(MAX_ITEM_ATTEMPTS + 2):
+            summary = run_donor_payouts(RUN_DATE, max_workers=1)
+
+        assert calls.count(donors[0]) == MAX_ITEM_ATTEMPTS == 3
+        assert _items(payout_db)[donors[0]] == ("failed", 3)
+        assert summary["status"] == "completed"
+        assert summary["failed_total"] == 1
+
+
+class TestProcessDonorPayout:
+    """Test retries of a single donor's payout"""
+
+    @pytest.fixture
+    def stripe(self, monkeypatch):
+        """Record create_payment_intent calls; the first one can be made to fail"""
+        calls = []
+        failures = []
+
+        def create_payment_intent(amount, currency, customer_id, metadata, idempotency_key=None):
+            calls.append(idempotency_key)
+            if failures:
+                raise failures.pop(0)
+            return {"id": "pi_1"}
+
+        monkeypatch.setattr(donor_schedule_module, "create_payment_intent", create_payment_intent)
+        monkeypatch.setattr(
+            DonorScheduleService,
+            "calculate_estimated_donation_amount",
+            staticmethod(lambda user, preference, db: 12.5)
+        )
+        return calls, failures
+
+    def test_retried_item_reuses_the_idempotency_key(self, payout_db, donors, stripe):
+        """A charge retried after a timeout uses the same key, so Stripe charges once"""
+        calls, failures = stripe
+        failures.append(TimeoutError("stripe timed out"))
+
+        run_donor_payouts(RUN_DATE, max_workers=1)
+        run_donor_payouts(RUN_DATE, max_workers=1)
+
+        first_donor_keys = [key for key in calls if key.endswith(f":{donors[0]}:{PERIOD}")]
+        assert len(first_donor_keys) == 2
+        assert len(set(first_donor_keys)) == 1
+        assert _items(payout_db)[donors[0]] == ("completed", 2)
+
+    def test_key_depends_on_donor_and_period(self):
+        key = DonorScheduleService.payout_idempotency_key(1, PERIOD)
+
+        assert key == DonorScheduleService.payout_idempotency_key(1, PERIOD)
+        assert key != DonorScheduleService.payout_idempotency_key(2, PERIOD)
+        assert key != DonorScheduleService.payout_idempotency_key(1, "2024-05-02")
+
+    def test_existing_payout_for_the_period_is_returned(self, payout_db, donors, stripe):
+        calls, _ = stripe
+        with payout_db() as db:
+            user = db.get(User, donors[0])
+            existing = DonorPayout(
+                user_id=user.id,
+                church_id=user.church_id,
+                donation_amount=Decimal("9.00"),
+                roundup_multiplier=2.0,
+                base_roundup_amount=Decimal("4.50"),
+                collection_period=f"{PERIOD}_{PERIOD}",
+                donation_type="scheduled",
+                status="completed",
+            )
+            db.add(existing)
+            db.commit()
+
+            result = DonorScheduleService.process_donor_payout(user.id, db, period=PERIOD)
+
+            assert result["success"]
+            assert result["already_processed"]
+            assert result["donor_payout_id"] == existing.id
+            assert result["amount"] == 9.0
+            assert calls == []
+            assert db.query(DonorPayout).count() == 1
+
+    def test_other_periods_are_charged(self, payout_db, donors, stripe):
+        calls, _ = stripe
+        with payout_db() as db:
+            DonorScheduleService.process_donor_payout(donors[0], db, period=PERIOD)
+
+            result = DonorScheduleService.process_donor_payout(donors[0], db, period="2024-05-02")
+
+            assert result["success"] and not result.get("already_processed")
+            assert len(calls) == 2
+            assert db.query(DonorPayout).count() == 2
@@ -0,0 +1,180 @@
+"""
+Unit Tests for DonorScheduleService.get_donors_due_for_donation
+
+Tests:
+- Due windows for biweekly and monthly donors, including the window edges
+- Donors without payouts falling back to their signup date
+- The last payout date and 3-payout average from the ranked history
+- Payouts with no processed_at date
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.utils.database import Base
+from app.model.m_user import User
+from app.model.m_church import Church
+from app.model.m_donation_preference import DonationPreference
+from app.model.m_roundup_new import DonorPayout
+from app.services.donor_schedule_service import DonorScheduleService
+from app.services import platform_counters
+
+TARGET_DATE = datetime(2024, 5, 15)
+# Biweekly donors are due when their base date falls on this day
+BIWEEKLY_BASE = datetime(2024, 5, 1)
+
+
+@pytest.fixture
+def schedule_db(monkeypatch):
+    # No platform_counters table here; don't reuse another test's cached check
+    monkeypatch.setattr(platform_counters, "_table_state", {"exists": False, "checked_at": None})
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    tables = [Church.__table__, User.__table__, DonationPreference.__table__, DonorPayout.__table__]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+    church = Church(name="Grace Church", email="grace@example.com", is_active=True)
+    session.add(church)
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine, tables=tables)
+
+
+@pytest.fixture
+def make_donor(schedule_db):
+    """Create a donor signed up at created_at, with completed payouts of (processed_at, amount)"""
+    church = schedule_db.query(Church).one()
+
+    def make_donor(created_at, payouts=(), frequency="biweekly", minimum_roundup=Decimal("2.00")):
+        donor_number = schedule_db.query(User).count()
+        user = User(
+            email=f"donor{donor_number}@example.com",
+            first_name="Donor",
+            last_name="Test",
+            role="donor",
+            church_id=church.id,
+            stripe_customer_id=f"cus_{donor_number}",
+            created_at=created_at,
+        )
+        schedule_db.add(user)
+        schedule_db.flush()
+        schedule_db.add(DonationPreference(
+            user_id=user.id,
+            frequency=frequency,
+            target_church_id=church.id,
+            minimum_roundup=minimum_roundup,
+        ))
+        for processed_at, amount in payouts:
+            schedule_db.add(DonorPayout(
+                user_id=user.id,
+                church_id=church.id,
+                donation_amount=Decimal(amount),
+                roundup_multiplier=1.0,
+                base_roundup_amount=Decimal(amount),
+                collection_period="2024",
+                donation_type="scheduled",
+                status="completed",
+                processed_at=processed_at,
+            ))
+        schedule_db.commit()
+        return user.id
+
+    return make_donor
+
+
+def _due(db):
+    return {donor["user_id"]: donor for donor in DonorScheduleService.get_donors_due_for_donation(db, TARGET_DATE)}
+
+
+class TestDueWindow:
+    """Test which donors are due on the target date"""
+
+    def test_donor_without_payouts_is_due_from_signup(self, schedule_db, make_donor):
+        due_id = make_donor(BIWEEKLY_BASE + timedelta(hours=10))
+        not_due_id = make_donor(BIWEEKLY_BASE + timedelta(days=3))
+
+        due = _due(schedule_db)
+
+        assert set(due) == {due_id}
+        assert due[due_id]["estimated_amount"] == 2.0
+        assert not_due_id not in due
+
+    def test_window_edges(self, schedule_db, make_donor):
+        """The window covers the whole base day: midnight is in, the next midnight is out"""
+        start_id = make_donor(BIWEEKLY_BASE - timedelta(days=30), payouts=[(BIWEEKLY_BASE, "5.00")])
+        end_id = make_donor(BIWEEKLY_BASE - timedelta(days=30), payouts=[(BIWEEKLY_BASE + timedelta(days=1), "5.00")])
+        before_id = make_donor(BIWEEKLY_BASE - timedelta(days=30), payouts=[(BIWEEKLY_BASE - timedelta(seconds=1), "5.00")])
+
+        due = _due(schedule_db)
+
+        assert start_id in due
+        assert end_id not in due
+        assert before_id not in due
+        assert due[start_id]["next_donation_date"] == (BIWEEKLY_BASE + timedelta(days=14)).isoformat()
+
+    def test_monthly_donor_uses_30_day_window(self, schedule_db, make_donor):
+        monthly_id = make_donor(datetime(2024, 1, 1), payouts=[(datetime(2024, 4, 15, 9), "5.00")], frequency="monthly")
+        early_monthly_id = make_donor(datetime(2024, 1, 1), payouts=[(BIWEEKLY_BASE, "5.00")], frequency="monthly")
+
+        due = _due(schedule_db)
+
+        assert monthly_id in due
+        assert early_monthly_id not in due
+
+
+class TestPayoutHistory:
+    """Test the windowed last payout date and recent average"""
+
+    def test_fewer_than_three_payouts(self, schedule_db, make_donor):
+        user_id = make_donor(
+            datetime(2024, 1, 1),
+            payouts=[(BIWEEKLY_BASE - timedelta(days=14), "10.00"), (BIWEEKLY_BASE + timedelta(hours=9), "20.00")]
+        )
+
+        due = _due(schedule_db)
+
+        assert due[user_id]["estimated_amount"] == 15.0
+
+    def test_average_uses_the_three_most_recent_payouts(self, schedule_db, make_donor):
+        user_id = make_donor(datetime(2024, 1, 1), payouts=[
+            (BIWEEKLY_BASE - timedelta(days=42), "100.00"),
+            (BIWEEKLY_BASE - timedelta(days=28), "3.00"),
+            (BIWEEKLY_BASE - timedelta(days=14), "6.00"),
+            (BIWEEKLY_BASE + timedelta(hours=9), "9.00"),
+        ])
+
+        due = _due(schedule_db)
+
+        assert due[user_id]["estimated_amount"] == 6.0
+
+    def test_only_the_latest_payout_sets_the_base_date(self, schedule_db, make_donor):
+        """An older payout on the due day doesn't make a donor due again"""
+        user_id = make_donor(datetime(2024, 1, 1), payouts=[
+            (BIWEEKLY_BASE, "5.00"),
+            (BIWEEKLY_BASE + timedelta(days=7), "5.00"),
+        ])
+
+        assert user_id not in _due(schedule_db)
+
+    def test_null_processed_at_falls_back_to_signup(self, schedule_db, make_donor):
+        """A payout with no processed_at date has no date to schedule from"""
+        user_id = make_donor(BIWEEKLY_BASE + timedelta(hours=8), payouts=[(None, "8.00")])
+
+        due = _due(schedule_db)
+
+        assert user_id in due
+        assert due[user_id]["estimated_amount"] == 8.0
+
+    def test_null_processed_at_ranks_after_dated_payouts(self, schedule_db, make_donor):
+        user_id = make_donor(datetime(2024, 1, 1), payouts=[(None, "8.00"), (BIWEEKLY_BASE + timedelta(hours=9), "4.00")])
+
+        due = _due(schedule_db)
+
+        assert user_id in due
+        assert due[user_id]["estimated_amount"] == 6.0
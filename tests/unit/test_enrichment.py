@@ -0,0 +1,260 @@
+"""
+Unit Tests for Per-Page Enrichment
+
+Tests:
+- aggregate_by_ids defaults for ids without rows
+- latest_rows_by_ids limits and ordering
+- List endpoints issuing the same number of queries at any page size
+- Church revenue summing completed DonationBatch.amount
+- KYC confirmation queue activity from church audit logs
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.utils.database import Base
+from app.model.m_user import User
+from app.model.m_church import Church
+from app.model.m_church_admin import ChurchAdmin
+from app.model.m_audit_log import AuditLog
+from app.model.m_donation_batch import DonationBatch
+from app.model.m_donation_preference import DonationPreference
+from app.model.m_roundup_new import DonorPayout
+from app.services import platform_counters
+from app.controller.admin.users import get_all_users
+from app.controller.admin.church_management import list_churches
+from app.controller.admin.kyc import get_kyc_confirmation_queue
+from app.controller.church.members import get_church_members
+from app.controller.church.donor_management import get_active_donors
+from app.utils.enrichment import aggregate_by_ids, latest_rows_by_ids
+
+MEMBER_COUNT = 12
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    # No platform_counters table here; don't reuse another test's cached check
+    monkeypatch.setattr(platform_counters, "_table_state", {"exists": False, "checked_at": None})
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    tables = [
+        Church.__table__,
+        User.__table__,
+        ChurchAdmin.__table__,
+        AuditLog.__table__,
+        DonationBatch.__table__,
+        DonationPreference.__table__,
+        DonorPayout.__table__,
+    ]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    try:
+        yield engine
+    finally:
+        Base.metadata.drop_all(bind=engine, tables=tables)
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _batch(user, amount, status="completed", church_id=None):
+    return DonationBatch(
+        user_id=user.id,
+        church_id=church_id or user.church_id,
+        batch_number=f"B-{user.id}-{amount}-{status}",
+        amount=Decimal(amount),
+        net_amount=Decimal(amount),
+        status=status,
+        collection_date=START,
+    )
+
+
+@pytest.fixture
+def church(db):
+    """A church of MEMBER_COUNT donors, each with donations, a payout and preferences"""
+    church = Church(name="Grace Church", email="grace@example.com", is_active=True, status="active")
+    db.add(church)
+    db.flush()
+    for i in range(MEMBER_COUNT):
+        user = User(
+            email=f"member{i}@example.com",
+            first_name="Member",
+            last_name=f"Number{i}",
+            role="donor",
+            church_id=church.id,
+            created_at=START + timedelta(days=i),
+        )
+        db.add(user)
+        db.flush()
+        db.add_all([_batch(user, "10.00"), _batch(user, f"{i}.00")])
+        db.add(DonationPreference(user_id=user.id, target_church_id=church.id))
+        db.add(DonorPayout(
+            user_id=user.id,
+            church_id=church.id,
+            donation_amount=Decimal("5.00"),
+            roundup_multiplier=1.0,
+            base_roundup_amount=Decimal("5.00"),
+            collection_period="2024",
+            donation_type="scheduled",
+            status="completed",
+        ))
+    db.commit()
+    return church
+
+
+@pytest.fixture
+def count_queries(engine):
+    """Run a callable and return how many SQL statements it issued"""
+    def count_queries(fn):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            fn()
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        return len(statements)
+
+    return count_queries
+
+
+class TestAggregateByIds:
+    """Test per-id GROUP BY aggregates"""
+
+    def test_empty_ids(self, db):
+        assert aggregate_by_ids(db, DonationBatch.user_id, [], {"total": func.sum(DonationBatch.amount)}) == {}
+        assert aggregate_by_ids(db, DonationBatch.user_id, [None], {"total": func.sum(DonationBatch.amount)}) == {}
+
+    def test_ids_without_rows_get_empty_defaults(self, db, church):
+        user_ids = [user.id for user in db.query(User).order_by(User.id).limit(2)]
+
+        stats = aggregate_by_ids(
+            db,
+            DonationBatch.user_id,
+            user_ids + [999, user_ids[0]],
+            {"total": func.sum(DonationBatch.amount), "count": func.count(DonationBatch.id)},
+            empty={"total": 0.0, "count": 0},
+        )
+
+        assert list(stats) == user_ids + [999]
+        assert stats[user_ids[0]] == {"total": Decimal("10.00"), "count": 2}
+        assert stats[user_ids[1]] == {"total": Decimal("11.00"), "count": 2}
+        assert stats[999] == {"total": 0.0, "count": 0}
+
+    def test_default_empty_is_none(self, db, church):
+        stats = aggregate_by_ids(db, DonationBatch.user_id, [999], {"total": func.sum(DonationBatch.amount)})
+
+        assert stats == {999: {"total": None}}
+
+    def test_filters_apply_and_null_aggregates_keep_the_default(self, db, church):
+        user_id = db.query(User.id).order_by(User.id).first()[0]
+
+        stats = aggregate_by_ids(
+            db,
+            DonationBatch.user_id,
+            [user_id],
+            {"total": func.sum(DonationBatch.amount), "latest": func.max(DonationBatch.payout_date)},
+            DonationBatch.amount > 5,
+            empty={"total": 0.0, "latest": "never"},
+        )
+
+        assert stats[user_id] == {"total": Decimal("10.00"), "latest": "never"}
+
+
+class TestLatestRowsByIds:
+    """Test the first N rows per id"""
+
+    def test_limits_and_orders_rows_per_id(self, db, church):
+        for i in range(4):
+            db.add(AuditLog(actor_type="system", action=f"A{i}", resource_type="church", resource_id=church.id,
+                            created_at=START + timedelta(hours=i)))
+        db.add(AuditLog(actor_type="system", action="OTHER", resource_type="church", resource_id=999,
+                        created_at=START))
+        db.commit()
+
+        rows = latest_rows_by_ids(
+            db, AuditLog, AuditLog.resource_id, [church.id, 555], AuditLog.created_at.desc(), 3
+        )
+
+        assert [log.action for log in rows[church.id]] == ["A3", "A2", "A1"]
+        assert rows[555] == []
+        assert 999 not in rows
+
+    def test_empty_ids(self, db):
+        assert latest_rows_by_ids(db, AuditLog, AuditLog.resource_id, [], AuditLog.created_at.desc(), 3) == {}
+
+
+class TestListQueryCounts:
+    """A page costs the same number of queries at 3 rows as at 10"""
+
+    def test_get_all_users(self, db, church, count_queries):
+        counts = [count_queries(lambda: get_all_users(page=1, limit=limit, db=db)) for limit in (3, 10)]
+        page = get_all_users(page=1, limit=3, db=db).data
+
+        assert counts[0] == counts[1]
+        assert len(page["users"]) == 3
+        assert all(user["church_name"] == "Grace Church" for user in page["users"])
+
+    def test_get_church_members(self, db, church, count_queries):
+        church_id = church.id
+        counts = [count_queries(lambda: get_church_members(church_id, page=1, limit=limit, db=db)) for limit in (3, 10)]
+        page = get_church_members(church_id, page=1, limit=10, db=db).data
+
+        assert counts[0] == counts[1]
+        assert len(page["members"]) == 10
+        assert all(member["donation_count"] == 2 for member in page["members"])
+
+    def test_get_active_donors(self, db, church, count_queries):
+        church_id = church.id
+        counts = [count_queries(lambda: get_active_donors(church_id, page=1, limit=limit, db=db)) for limit in (3, 10)]
+        page = get_active_donors(church_id, page=1, limit=10, db=db).data
+
+        assert counts[0] == counts[1]
+        assert len(page["donors"]) == 10
+        assert all(donor["donation_preferences"] is not None for donor in page["donors"])
+
+
+class TestChurchRevenue:
+    """Test church_management revenue from completed donation batches"""
+
+    def test_sums_completed_batch_amounts(self, db, church):
+        user = db.query(User).order_by(User.id).first()
+        db.add_all([_batch(user, "100.00", status="success"), _batch(user, "50.00", status="pending")])
+        db.commit()
+
+        result = list_churches("all", 10, 0, db).data["churches"]
+
+        # 12 x 10.00 plus 0.00 + 1.00 + ... + 11.00; "success" and pending batches are excluded
+        assert result[0]["total_revenue"] == 120.0 + 66.0
+        assert result[0]["active_givers"] == MEMBER_COUNT
+
+
+class TestKycConfirmationQueue:
+    """Test recent activity in the KYC confirmation queue"""
+
+    def test_recent_activity_from_church_audit_logs(self, db, church):
+        church.kyc_status = "pending"
+        for i in range(6):
+            db.add(AuditLog(actor_type="system", action=f"KYC_{i}", resource_type="church", resource_id=church.id,
+                            additional_data={"step": i}, created_at=START + timedelta(hours=i)))
+        db.add(AuditLog(actor_type="system", action="USER_UPDATED", resource_type="user", resource_id=church.id,
+                        created_at=START + timedelta(days=1)))
+        db.commit()
+
+        queue = get_kyc_confirmation_queue(db).data["churches"]
+
+        activity = queue[0]["recent_activity"]
+        assert [log["action"] for log in activity] == ["KYC_5", "KYC_4", "KYC_3", "KYC_2", "KYC_1"]
+        assert activity[0]["details"] == {"step": 5}
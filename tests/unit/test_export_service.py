@@ -0,0 +1,170 @@
+"""
+Unit Tests for the Streaming Export Service
+
+Tests:
+- Format validation and aliases
+- CSV and NDJSON serialization in chunks
+- gzip-compressed streams
+- The streaming response owns and closes its session
+"""
+
+import asyncio
+import csv
+import gzip
+import io
+import json
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from fastapi import HTTPException
+from sqlalchemy import Column, DateTime, Integer, Numeric, String, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.services import export_service
+from app.services.export_service import iter_export_chunks, normalize_export_format, stream_query_export
+
+Base = declarative_base()
+
+COLUMNS = ["id", "name", "total", "joined_at"]
+
+
+class Member(Base):
+    __tablename__ = "members"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False)
+    total = Column(Numeric(10, 2), nullable=False)
+    joined_at = Column(DateTime, nullable=False)
+
+
+def _serialize(member):
+    return {"id": member.id, "name": member.name, "total": member.total, "joined_at": member.joined_at}
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    """Sessions the export opens, on an in-memory database with 25 members"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        db.add_all(
+            Member(id=i, name=f"Member, {i}", total=Decimal(i) / 4, joined_at=datetime(2024, 1, i))
+            for i in range(1, 26)
+        )
+        db.commit()
+
+    opened = []
+
+    def session_local():
+        session = factory()
+        opened.append(session)
+        return session
+
+    monkeypatch.setattr(export_service, "SessionLocal", session_local)
+    return opened
+
+
+def _body(response):
+    async def read():
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    return asyncio.run(read())
+
+
+def _export(format_type, gzip_body=False):
+    return stream_query_export(
+        lambda db: db.query(Member).order_by(Member.id),
+        _serialize,
+        COLUMNS,
+        format_type,
+        "members",
+        gzip=gzip_body,
+        fetch_size=10,
+    )
+
+
+class TestFormats:
+    """Test format validation"""
+
+    def test_json_is_an_alias_for_ndjson(self):
+        assert normalize_export_format("JSON") == "ndjson"
+        assert normalize_export_format("csv") == "csv"
+
+    @pytest.mark.parametrize("format_type", ["xml", "", None])
+    def test_unknown_format_is_rejected(self, format_type):
+        with pytest.raises(HTTPException) as exc_info:
+            normalize_export_format(format_type)
+
+        assert exc_info.value.status_code == 400
+
+
+class TestChunks:
+    """Test serialization"""
+
+    def test_rows_are_flushed_in_chunks(self):
+        rows = ({"id": i} for i in range(7))
+
+        chunks = list(iter_export_chunks(rows, ["id"], "ndjson", chunk_rows=3))
+
+        assert [chunk.count("\n") for chunk in chunks] == [3, 3, 1]
+
+    def test_csv_header_is_written_once(self):
+        chunks = list(iter_export_chunks(({"id": i} for i in range(4)), ["id"], "csv", chunk_rows=2))
+
+        assert "".join(chunks).splitlines() == ["id", "0", "1", "2", "3"]
+
+    def test_empty_csv_still_has_a_header(self):
+        assert "".join(iter_export_chunks([], COLUMNS, "csv")).strip() == ",".join(COLUMNS)
+
+    def test_values_are_json_friendly(self):
+        row = {"id": 1, "total": Decimal("2.50"), "joined_at": datetime(2024, 1, 1, 9), "name": None}
+
+        line = json.loads("".join(iter_export_chunks([row], COLUMNS, "ndjson")))
+
+        assert line == {"id": 1, "name": None, "total": 2.5, "joined_at": "2024-01-01T09:00:00"}
+
+
+class TestStreamQueryExport:
+    """Test the streaming response"""
+
+    def test_csv_export(self, sessions):
+        response = _export("csv")
+
+        rows = list(csv.DictReader(io.StringIO(_body(response).decode("utf-8"))))
+
+        assert response.media_type == "text/csv"
+        assert 'filename="members_' in response.headers["content-disposition"]
+        assert response.headers["content-disposition"].endswith('.csv"')
+        assert len(rows) == 25
+        assert rows[0] == {"id": "1", "name": "Member, 1", "total": "0.25", "joined_at": "2024-01-01T00:00:00"}
+
+    def test_gzip_export(self, sessions):
+        response = _export("json", gzip_body=True)
+
+        lines = gzip.decompress(_body(response)).decode("utf-8").splitlines()
+
+        assert response.media_type == "application/gzip"
+        assert response.headers["content-disposition"].endswith('.ndjson.gz"')
+        assert [json.loads(line)["id"] for line in lines] == list(range(1, 26))
+
+    def test_query_runs_when_the_body_is_read(self, sessions):
+        """No session is opened until the response is iterated, and it is closed after"""
+        response = _export("ndjson")
+        assert sessions == []
+
+        _body(response)
+
+        assert len(sessions) == 1
+        assert not sessions[0].in_transaction()
+
+    def test_session_is_closed_when_serialization_fails(self, sessions):
+        def failing(member):
+            raise RuntimeError("bad row")
+
+        response = stream_query_export(lambda db: db.query(Member), failing, COLUMNS, "csv", "members")
+
+        with pytest.raises(RuntimeError):
+            _body(response)
+        assert not sessions[0].in_transaction()
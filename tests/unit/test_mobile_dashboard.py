@@ -0,0 +1,86 @@
+"""
+Unit Tests for the Async Mobile Dashboard
+
+Tests:
+- The overlapped Plaid lookup is not orphaned when a query fails
+"""
+
+import asyncio
+import gc
+import threading
+from fastapi import HTTPException
+
+from app.controller.mobile import dashboard
+
+
+class _FailingSession:
+    """AsyncSession stand-in: the user loads, every query fails after a delay"""
+
+    def __init__(self, user, delay=0.0):
+        self.user = user
+        self.delay = delay
+
+    async def get(self, model, ident):
+        return self.user if model is dashboard.User else None
+
+    async def execute(self, statement):
+        await asyncio.sleep(self.delay)
+        raise RuntimeError("database went away")
+
+
+def _run_dashboard(session):
+    """Run the dashboard; return the status code raised, tasks left running and loop errors"""
+    reported = []
+    result = {}
+
+    async def main():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: reported.append(context))
+        try:
+            await dashboard.get_mobile_dashboard_async(1, session)
+        except HTTPException as e:
+            # Keep only the status; the traceback would keep the lookup task alive
+            result["status_code"] = e.status_code
+        await asyncio.sleep(0.05)  # Let a cancelled lookup task settle
+        result["running"] = [
+            task for task in asyncio.all_tasks() if task is not asyncio.current_task() and not task.done()
+        ]
+        gc.collect()
+
+    asyncio.run(main())
+    gc.collect()
+    return result.get("status_code"), len(result["running"]), reported
+
+
+def _user():
+    return dashboard.User(id=1, email="donor@example.com", first_name="Dana", last_name="Donor")
+
+
+class TestMobileDashboardAsync:
+    """Test get_mobile_dashboard_async cleanup"""
+
+    def test_running_lookup_is_cancelled_when_a_query_fails(self, monkeypatch):
+        """A lookup still in flight when a query fails is cancelled, not awaited"""
+        release = threading.Event()
+        monkeypatch.setattr(dashboard, "_count_bank_accounts", lambda user_id: release.wait(2) and 0)
+
+        try:
+            status_code, running, reported = _run_dashboard(_FailingSession(_user()))
+        finally:
+            release.set()
+
+        assert status_code == 500
+        assert running == 0
+        assert reported == []
+
+    def test_failed_lookup_is_retrieved_when_a_query_fails(self, monkeypatch):
+        """A lookup that already failed does not surface as "Task exception was never retrieved\""""
+        def failing_lookup(user_id):
+            raise RuntimeError("plaid is down")
+
+        monkeypatch.setattr(dashboard, "_count_bank_accounts", failing_lookup)
+
+        status_code, running, reported = _run_dashboard(_FailingSession(_user(), delay=0.05))
+
+        assert status_code == 500
+        assert running == 0
+        assert reported == []
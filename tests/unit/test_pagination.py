@@ -0,0 +1,144 @@
+"""
+Unit Tests for Keyset Pagination
+
+Tests:
+- Cursor encoding and decoding
+- _after predicates for uniform and mixed sort directions
+- Walking every page of a table with ties in the sort key
+"""
+
+import pytest
+from datetime import date, datetime, timezone, timedelta
+from decimal import Decimal
+from fastapi import HTTPException
+from sqlalchemy import Column, DateTime, Integer, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+from app.utils.pagination import _after, decode_cursor, encode_cursor, keyset_page, keyset_pagination
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    score = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+
+@pytest.fixture
+def db():
+    """In-memory table with repeated scores and timestamps"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    start = datetime(2024, 1, 1)
+    session.add_all(
+        Item(id=i, score=i % 4, created_at=start + timedelta(days=i // 3))
+        for i in range(1, 24)
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+def _walk(db, order, limit):
+    """ids of every page, following next_cursor to the end"""
+    pages, cursor = [], None
+    while True:
+        rows, cursor = keyset_page(db.query(Item), order, limit, cursor)
+        pages.append([row.id for row in rows])
+        if cursor is None:
+            return pages
+
+
+class TestCursor:
+    """Test cursor encoding"""
+
+    def test_round_trip(self):
+        values = [
+            datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+            date(2024, 5, 1),
+            Decimal("10.50"),
+            "name",
+            None,
+            42,
+        ]
+
+        assert decode_cursor(encode_cursor(values), len(values)) == values
+
+    def test_cursor_is_url_safe(self):
+        cursor = encode_cursor(["??>>", 1])
+
+        assert "=" not in cursor
+        assert "+" not in cursor and "/" not in cursor
+
+    def test_empty_cursor_is_the_first_page(self):
+        assert decode_cursor(None, 2) is None
+        assert decode_cursor("", 2) is None
+
+    @pytest.mark.parametrize("cursor", ["not a cursor", "e30", encode_cursor([1])])
+    def test_invalid_cursor_is_rejected(self, cursor):
+        """Garbage, non-list JSON and a key of the wrong size are all a 400"""
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor(cursor, 2)
+
+        assert exc_info.value.status_code == 400
+
+
+class TestAfter:
+    """Test the seek predicate"""
+
+    def _ids(self, db, order, values):
+        return sorted(item.id for item in db.query(Item).filter(_after(order, values)))
+
+    def test_uniform_descending(self, db):
+        order = [(Item.created_at, True), (Item.id, True)]
+        key = [datetime(2024, 1, 3), 7]  # Day 2 holds ids 6, 7, 8
+
+        assert self._ids(db, order, key) == [1, 2, 3, 4, 5, 6]
+
+    def test_uniform_ascending(self, db):
+        order = [(Item.score, False), (Item.id, False)]
+
+        assert self._ids(db, order, [3, 15]) == [19, 23]
+
+    def test_mixed_directions(self, db):
+        """Score descending, then id ascending within a score"""
+        order = [(Item.score, True), (Item.id, False)]
+
+        ids = self._ids(db, order, [2, 10])
+
+        assert ids == sorted([14, 18, 22] + [i for i in range(1, 24) if i % 4 < 2])
+
+
+class TestKeysetPage:
+    """Test paging through a table"""
+
+    @pytest.mark.parametrize("order", [
+        [(Item.created_at, True), (Item.id, True)],
+        [(Item.score, False), (Item.id, False)],
+        [(Item.score, True), (Item.created_at, False), (Item.id, True)],
+    ])
+    def test_pages_cover_every_row_once_in_order(self, db, order):
+        pages = _walk(db, order, limit=5)
+
+        expected = [
+            item.id for item in db.query(Item).order_by(
+                *[column.desc() if descending else column.asc() for column, descending in order]
+            )
+        ]
+        assert [item_id for page in pages for item_id in page] == expected
+        assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+
+    def test_exact_multiple_has_no_empty_last_page(self, db):
+        db.query(Item).filter(Item.id > 20).delete()
+
+        pages = _walk(db, [(Item.id, False)], limit=5)
+
+        assert [len(page) for page in pages] == [5, 5, 5, 5]
+
+    def test_pagination_block(self):
+        assert keyset_pagination(10, None) == {"limit": 10, "next_cursor": None, "has_more": False}
+        assert keyset_pagination(10, "abc", total_estimate=99)["total_estimate"] == 99
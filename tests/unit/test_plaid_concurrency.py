@@ -0,0 +1,180 @@
+"""
+Unit Tests for Plaid Request Concurrency
+
+Tests:
+- Token bucket burst, refill and waiting
+- Concurrent per-item fetches keep item order and isolate failures
+- Transport timeouts mapped to TimeoutError and retried
+"""
+
+import sys
+import threading
+import time
+import pytest
+import urllib3
+from types import SimpleNamespace
+
+import app.services.plaid_client  # noqa: F401  (app.services re-exports the client object under this name)
+from app.services.plaid_transaction_service import _fetch_items_concurrently
+
+plaid_client_module = sys.modules["app.services.plaid_client"]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time for the bucket; sleeping advances the clock
+
+    Rates in these tests keep waits exact in binary floating point, so a
+    sleep always lands the bucket on a whole token.
+    """
+    now = {"value": 100.0}
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now["value"] += seconds
+
+    monkeypatch.setattr(plaid_client_module, "time", SimpleNamespace(monotonic=lambda: now["value"], sleep=sleep))
+
+    def advance(seconds):
+        now["value"] += seconds
+
+    advance.sleeps = sleeps
+    return advance
+
+
+class TestTokenBucket:
+    """Test the process-wide Plaid rate limiter"""
+
+    def test_burst_does_not_wait(self, clock):
+        bucket = plaid_client_module.TokenBucket(rate=4.0, capacity=5)
+
+        for _ in range(5):
+            bucket.acquire()
+
+        assert clock.sleeps == []
+
+    def test_waits_for_the_next_token_once_empty(self, clock):
+        bucket = plaid_client_module.TokenBucket(rate=4.0, capacity=2)
+        bucket.acquire()
+        bucket.acquire()
+
+        bucket.acquire()
+
+        assert clock.sleeps == [0.25]
+
+    def test_refills_up_to_capacity(self, clock):
+        bucket = plaid_client_module.TokenBucket(rate=4.0, capacity=3)
+        for _ in range(3):
+            bucket.acquire()
+
+        clock(60)  # Far longer than a full refill
+        for _ in range(3):
+            bucket.acquire()
+        assert clock.sleeps == []
+
+        bucket.acquire()
+        assert len(clock.sleeps) == 1
+
+    def test_sustained_rate(self, clock):
+        """After the burst, calls proceed at the refill rate"""
+        bucket = plaid_client_module.TokenBucket(rate=8.0, capacity=1)
+
+        for _ in range(17):
+            bucket.acquire()
+
+        assert clock.sleeps == [0.125] * 16
+
+
+class TestFetchItemsConcurrently:
+    """Test fanning out over a user's Plaid items"""
+
+    def test_results_follow_item_order(self):
+        items = [{"item_id": f"item-{i}", "delay": (5 - i) * 0.02} for i in range(5)]
+
+        def fetch(item):
+            time.sleep(item["delay"])
+            return item["item_id"]
+
+        assert _fetch_items_concurrently(items, fetch) == [item["item_id"] for item in items]
+
+    def test_failed_item_yields_none(self):
+        items = [{"item_id": "ok"}, {"item_id": "broken"}, {"item_id": "also-ok"}]
+
+        def fetch(item):
+            if item["item_id"] == "broken":
+                raise RuntimeError("ITEM_LOGIN_REQUIRED")
+            return [item["item_id"]]
+
+        assert _fetch_items_concurrently(items, fetch) == [["ok"], None, ["also-ok"]]
+
+    def test_items_are_fetched_in_parallel(self):
+        """Three items that each wait on the others only finish if run together"""
+        items = [{"item_id": f"item-{i}"} for i in range(3)]
+        barrier = threading.Barrier(3, timeout=2)
+
+        def fetch(item):
+            barrier.wait()
+            return item["item_id"]
+
+        assert _fetch_items_concurrently(items, fetch) == ["item-0", "item-1", "item-2"]
+
+
+class TestTimeouts:
+    """Test socket timeouts from the Plaid HTTP client"""
+
+    @pytest.fixture
+    def transport(self, monkeypatch):
+        """Scripted RESTClientObject.request: each call pops an outcome, raising exceptions
+
+        Returns the timeouts each call was made with, the outcome script and the backoff sleeps.
+        """
+        calls = []
+        outcomes = []
+
+        def request(self, method, url, _request_timeout=None, **kwargs):
+            calls.append(_request_timeout)
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        sleeps = []
+        monkeypatch.setattr(plaid_client_module.RESTClientObject, "request", request)
+        monkeypatch.setattr(plaid_client_module, "_rate_limiter", SimpleNamespace(acquire=lambda: None))
+        monkeypatch.setattr(plaid_client_module, "time", SimpleNamespace(sleep=sleeps.append))
+        return calls, outcomes, sleeps
+
+    def _read_timeout(self):
+        return urllib3.exceptions.ReadTimeoutError(None, "/transactions/sync", "Read timed out.")
+
+    def _call(self, max_retries=3):
+        @plaid_client_module._handle_plaid_rate_limit(max_retries=max_retries)
+        def call():
+            return plaid_client_module.api_client.rest_client.request("POST", "https://sandbox.plaid.com/x")
+
+        return call()
+
+    def test_timeout_is_retried(self, transport):
+        calls, outcomes, sleeps = transport
+        outcomes.extend([self._read_timeout(), "response"])
+        before = plaid_client_module.get_plaid_client_stats()
+
+        assert self._call() == "response"
+
+        assert calls == [plaid_client_module.REQUEST_TIMEOUT] * 2
+        assert sleeps == [1]
+        stats = plaid_client_module.get_plaid_client_stats()
+        assert stats["timeouts"] == before["timeouts"] + 1
+        assert stats["in_flight"] == before["in_flight"]
+
+    def test_exhausted_retries_raise_the_module_timeout_error(self, transport):
+        calls, outcomes, sleeps = transport
+        outcomes.extend([self._read_timeout() for _ in range(3)])
+
+        with pytest.raises(plaid_client_module.TimeoutError) as exc_info:
+            self._call()
+
+        assert isinstance(exc_info.value.__cause__, urllib3.exceptions.TimeoutError)
+        assert len(calls) == 3
+        assert sleeps == [1, 2]
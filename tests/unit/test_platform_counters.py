@@ -0,0 +1,201 @@
+"""
+Unit Tests for Platform Counters
+
+Tests:
+- Flush deltas for inserted, updated and deleted rows
+- Increments spread over shards and summed on read
+- Reconciliation repairs drift without losing later increments
+"""
+
+import pytest
+from decimal import Decimal
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.utils.database import Base
+from app.model.m_user import User
+from app.model.m_church import Church
+from app.model.m_church_referral import ChurchReferral
+from app.model.m_referral import ReferralCommission
+from app.model.m_roundup_new import DonorPayout, ChurchPayout
+from app.model.m_pending_roundup import PendingRoundup
+from app.model.m_platform_counter import PlatformCounter
+from app.services import platform_counters
+from app.services.platform_counters import (
+    COUNTER_SHARDS,
+    collect_deltas,
+    get_platform_counters,
+    reconcile_platform_counters,
+)
+
+
+@pytest.fixture
+def counter_db(monkeypatch):
+    """In-memory database with the counted tables and platform_counters"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    tables = [
+        Church.__table__,
+        User.__table__,
+        DonorPayout.__table__,
+        PendingRoundup.__table__,
+        ChurchPayout.__table__,
+        ChurchReferral.__table__,
+        ReferralCommission.__table__,
+        PlatformCounter.__table__,
+    ]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    # The table-exists check is cached per process; start from a fresh check
+    monkeypatch.setattr(platform_counters, "_table_state", {"exists": False, "checked_at": None})
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine, tables=tables)
+
+
+def _church(**overrides):
+    values = {"name": "Grace Church", "is_active": True, "kyc_status": "approved", "status": "active"}
+    values.update(overrides)
+    return Church(**values)
+
+
+def _donor_payout(church_id, user_id, status="completed", amount="10.00"):
+    return DonorPayout(
+        user_id=user_id,
+        church_id=church_id,
+        donation_amount=Decimal(amount),
+        base_roundup_amount=Decimal(amount),
+        collection_period="2026-10-01_2026-10-15",
+        donation_type="roundup",
+        status=status,
+    )
+
+
+class TestCounterDeltas:
+    """Test the deltas a flush contributes"""
+
+    def test_new_rows_add_their_contribution(self, counter_db):
+        """Inserting a church counts it under every breakdown"""
+        counter_db.add(_church())
+
+        deltas = collect_deltas(counter_db)
+
+        assert deltas == {
+            "churches.total": Decimal(1),
+            "churches.active": Decimal(1),
+            "churches.kyc_status.approved": Decimal(1),
+            "churches.status.active": Decimal(1),
+        }
+
+    def test_updates_move_between_breakdowns(self, counter_db):
+        """Changing a status moves the row from the old bucket to the new one"""
+        church = _church(kyc_status="pending")
+        counter_db.add(church)
+        counter_db.commit()
+
+        church.kyc_status = "approved"
+        counter_db.commit()
+
+        counters = get_platform_counters(counter_db)
+        assert counters["churches.total"] == Decimal(1)
+        assert counters["churches.kyc_status.pending"] == Decimal(0)
+        assert counters["churches.kyc_status.approved"] == Decimal(1)
+
+    def test_deletes_subtract(self, counter_db):
+        """Deleting a completed payout removes its count and amount"""
+        church = _church()
+        counter_db.add(church)
+        counter_db.flush()
+        user = User(email="donor@example.com", first_name="Dana", last_name="Donor", church_id=church.id)
+        counter_db.add(user)
+        counter_db.flush()
+        payout = _donor_payout(church.id, user.id, amount="12.50")
+        counter_db.add(payout)
+        counter_db.commit()
+
+        assert get_platform_counters(counter_db)["donor_payouts.completed_amount"] == Decimal("12.50")
+
+        counter_db.delete(payout)
+        counter_db.commit()
+
+        counters = get_platform_counters(counter_db)
+        assert counters["donor_payouts.total"] == Decimal(0)
+        assert counters["donor_payouts.completed_amount"] == Decimal(0)
+
+
+class TestCounterShards:
+    """Test sharded counter storage"""
+
+    def test_transactions_spread_over_shards_and_sum_on_read(self, counter_db):
+        """Each transaction writes one shard; readers see the total"""
+        for index in range(40):
+            counter_db.add(User(email=f"user{index}@example.com", first_name="U", last_name=str(index)))
+            counter_db.commit()
+
+        shards = counter_db.query(PlatformCounter.shard).filter(PlatformCounter.name == "users.total").all()
+        assert 1 < len(shards) <= COUNTER_SHARDS
+        assert get_platform_counters(counter_db)["users.total"] == Decimal(40)
+
+    def test_one_shard_per_transaction(self, counter_db):
+        """Several flushes in one transaction all land on the same shard"""
+        for index in range(3):
+            counter_db.add(User(email=f"user{index}@example.com", first_name="U", last_name=str(index)))
+            counter_db.flush()
+        counter_db.commit()
+
+        shards = counter_db.query(PlatformCounter.shard).filter(PlatformCounter.name == "users.total").all()
+        assert len(shards) == 1
+
+
+class TestReconcile:
+    """Test drift repair"""
+
+    def test_reconcile_repairs_drift(self, counter_db):
+        """Counters written outside the ORM events are corrected"""
+        counter_db.add(_church())
+        counter_db.commit()
+        # A bulk update bypasses the flush events
+        counter_db.query(Church).update({"is_active": False}, synchronize_session=False)
+        counter_db.commit()
+        assert get_platform_counters(counter_db)["churches.active"] == Decimal(1)
+
+        reconcile_platform_counters(counter_db)
+
+        assert get_platform_counters(counter_db)["churches.active"] == Decimal(0)
+
+    def test_reconcile_keeps_increments_committed_after_snapshot(self, counter_db, monkeypatch):
+        """Drift is added to the stored value rather than written over it"""
+        counter_db.add(User(email="first@example.com", first_name="F", last_name="U"))
+        counter_db.commit()
+        # Lose the first signup's increment so there is drift to repair
+        counter_db.query(PlatformCounter).delete()
+        counter_db.commit()
+
+        snapshot_counters = platform_counters._snapshot_counters
+
+        def snapshot_then_signup(db):
+            snapshot = snapshot_counters(db)
+            # A signup commits between the snapshot and the drift write
+            counter_db.add(User(email="second@example.com", first_name="S", last_name="U"))
+            counter_db.commit()
+            return snapshot
+
+        monkeypatch.setattr(platform_counters, "_snapshot_counters", snapshot_then_signup)
+        reconcile_platform_counters(counter_db)
+
+        assert counter_db.query(func.count(User.id)).scalar() == 2
+        assert get_platform_counters(counter_db)["users.total"] == Decimal(2)
+
+    def test_get_seeds_empty_table(self, counter_db):
+        """The first read seeds counters for rows that predate the table"""
+        counter_db.add(_church())
+        counter_db.commit()
+        counter_db.query(PlatformCounter).delete()
+        counter_db.commit()
+
+        counters = get_platform_counters(counter_db)
+
+        assert counters["churches.total"] == Decimal(1)
+        assert counter_db.query(PlatformCounter).count() > 0
@@ -0,0 +1,136 @@
+"""
+Unit Tests for the Principal Cache
+
+Tests:
+- TTL expiry and LRU bound
+- Per-user and per-church invalidation
+- Invalidation after committed user changes
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.utils.database import Base
+from app.model.m_user import User
+from app.model.m_church import Church
+from app.services import platform_counters
+from app.services import principal_cache as principal_cache_module
+from app.services.principal_cache import PrincipalCache
+
+
+def _principal(user_id, church_id=None):
+    return {"user_id": user_id, "email": f"user{user_id}@example.com", "church_id": church_id, "role": "donor"}
+
+
+class TestPrincipalCache:
+    """Test the cache itself"""
+
+    def test_returns_copies_until_ttl(self, monkeypatch):
+        """Hits are copies; entries expire after the TTL"""
+        now = [1000.0]
+        monkeypatch.setattr(principal_cache_module.time, "monotonic", lambda: now[0])
+        cache = PrincipalCache(ttl_seconds=30)
+        cache.set("donor", 1, _principal(1))
+
+        hit = cache.get("donor", 1)
+        hit["role"] = "manna_admin"
+        assert cache.get("donor", 1)["role"] == "donor"
+
+        now[0] += 31
+        assert cache.get("donor", 1) is None
+        assert cache.stats["misses"] == 1
+
+    def test_zero_ttl_disables(self):
+        """A TTL of 0 never caches"""
+        cache = PrincipalCache(ttl_seconds=0)
+        cache.set("donor", 1, _principal(1))
+
+        assert cache.get("donor", 1) is None
+
+    def test_evicts_least_recently_used(self):
+        """Past max_entries, the least recently read entry goes first"""
+        cache = PrincipalCache(ttl_seconds=30, max_entries=2)
+        cache.set("donor", 1, _principal(1))
+        cache.set("donor", 2, _principal(2))
+        cache.get("donor", 1)
+        cache.set("donor", 3, _principal(3))
+
+        assert cache.get("donor", 1) is not None
+        assert cache.get("donor", 2) is None
+        assert cache.get("donor", 3) is not None
+
+    def test_invalidate_user_drops_every_kind(self):
+        """Donor and church admin principals of the user both go"""
+        cache = PrincipalCache(ttl_seconds=30)
+        cache.set("donor", 1, _principal(1))
+        cache.set("church_admin", 1, _principal(1))
+        cache.set("donor", 2, _principal(2))
+
+        cache.invalidate_user(1)
+
+        assert cache.get("donor", 1) is None
+        assert cache.get("church_admin", 1) is None
+        assert cache.get("donor", 2) is not None
+
+    def test_invalidate_church_drops_its_users(self):
+        """Only users attached to the church are dropped"""
+        cache = PrincipalCache(ttl_seconds=30)
+        cache.set("church_admin", 1, _principal(1, church_id=10))
+        cache.set("donor", 2, _principal(2, church_id=10))
+        cache.set("donor", 3, _principal(3, church_id=20))
+
+        cache.invalidate_church(10)
+
+        assert cache.get("church_admin", 1) is None
+        assert cache.get("donor", 2) is None
+        assert cache.get("donor", 3) is not None
+
+
+class TestCommitInvalidation:
+    """Test invalidation driven by session commits"""
+
+    @pytest.fixture
+    def cache_db(self, monkeypatch):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        tables = [Church.__table__, User.__table__]
+        Base.metadata.create_all(bind=engine, tables=tables)
+        monkeypatch.setattr(platform_counters, "_table_state", {"exists": False, "checked_at": None})
+        cache = PrincipalCache(ttl_seconds=30)
+        monkeypatch.setattr(principal_cache_module, "principal_cache", cache)
+        session = sessionmaker(bind=engine)()
+        try:
+            yield session, cache
+        finally:
+            session.close()
+            Base.metadata.drop_all(bind=engine, tables=tables)
+
+    def test_committed_deactivation_invalidates(self, cache_db):
+        """Deactivating a user drops their principal once committed"""
+        db, cache = cache_db
+        user = User(email="donor@example.com", first_name="Dana", last_name="Donor")
+        db.add(user)
+        db.commit()
+        cache.set("donor", user.id, _principal(user.id))
+
+        user.is_active = False
+        db.flush()
+        assert cache.get("donor", user.id) is not None  # Not yet committed
+
+        db.commit()
+        assert cache.get("donor", user.id) is None
+
+    def test_rolled_back_change_keeps_entry(self, cache_db):
+        """A rolled back change leaves the cached principal alone"""
+        db, cache = cache_db
+        user = User(email="donor@example.com", first_name="Dana", last_name="Donor")
+        db.add(user)
+        db.commit()
+        cache.set("donor", user.id, _principal(user.id))
+
+        user.role = "church_admin"
+        db.flush()
+        db.rollback()
+
+        assert cache.get("donor", user.id) is not None
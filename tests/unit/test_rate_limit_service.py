@@ -0,0 +1,161 @@
+"""
+Unit Tests for the Rate Limit Service
+
+Tests:
+- Sliding window counting, decay across windows and retry_after
+- Combined limits (sustained rate plus burst)
+- In-process LRU bound and eviction order
+"""
+
+import pytest
+from types import SimpleNamespace
+
+from app.services import rate_limit_service as rate_limit_module
+from app.services.rate_limit_service import RateLimit, RateLimitService
+
+# Start of a 60 second window
+WINDOW_START = 6000.0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the limiter"""
+    now = {"value": WINDOW_START}
+    monkeypatch.setattr(rate_limit_module, "time", SimpleNamespace(time=lambda: now["value"]))
+
+    def advance(seconds):
+        now["value"] += seconds
+
+    return advance
+
+
+@pytest.fixture
+def limiter():
+    return RateLimitService(redis_client=None)
+
+
+class TestSlidingWindow:
+    """Test the sliding window counter"""
+
+    def test_allows_up_to_the_limit(self, clock, limiter):
+        """Requests within the limit pass and report what is left"""
+        limit = RateLimit(3, 60)
+
+        results = [limiter.hit("client", limit) for _ in range(4)]
+
+        assert [result.allowed for result in results] == [True, True, True, False]
+        assert [result.remaining for result in results[:3]] == [2, 1, 0]
+        assert results[3].exceeded == limit
+
+    def test_denied_requests_are_not_counted(self, clock, limiter):
+        """A denied request leaves the count where it was"""
+        limit = RateLimit(2, 60)
+        for _ in range(5):
+            limiter.hit("client", limit)
+
+        assert limiter.peek("client", limit).current_requests == 2
+
+    def test_previous_window_decays(self, clock, limiter):
+        """Halfway into the next window the previous count weighs one half"""
+        limit = RateLimit(3, 60)
+        for _ in range(3):
+            limiter.hit("client", limit)
+
+        clock(90)  # 30 seconds into the next window: 3 * 0.5 = 1.5
+
+        assert limiter.hit("client", limit).allowed
+        assert not limiter.hit("client", limit).allowed
+
+    def test_retry_after_is_when_a_request_passes(self, clock, limiter):
+        """Waiting retry_after seconds is exactly enough"""
+        limit = RateLimit(3, 60)
+        for _ in range(3):
+            limiter.hit("client", limit)
+        retry_after = limiter.hit("client", limit).retry_after
+
+        assert retry_after == 80
+        clock(retry_after - 1)
+        assert not limiter.peek("client", limit).allowed
+        clock(1)
+        assert limiter.hit("client", limit).allowed
+
+    def test_keys_are_independent(self, clock, limiter):
+        """One client's count does not affect another's"""
+        limit = RateLimit(1, 60)
+
+        assert limiter.hit("a", limit).allowed
+        assert limiter.hit("b", limit).allowed
+        assert not limiter.hit("a", limit).allowed
+
+    def test_peek_does_not_count_or_track(self, clock, limiter):
+        """peek neither counts a request nor starts tracking the key"""
+        limit = RateLimit(1, 60)
+
+        assert limiter.peek("client", limit).allowed
+        assert limiter.get_stats()["tracked_keys"] == 0
+        assert limiter.hit("client", limit).allowed
+
+    def test_reset_forgets_counts(self, clock, limiter):
+        limit = RateLimit(1, 60)
+        limiter.hit("client", limit)
+
+        limiter.reset("client", limit)
+
+        assert limiter.hit("client", limit).allowed
+
+    def test_requires_a_limit(self, limiter):
+        with pytest.raises(ValueError):
+            limiter.hit("client")
+
+
+class TestCombinedLimits:
+    """Test several limits checked together"""
+
+    def test_burst_limit_denies_and_is_reported(self, clock, limiter):
+        """The exceeded limit is the one reported"""
+        sustained, burst = RateLimit(100, 60), RateLimit(2, 1)
+        limiter.hit("client", sustained, burst)
+        limiter.hit("client", sustained, burst)
+
+        result = limiter.hit("client", sustained, burst)
+
+        assert not result.allowed
+        assert result.exceeded == burst
+
+    def test_denied_request_counts_against_no_limit(self, clock, limiter):
+        """A request denied by one limit is not counted by the others"""
+        sustained, burst = RateLimit(100, 60), RateLimit(1, 1)
+        limiter.hit("client", sustained, burst)
+        for _ in range(5):
+            limiter.hit("client", sustained, burst)
+
+        assert limiter.peek("client", sustained).current_requests == 1
+
+
+class TestMemoryLRU:
+    """Test the bounded in-process key store"""
+
+    def test_evicts_least_recently_checked_key(self, clock):
+        """Past max_keys, the oldest key goes first"""
+        limiter = RateLimitService(redis_client=None, max_keys=2)
+        limit = RateLimit(1, 60)
+        for key in ("a", "b", "c"):
+            limiter.hit(key, limit)
+
+        stats = limiter.get_stats()
+        assert stats["tracked_keys"] == 2
+        assert stats["evictions"] == 1
+        assert limiter.hit("a", limit).allowed  # Forgotten, so allowed again
+
+    def test_denied_checks_keep_a_throttled_key(self, clock):
+        """A key being denied is refreshed and outlives quieter keys"""
+        limiter = RateLimitService(redis_client=None, max_keys=2)
+        limit = RateLimit(1, 60)
+        limiter.hit("throttled", limit)
+        limiter.hit("quiet", limit)
+
+        assert not limiter.hit("throttled", limit).allowed
+        limiter.hit("new", limit)  # Evicts one key
+
+        assert not limiter.peek("throttled", limit).allowed
+        assert limiter.peek("quiet", limit).allowed
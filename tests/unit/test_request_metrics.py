@@ -0,0 +1,199 @@
+"""
+Unit Tests for Request Metrics
+
+Tests:
+- HDR bucket index and bounds
+- Percentiles against known samples
+- Rolling window expiry and slot reuse
+- Cumulative Prometheus histogram output
+"""
+
+import re
+import pytest
+from types import SimpleNamespace
+
+from app.services import request_metrics as request_metrics_module
+from app.services.request_metrics import (
+    MAX_LATENCY_US,
+    PROMETHEUS_BUCKETS,
+    SUB_BUCKETS,
+    RequestMetrics,
+    RouteMetrics,
+    bucket_bounds,
+    bucket_index,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the registry"""
+    now = {"value": 1_000_000.0}
+    monkeypatch.setattr(request_metrics_module, "time", SimpleNamespace(time=lambda: now["value"]))
+
+    def advance(seconds):
+        now["value"] += seconds
+
+    return advance
+
+
+class TestBuckets:
+    """Test the HDR bucket layout"""
+
+    def test_small_latencies_are_exact(self):
+        for latency in range(2 * SUB_BUCKETS):
+            assert bucket_bounds(bucket_index(latency)) == (latency, latency + 1)
+
+    def test_buckets_tile_the_range(self):
+        """Consecutive buckets are contiguous and each maps back to itself"""
+        last = bucket_index(MAX_LATENCY_US)
+        for index in range(last):
+            low, high = bucket_bounds(index)
+            assert bucket_bounds(index + 1)[0] == high
+            assert bucket_index(low) == index
+            assert bucket_index(high - 1) == index
+
+    def test_bucket_width_is_within_a_sixteenth(self):
+        """Any value is within 1/16 of its bucket's lower bound"""
+        for latency in (17, 100, 1_234, 50_000, 999_999, 12_345_678):
+            low, high = bucket_bounds(bucket_index(latency))
+            assert low <= latency < high
+            assert (high - low) / low <= 1 / SUB_BUCKETS
+
+    def test_known_values(self):
+        assert bucket_index(32) == bucket_index(33) == 32
+        assert bucket_bounds(32) == (32, 34)
+        assert bucket_bounds(bucket_index(1000)) == (992, 1024)
+
+    def test_out_of_range_values_are_clamped(self):
+        assert bucket_index(-5) == 0
+        assert bucket_index(MAX_LATENCY_US * 10) == bucket_index(MAX_LATENCY_US)
+
+
+class TestPercentiles:
+    """Test summaries against known samples"""
+
+    def test_percentiles_of_a_uniform_sample(self, clock):
+        """1..1000 ms: percentiles land within the bucket error of the exact values"""
+        metrics = RequestMetrics()
+        for ms in range(1, 1001):
+            metrics.record("GET", "/api/v1/items", ms / 1000, 200)
+
+        summary = metrics.summary("1m")
+
+        assert summary["requests"] == 1000
+        assert summary["avg_ms"] == pytest.approx(500.5, rel=0.001)
+        for key, exact in (("p50_ms", 500), ("p95_ms", 950), ("p99_ms", 990)):
+            assert summary[key] == pytest.approx(exact, rel=1 / SUB_BUCKETS)
+
+    def test_single_latency(self, clock):
+        metrics = RequestMetrics()
+        for _ in range(10):
+            metrics.record("GET", "/health", 0.000005, 200)
+
+        summary = metrics.summary("1m")
+
+        assert summary["p50_ms"] == summary["p99_ms"] == 0.01  # 5 us, rounded to 2 places of ms
+
+    def test_errors_and_routes(self, clock):
+        metrics = RequestMetrics()
+        metrics.record("GET", "/a", 0.01, 200)
+        metrics.record("GET", "/a", 0.01, 503)
+        metrics.record("POST", "/b", 0.01, 404)
+        metrics.record("GET", None, 0.01, 404)
+
+        assert metrics.summary("1m")["errors"] == 1
+        assert metrics.summary("1m")["error_rate"] == 25.0
+        assert metrics.summary("1m", route="/a")["requests"] == 2
+        routes = metrics.route_summaries("1m")
+        assert routes[0]["route"] == "/a" and routes[0]["requests"] == 2
+        assert {route["route"] for route in routes} == {"/a", "/b", "unmatched"}
+
+    def test_empty_window(self, clock):
+        summary = RequestMetrics().summary("1h")
+
+        assert summary["requests"] == 0
+        assert summary["p99_ms"] == 0.0
+
+
+class TestRollingWindows:
+    """Test window expiry"""
+
+    def test_one_minute_window_expires(self):
+        route = RouteMetrics("GET", "/a")
+        route.record(1000.0, 1000, 200)
+
+        assert route.window("1m", 1059.0).count == 1
+        assert route.window("1m", 1060.0).count == 0
+        assert route.window("1h", 1060.0).count == 1
+
+    def test_reused_slot_drops_old_counts(self):
+        """A slot that comes round again starts from zero"""
+        route = RouteMetrics("GET", "/a")
+        route.record(1000.0, 1000, 200)
+        route.record(1060.0, 2000, 200)  # Same 1m ring slot, one lap later
+
+        window = route.window("1m", 1060.0)
+        assert window.count == 1
+        assert window.total_us == 2000
+
+    def test_registry_windows_follow_the_clock(self, clock):
+        metrics = RequestMetrics()
+        metrics.record("GET", "/a", 0.01, 200)
+
+        clock(61)
+        assert metrics.summary("1m")["requests"] == 0
+        assert metrics.summary("1h")["requests"] == 1
+
+        clock(3600)
+        assert metrics.summary("1h")["requests"] == 0
+        assert metrics.summary("24h")["requests"] == 1
+
+
+class TestPrometheus:
+    """Test the text exposition"""
+
+    def _buckets(self, text, route):
+        pattern = re.compile(
+            r'http_request_duration_seconds_bucket\{method="GET",route="' + re.escape(route) + r'",le="([^"]+)"\} (\d+)'
+        )
+        return [(le, int(count)) for le, count in pattern.findall(text)]
+
+    def test_histogram_is_cumulative(self, clock):
+        metrics = RequestMetrics()
+        for seconds in (0.001, 0.02, 0.02, 0.3, 20.0):
+            metrics.record("GET", "/a", seconds, 200)
+
+        text = metrics.render_prometheus()
+        buckets = self._buckets(text, "/a")
+
+        assert [le for le, _ in buckets] == [str(bound) for bound in PROMETHEUS_BUCKETS] + ["+Inf"]
+        counts = [count for _, count in buckets]
+        assert counts == sorted(counts)
+        assert dict(buckets)["0.005"] == 1
+        assert dict(buckets)["0.025"] == 3
+        assert dict(buckets)["0.5"] == 4
+        assert dict(buckets)["+Inf"] == 5
+        assert 'http_request_duration_seconds_count{method="GET",route="/a"} 5' in text
+
+    def test_counts_survive_window_expiry(self, clock):
+        """Exported counts are since startup, not per window"""
+        metrics = RequestMetrics()
+        metrics.record("GET", "/a", 0.01, 200)
+        clock(2 * 86400)
+        metrics.record("GET", "/a", 0.01, 500)
+
+        text = metrics.render_prometheus()
+
+        assert dict(self._buckets(text, "/a"))["+Inf"] == 2
+        assert 'http_requests_total{method="GET",route="/a",status="2xx"} 1' in text
+        assert 'http_requests_total{method="GET",route="/a",status="5xx"} 1' in text
+
+    def test_labels_are_escaped_and_gauges_rendered(self, clock):
+        metrics = RequestMetrics()
+        metrics.record("GET", '/weird"route', 0.01, 200)
+
+        text = metrics.render_prometheus({"process_cpu_percent": ("CPU usage", 12.5)})
+
+        assert 'route="/weird\\"route"' in text
+        assert "# TYPE process_cpu_percent gauge\nprocess_cpu_percent 12.5" in text
+        assert text.endswith("\n")
@@ -0,0 +1,135 @@
+"""
+Unit Tests for the Revoked Token Filter
+
+Tests:
+- Seeding from inactive, unexpired RefreshToken rows
+- Lookups within the refresh interval skip the database
+- Revocations from other workers are picked up after the interval
+- Local revocations and expiry
+"""
+
+import pytest
+from datetime import datetime, timezone, timedelta
+from types import SimpleNamespace
+from jose import jwt
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.utils.database import Base
+from app.model.m_user import User
+from app.model.m_refresh_token import RefreshToken
+from app.utils import token_manager as token_manager_module
+from app.utils.token_manager import RevokedTokenFilter, TokenManager
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic() for the filter"""
+    now = {"value": 1000.0}
+    monkeypatch.setattr(token_manager_module, "time", SimpleNamespace(monotonic=lambda: now["value"]))
+
+    def advance(seconds):
+        now["value"] += seconds
+
+    return advance
+
+
+@pytest.fixture
+def token_db():
+    """Session on a refresh_tokens table, and a list collecting the statements it runs"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    tables = [User.__table__, RefreshToken.__table__]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session, statements
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine, tables=tables)
+
+
+def _token(db, token, is_active=False, expires_in=timedelta(days=1)):
+    db.add(RefreshToken(
+        user_id=1,
+        token=token,
+        is_active=is_active,
+        expires_at=datetime.now(timezone.utc) + expires_in
+    ))
+    db.commit()
+
+
+class TestRevokedTokenFilter:
+    """Test the in-process revocation set"""
+
+    def test_seeds_from_revoked_rows(self, clock, token_db):
+        db, _ = token_db
+        _token(db, "revoked")
+        _token(db, "active", is_active=True)
+        _token(db, "expired", expires_in=timedelta(days=-1))
+        revoked = RevokedTokenFilter(refresh_seconds=30)
+
+        assert revoked.is_revoked("revoked", db)
+        assert not revoked.is_revoked("active", db)
+        assert not revoked.is_revoked("expired", db)
+
+    def test_checks_within_the_interval_skip_the_database(self, clock, token_db):
+        db, statements = token_db
+        revoked = RevokedTokenFilter(refresh_seconds=30)
+        revoked.is_revoked("anything", db)
+        statements.clear()
+
+        clock(29)
+        for _ in range(100):
+            revoked.is_revoked("anything", db)
+
+        assert statements == []
+
+    def test_other_workers_revocations_are_seen_after_the_interval(self, clock, token_db):
+        db, _ = token_db
+        revoked = RevokedTokenFilter(refresh_seconds=30)
+        assert not revoked.is_revoked("jti-1", db)
+
+        _token(db, "jti-1")  # Revoked by another worker
+        clock(29)
+        assert not revoked.is_revoked("jti-1", db)
+        clock(1)
+        assert revoked.is_revoked("jti-1", db)
+
+    def test_local_revocations_apply_immediately(self, clock, token_db):
+        db, _ = token_db
+        revoked = RevokedTokenFilter(refresh_seconds=30)
+        revoked.is_revoked("jti-1", db)
+
+        revoked.add("jti-1", datetime.now(timezone.utc) + timedelta(hours=1))
+
+        assert revoked.is_revoked("jti-1", db)
+
+    def test_expired_entries_are_dropped_on_refresh(self, clock, token_db):
+        db, _ = token_db
+        revoked = RevokedTokenFilter(refresh_seconds=30)
+        revoked.add("old", datetime.now(timezone.utc) - timedelta(seconds=1))
+        revoked.add("naive", datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=1))
+        revoked.add("current", datetime.now(timezone.utc) + timedelta(hours=1))
+
+        revoked.refresh(db)
+
+        assert set(revoked._revoked) == {"current"}
+
+
+class TestBlacklistAccessToken:
+    """Test revoking an access token end to end"""
+
+    def test_blacklisted_jti_is_revoked(self, clock, token_db, monkeypatch):
+        db, _ = token_db
+        revoked = RevokedTokenFilter(refresh_seconds=30)
+        monkeypatch.setattr(token_manager_module, "revoked_token_filter", revoked)
+        access_token = jwt.encode({"sub": "1", "jti": "jti-logout"}, "secret", algorithm="HS256")
+
+        assert TokenManager().blacklist_access_token(access_token, db, user_id=1)
+
+        assert revoked.is_revoked("jti-logout", db)
+        # Another worker sees it from the row
+        assert RevokedTokenFilter(refresh_seconds=30).is_revoked("jti-logout", db)
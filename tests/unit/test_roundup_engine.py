@@ -0,0 +1,233 @@
+"""
+Unit Tests for the Roundup Engine
+
+Tests:
+- Bulk ingestion: one INSERT and one commit per user
+- Duplicate transaction ids within a batch and already stored
+- Monthly cap applied in memory
+"""
+
+import math
+import pytest
+from datetime import datetime, timezone, timedelta
+from decimal import Decimal
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.utils.database import Base
+from app.model.m_user import User
+from app.model.m_church import Church
+from app.model.m_donation_preference import DonationPreference
+from app.model.m_pending_roundup import PendingRoundup
+from app.services import platform_counters
+from app.services.roundup_engine import RoundupEngine
+
+
+@pytest.fixture
+def roundup_db(monkeypatch):
+    """In-memory database with the tables roundup ingestion touches, and its statements and commits"""
+    # No platform_counters table here; don't reuse another test's cached check
+    monkeypatch.setattr(platform_counters, "_table_state", {"exists": False, "checked_at": None})
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    tables = [Church.__table__, User.__table__, DonationPreference.__table__, PendingRoundup.__table__]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+    log = {"statements": [], "commits": 0}
+    event.listen(engine, "before_cursor_execute", lambda *args: log["statements"].append(args[2]))
+
+    def count_commit(_):
+        log["commits"] += 1
+
+    event.listen(session, "after_commit", count_commit)
+    try:
+        yield session, log
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine, tables=tables)
+
+
+@pytest.fixture(autouse=True)
+def dollar_roundups(monkeypatch):
+    """
+    Round up to the next whole dollar
+
+    These tests cover the ingestion path (cap, duplicates, statements), not the
+    roundup formula, so amounts are kept simple and independent of it.
+    """
+    monkeypatch.setattr(
+        RoundupEngine,
+        "calculate_roundup",
+        lambda self, transaction_amount, multiplier="1x": round(math.ceil(transaction_amount) - transaction_amount, 2)
+    )
+
+
+@pytest.fixture
+def donor(roundup_db):
+    """A donor with roundups on, no minimum and no cap"""
+    db, log = roundup_db
+    user = User(email="donor@example.com", first_name="Dana", last_name="Donor", role="donor")
+    db.add(user)
+    db.flush()
+    db.add(DonationPreference(user_id=user.id, multiplier="1x", minimum_roundup=Decimal("0.01"), roundups_enabled=True))
+    db.commit()
+    log["statements"].clear()
+    log["commits"] = 0
+    return user
+
+
+def _transaction(transaction_id, amount, category="Food and Drink"):
+    return {
+        "transaction_id": transaction_id,
+        "account_id": "account-1",
+        "amount": amount,
+        "date": "2024-05-01",
+        "merchant_name": "Coffee Shop",
+        "category": [category],
+    }
+
+
+def _inserts(log):
+    return [statement for statement in log["statements"] if statement.lstrip().upper().startswith("INSERT")]
+
+
+def _roundups(db, user_id):
+    return {row.transaction_id: float(row.roundup_amount) for row in db.query(PendingRoundup).filter_by(user_id=user_id)}
+
+
+class TestBatchIngestion:
+    """Test _process_user_transactions_batch"""
+
+    def test_one_insert_and_one_commit(self, roundup_db, donor):
+        db, log = roundup_db
+        transactions = [_transaction(f"t{i}", 4.25 + i) for i in range(20)]
+
+        result = RoundupEngine(db).process_user_transactions(donor.id, transactions)
+
+        assert result["processed_count"] == 20
+        assert result["total_roundup"] == pytest.approx(20 * 0.75)
+        assert len(_inserts(log)) == 1
+        assert log["commits"] == 1
+
+    def test_ineligible_transactions_are_skipped(self, roundup_db, donor):
+        db, _ = roundup_db
+        transactions = [
+            _transaction("debit", 4.25),
+            _transaction("credit", -10.00),
+            _transaction("whole-dollar", 5.00),
+        ]
+
+        RoundupEngine(db).process_user_transactions(donor.id, transactions)
+
+        assert _roundups(db, donor.id) == {"debit": 0.75}
+
+    def test_paused_donor_writes_nothing(self, roundup_db, donor):
+        db, log = roundup_db
+        db.query(DonationPreference).update({"pause": True})
+        db.commit()
+        log["commits"] = 0
+
+        result = RoundupEngine(db).process_user_transactions(donor.id, [_transaction("t1", 4.25)])
+
+        assert result["processed_count"] == 0
+        assert _inserts(log) == []
+        assert log["commits"] == 0
+
+
+class TestDuplicateTransactions:
+    """Test that a transaction gets at most one roundup"""
+
+    def test_duplicates_within_a_batch(self, roundup_db, donor):
+        db, _ = roundup_db
+
+        result = RoundupEngine(db).process_user_transactions(
+            donor.id, [_transaction("t1", 4.25), _transaction("t1", 4.25), _transaction("t2", 3.50)]
+        )
+
+        assert result["processed_count"] == 2
+        assert _roundups(db, donor.id) == {"t1": 0.75, "t2": 0.50}
+
+    def test_already_stored_transactions_are_skipped(self, roundup_db, donor):
+        db, log = roundup_db
+        engine = RoundupEngine(db)
+        engine.process_user_transactions(donor.id, [_transaction("t1", 4.25)])
+        log["statements"].clear()
+
+        result = engine.process_user_transactions(donor.id, [_transaction("t1", 4.25), _transaction("t2", 3.50)])
+
+        assert result["processed_count"] == 1
+        assert [roundup.transaction_id for roundup in result["created_roundups"]] == ["t2"]
+        assert len(_inserts(log)) == 1
+
+    def test_conflicting_insert_is_ignored(self, roundup_db, donor):
+        """A row another worker stored first is left alone by the upsert"""
+        db, _ = roundup_db
+        engine = RoundupEngine(db)
+        row = {
+            "user_id": donor.id,
+            "transaction_id": "t1",
+            "account_id": "account-1",
+            "original_amount": 4.25,
+            "roundup_amount": 0.75,
+            "transaction_date": datetime(2024, 5, 1, tzinfo=timezone.utc),
+            "status": "pending",
+            "created_at": datetime.now(timezone.utc),
+        }
+        db.execute(engine._upsert_statement([row]))
+
+        created = db.scalars(
+            engine._upsert_statement([dict(row, roundup_amount=0.10)]).returning(PendingRoundup)
+        ).all()
+
+        assert created == []
+        assert _roundups(db, donor.id) == {"t1": 0.75}
+
+
+class TestMonthlyCap:
+    """Test the cap applied while building the batch"""
+
+    def test_last_roundup_is_trimmed_to_the_cap(self, roundup_db, donor):
+        db, _ = roundup_db
+        db.query(DonationPreference).update({"monthly_cap": Decimal("1.50")})
+        db.commit()
+
+        result = RoundupEngine(db).process_user_transactions(
+            donor.id, [_transaction("t1", 4.25), _transaction("t2", 3.50), _transaction("t3", 2.10)]
+        )
+
+        assert _roundups(db, donor.id) == {"t1": 0.75, "t2": 0.50, "t3": 0.25}
+        assert result["total_roundup"] == pytest.approx(1.50)
+
+    def test_cap_counts_this_months_pending_roundups(self, roundup_db, donor):
+        db, _ = roundup_db
+        db.query(DonationPreference).update({"monthly_cap": Decimal("1.00")})
+        db.commit()
+        engine = RoundupEngine(db)
+        engine.process_user_transactions(donor.id, [_transaction("t1", 4.25)])
+
+        engine.process_user_transactions(donor.id, [_transaction("t2", 3.50), _transaction("t3", 2.10)])
+
+        assert _roundups(db, donor.id) == {"t1": 0.75, "t2": 0.25}
+
+    def test_skipped_duplicates_do_not_use_up_the_cap(self, roundup_db, donor):
+        """A transaction seen before neither gets a roundup nor counts towards the cap"""
+        db, _ = roundup_db
+        db.query(DonationPreference).update({"monthly_cap": Decimal("1.25")})
+        db.commit()
+        engine = RoundupEngine(db)
+        engine.process_user_transactions(donor.id, [_transaction("t1", 4.25)])
+
+        engine.process_user_transactions(donor.id, [_transaction("t1", 4.25), _transaction("t2", 3.50)])
+
+        assert _roundups(db, donor.id) == {"t1": 0.75, "t2": 0.50}
+
+    def test_roundups_below_the_minimum_after_trimming_are_dropped(self, roundup_db, donor):
+        db, _ = roundup_db
+        db.query(DonationPreference).update({"monthly_cap": Decimal("0.80"), "minimum_roundup": Decimal("0.10")})
+        db.commit()
+
+        RoundupEngine(db).process_user_transactions(
+            donor.id, [_transaction("t1", 4.25), _transaction("t2", 3.50)]
+        )
+
+        assert _roundups(db, donor.id) == {"t1": 0.75}
@@ -0,0 +1,54 @@
+"""
+Unit Tests for the Background Job Scheduler
+
+Tests:
+- The scheduler stays off unless enabled
+- Only the data sync jobs are started
+"""
+
+import pytest
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from app.tasks import scheduler as scheduler_module
+from app.tasks.scheduler import start_scheduler, stop_scheduler
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    """Fresh, stopped scheduler in place of the module's"""
+    fresh = BackgroundScheduler()
+    monkeypatch.setattr(scheduler_module, "scheduler", fresh)
+    yield fresh
+    if fresh.running:
+        fresh.shutdown(wait=False)
+
+
+class TestStartScheduler:
+    """Test start_scheduler"""
+
+    def test_disabled_by_default(self):
+        assert type(scheduler_module.config).model_fields["SCHEDULER_ENABLED"].default is False
+
+    def test_disabled_scheduler_does_not_start(self, scheduler, monkeypatch):
+        monkeypatch.setattr(scheduler_module.config, "SCHEDULER_ENABLED", False)
+
+        start_scheduler()
+
+        assert not scheduler.running
+        assert scheduler.get_jobs() == []
+
+    def test_starts_only_the_data_sync_jobs(self, scheduler, monkeypatch):
+        """No charge or payout job is scheduled"""
+        monkeypatch.setattr(scheduler_module.config, "SCHEDULER_ENABLED", True)
+
+        start_scheduler()
+        start_scheduler()  # Already running: no duplicate jobs
+
+        assert scheduler.running
+        assert sorted(job.id for job in scheduler.get_jobs()) == [
+            "reconcile_platform_counters",
+            "sync_donor_transactions",
+        ]
+
+        stop_scheduler()
+        assert not scheduler.running
@@ -0,0 +1,121 @@
+"""
+Unit Tests for SecurityMiddleware Body Scanning
+
+Tests:
+- Precompiled alternations match exactly when a listed pattern does
+- Threat categories
+- Chunk overlap and the scan size bound
+- Content type and multipart handling
+"""
+
+import re
+import pytest
+
+from app.middleware import security_middleware
+from app.middleware.security_middleware import (
+    BODY_SCAN_CHUNK_SIZE,
+    BODY_SCAN_MAX_BYTES,
+    BODY_THREAT_REGEX,
+    MALICIOUS_PATTERNS,
+    MALICIOUS_REGEX,
+    SQL_INJECTION_PATTERNS,
+    XSS_PATTERNS,
+    scan_request_body,
+)
+
+SAMPLES = [
+    "plain donation note",
+    "SELECT name FROM churches",
+    "x UNION   SELECT password",
+    "'; DROP TABLE users; --",
+    "a /* comment */ b",
+    "exec (xp_cmdshell)",
+    "update set name",
+    "<SCRIPT src=x>alert(1)</script>",
+    "<a href='javascript:alert(1)'>",
+    "<img OnError = alert(1)>",
+    "<iframe src=x>",
+    "width: expression(alert(1))",
+    "background: url(evil)",
+    "../../etc/passwd",
+    "..\\windows\\system32",
+    "<meta http-equiv=refresh>",
+    "one-dash - fine",
+    "on the way = fine?",
+]
+
+
+def _naive(patterns, text):
+    """True if any pattern matches the lowercased text on its own"""
+    return any(re.search(pattern, text.lower()) for pattern in patterns)
+
+
+class TestCompiledPatterns:
+    """Test the single-pass alternations against the pattern lists"""
+
+    @pytest.mark.parametrize("text", SAMPLES)
+    def test_body_regex_matches_like_the_lists(self, text):
+        expected = _naive(SQL_INJECTION_PATTERNS + XSS_PATTERNS, text)
+
+        assert (BODY_THREAT_REGEX.search(text.lower()) is not None) == expected
+
+    @pytest.mark.parametrize("text", SAMPLES)
+    def test_url_regex_matches_like_the_list(self, text):
+        expected = _naive(MALICIOUS_PATTERNS, text)
+
+        assert (MALICIOUS_REGEX.search(text.lower()) is not None) == expected
+
+
+class TestScanRequestBody:
+    """Test scan_request_body"""
+
+    @pytest.mark.parametrize("body, threat", [
+        (b'{"note": "weekly giving"}', None),
+        (b'{"q": "1 UNION SELECT *"}', "sql"),
+        (b'{"q": "x\' -- "}', "sql"),
+        (b'{"bio": "<script>alert(1)</script>"}', "xss"),
+        (b'{"bio": "<img onload=1>"}', "xss"),
+    ])
+    def test_categories(self, body, threat):
+        assert scan_request_body(body, "application/json") == threat
+
+    def test_match_across_a_chunk_edge_is_found(self):
+        body = b"a" * (BODY_SCAN_CHUNK_SIZE - 4) + b"union select"
+
+        assert scan_request_body(body, "text/plain") == "sql"
+
+    def test_only_the_first_bytes_are_scanned(self):
+        body = b"a" * BODY_SCAN_MAX_BYTES + b"<script>"
+
+        assert scan_request_body(body, "text/plain") is None
+
+    def test_binary_content_is_skipped(self):
+        assert scan_request_body(b"<script>", "image/png") is None
+        assert scan_request_body(b"<script>", "application/octet-stream") is None
+        assert scan_request_body(b"<script>", "") == "xss"
+
+    def test_multipart_scans_fields_and_skips_files(self):
+        def multipart(*parts):
+            return b"".join(b"--XyZ\r\n" + part for part in parts) + b"--XyZ--\r\n"
+
+        file_part = (
+            b'Content-Disposition: form-data; name="photo"; filename="a.png"\r\n\r\n'
+            b"<script>binary</script>\r\n"
+        )
+        clean_field = b'Content-Disposition: form-data; name="note"\r\n\r\nhello\r\n'
+        bad_field = b'Content-Disposition: form-data; name="note"\r\n\r\n<iframe src=x>\r\n'
+        content_type = 'multipart/form-data; boundary="XyZ"'
+
+        assert scan_request_body(multipart(file_part, clean_field), content_type) is None
+        assert scan_request_body(multipart(file_part, bad_field), content_type) == "xss"
+        assert scan_request_body(multipart(bad_field), "multipart/form-data") is None  # No boundary
+
+    def test_multipart_fields_share_the_size_bound(self, monkeypatch):
+        monkeypatch.setattr(security_middleware, "BODY_SCAN_MAX_BYTES", 16)
+        body = (
+            b'--b\r\nContent-Disposition: form-data; name="a"\r\n\r\n' + b"x" * 20 + b"\r\n"
+            b'--b\r\nContent-Disposition: form-data; name="b"\r\n\r\n<script>\r\n'
+            b"--b--\r\n"
+        )
+
+        assert scan_request_body(body, "multipart/form-data; boundary=b") is None
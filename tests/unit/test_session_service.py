@@ -0,0 +1,131 @@
+"""
+Unit Tests for the Session Manager
+
+Tests:
+- Access token JTI and refresh token indexes
+- Index maintenance on rotation and removal
+- Idle sweep driven by the activity heap
+"""
+
+import pytest
+from datetime import datetime, timezone, timedelta
+
+from app.services.session_service import SessionManager
+
+
+@pytest.fixture
+def manager():
+    return SessionManager()
+
+
+def _create(manager, user_id=1, device="phone", **tokens):
+    return manager.create_session(user_id, "donor", ip_address="10.0.0.1", user_agent=device, **tokens)
+
+
+def _idle(manager, session_id, minutes):
+    """Make a session look idle for `minutes`"""
+    manager._sessions[session_id].last_activity = datetime.now(timezone.utc) - timedelta(minutes=minutes)
+
+
+class TestTokenIndexes:
+    """Test lookups by token"""
+
+    def test_find_by_jti_and_refresh_token(self, manager):
+        session_id = _create(manager, access_token_jti="jti-1", refresh_token="refresh-1")
+
+        assert manager.find_session_by_token_jti("jti-1").session_id == session_id
+        assert manager.find_session_by_refresh_token("refresh-1").session_id == session_id
+        assert manager.find_session_by_token_jti("unknown") is None
+
+    def test_rotation_moves_the_index(self, manager):
+        session_id = _create(manager, access_token_jti="jti-1", refresh_token="refresh-1")
+
+        manager.update_session_tokens(session_id, access_token_jti="jti-2", refresh_token="refresh-2")
+
+        assert manager.find_session_by_token_jti("jti-1") is None
+        assert manager.find_session_by_refresh_token("refresh-1") is None
+        assert manager.find_session_by_token_jti("jti-2").session_id == session_id
+        assert manager.find_session_by_refresh_token("refresh-2").session_id == session_id
+        assert set(manager._jti_index) == {"jti-2"}
+
+    def test_rotating_one_token_keeps_the_other(self, manager):
+        session_id = _create(manager, access_token_jti="jti-1", refresh_token="refresh-1")
+
+        manager.update_session_tokens(session_id, access_token_jti="jti-2")
+
+        assert manager.find_session_by_refresh_token("refresh-1").session_id == session_id
+
+    def test_removal_unindexes(self, manager):
+        session_id = _create(manager, access_token_jti="jti-1", refresh_token="refresh-1")
+
+        manager.remove_session(session_id)
+
+        assert manager._jti_index == {}
+        assert manager._refresh_token_index == {}
+
+    def test_deactivated_session_is_not_found(self, manager):
+        session_id = _create(manager, access_token_jti="jti-1")
+
+        manager.deactivate_session(session_id)
+
+        assert manager.find_session_by_token_jti("jti-1") is None
+
+    def test_reused_token_points_at_the_newest_session(self, manager):
+        """Removing the older session does not drop the newer one's entry"""
+        first = _create(manager, device="phone", refresh_token="shared")
+        second = _create(manager, device="tablet", refresh_token="shared")
+
+        manager.remove_session(first)
+
+        assert manager.find_session_by_refresh_token("shared").session_id == second
+
+
+class TestIdleSweep:
+    """Test cleanup_expired_sessions"""
+
+    def test_removes_idle_sessions_only(self, manager):
+        idle = _create(manager, device="phone", access_token_jti="jti-idle")
+        fresh = _create(manager, device="tablet")
+        _idle(manager, idle, 31)
+        manager._activity_heap = [(manager._sessions[idle].last_activity.timestamp(), idle), (0.0, fresh)]
+
+        manager.cleanup_expired_sessions()
+
+        assert idle not in manager._sessions
+        assert fresh in manager._sessions
+        assert manager._jti_index == {}
+
+    def test_touched_session_is_requeued(self, manager):
+        """A session queued long ago but used since survives and is queued at its new activity"""
+        session_id = _create(manager)
+        manager._activity_heap = [(0.0, session_id)]
+
+        manager.cleanup_expired_sessions()
+
+        assert session_id in manager._sessions
+        assert manager._activity_heap == [(manager._sessions[session_id].last_activity.timestamp(), session_id)]
+
+    def test_deactivated_session_is_swept_next_time(self, manager):
+        _create(manager)
+
+        manager.logout_user(1)
+        manager.cleanup_expired_sessions()
+
+        assert manager._sessions == {}
+
+    def test_sweep_ignores_entries_for_removed_sessions(self, manager):
+        session_id = _create(manager)
+        manager.remove_session(session_id)
+        manager._activity_heap = [(0.0, session_id)]
+
+        manager.cleanup_expired_sessions()
+
+        assert manager._activity_heap == []
+
+    def test_oldest_session_is_replaced_past_the_per_user_limit(self, manager):
+        session_ids = [_create(manager, device=f"device-{i}") for i in range(6)]
+
+        remaining = {session.session_id for session in manager.get_user_sessions(1)}
+
+        assert len(remaining) == 5
+        assert session_ids[-1] in remaining
@@ -0,0 +1,91 @@
+"""
+Unit Tests for the System Metrics Sampler
+
+Tests:
+- latest() freshness with and without the sampling thread
+- Ring buffer bound and history window
+- Background thread start/stop
+"""
+
+import time
+from dataclasses import replace
+from datetime import datetime, timezone, timedelta
+
+from app.services.system_metrics_sampler import SystemMetricsSampler
+
+
+def _backdate(sampler, seconds):
+    """Make the newest sample look `seconds` old"""
+    sample = sampler.samples.pop()
+    sampler.samples.append(replace(sample, timestamp=sample.timestamp - timedelta(seconds=seconds)))
+    return sampler.samples[-1]
+
+
+class TestLatest:
+    """Test which sample latest() returns"""
+
+    def test_samples_inline_before_the_first_sample(self):
+        sampler = SystemMetricsSampler(interval=10)
+
+        sample = sampler.latest()
+
+        assert len(sampler.samples) == 1
+        assert sampler.samples[-1] is sample
+
+    def test_reuses_a_fresh_sample_without_a_thread(self):
+        sampler = SystemMetricsSampler(interval=10)
+        first = sampler.latest()
+
+        assert sampler.latest() is first
+        assert len(sampler.samples) == 1
+
+    def test_resamples_a_stale_sample_without_a_thread(self):
+        """Without the thread, a sample older than the interval is not served forever"""
+        sampler = SystemMetricsSampler(interval=10)
+        sampler.latest()
+        stale = _backdate(sampler, 11)
+
+        fresh = sampler.latest()
+
+        assert fresh is not stale
+        assert fresh.timestamp > stale.timestamp
+        assert len(sampler.samples) == 2
+
+    def test_serves_the_buffer_while_the_thread_runs(self):
+        """With the thread running, readers never sample on the request path"""
+        sampler = SystemMetricsSampler(interval=60)
+        sampler.start()
+        try:
+            deadline = time.monotonic() + 5
+            while not sampler.samples and time.monotonic() < deadline:
+                time.sleep(0.01)
+            old = _backdate(sampler, 120)
+
+            assert sampler.latest() is old
+        finally:
+            sampler.stop()
+        assert not sampler.running
+
+
+class TestHistory:
+    """Test the ring buffer"""
+
+    def test_buffer_is_bounded(self):
+        sampler = SystemMetricsSampler(interval=10, history_size=3)
+        for _ in range(5):
+            sampler.sample()
+
+        assert len(sampler.samples) == 3
+
+    def test_history_returns_recent_samples_oldest_first(self):
+        sampler = SystemMetricsSampler(interval=10)
+        sampler.sample()
+        _backdate(sampler, 2 * 3600)
+        sampler.sample()
+        sampler.sample()
+
+        recent = sampler.history(minutes=60)
+
+        assert len(recent) == 2
+        assert recent[0].timestamp <= recent[1].timestamp
+        assert all(sample.timestamp >= datetime.now(timezone.utc) - timedelta(minutes=60) for sample in recent)
@@ -0,0 +1,217 @@
+"""
+Unit Tests for Time-Series Helpers
+
+Tests:
+- Grouping aggregate queries by month and day
+- Period keys and time zone boundaries
+- Gap filling across month, year and leap day boundaries
+- Dropping the still-running period
+- Admin growth rates comparing complete months
+"""
+
+import pytest
+from datetime import date, datetime, timezone, timedelta
+from decimal import Decimal
+from sqlalchemy import Column, DateTime, Integer, Numeric, create_engine, func
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session, declarative_base
+
+from app.controller.admin.analytics import get_church_growth_analytics, get_user_growth_analytics
+from app.model.m_church import Church
+from app.model.m_user import User
+from app.services import platform_counters
+from app.utils.database import Base as AppBase
+from app.utils.time_series import aggregate_by_period, complete_periods, fill_periods, period_bucket, period_key
+
+Base = declarative_base()
+
+
+class Payment(Base):
+    __tablename__ = "payments"
+
+    id = Column(Integer, primary_key=True)
+    amount = Column(Numeric(10, 2), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    session.add_all([
+        Payment(amount=Decimal("10.00"), created_at=datetime(2024, 1, 5, 9)),
+        Payment(amount=Decimal("5.50"), created_at=datetime(2024, 1, 31, 23, 59)),
+        Payment(amount=Decimal("2.00"), created_at=datetime(2024, 3, 1, 0, 0)),
+        Payment(amount=Decimal("7.25"), created_at=datetime(2024, 3, 1, 18)),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+class TestAggregateByPeriod:
+    """Test grouping in the database"""
+
+    def test_groups_by_month(self, db):
+        query = db.query(func.sum(Payment.amount), func.count(Payment.id))
+
+        buckets = aggregate_by_period(query, Payment.created_at)
+
+        assert buckets == {"2024-01": (Decimal("15.50"), 2), "2024-03": (Decimal("9.25"), 2)}
+
+    def test_groups_by_day_with_filters(self, db):
+        query = db.query(func.count(Payment.id)).filter(Payment.amount > 3)
+
+        buckets = aggregate_by_period(query, Payment.created_at, period="day")
+
+        assert buckets == {"2024-01-05": (1,), "2024-01-31": (1,), "2024-03-01": (1,)}
+
+    def test_empty_result(self, db):
+        query = db.query(func.count(Payment.id)).filter(Payment.amount > 100)
+
+        assert aggregate_by_period(query, Payment.created_at) == {}
+
+
+class TestPeriodBucket:
+    """Test the SQL expression per dialect"""
+
+    def test_postgres_converts_timestamptz_before_truncating(self):
+        sql = str(period_bucket(Payment.created_at, "postgresql", "month", "America/Chicago").compile(
+            dialect=postgresql.dialect()
+        ))
+
+        assert "date_trunc" in sql
+        assert "timezone" in sql
+
+    def test_unsupported_period(self):
+        with pytest.raises(ValueError):
+            period_bucket(Payment.created_at, "sqlite", "week")
+
+
+class TestPeriodKey:
+    """Test bucket keys"""
+
+    def test_aware_datetime_uses_the_time_zone(self):
+        """00:30 UTC on the 1st is still the previous month in Chicago"""
+        value = datetime(2024, 3, 1, 0, 30, tzinfo=timezone.utc)
+
+        assert period_key(value) == "2024-03"
+        assert period_key(value, tz="America/Chicago") == "2024-02"
+        assert period_key(value, "day", "America/Chicago") == "2024-02-29"
+
+    def test_dates_and_bucket_values(self):
+        assert period_key(date(2024, 7, 4), "day") == "2024-07-04"
+        assert period_key("2024-07-04 00:00:00", "month") == "2024-07"
+        assert period_key(datetime(2024, 7, 4, 12), "day") == "2024-07-04"
+
+
+class TestFillPeriods:
+    """Test gap filling"""
+
+    def test_fills_missing_months(self):
+        series = fill_periods({"2024-01": 3, "2024-03": 1}, empty=0)
+
+        assert series == [("2024-01", 3), ("2024-02", 0), ("2024-03", 1)]
+
+    def test_explicit_range_crosses_the_year(self):
+        series = fill_periods(
+            {"2024-01": 3},
+            start=datetime(2023, 11, 15, tzinfo=timezone.utc),
+            end=datetime(2024, 2, 1, tzinfo=timezone.utc),
+            empty=0,
+        )
+
+        assert [key for key, _ in series] == ["2023-11", "2023-12", "2024-01", "2024-02"]
+        assert dict(series)["2024-01"] == 3
+
+    def test_days_cross_a_leap_day(self):
+        series = fill_periods(
+            {},
+            start=datetime(2024, 2, 27),
+            end=datetime(2024, 3, 1),
+            empty=(0, 0),
+            period="day",
+        )
+
+        assert series == [
+            ("2024-02-27", (0, 0)),
+            ("2024-02-28", (0, 0)),
+            ("2024-02-29", (0, 0)),
+            ("2024-03-01", (0, 0)),
+        ]
+
+    def test_open_end_runs_to_now(self):
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        series = fill_periods({}, start=start, empty=0)
+
+        assert series[0] == ("2024-01", 0)
+        assert series[-1][0] == period_key(datetime.now(timezone.utc))
+
+    def test_no_buckets_and_no_start(self):
+        assert fill_periods({}) == []
+
+
+class TestCompletePeriods:
+    """Test dropping the period that is still accumulating"""
+
+    SERIES = [("2024-03", 1), ("2024-04", 2), ("2024-05", 3)]
+
+    def test_drops_the_current_period(self):
+        now = datetime(2024, 5, 14, 12, tzinfo=timezone.utc)
+
+        assert complete_periods(self.SERIES, now=now) == [("2024-03", 1), ("2024-04", 2)]
+
+    def test_past_series_is_complete(self):
+        now = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+        assert complete_periods(self.SERIES, now=now) == self.SERIES
+
+    def test_uses_the_time_zone(self):
+        """00:30 UTC on June 1st is still May in New York"""
+        now = datetime(2024, 6, 1, 0, 30, tzinfo=timezone.utc)
+
+        assert complete_periods(self.SERIES, tz="America/New_York", now=now) == self.SERIES[:2]
+
+    def test_days(self):
+        series = [("2024-05-13", 4), ("2024-05-14", 1)]
+
+        assert complete_periods(series, period="day", now=datetime(2024, 5, 14, 9)) == [("2024-05-13", 4)]
+
+
+class TestGrowthAnalytics:
+    """Test admin growth rates over the default 12-month window"""
+
+    @pytest.fixture
+    def growth_db(self, monkeypatch):
+        # No platform_counters table here; don't reuse another test's cached check
+        monkeypatch.setattr(platform_counters, "_table_state", {"exists": False, "checked_at": None})
+        engine = create_engine("sqlite://")
+        tables = [Church.__table__, User.__table__]
+        AppBase.metadata.create_all(engine, tables=tables)
+        session = Session(engine)
+        this_month = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        last_month = this_month - timedelta(days=15)
+        two_months_ago = this_month - timedelta(days=45)
+        # 2 two months ago, 4 last month, 1 so far this month
+        created = [two_months_ago] * 2 + [last_month] * 4 + [this_month]
+        for i, created_at in enumerate(created):
+            session.add(Church(name=f"Church {i}", email=f"church{i}@example.com", created_at=created_at))
+            session.add(User(email=f"user{i}@example.com", first_name="U", last_name=str(i), created_at=created_at))
+        session.commit()
+        yield session
+        session.close()
+
+    def test_user_growth_compares_complete_months(self, growth_db):
+        data = get_user_growth_analytics(db=growth_db).data
+
+        assert data["growth_rate"] == 100.0
+        assert data["total_users"] == 7
+        assert data["monthly_growth"][-1]["new_users"] == 1
+
+    def test_church_growth_compares_complete_months(self, growth_db):
+        data = get_church_growth_analytics(db=growth_db).data
+
+        assert data["growth_rate"] == 100.0
+        assert data["total_churches"] == 7
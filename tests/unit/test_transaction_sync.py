@@ -0,0 +1,335 @@
+"""
+Unit Tests for Cursor-Based Transaction Sync
+
+Tests:
+- Paging and restarting /transactions/sync pulls
+- Applying added, modified and removed deltas to pending roundups
+- Saving the item cursor only after its deltas are applied
+- Replaying a batch after a crash between the delta and cursor commits
+"""
+
+import math
+import sys
+import pytest
+from datetime import datetime, timezone
+from decimal import Decimal
+from plaid.exceptions import ApiException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.utils.database import Base
+from app.model.m_user import User
+from app.model.m_church import Church
+from app.model.m_plaid_items import PlaidItem
+from app.model.m_donation_preference import DonationPreference
+from app.model.m_pending_roundup import PendingRoundup
+from app.services import platform_counters
+from app.services import plaid_transaction_service as plaid_transaction_service_module
+from app.services.church_spending_rollup_service import ChurchSpendingRollupService
+from app.services.roundup_engine import RoundupEngine
+from app.services.transaction_processor import TransactionProcessor
+
+# app.services re-exports a client object under the module's own name
+plaid_client = sys.modules["app.services.plaid_client"]
+
+
+@pytest.fixture(autouse=True)
+def dollar_roundups(monkeypatch):
+    """Round up to the next whole dollar; the formula itself is not under test here"""
+    monkeypatch.setattr(
+        RoundupEngine,
+        "calculate_roundup",
+        lambda self, transaction_amount, multiplier="1x": round(math.ceil(transaction_amount) - transaction_amount, 2)
+    )
+
+
+@pytest.fixture
+def sync_db(monkeypatch):
+    """In-memory database with the tables a sync touches"""
+    # No platform_counters table here; don't reuse another test's cached check
+    monkeypatch.setattr(platform_counters, "_table_state", {"exists": False, "checked_at": None})
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    tables = [
+        Church.__table__,
+        User.__table__,
+        PlaidItem.__table__,
+        DonationPreference.__table__,
+        PendingRoundup.__table__,
+    ]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine, tables=tables)
+
+
+@pytest.fixture
+def donor(sync_db):
+    """A donor with roundups on and one Plaid item that has synced before"""
+    user = User(email="donor@example.com", first_name="Dana", last_name="Donor", role="donor")
+    sync_db.add(user)
+    sync_db.flush()
+    sync_db.add(DonationPreference(user_id=user.id, multiplier="1x", minimum_roundup=Decimal("0.01"), roundups_enabled=True))
+    sync_db.add(PlaidItem(user_id=user.id, item_id="item-1", access_token="access-1", status="active", transactions_cursor="cursor-0"))
+    sync_db.commit()
+    return user
+
+
+def _transaction(transaction_id, amount, category="Food and Drink", day="2024-05-01"):
+    return {
+        "transaction_id": transaction_id,
+        "account_id": "account-1",
+        "amount": amount,
+        "date": day,
+        "merchant_name": "Coffee Shop",
+        "category": [category],
+    }
+
+
+def _roundups(db, user_id):
+    """transaction_id -> (status, roundup amount)"""
+    db.expire_all()
+    return {
+        row.transaction_id: (row.status, float(row.roundup_amount))
+        for row in db.query(PendingRoundup).filter_by(user_id=user_id)
+    }
+
+
+def _cursor(db):
+    db.expire_all()
+    return db.query(PlaidItem).one().transactions_cursor
+
+
+def _mutation_error():
+    error = ApiException(status=400, reason="Bad Request")
+    error.body = '{"error_code": "TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION"}'
+    return error
+
+
+class TestSyncTransactions:
+    """Test plaid_client.sync_transactions"""
+
+    def _pages(self, monkeypatch, pages):
+        """Serve scripted /transactions/sync pages; returns the cursors requested"""
+        requested = []
+        pages = iter(pages)
+
+        def get_transactions_sync(access_token, cursor=None, count=100):
+            requested.append(cursor)
+            page = next(pages)
+            if isinstance(page, Exception):
+                raise page
+            return page
+
+        monkeypatch.setattr(plaid_client, "get_transactions_sync", get_transactions_sync)
+        return requested
+
+    def _page(self, added, next_cursor, has_more, modified=(), removed=()):
+        return {
+            "transactions": list(added),
+            "modified": list(modified),
+            "removed": list(removed),
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        }
+
+    def test_pages_until_has_more_is_false(self, monkeypatch):
+        requested = self._pages(monkeypatch, [
+            self._page([{"transaction_id": "a"}], "c1", True),
+            self._page([{"transaction_id": "b"}], "c2", False, modified=[{"transaction_id": "m"}], removed=["r"]),
+        ])
+
+        delta = plaid_client.sync_transactions("access-1", cursor="c0")
+
+        assert requested == ["c0", "c1"]
+        assert [t["transaction_id"] for t in delta["added"]] == ["a", "b"]
+        assert [t["transaction_id"] for t in delta["modified"]] == ["m"]
+        assert delta["removed"] == ["r"]
+        assert delta["next_cursor"] == "c2"
+
+    def test_mutation_during_pagination_restarts_from_the_saved_cursor(self, monkeypatch):
+        """Pages from the abandoned pull are discarded, not duplicated"""
+        requested = self._pages(monkeypatch, [
+            self._page([{"transaction_id": "a"}], "c1", True),
+            _mutation_error(),
+            self._page([{"transaction_id": "a"}], "c1", True),
+            self._page([{"transaction_id": "b"}], "c2", False),
+        ])
+
+        delta = plaid_client.sync_transactions("access-1", cursor="c0")
+
+        assert requested == ["c0", "c1", "c0", "c1"]
+        assert [t["transaction_id"] for t in delta["added"]] == ["a", "b"]
+        assert delta["next_cursor"] == "c2"
+
+    def test_repeated_mutations_give_up(self, monkeypatch):
+        self._pages(monkeypatch, [_mutation_error()] * plaid_client.MAX_RETRIES)
+
+        with pytest.raises(ApiException):
+            plaid_client.sync_transactions("access-1", cursor="c0")
+
+    def test_other_errors_are_not_retried(self, monkeypatch):
+        requested = self._pages(monkeypatch, [ApiException(status=400, reason="ITEM_LOGIN_REQUIRED")])
+
+        with pytest.raises(ApiException):
+            plaid_client.sync_transactions("access-1", cursor="c0")
+        assert requested == ["c0"]
+
+
+class TestApplyTransactionDeltas:
+    """Test RoundupEngine.apply_transaction_deltas"""
+
+    def test_added_transactions_create_roundups(self, sync_db, donor):
+        result = RoundupEngine(sync_db).apply_transaction_deltas(donor.id, [_transaction("t1", 4.25)])
+
+        assert result["processed_count"] == 1
+        assert _roundups(sync_db, donor.id) == {"t1": ("pending", 0.75)}
+
+    def test_modified_transaction_recomputes_its_roundup(self, sync_db, donor):
+        engine = RoundupEngine(sync_db)
+        engine.apply_transaction_deltas(donor.id, [_transaction("t1", 4.25)])
+
+        result = engine.apply_transaction_deltas(donor.id, [], modified=[_transaction("t1", 4.60, day="2024-05-02")])
+
+        assert result["updated_count"] == 1
+        assert _roundups(sync_db, donor.id) == {"t1": ("pending", 0.40)}
+        assert sync_db.query(PendingRoundup).one().transaction_date.date().isoformat() == "2024-05-02"
+
+    def test_modified_transaction_that_is_no_longer_eligible_is_cancelled(self, sync_db, donor):
+        engine = RoundupEngine(sync_db)
+        engine.apply_transaction_deltas(donor.id, [_transaction("t1", 4.25)])
+
+        result = engine.apply_transaction_deltas(donor.id, [], modified=[_transaction("t1", -4.25)])
+
+        assert result["cancelled_count"] == 1
+        assert _roundups(sync_db, donor.id) == {"t1": ("cancelled", 0.75)}
+
+    def test_unknown_modified_transaction_is_added(self, sync_db, donor):
+        RoundupEngine(sync_db).apply_transaction_deltas(donor.id, [], modified=[_transaction("t1", 4.25)])
+
+        assert _roundups(sync_db, donor.id) == {"t1": ("pending", 0.75)}
+
+    def test_removed_transaction_cancels_its_roundup(self, sync_db, donor):
+        engine = RoundupEngine(sync_db)
+        engine.apply_transaction_deltas(donor.id, [_transaction("t1", 4.25), _transaction("t2", 3.50)])
+
+        result = engine.apply_transaction_deltas(donor.id, [], removed=["t1"])
+
+        assert result["cancelled_count"] == 1
+        assert _roundups(sync_db, donor.id) == {"t1": ("cancelled", 0.75), "t2": ("pending", 0.50)}
+
+    def test_collected_roundups_are_never_changed(self, sync_db, donor):
+        engine = RoundupEngine(sync_db)
+        engine.apply_transaction_deltas(donor.id, [_transaction("t1", 4.25), _transaction("t2", 3.50)])
+        sync_db.query(PendingRoundup).update({"status": "collected"})
+        sync_db.commit()
+
+        engine.apply_transaction_deltas(donor.id, [], modified=[_transaction("t1", 4.90)], removed=["t2"])
+
+        assert _roundups(sync_db, donor.id) == {"t1": ("collected", 0.75), "t2": ("collected", 0.50)}
+
+    def test_all_deltas_commit_once(self, sync_db, donor):
+        engine = RoundupEngine(sync_db)
+        engine.apply_transaction_deltas(donor.id, [_transaction("t1", 4.25)])
+        commits = []
+        event.listen(sync_db, "after_commit", lambda session: commits.append(1))
+
+        engine.apply_transaction_deltas(
+            donor.id, [_transaction("t2", 3.50)], modified=[_transaction("t1", 4.60)], removed=["t3"]
+        )
+
+        assert len(commits) == 1
+
+
+class TestCursorHandling:
+    """Test TransactionProcessor saving the item cursor"""
+
+    def _serve(self, monkeypatch, *deltas):
+        """Serve one scripted delta per sync; returns the cursors the syncs started from"""
+        requested = []
+        deltas = iter(deltas)
+
+        def sync_transactions(access_token, cursor=None):
+            requested.append(cursor)
+            return next(deltas)
+
+        monkeypatch.setattr(plaid_transaction_service_module, "sync_transactions", sync_transactions)
+        return requested
+
+    def _delta(self, next_cursor, added=(), modified=(), removed=()):
+        return {"added": list(added), "modified": list(modified), "removed": list(removed), "next_cursor": next_cursor}
+
+    def test_cursor_advances_after_the_deltas_are_applied(self, sync_db, donor, monkeypatch):
+        requested = self._serve(
+            monkeypatch,
+            self._delta("cursor-1", added=[_transaction("t1", 4.25)]),
+            self._delta("cursor-2", removed=["t1"]),
+        )
+        processor = TransactionProcessor(sync_db)
+
+        processor.process_user_transactions(donor.id)
+        assert _cursor(sync_db) == "cursor-1"
+        processor.process_user_transactions(donor.id)
+
+        assert requested == ["cursor-0", "cursor-1"]
+        assert _cursor(sync_db) == "cursor-2"
+        assert _roundups(sync_db, donor.id) == {"t1": ("cancelled", 0.75)}
+
+    def test_failed_apply_keeps_the_cursor(self, sync_db, donor, monkeypatch):
+        self._serve(monkeypatch, self._delta("cursor-1", added=[_transaction("t1", 4.25)]))
+
+        def failing_apply(self, *args, **kwargs):
+            raise RuntimeError("database went away")
+
+        monkeypatch.setattr(RoundupEngine, "apply_transaction_deltas", failing_apply)
+
+        TransactionProcessor(sync_db).process_user_transactions(donor.id)
+
+        assert _cursor(sync_db) == "cursor-0"
+
+    def test_crash_before_the_cursor_commit_replays_safely(self, sync_db, donor, monkeypatch):
+        """Deltas committed without their cursor are applied again without duplicating roundups"""
+        batch = [_transaction("t1", 4.25), _transaction("t2", 3.50)]
+        requested = self._serve(
+            monkeypatch,
+            self._delta("cursor-1", added=batch),
+            self._delta("cursor-1", added=batch),
+        )
+        record = ChurchSpendingRollupService.record_user_transactions
+        crashes = iter([True, False])
+
+        def crash_once(db, user_id, transactions):
+            if next(crashes):
+                raise RuntimeError("worker killed")
+            return record(db, user_id, transactions)
+
+        monkeypatch.setattr(ChurchSpendingRollupService, "record_user_transactions", crash_once)
+        processor = TransactionProcessor(sync_db)
+
+        processor.process_user_transactions(donor.id)
+        assert _cursor(sync_db) == "cursor-0"
+        assert _roundups(sync_db, donor.id) == {"t1": ("pending", 0.75), "t2": ("pending", 0.50)}
+
+        result = processor.process_user_transactions(donor.id)
+
+        assert requested == ["cursor-0", "cursor-0"]
+        assert result["processed_count"] == 0
+        assert _cursor(sync_db) == "cursor-1"
+        assert _roundups(sync_db, donor.id) == {"t1": ("pending", 0.75), "t2": ("pending", 0.50)}
+
+    def test_first_sync_skips_old_history(self, sync_db, donor, monkeypatch):
+        sync_db.query(PlaidItem).update({"transactions_cursor": None})
+        sync_db.commit()
+        today = datetime.now(timezone.utc).date().isoformat()
+        self._serve(monkeypatch, self._delta("cursor-1", added=[
+            _transaction("recent", 4.25, day=today),
+            _transaction("old", 3.50, day="2020-01-01"),
+        ]))
+
+        TransactionProcessor(sync_db).process_user_transactions(donor.id, days_back=30)
+
+        assert set(_roundups(sync_db, donor.id)) == {"recent"}
+        assert _cursor(sync_db) == "cursor-1"
@@ -0,0 +1,127 @@
+"""
+Unit Tests for User Search
+
+Tests:
+- The SQLite fallback matching the per-column ILIKE predicate, unranked
+- The PostgreSQL search document matching the trigram index expression
+- Admin user search results
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import create_engine, or_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.utils.database import Base
+from app.model.m_user import User
+from app.model.m_church import Church
+from app.services import platform_counters
+from app.controller.admin.users import search_users
+from app.services.user_search import filter_by_search_term, order_by_relevance, search_rank, user_search_document
+from migrations.add_user_search_indexes import SEARCH_DOCUMENT
+
+START = datetime(2024, 1, 1)
+USERS = [
+    ("Anna", "Smith", "anna@example.com"),
+    ("Hannah", "Jones", "hj@example.com"),
+    ("Bob", "Annaberg", "bob@example.com"),
+    ("Carl", "Lee", "carl.ANNA@example.org"),
+    ("Dora", "Smith", "dora@example.net"),
+]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    # No platform_counters table here; don't reuse another test's cached check
+    monkeypatch.setattr(platform_counters, "_table_state", {"exists": False, "checked_at": None})
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    tables = [Church.__table__, User.__table__]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        User(first_name=first, last_name=last, email=email, role="donor", created_at=START + timedelta(days=i))
+        for i, (first, last, email) in enumerate(USERS)
+    )
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine, tables=tables)
+
+
+def _previous_search(db, term):
+    """The per-column predicate the admin user list used before the search service"""
+    pattern = f"%{term}%"
+    return db.query(User).filter(
+        or_(User.email.ilike(pattern), User.first_name.ilike(pattern), User.last_name.ilike(pattern))
+    )
+
+
+class TestSqliteFallback:
+    """Test the unindexed fallback used outside PostgreSQL"""
+
+    @pytest.mark.parametrize("term", ["anna", "ANNA", "smith", "example.org", "ob", "nobody"])
+    def test_matches_the_previous_predicate(self, db, term):
+        matched = filter_by_search_term(db.query(User), term).order_by(User.id).all()
+
+        assert matched == _previous_search(db, term).order_by(User.id).all()
+
+    def test_ordering_is_unchanged(self, db):
+        query = filter_by_search_term(db.query(User), "anna").order_by(User.created_at.desc())
+
+        assert search_rank(query, "anna") is None
+        assert order_by_relevance(query, "anna") is query
+        assert [user.email for user in order_by_relevance(query, "anna")] == [
+            "carl.ANNA@example.org", "bob@example.com", "hj@example.com", "anna@example.com"
+        ]
+
+
+class TestPostgresSearchDocument:
+    """Test the PostgreSQL expression against the migration's index"""
+
+    @pytest.fixture
+    def pg_query(self):
+        # Never connects; only the dialect is used to pick the search expression
+        engine = create_engine("postgresql://localhost/unused")
+        return Session(bind=engine).query(User)
+
+    def _sql(self, clause):
+        return str(clause.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    def test_document_matches_the_index_expression(self):
+        assert self._sql(user_search_document()).replace("users.", "") == SEARCH_DOCUMENT
+
+    def test_filter_uses_the_indexed_document(self, pg_query):
+        sql = self._sql(filter_by_search_term(pg_query, "Anna").statement).replace("users.", "")
+
+        assert f"WHERE {SEARCH_DOCUMENT} ILIKE" in sql
+
+    def test_rank_uses_word_similarity(self, pg_query):
+        sql = self._sql(order_by_relevance(pg_query, "Anna").statement).replace("users.", "")
+
+        assert f"ORDER BY word_similarity('anna', {SEARCH_DOCUMENT}) DESC" in sql
+
+
+class TestSearchUsers:
+    """Test GET /admin/users/search"""
+
+    def test_returns_matches_newest_first(self, db):
+        result = search_users("smith", db=db).data
+
+        assert [user["email"] for user in result["users"]] == ["dora@example.net", "anna@example.com"]
+        assert result["search_term"] == "smith"
+
+    def test_limit(self, db):
+        result = search_users("example", limit=2, db=db).data
+
+        assert len(result["users"]) == 2
+
+    def test_blank_term_is_rejected(self, db):
+        with pytest.raises(HTTPException) as exc_info:
+            search_users("   ", db=db)
+
+        assert exc_info.value.status_code == 400